@@ -0,0 +1,187 @@
+"""
+KPIの時系列から派生指標をベクトル演算で計算する処理
+
+前期比、移動平均、直前の期間に対するzスコア（異常値の検出）、目標達成率を
+NumPy の配列演算（累積和）で計算します。いずれも時系列の長さに対して線形時間で、
+ウィンドウの幅には依存しません。値の存在しない位置（計算に必要な過去の値が足りない位置など）は NaN です。
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .series import Series
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    長さ `window` の各区間の合計を返します（`result[i]` は `values[i:i + window]` の合計）。
+
+    累積和の桁落ちを抑えるため、平均を引いた値で累積和を計算します。
+    """
+    offset = values.mean()
+    cumulative = np.concatenate(([0.0], np.cumsum(values - offset)))
+    return cumulative[window:] - cumulative[:-window] + offset * window
+
+
+def period_change(values: np.ndarray, periods: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `periods` 個前の値からの変化量と変化率を計算します。
+
+    Parameters
+    ----------
+    values : np.ndarray
+        時系列の値
+    periods : int, optional
+        比較する値の間隔, by default 1
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        変化量と変化率（比較する値が0の場合は NaN）
+    """
+    change = np.full(len(values), np.nan)
+    ratio = np.full(len(values), np.nan)
+    if len(values) > periods:
+        previous = values[:-periods]
+        change[periods:] = values[periods:] - previous
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio[periods:] = np.where(previous != 0, change[periods:] / np.abs(previous), np.nan)
+    return change, ratio
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    直近 `window` 個の値（その位置の値を含む）の移動平均を計算します。
+
+    Parameters
+    ----------
+    values : np.ndarray
+        時系列の値
+    window : int
+        移動平均の幅
+
+    Returns
+    -------
+    np.ndarray
+        移動平均（先頭の `window - 1` 個は NaN）
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = _window_sums(values, window) / window
+    return result
+
+
+def rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    各値の、直前の `window` 個の値（その位置の値を含まない）の平均・標準偏差に対するzスコアを計算します。
+
+    Parameters
+    ----------
+    values : np.ndarray
+        時系列の値
+    window : int
+        基準とする直前の値の個数
+
+    Returns
+    -------
+    np.ndarray
+        zスコア（先頭の `window` 個と、直前の値がすべて同じ位置は NaN）
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) > window:
+        centered = values - values.mean()
+        mean = _window_sums(centered[:-1], window) / window
+        variance = _window_sums(centered[:-1] ** 2, window) / window - mean ** 2
+        std = np.sqrt(np.clip(variance, 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[window:] = np.where(std > 0, (centered[window:] - mean) / std, np.nan)
+    return result
+
+
+def _last(values: np.ndarray) -> Optional[float]:
+    return float(values[-1]) if len(values) and not np.isnan(values[-1]) else None
+
+
+def analyze(
+    series: Series,
+    window: int = 7,
+    periods: int = 1,
+    z_threshold: float = 3.0,
+    target: Optional[float] = None,
+    max_anomalies: int = 100,
+    include_series: bool = False
+) -> Dict[str, Any]:
+    """
+    時系列の統計量と派生指標を計算します。
+
+    Parameters
+    ----------
+    series : Series
+        時系列
+    window : int, optional
+        移動平均・zスコアの幅, by default 7
+    periods : int, optional
+        前期比で比較する値の間隔, by default 1
+    z_threshold : float, optional
+        異常値とみなすzスコアの絶対値, by default 3.0
+    target : Optional[float], optional
+        目標値。指定した場合は達成率を計算する, by default None
+    max_anomalies : int, optional
+        結果に含める異常値の最大件数（新しい順）, by default 100
+    include_series : bool, optional
+        Trueの場合は派生指標の時系列（列ごとの配列）を結果に含める, by default False
+
+    Returns
+    -------
+    Dict[str, Any]
+        `app.db.schemas.kpi_analytics.KpiAnalytics` の形式の辞書（日時はUTCのタイムゾーンなしの datetime、
+        数値は NumPy の数値・配列を含む。`ArrayResponse` でそのままエンコードできます）
+    """
+    timestamps, values = series
+    count = len(values)
+    change, change_ratio = period_change(values, periods)
+    average = moving_average(values, window)
+    zscore = rolling_zscore(values, window)
+
+    with np.errstate(invalid="ignore"):
+        anomalies = np.flatnonzero(np.abs(zscore) > z_threshold)
+    recent = anomalies[::-1][:max_anomalies]
+
+    result: Dict[str, Any] = {
+        "points": count,
+        "start": timestamps[0].item() if count else None,
+        "end": timestamps[-1].item() if count else None,
+        "last": _last(values),
+        "mean": values.mean() if count else None,
+        "min": values.min() if count else None,
+        "max": values.max() if count else None,
+        "std": values.std() if count else None,
+        "change": _last(change),
+        "change_ratio": _last(change_ratio),
+        "moving_average": _last(average),
+        "zscore": _last(zscore),
+        "anomaly_count": len(anomalies),
+        "anomalies": [
+            {"timestamp": timestamps[i].item(), "value": values[i], "zscore": zscore[i]} for i in recent
+        ],
+        "target": target,
+        "attainment": None,
+        "last_attainment": None,
+        "target_hit_ratio": None,
+        "series": None,
+    }
+    if target is not None and count:
+        result["target_hit_ratio"] = np.count_nonzero(values >= target) / count
+        if target != 0:
+            result["attainment"] = values.mean() / target
+            result["last_attainment"] = values[-1] / target
+    if include_series:
+        result["series"] = {
+            "timestamps": timestamps.tolist(),
+            "values": values,
+            "change": change,
+            "change_ratio": change_ratio,
+            "moving_average": average,
+            "zscore": zscore,
+        }
+    return result
@@ -0,0 +1,100 @@
+"""
+KPI測定値の時系列を列指向の NumPy 配列として取得する処理
+
+複数アイテムの時系列を1回のクエリで取得します。各アイテムの日時と値は
+PostgreSQL 側でバイナリ表現（`timestamptz_send` / `float8send`）を連結した `bytea` として返し、
+`numpy.frombuffer` でそのまま配列に変換するため、測定値ごとの Python オブジェクトは生成しません。
+"""
+from datetime import datetime
+from typing import Dict, Literal, NamedTuple, Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import LargeBinary, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from ..db.models.kpi_measurement import KpiMeasurement
+from ..db.rollups import ROLLUPS
+
+SeriesBucket = Literal["hour", "day", "month"]
+
+# PostgreSQL の日時のバイナリ表現（2000-01-01 UTC からのマイクロ秒）の基準日時
+_POSTGRES_EPOCH = np.datetime64("2000-01-01T00:00:00", "us")
+
+
+class Series(NamedTuple):
+    """
+    1アイテムの時系列
+
+    Attributes
+    ----------
+    timestamps : np.ndarray
+        日時（`datetime64[us]`、UTC、昇順）
+    values : np.ndarray
+        値（`float64`）
+    """
+    timestamps: np.ndarray
+    values: np.ndarray
+
+
+EMPTY_SERIES = Series(np.empty(0, dtype="datetime64[us]"), np.empty(0, dtype=np.float64))
+
+
+def _packed(expression, order_by):
+    """列の値のバイナリ表現を順序どおりに連結する集約式を返します。"""
+    return func.string_agg(expression, aggregate_order_by(literal(b"", LargeBinary), order_by))
+
+
+def fetch_series(
+    db: Session,
+    item_ids: Sequence[UUID],
+    start: datetime,
+    end: datetime,
+    bucket: Optional[SeriesBucket] = None
+) -> Dict[UUID, Series]:
+    """
+    複数アイテムの指定された期間の時系列を1回のクエリで取得します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_ids : Sequence[UUID]
+        アイテムのIDのリスト
+    start : datetime
+        期間の開始日時（この日時を含む）
+    end : datetime
+        期間の終了日時（この日時を含まない）
+    bucket : Optional[SeriesBucket], optional
+        指定した場合は測定値の代わりにロールアップの平均値（"hour"、"day"、"month" ごと）の
+        時系列を取得する, by default None
+
+    Returns
+    -------
+    Dict[UUID, Series]
+        アイテムのIDと時系列の辞書（測定値のないアイテムは空の時系列）
+    """
+    if bucket is None:
+        item_id, time_column, value = KpiMeasurement.item_id, KpiMeasurement.measured_at, KpiMeasurement.value
+    else:
+        model = ROLLUPS[bucket]
+        item_id, time_column, value = model.item_id, model.bucket, model.sum / model.count
+
+    rows = db.execute(
+        select(
+            item_id,
+            _packed(func.timestamptz_send(time_column), time_column),
+            _packed(func.float8send(value), time_column),
+        )
+        .where(item_id.in_(set(item_ids)), time_column >= start, time_column < end)
+        .group_by(item_id)
+    )
+
+    series = dict.fromkeys(item_ids, EMPTY_SERIES)
+    for row_item_id, packed_timestamps, packed_values in rows:
+        series[row_item_id] = Series(
+            np.frombuffer(packed_timestamps, dtype=">i8").astype("timedelta64[us]") + _POSTGRES_EPOCH,
+            np.frombuffer(packed_values, dtype=">f8").astype(np.float64),
+        )
+    return series
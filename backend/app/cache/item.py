@@ -0,0 +1,768 @@
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+import redis
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.redis import redis_client
+from ..db.crud import item as crud
+from ..db.models.item import Item as ItemModel
+from ..db.schemas.item import Item, ItemBulkUpdate, ItemCreate, ItemUpdate
+from .local import LocalCache
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 無効化したキーの値
+TOMBSTONE = b""
+
+# 無効化したキーに再保存できるようになるまでの秒数の既定値（データベースからの1件の読み込みより十分に長くする）
+DEFAULT_TOMBSTONE_TTL = 2
+
+
+class ItemCache:
+    """
+    アイテムのJSONをRedisに保存するキャッシュです。
+
+    Redisに障害が発生した場合は例外を送出せずにキャッシュミスとして扱い、
+    `retry_interval` 秒の間はRedisへのアクセスを行いません（リクエストごとに
+    タイムアウトを待たないようにするため）。
+
+    `local` を指定した場合は、Redisの前段にプロセス内のキャッシュ（`LocalCache`）を置き、取得したJSONを保持します
+    （参照はネットワークを経由しません）。無効化はRedisの Pub/Sub（`<key_prefix>invalidate` チャンネル）で
+    全てのプロセスに通知し、各プロセスはバックグラウンドのスレッドで受信してプロセス内の値を破棄します。
+    通知を受信していない間（受信の開始前・Redisとの接続が切れている間）はプロセス内のキャッシュを使用せず、
+    受信を再開する際に全ての値を破棄します。
+
+    無効化はキーを削除せずに `tombstone_ttl` 秒の間「削除済み」の値に置き換え、保存は既存のキーがない場合のみ行います。
+    無効化の前にデータベースから読み込んだ値（読み込みと保存の間に更新・削除された値）や、書き込み前の行を返す
+    （遅延している）リードレプリカから読み込んだ値で、無効化したキャッシュを埋め直さないようにするためです。
+
+    Parameters
+    ----------
+    client : redis.Redis
+        Redisクライアント
+    ttl : int
+        キャッシュの有効期限（秒）
+    enabled : bool, optional
+        キャッシュを有効にするかどうか, by default True
+    retry_interval : float, optional
+        障害検知後にRedisへのアクセスを再開するまでの秒数, by default 5.0
+    key_prefix : str, optional
+        キーの接頭辞, by default "item:"
+    tombstone_ttl : int, optional
+        無効化したキーに再保存できるようになるまでの秒数（1以上、読み込みから保存までの時間より長くする）,
+        by default DEFAULT_TOMBSTONE_TTL
+    lock_timeout : float, optional
+        キャッシュミスしたアイテムの読み込みのロック（`lock`）の有効期限と、他のプロセスの読み込みを待つ最大秒数
+        （0の場合はロックを使用しない）, by default 0
+    local : Optional[LocalCache], optional
+        Redisの前段に置くプロセス内のキャッシュ, by default None
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int,
+        enabled: bool = True,
+        retry_interval: float = 5.0,
+        key_prefix: str = "item:",
+        tombstone_ttl: int = DEFAULT_TOMBSTONE_TTL,
+        lock_timeout: float = 0,
+        local: Optional[LocalCache] = None
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.enabled = enabled
+        self.retry_interval = retry_interval
+        self.key_prefix = key_prefix
+        if tombstone_ttl < 1:
+            raise ValueError("tombstone_ttl must be at least 1 second")
+        self.tombstone_ttl = tombstone_ttl
+        self.lock_timeout = lock_timeout
+        self.local = local
+        self.channel = f"{key_prefix}invalidate"
+        self._lock = threading.Lock()
+        # 無効化の通知を受信するスレッド（fork したワーカーにはスレッドが引き継がれないため、プロセスごとに開始する）
+        self._listener_pid: Optional[int] = None
+        self._listening = threading.Event()
+        self._closed = threading.Event()
+        self._unavailable_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        self.lock_waits = 0
+
+    def _key(self, item_id: UUID) -> str:
+        return f"{self.key_prefix}{item_id}"
+
+    def _lock_key(self, item_id: UUID) -> str:
+        return f"{self.key_prefix}lock:{item_id}"
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._unavailable_until
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _on_error(self, operation: str, error: redis.RedisError) -> None:
+        self._count("errors")
+        self._unavailable_until = time.monotonic() + self.retry_interval
+        logger.warning("Redis %s failed, bypassing cache for %.1fs: %s", operation, self.retry_interval, error)
+
+    def _local_tier(self) -> Optional[LocalCache]:
+        """無効化の通知を受信している場合のみプロセス内のキャッシュを返します（受信を開始していない場合は開始します）。"""
+        if self.local is None or not self.enabled:
+            return None
+        if self._listener_pid != os.getpid():
+            with self._lock:
+                if self._listener_pid != os.getpid():
+                    self._listener_pid = os.getpid()
+                    self._listening = threading.Event()
+                    threading.Thread(
+                        target=self._listen, args=(self._listening,), name="item-cache-invalidation", daemon=True
+                    ).start()
+        return self.local if self._listening.is_set() else None
+
+    def _listen(self, listening: threading.Event) -> None:
+        """無効化の通知を受信し、プロセス内の値を破棄します（接続が切れた場合は `retry_interval` 秒後に再接続します）。"""
+        while not self._closed.is_set():
+            pubsub = self.client.pubsub()
+            try:
+                pubsub.subscribe(self.channel)
+                while not self._closed.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    if message["type"] == "subscribe":
+                        # 受信の開始前の無効化を取りこぼしている可能性があるため、全ての値を破棄してから使用する
+                        self.local.clear()
+                        listening.set()
+                    elif message["type"] == "message":
+                        for item_id in message["data"].decode().split():
+                            self.local.discard(item_id)
+            except redis.RedisError as e:
+                logger.warning("Item cache invalidation listener failed, bypassing local cache: %s", e)
+            finally:
+                listening.clear()
+                self.local.clear()
+                pubsub.close()
+            self._closed.wait(self.retry_interval)
+
+    def close(self) -> None:
+        """無効化の通知の受信を停止します。"""
+        self._closed.set()
+
+    @property
+    def generation(self) -> Optional[int]:
+        """プロセス内のキャッシュの `generation`（読み込み前に取得して `set` に渡す）"""
+        return self.local.generation if self.local is not None else None
+
+    def get(self, item_id: UUID) -> Optional[bytes]:
+        """
+        キャッシュされたアイテムのJSONを取得します。
+
+        プロセス内のキャッシュを使用する場合は先に参照し、Redisから取得した値をプロセス内にも保存します。
+
+        Parameters
+        ----------
+        item_id : UUID
+            アイテムのID
+
+        Returns
+        -------
+        Optional[bytes]
+            キャッシュされている場合はJSON、キャッシュミスまたはRedis障害時はNone
+        """
+        local = self._local_tier()
+        if local is not None:
+            payload = local.get(str(item_id))
+            if payload is not None:
+                return payload
+            generation = local.generation
+        if not self._available():
+            return None
+        try:
+            payload = self.client.get(self._key(item_id))
+        except redis.RedisError as e:
+            self._on_error("GET", e)
+            return None
+        if payload == TOMBSTONE:
+            payload = None
+        self._count("hits" if payload is not None else "misses")
+        if payload is not None and local is not None:
+            local.set(str(item_id), payload, generation)
+        return payload
+
+    def set(self, item_id: UUID, payload: bytes, generation: Optional[int] = None) -> None:
+        """
+        アイテムのJSONを有効期限付きで保存します。
+
+        既存のキーがない場合のみ保存します（無効化の直後の `tombstone_ttl` 秒の間は保存しません）。
+        Redisに保存した場合はプロセス内のキャッシュにも保存します（`generation` の取得後に無効化された場合は保存しません）。
+
+        Parameters
+        ----------
+        item_id : UUID
+            アイテムのID
+        payload : bytes
+            保存するJSON
+        generation : Optional[int], optional
+            データベースから読み込む前に取得した `generation`, by default None
+        """
+        if not self._available():
+            return
+        try:
+            stored = self.client.set(self._key(item_id), payload, ex=self.ttl, nx=True)
+        except redis.RedisError as e:
+            self._on_error("SET", e)
+            return
+        local = self._local_tier()
+        if stored and local is not None:
+            local.set(str(item_id), payload, generation)
+
+    def lock(self, item_id: UUID) -> bool:
+        """
+        キャッシュミスしたアイテムをデータベースから読み込むロックを取得します（プロセス間の single-flight）。
+
+        ロックを取得したプロセスのみがデータベースから読み込んでキャッシュに保存し、他のプロセスは `wait` で
+        保存を待ちます。ロックは `lock_timeout` 秒で失効するため、読み込み中のプロセスが停止しても残りません
+        （失効後に解放した場合は他のプロセスのロックを削除することがありますが、読み込みが重複するだけです）。
+
+        Parameters
+        ----------
+        item_id : UUID
+            アイテムのID
+
+        Returns
+        -------
+        bool
+            ロックを取得した場合、またはロックを使用しない場合（`lock_timeout` が0の場合・Redis障害時）はTrue、
+            他のプロセスが読み込み中の場合はFalse
+        """
+        if not self.lock_timeout or not self._available():
+            return True
+        try:
+            return bool(self.client.set(self._lock_key(item_id), b"1", nx=True, px=int(self.lock_timeout * 1000)))
+        except redis.RedisError as e:
+            self._on_error("SET", e)
+            return True
+
+    def unlock(self, item_id: UUID) -> None:
+        """
+        `lock` で取得したロックを解放します。
+
+        Parameters
+        ----------
+        item_id : UUID
+            アイテムのID
+        """
+        if not self.lock_timeout or not self._available():
+            return
+        try:
+            self.client.delete(self._lock_key(item_id))
+        except redis.RedisError as e:
+            self._on_error("DEL", e)
+
+    def wait(self, item_id: UUID, interval: float = 0.005) -> Optional[bytes]:
+        """
+        他のプロセスがロックを取得して読み込んでいるアイテムのキャッシュへの保存を待ちます。
+
+        Parameters
+        ----------
+        item_id : UUID
+            アイテムのID
+        interval : float, optional
+            キャッシュとロックを確認する間隔（秒）, by default 0.005
+
+        Returns
+        -------
+        Optional[bytes]
+            保存されたJSON、ロックが解放されても保存されなかった場合（アイテムが存在しない場合など）・
+            `lock_timeout` 秒以内に保存されなかった場合・Redis障害時はNone
+        """
+        self._count("lock_waits")
+        deadline = time.monotonic() + self.lock_timeout
+        while self._available() and time.monotonic() < deadline:
+            time.sleep(interval)
+            try:
+                with self.client.pipeline(transaction=False) as pipe:
+                    payload, locked = pipe.get(self._key(item_id)).exists(self._lock_key(item_id)).execute()
+            except redis.RedisError as e:
+                self._on_error("GET", e)
+                return None
+            if payload and payload != TOMBSTONE:
+                return payload
+            if not locked:
+                break
+        return None
+
+    def invalidate(self, item_id: UUID) -> None:
+        """
+        アイテムのキャッシュを無効化します（`tombstone_ttl` 秒の間「削除済み」の値に置き換えます）。
+
+        Parameters
+        ----------
+        item_id : UUID
+            アイテムのID
+        """
+        if not self.enabled:
+            return
+        self._count("invalidations")
+        if self.local is not None:
+            self.local.discard(str(item_id))
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(self._key(item_id), TOMBSTONE, ex=self.tombstone_ttl)
+                if self.local is not None:
+                    pipe.publish(self.channel, str(item_id))
+                pipe.execute()
+        except redis.RedisError as e:
+            self._on_error("DEL", e)
+
+    def invalidate_many(self, item_ids: Iterable[UUID]) -> None:
+        """
+        複数のアイテムのキャッシュを1回のパイプライン（と1件の無効化の通知）で無効化します。
+
+        Parameters
+        ----------
+        item_ids : Iterable[UUID]
+            アイテムのIDのリスト
+        """
+        item_ids = [str(item_id) for item_id in item_ids]
+        keys = [self._key(item_id) for item_id in item_ids]
+        if not self.enabled or not keys:
+            return
+        with self._lock:
+            self.invalidations += len(keys)
+        if self.local is not None:
+            for item_id in item_ids:
+                self.local.discard(item_id)
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, TOMBSTONE, ex=self.tombstone_ttl)
+                if self.local is not None:
+                    pipe.publish(self.channel, " ".join(item_ids))
+                pipe.execute()
+        except redis.RedisError as e:
+            self._on_error("DEL", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        キャッシュのヒット・ミス数などの統計を返します。
+
+        Returns
+        -------
+        Dict[str, Any]
+            ヒット数、ミス数、ヒット率、エラー数、無効化数、Redisの利用可否
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "available": self._available(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "errors": self.errors,
+                "invalidations": self.invalidations,
+                "lock_waits": self.lock_waits,
+                "ttl_seconds": self.ttl,
+                "local": (
+                    dict(self.local.stats(), listening=self._listening.is_set()) if self.local is not None else None
+                ),
+            }
+
+
+item_cache = ItemCache(
+    redis_client,
+    ttl=settings.item_cache_ttl,
+    enabled=settings.item_cache_enabled,
+    retry_interval=settings.redis_retry_interval,
+    # レプリカの遅延は最大で max_lag + 確認の間隔（前回の確認から遅延した場合）
+    tombstone_ttl=(
+        max(DEFAULT_TOMBSTONE_TTL, math.ceil(settings.db_replica_max_lag + settings.db_replica_check_interval))
+        if settings.database_replica_urls else DEFAULT_TOMBSTONE_TTL
+    ),
+    lock_timeout=settings.single_flight_lock_timeout if settings.single_flight_redis_lock else 0,
+    local=(
+        LocalCache(
+            max_items=settings.item_local_cache_max_items,
+            max_bytes=settings.item_local_cache_max_bytes,
+            ttl=settings.item_local_cache_ttl,
+        )
+        if settings.item_local_cache_enabled else None
+    ),
+)
+
+# 同じアイテム・同じ一覧のページの同時の読み取りをまとめる（プロセスごと）
+# 書き込み後は実行中の読み取りを忘れ、書き込み前に開始した読み取りの結果を返さないようにする
+item_flights = SingleFlight("item", enabled=settings.single_flight_enabled)
+
+
+def get_item_json(
+    db: Session,
+    item_id: UUID,
+    cache: ItemCache = item_cache,
+    flights: SingleFlight = item_flights
+) -> Optional[bytes]:
+    """
+    キャッシュを経由して指定されたIDのアイテムのJSONを取得します（リードスルー）。
+
+    プロセス内のキャッシュ、Redisの順に参照し、キャッシュミスの場合はデータベースから取得して結果をキャッシュに保存します。
+    同じアイテムの同時のキャッシュミスは1回の読み込みにまとめ（`flights`）、キャッシュのロックを
+    使用する場合は他のプロセスの読み込みも待ちます。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        取得するアイテムのID
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+    flights : SingleFlight, optional
+        同時の読み込みをまとめる single-flight, by default item_flights
+
+    Returns
+    -------
+    Optional[bytes]
+        アイテムが見つかった場合はアイテムのJSON（`Item` の形式）、見つからなかった場合はNone
+    """
+    payload = cache.get(item_id)
+    if payload is not None:
+        return payload
+    return flights.do(("item", db.get_bind(), item_id), lambda: _load_item(db, item_id, cache))
+
+
+def _load_item(db: Session, item_id: UUID, cache: ItemCache) -> Optional[bytes]:
+    """キャッシュミスしたアイテムをデータベースから読み込み、キャッシュに保存します。"""
+    locked = cache.lock(item_id)
+    if not locked:
+        payload = cache.wait(item_id)
+        if payload is not None:
+            return payload
+    try:
+        # 読み込み中に無効化された場合は、読み込んだ値をプロセス内のキャッシュに保存しない
+        generation = cache.generation
+        db_item = crud.get_item(db, item_id)
+        if db_item is None:
+            return None
+        payload = Item.model_validate(db_item).model_dump_json().encode()
+        cache.set(item_id, payload, generation)
+        return payload
+    finally:
+        if locked:
+            cache.unlock(item_id)
+
+
+def get_item(
+    db: Session,
+    item_id: UUID,
+    cache: ItemCache = item_cache,
+    flights: SingleFlight = item_flights
+) -> Optional[Item]:
+    """
+    キャッシュを経由して指定されたIDのアイテムを取得します（`get_item_json` の結果をモデルに変換します）。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        取得するアイテムのID
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+    flights : SingleFlight, optional
+        同時の読み込みをまとめる single-flight, by default item_flights
+
+    Returns
+    -------
+    Optional[Item]
+        アイテムが見つかった場合はアイテム、見つからなかった場合はNone
+    """
+    payload = get_item_json(db, item_id, cache=cache, flights=flights)
+    return Item.model_validate_json(payload) if payload is not None else None
+
+
+def payload_updated_at(payload: bytes) -> datetime:
+    """
+    アイテムのJSONから更新日時を取得します。
+
+    Parameters
+    ----------
+    payload : bytes
+        アイテムのJSON
+
+    Returns
+    -------
+    datetime
+        更新日時
+    """
+    return datetime.fromisoformat(orjson.loads(payload)["updated_at"])
+
+
+def get_item_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    columns: Sequence = crud.ITEM_COLUMNS,
+    flights: SingleFlight = item_flights
+) -> List[Row]:
+    """
+    アイテムの一覧を行として取得します（`crud.get_item_rows`）。
+
+    同じページ（同じデータベース・`skip`・`limit`・`after`・列）の同時の取得は1回のSQLにまとめます。
+    一覧はキャッシュしません。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    skip : int, optional
+        スキップする件数, by default 0
+    limit : int, optional
+        取得する最大件数, by default 100
+    after : Optional[Tuple[datetime, UUID]], optional
+        直前のページの最後の行の `(created_at, id)`, by default None
+    columns : Sequence, optional
+        取得する列, by default crud.ITEM_COLUMNS
+    flights : SingleFlight, optional
+        同時の取得をまとめる single-flight, by default item_flights
+
+    Returns
+    -------
+    List[Row]
+        行のリスト（作成日時、IDの順）
+    """
+    key = ("rows", db.get_bind(), skip if after is None else None, limit, after, tuple(column.key for column in columns))
+    return flights.do(key, lambda: crud.get_item_rows(db, skip=skip, limit=limit, after=after, columns=columns))
+
+
+def get_item_updated_at(db: Session, item_id: UUID, cache: ItemCache = item_cache) -> Optional[datetime]:
+    """
+    キャッシュを経由して指定されたIDのアイテムの更新日時のみを取得します。
+
+    キャッシュヒットの場合はキャッシュされたJSONから、キャッシュミスの場合は
+    `SELECT updated_at` で取得します（行全体の読み込みやキャッシュへの保存は行いません）。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        アイテムのID
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+
+    Returns
+    -------
+    Optional[datetime]
+        アイテムが見つかった場合は更新日時、見つからなかった場合はNone
+    """
+    payload = cache.get(item_id)
+    if payload is not None:
+        return payload_updated_at(payload)
+    return crud.get_item_updated_at(db, item_id)
+
+
+def update_item(
+    db: Session,
+    item_id: UUID,
+    item: ItemUpdate,
+    expected_updated_at: Optional[datetime] = None,
+    cache: ItemCache = item_cache
+) -> Optional[ItemModel]:
+    """
+    アイテムを更新し、キャッシュを無効化します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        更新するアイテムのID
+    item : ItemUpdate
+        更新する情報
+    expected_updated_at : Optional[datetime], optional
+        楽観的排他制御に使用する更新日時, by default None
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+
+    Returns
+    -------
+    Optional[ItemModel]
+        更新されたアイテムオブジェクト、アイテムが見つからなかった場合（または更新日時が一致しない場合）はNone
+    """
+    db_item = crud.update_item(db, item_id, item, expected_updated_at=expected_updated_at)
+    if db_item is not None:
+        cache.invalidate(item_id)
+        item_flights.forget()
+    return db_item
+
+
+def create_item(db: Session, item: ItemCreate) -> ItemModel:
+    """
+    アイテムを作成し、実行中の一覧の読み取りを忘れます（以降の一覧の取得に作成したアイテムを含めるため）。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item : ItemCreate
+        作成するアイテムの情報
+
+    Returns
+    -------
+    ItemModel
+        作成されたアイテムオブジェクト
+    """
+    db_item = crud.create_item(db, item)
+    item_flights.forget()
+    return db_item
+
+
+def create_items(db: Session, items: Sequence[ItemCreate]) -> List[ItemModel]:
+    """
+    複数のアイテムを一括作成し、実行中の一覧の読み取りを忘れます。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    items : Sequence[ItemCreate]
+        作成するアイテムの情報のリスト
+
+    Returns
+    -------
+    List[ItemModel]
+        作成されたアイテムオブジェクトのリスト（入力と同じ順序）
+    """
+    db_items = crud.create_items(db, items)
+    item_flights.forget()
+    return db_items
+
+
+def upsert_item(
+    db: Session,
+    code: str,
+    item: ItemCreate,
+    cache: ItemCache = item_cache
+) -> Tuple[ItemModel, bool]:
+    """
+    アイテムコードをキーにアイテムを作成・更新し、更新した場合はキャッシュを無効化します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    code : str
+        アイテムコード
+    item : ItemCreate
+        作成・更新するアイテムの情報
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+
+    Returns
+    -------
+    Tuple[ItemModel, bool]
+        作成・更新されたアイテムオブジェクトと、新しく作成した場合はTrue
+    """
+    db_item, created = crud.upsert_item(db, code, item)
+    if not created:
+        cache.invalidate(db_item.id)
+    item_flights.forget()
+    return db_item, created
+
+
+def delete_item(
+    db: Session,
+    item_id: UUID,
+    expected_updated_at: Optional[datetime] = None,
+    cache: ItemCache = item_cache
+) -> bool:
+    """
+    アイテムを削除し、キャッシュを無効化します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        削除するアイテムのID
+    expected_updated_at : Optional[datetime], optional
+        楽観的排他制御に使用する更新日時, by default None
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+
+    Returns
+    -------
+    bool
+        削除に成功した場合はTrue、アイテムが見つからなかった場合（または更新日時が一致しない場合）はFalse
+    """
+    deleted = crud.delete_item(db, item_id, expected_updated_at=expected_updated_at)
+    if deleted:
+        cache.invalidate(item_id)
+        item_flights.forget()
+    return deleted
+
+
+def update_items(db: Session, items: Sequence[ItemBulkUpdate], cache: ItemCache = item_cache) -> Dict[UUID, ItemModel]:
+    """
+    複数のアイテムを一括更新し、更新されたアイテムのキャッシュを無効化します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    items : Sequence[ItemBulkUpdate]
+        更新する情報のリスト
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+
+    Returns
+    -------
+    Dict[UUID, ItemModel]
+        更新されたアイテムのIDとアイテムオブジェクトの辞書
+    """
+    updated = crud.update_items(db, items)
+    cache.invalidate_many(updated.keys())
+    item_flights.forget()
+    return updated
+
+
+def delete_items(db: Session, item_ids: Sequence[UUID], cache: ItemCache = item_cache) -> List[UUID]:
+    """
+    複数のアイテムを一括削除し、削除されたアイテムのキャッシュを無効化します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_ids : Sequence[UUID]
+        削除するアイテムのIDのリスト
+    cache : ItemCache, optional
+        使用するキャッシュ, by default item_cache
+
+    Returns
+    -------
+    List[UUID]
+        削除されたアイテムのIDのリスト
+    """
+    deleted = crud.delete_items(db, item_ids)
+    cache.invalidate_many(deleted)
+    item_flights.forget()
+    return deleted
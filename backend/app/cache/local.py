@@ -0,0 +1,142 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LocalCache:
+    """
+    プロセス内の LRU + TTL キャッシュです（値はエンコード済みのJSONなどの `bytes`）。
+
+    件数（`max_items`）と値の合計サイズ（`max_bytes`）の上限を超えた場合は、最も長く参照されていない値から破棄します。
+    期限切れの値は参照時に破棄します（期限切れの値を探すタイマーは持ちません）。
+
+    無効化（`discard`・`clear`）のたびに `generation` が増えるため、読み込み前の `generation` を `set` に渡すと、
+    読み込み中に無効化された古い値を保存しないようにできます。
+
+    Parameters
+    ----------
+    max_items : int
+        保持する最大件数
+    max_bytes : int
+        保持する値の合計サイズの上限（バイト）
+    ttl : float
+        値の有効期限（秒）
+    clock : Callable[[], float], optional
+        現在時刻（秒）を返す関数, by default time.monotonic
+    """
+
+    def __init__(self, max_items: int, max_bytes: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, float]]" = OrderedDict()
+        self.bytes = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        値を取得します。
+
+        Parameters
+        ----------
+        key : Hashable
+            キー
+
+        Returns
+        -------
+        Optional[bytes]
+            有効期限内の値がある場合は値、ない場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: bytes, generation: Optional[int] = None) -> bool:
+        """
+        値を保存します。
+
+        Parameters
+        ----------
+        key : Hashable
+            キー
+        value : bytes
+            値
+        generation : Optional[int], optional
+            値を読み込む前の `generation`（その後に無効化があった場合は保存しない）, by default None
+
+        Returns
+        -------
+        bool
+            保存した場合はTrue
+        """
+        size = sys.getsizeof(value)
+        with self._lock:
+            if (generation is not None and generation != self.generation) or size > self.max_bytes:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self.bytes += size
+            while len(self._entries) > self.max_items or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def discard(self, key: Hashable) -> None:
+        """値を破棄します（値がない場合も `generation` を増やします）。"""
+        with self._lock:
+            self.generation += 1
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """全ての値を破棄します。"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        value, _ = self._entries.pop(key)
+        self.bytes -= sys.getsizeof(value)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        件数・使用メモリとヒット・ミス数などの統計を返します。
+
+        Returns
+        -------
+        Dict[str, Any]
+            件数と上限、値の合計サイズ（バイト）と上限、ヒット数、ミス数、ヒット率、LRUによる破棄数、期限切れ数
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._entries),
+                "max_items": self.max_items,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "ttl_seconds": self.ttl,
+            }
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """実行中の同期呼び出し（完了を待つイベントと結果）"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    同じキーの同時呼び出しを1回の実行にまとめるクラスです（single-flight）。
+
+    実行中の呼び出しと同じキーで呼び出した場合は、関数を実行せずに実行中の呼び出しの完了を待ち、
+    同じ結果（例外の場合は同じ例外）を返します。結果は保存しないため、完了後の呼び出しは新たに実行します
+    （キャッシュではなく、同時に到着した同じ読み取りだけをまとめます）。待っている呼び出しは
+    データベースの接続を使用しないため、同じSQLが同時に大量に実行されてコネクションプールが枯渇することを防げます。
+
+    まとめた呼び出しは、実行中のSQL1回分だけ古い結果を返す場合があります。書き込み後は `forget` を呼び出し、
+    以降の呼び出しが書き込み前に開始した実行にまとめられないようにしてください。
+    返した結果は呼び出し元の間で共有されるため、変更しないでください。
+
+    同期（スレッド）と非同期（asyncio）の呼び出しは、実行中の呼び出しを別に管理します。
+
+    Parameters
+    ----------
+    name : str
+        識別名（メトリクス用）
+    enabled : bool, optional
+        呼び出しをまとめるかどうか（Falseの場合は常に関数を実行する）, by default True
+    """
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        同じキーの実行中の呼び出しがなければ関数を実行し、あれば完了を待って同じ結果を返します。
+
+        Parameters
+        ----------
+        key : Hashable
+            呼び出しのキー（同じ結果を返す呼び出しは同じキーにする）
+        fn : Callable[[], T]
+            実行する関数
+
+        Returns
+        -------
+        T
+            関数の戻り値
+
+        Raises
+        ------
+        BaseException
+            関数が送出した例外（待っていた呼び出しにも同じ例外を送出する）
+        """
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        `do` の非同期版です。
+
+        関数はタスクとして実行し、呼び出し元がキャンセルされても（クライアントの切断など）
+        待っている他の呼び出しの結果には影響しません。
+        そのため関数は呼び出し元のリクエストのセッションなどに依存せず（必要なセッションは関数の中で開く）、
+        セッションから切り離された値（エンコード済みのJSONなど）を返すようにしてください。
+
+        Parameters
+        ----------
+        key : Hashable
+            呼び出しのキー
+        fn : Callable[[], Awaitable[T]]
+            実行するコルーチン関数
+
+        Returns
+        -------
+        T
+            関数の戻り値
+        """
+        if not self.enabled:
+            return await fn()
+
+        task = self._tasks.get(key)
+        with self._lock:
+            if task is None:
+                self.executions += 1
+            else:
+                self.shared += 1
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._forget_task(key, done))
+        return await asyncio.shield(task)
+
+    def _forget_task(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def forget(self) -> None:
+        """
+        実行中の呼び出しを忘れ、以降の呼び出しが新たに実行されるようにします。
+
+        既に待っている呼び出しには実行中の呼び出しの結果を返します。
+        """
+        with self._lock:
+            self._calls.clear()
+        self._tasks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        実行回数とまとめた呼び出しの数を返します。
+
+        Returns
+        -------
+        Dict[str, Any]
+            関数の実行回数、実行せずに結果を共有した呼び出しの数、現在実行中の呼び出しの数
+        """
+        with self._lock:
+            calls = self.executions + self.shared
+            return {
+                "enabled": self.enabled,
+                "executions": self.executions,
+                "shared": self.shared,
+                "shared_ratio": round(self.shared / calls, 4) if calls else 0.0,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
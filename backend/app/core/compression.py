@@ -0,0 +1,221 @@
+"""
+レスポンスの圧縮（`Accept-Encoding` に応じた brotli / gzip）
+
+brotli は任意の依存関係で、`brotli` パッケージがインストールされている場合のみ使用します。
+"""
+import zlib
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli は任意
+    brotli = None
+
+# 圧縮しないメディアタイプ（SSE は1件ずつ届く必要があり、画像・アーカイブは圧縮済み）
+EXCLUDED_MEDIA_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+# この大きさ以上のチャンクはスレッドで圧縮し、イベントループを止めない
+_OFFLOAD_SIZE = 64 * 1024
+
+
+def available_encodings(encodings: Iterable[str]) -> Tuple[str, ...]:
+    """
+    使用できる圧縮方式に絞り込みます（brotli はパッケージがインストールされている場合のみ）。
+
+    Parameters
+    ----------
+    encodings : Iterable[str]
+        圧縮方式（優先順、"br" / "gzip"）
+
+    Returns
+    -------
+    Tuple[str, ...]
+        使用できる圧縮方式（優先順）
+    """
+    supported = {"gzip"} | ({"br"} if brotli is not None else set())
+    return tuple(encoding for encoding in (e.strip().lower() for e in encodings) if encoding in supported)
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    `Accept-Encoding` から使用する圧縮方式を選びます。
+
+    qの値が最も大きい方式を選び、同じ場合は `encodings` の順を優先します。
+    `q=0` の方式は使用せず、`*` は明示されていない方式に適用します。
+
+    Parameters
+    ----------
+    accept_encoding : str
+        `Accept-Encoding` ヘッダーの値
+    encodings : Sequence[str]
+        サーバーが使用できる圧縮方式（優先順）
+
+    Returns
+    -------
+    Optional[str]
+        圧縮方式。使用できる方式がない場合はNone
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best: Optional[str] = None
+    best_q = 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """1つのレスポンスの圧縮ストリーム"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """データを圧縮し、受信側がここまでを展開できるよう出力をフラッシュします（`final` の場合は終端）。"""
+        if self._brotli is not None:
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    レスポンスの本文を `Accept-Encoding` に応じて brotli または gzip で圧縮するASGIミドルウェアです。
+
+    `minimum_size` 未満の本文、既に `Content-Encoding` があるレスポンス、SSE・画像などのメディアタイプは圧縮しません。
+    圧縮の対象になるレスポンスには `Vary: Accept-Encoding` を付与し、圧縮した場合は
+    本文が変わるため強いETagを弱いETag（`W/`）に変更します。
+    `StreamingResponse` はチャンクごとに圧縮してフラッシュするため、クライアントは受信した分から展開できます。
+
+    Parameters
+    ----------
+    app : ASGIApp
+        アプリケーション
+    encodings : Sequence[str], optional
+        使用する圧縮方式（優先順、使用できない方式は無視する）, by default ("br", "gzip")
+    minimum_size : int, optional
+        圧縮する本文の最小サイズ（バイト）, by default 1024
+    gzip_level : int, optional
+        gzip の圧縮レベル（1〜9）, by default 3
+    brotli_quality : int, optional
+        brotli の圧縮品質（0〜11）, by default 4
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("br", "gzip"),
+        minimum_size: int = 1024,
+        gzip_level: int = 3,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # 本文の最初のチャンクを見てから圧縮するかどうかを決める
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            more_body: bool = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                if not self._compressible(start["status"], headers, body, more_body):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send({**start, "headers": headers.raw})
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                etag = headers.get("etag")
+                if etag is not None and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["Content-Length"]
+                    await send({**start, "headers": headers.raw})
+                else:
+                    compressed = await self._compress(compressor, body, True)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send({**start, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+            await send({
+                "type": "http.response.body",
+                "body": await self._compress(compressor, body, not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, status: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        """圧縮の対象になるレスポンスかどうかを返します。"""
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").lower()
+        if media_type.startswith(EXCLUDED_MEDIA_TYPES):
+            return False
+        if not more_body:
+            return len(body) >= self.minimum_size
+        # ストリーミングは長さが事前にわかっている場合のみ最小サイズを確認する
+        length = headers.get("content-length")
+        return length is None or int(length) >= self.minimum_size
+
+    @staticmethod
+    async def _compress(compressor: _Compressor, data: bytes, final: bool) -> bytes:
+        if len(data) >= _OFFLOAD_SIZE:
+            return await anyio.to_thread.run_sync(compressor.compress, data, final)
+        return compressor.compress(data, final)
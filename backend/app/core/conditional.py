@@ -0,0 +1,194 @@
+"""
+`updated_at` を使用した条件付きリクエスト（ETag / Last-Modified）の処理
+
+アイテムのETagは `updated_at` をマイクロ秒単位で表した値で、`If-Match` で受け取った
+ETagから更新前の `updated_at` を復元して楽観的排他制御に使用します。
+一覧のETagは、ページに含まれる行の `(id, updated_at)` のダイジェストです。
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Request
+from sqlalchemy.engine import Row
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _parse_etags(header: str) -> List[str]:
+    """ETagのリストを弱いETagの接頭辞（W/）を除いて分割します。"""
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def item_etag(updated_at: datetime) -> str:
+    """
+    アイテムのETagを生成します。
+
+    Parameters
+    ----------
+    updated_at : datetime
+        アイテムの更新日時
+
+    Returns
+    -------
+    str
+        ETag（`"<エポックからのマイクロ秒の16進数>"`）
+    """
+    return f'"{(updated_at - _EPOCH) // _MICROSECOND:x}"'
+
+
+def parse_item_etag(etag: str) -> Optional[datetime]:
+    """
+    `item_etag` で生成したETagから更新日時を復元します。
+
+    Parameters
+    ----------
+    etag : str
+        ETag（弱いETagの接頭辞は無視します）
+
+    Returns
+    -------
+    Optional[datetime]
+        更新日時。形式が不正な場合はNone
+    """
+    tags = _parse_etags(etag)
+    if len(tags) != 1 or not (tags[0].startswith('"') and tags[0].endswith('"')):
+        return None
+    try:
+        return _EPOCH + int(tags[0][1:-1], 16) * _MICROSECOND
+    except (ValueError, OverflowError):
+        return None
+
+
+def page_etag(rows: Iterable[Row]) -> str:
+    """
+    一覧のページのETagを生成します。
+
+    行の追加・削除・更新のいずれでも値が変わるよう、各行の `(id, updated_at)` から計算します。
+
+    Parameters
+    ----------
+    rows : Iterable[Row]
+        `id` と `updated_at` を含む行
+
+    Returns
+    -------
+    str
+        ETag
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        digest.update(row.id.bytes)
+        digest.update(((row.updated_at - _EPOCH) // _MICROSECOND).to_bytes(8, "big", signed=True))
+    return f'"{digest.hexdigest()}"'
+
+
+def last_modified(updated_at: datetime) -> str:
+    """
+    更新日時を `Last-Modified` ヘッダーの形式（HTTP-date）に変換します。
+
+    Parameters
+    ----------
+    updated_at : datetime
+        更新日時
+
+    Returns
+    -------
+    str
+        HTTP-date（秒単位）
+    """
+    return format_datetime(updated_at.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def item_headers(updated_at: datetime) -> Dict[str, str]:
+    """
+    アイテムのレスポンスに付与する `ETag` と `Last-Modified` ヘッダーを返します。
+
+    Parameters
+    ----------
+    updated_at : datetime
+        アイテムの更新日時
+
+    Returns
+    -------
+    Dict[str, str]
+        ヘッダー
+    """
+    return {"ETag": item_etag(updated_at), "Last-Modified": last_modified(updated_at)}
+
+
+def shared_cache_headers(max_age: int) -> Dict[str, str]:
+    """
+    共有キャッシュ（リバースプロキシ）にのみ保存を許可する `Cache-Control` ヘッダーを返します。
+
+    ブラウザには保存させず（`max-age=0`）、毎回 `ETag` で再検証させます。
+
+    Parameters
+    ----------
+    max_age : int
+        共有キャッシュに保存できる秒数（`s-maxage`）。0以下の場合は共有キャッシュにも保存させない
+
+    Returns
+    -------
+    Dict[str, str]
+        ヘッダー
+    """
+    if max_age <= 0:
+        return {"Cache-Control": "no-cache"}
+    return {"Cache-Control": f"public, max-age=0, s-maxage={max_age}"}
+
+def is_conditional(request: Request) -> bool:
+    """
+    リクエストに `If-None-Match` または `If-Modified-Since` が含まれているかを返します。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト
+
+    Returns
+    -------
+    bool
+        条件付きGETの場合はTrue
+    """
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, updated_at: Optional[datetime] = None) -> bool:
+    """
+    条件付きGETに対して304を返せるかどうかを判定します。
+
+    `If-None-Match` がある場合はそれのみで判定し、ない場合は `If-Modified-Since` と
+    更新日時（秒単位）を比較します。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト
+    etag : str
+        現在のETag
+    updated_at : Optional[datetime], optional
+        現在の更新日時（一覧など、更新日時で判定できない場合はNone）, by default None
+
+    Returns
+    -------
+    bool
+        クライアントのキャッシュが最新の場合はTrue
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _parse_etags(if_none_match)
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or updated_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return updated_at.replace(microsecond=0) <= since
@@ -0,0 +1,351 @@
+"""
+リクエストごとの処理時間の計測（Server-Timing ヘッダーと Prometheus 形式のヒストグラム）
+
+`InstrumentationMiddleware` がリクエストごとに `RequestTimings` を作成し、以下の時間を集計します。
+
+- total: リクエストの受信からレスポンスの送信完了まで（Server-Timing ヘッダーはレスポンスヘッダーの送信時点の値）
+- db: SQLの実行時間と実行回数（`instrument_engine` で登録する `before_cursor_execute` / `after_cursor_execute`）
+- pool: コネクションプールのチェックアウト待ち時間（`app.db.pool` の計測付きプールから `record_pool_wait` で受け取る）
+- serialize: レスポンスのシリアライズ時間（`TimedRoute` と `measure_serialization`）
+
+集計した時間はレスポンスの `Server-Timing` ヘッダーに付与し、`request_metrics` のヒストグラムに記録します
+（`GET /metrics` で Prometheus 形式で取得できます）。計測はリクエストの処理中のみ行い、
+ワーカーやCLIなどリクエスト外のSQLは記録しません。
+"""
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 秒単位のヒストグラムのバケット（上限）
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQLの実行回数のヒストグラムのバケット（上限）
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestTimings:
+    """
+    1リクエストの処理時間の内訳
+
+    Attributes
+    ----------
+    started : float
+        リクエストの受信時刻（`time.perf_counter()`）
+    queries : int
+        実行したSQLの数
+    db_seconds : float
+        SQLの実行時間の合計（秒）
+    pool_wait_seconds : float
+        コネクションプールのチェックアウト待ち時間の合計（秒）
+    serialization_seconds : float
+        レスポンスのシリアライズ時間の合計（秒）
+    """
+
+    __slots__ = ("started", "queries", "db_seconds", "pool_wait_seconds", "serialization_seconds", "endpoint_returned")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.serialization_seconds = 0.0
+        # エンドポイントが値を返した時刻（`TimedRoute` がシリアライズ時間の計算に使用する）
+        self.endpoint_returned = 0.0
+
+    def server_timing(self, total: float) -> bytes:
+        """`Server-Timing` ヘッダーの値（ミリ秒）を返します。"""
+        return (
+            f"total;dur={total * 1000:.3f}, "
+            f'db;dur={self.db_seconds * 1000:.3f};desc="{self.queries} queries", '
+            f"pool;dur={self.pool_wait_seconds * 1000:.3f}, "
+            f"serialize;dur={self.serialization_seconds * 1000:.3f}"
+        ).encode()
+
+
+# 処理中のリクエストの計測（同期エンドポイント・依存関数を実行するスレッドにもコンテキストごと引き継がれる）
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """処理中のリクエストの計測を返します（リクエスト外の場合はNone）。"""
+    return _current.get()
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if context is not None and _current.get() is not None:
+        context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    started = getattr(context, "query_started", None)
+    if started is not None:
+        timings = _current.get()
+        if timings is not None:
+            timings.queries += 1
+            timings.db_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    エンジンにSQLの実行回数・実行時間を計測するイベントリスナーを登録します。
+
+    Parameters
+    ----------
+    engine : Engine
+        計測対象のエンジン（非同期エンジンの場合は `sync_engine`）
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_pool_wait(seconds: float) -> None:
+    """処理中のリクエストにコネクションプールのチェックアウト待ち時間を加算します。"""
+    timings = _current.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    """
+    ブロック内の処理時間を処理中のリクエストのシリアライズ時間に加算します。
+
+    エンドポイント内でレスポンスの本文を作成する場合（`RowsResponse` など）に使用します。
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.serialization_seconds += time.perf_counter() - started
+
+
+def _mark_endpoint_returned() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_returned = time.perf_counter()
+
+
+def _returning_marked(call: Callable[..., Any]) -> Callable[..., Any]:
+    # エンドポイントが値を返した時刻を記録する（FastAPI が同期・非同期を判定できるよう同じ種類の関数で包む）
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _mark_endpoint_returned()
+    else:
+        @functools.wraps(call)
+        def endpoint(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _mark_endpoint_returned()
+    return endpoint
+
+
+@functools.lru_cache(maxsize=None)
+def _timed_response_class(base: Type[Response]) -> Type[Response]:
+    # インスタンスの作成（本文のエンコード）を終えた時点でシリアライズ時間を記録するレスポンスクラス
+    def __init__(self: Response, *args: Any, **kwargs: Any) -> None:
+        base.__init__(self, *args, **kwargs)
+        timings = _current.get()
+        if timings is not None and timings.endpoint_returned:
+            timings.serialization_seconds += time.perf_counter() - timings.endpoint_returned
+            timings.endpoint_returned = 0.0
+
+    return type(f"Timed{base.__name__}", (base,), {"__init__": __init__})
+
+
+class TimedRoute(APIRoute):
+    """
+    レスポンスのシリアライズ時間を計測する `APIRoute` です（`APIRouter(route_class=TimedRoute)` で使用します）。
+
+    エンドポイントが値を返してから、FastAPI が `response_model` による変換とレスポンスクラスでの
+    エンコードを終えるまでをシリアライズ時間として記録します。エンドポイントが `Response` を
+    返した場合は記録しません（本文の作成は `measure_serialization` で計測します）。
+    """
+
+    def get_route_handler(self) -> Callable:
+        self.dependant.call = _returning_marked(self.dependant.call)
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            self.response_class = DefaultPlaceholder(_timed_response_class(response_class.value))
+        else:
+            self.response_class = _timed_response_class(response_class)
+        try:
+            return super().get_route_handler()
+        finally:
+            # OpenAPI のスキーマには元のレスポンスクラスを使用する
+            self.response_class = response_class
+
+
+class Histogram:
+    """
+    Prometheus 形式のヒストグラム（ラベルの組み合わせごとの累積バケット）
+
+    スレッドセーフではないため、`RequestMetrics` のロックの中で使用します。
+
+    Parameters
+    ----------
+    name : str
+        メトリクス名
+    documentation : str
+        メトリクスの説明（`# HELP`）
+    buckets : Sequence[float]
+        バケットの上限（昇順。`+Inf` は自動的に追加される）
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """値を記録します。"""
+        series = self._series.get(labels)
+        if series is None:
+            # [バケットごとの件数（+Inf を含む、累積ではない）, 合計, 件数]
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, label_names: Sequence[str]) -> List[str]:
+        """Prometheus のテキスト形式の行を返します。"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """
+    リクエストの処理時間の内訳をメソッド・ルート（パスのテンプレート）・ステータスコードごとに集計するクラスです。
+
+    値はワーカープロセスごとに集計します（gunicorn の複数ワーカーの場合はスクレイプしたワーカーの値）。
+    """
+
+    LABELS = ("method", "route", "status")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Total time spent handling the request.", SECONDS_BUCKETS
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds", "Time spent executing SQL statements.", SECONDS_BUCKETS
+        )
+        self.db_queries = Histogram(
+            "http_request_db_queries", "Number of SQL statements executed.", QUERY_BUCKETS
+        )
+        self.pool_wait = Histogram(
+            "http_request_pool_wait_seconds", "Time spent waiting for a database connection.", SECONDS_BUCKETS
+        )
+        self.serialization = Histogram(
+            "http_request_serialization_seconds", "Time spent serializing the response body.", SECONDS_BUCKETS
+        )
+
+    def observe(self, method: str, route: str, status: int, timings: RequestTimings, total: float) -> None:
+        """1リクエストの計測を記録します。"""
+        labels = (method, route, str(status))
+        with self._lock:
+            self.duration.observe(labels, total)
+            self.db_duration.observe(labels, timings.db_seconds)
+            self.db_queries.observe(labels, timings.queries)
+            self.pool_wait.observe(labels, timings.pool_wait_seconds)
+            self.serialization.observe(labels, timings.serialization_seconds)
+
+    def render(self) -> str:
+        """
+        Prometheus のテキスト形式（バージョン 0.0.4）で出力します。
+
+        Returns
+        -------
+        str
+            全てのヒストグラムの出力
+        """
+        lines: List[str] = []
+        with self._lock:
+            for histogram in (self.duration, self.db_duration, self.db_queries, self.pool_wait, self.serialization):
+                lines.extend(histogram.render(self.LABELS))
+        return "\n".join(lines) + "\n"
+
+
+# アプリケーション全体で共有する集計
+request_metrics = RequestMetrics()
+
+
+class InstrumentationMiddleware:
+    """
+    リクエストごとの処理時間を計測し、`Server-Timing` ヘッダーの付与とヒストグラムへの記録を行うASGIミドルウェアです。
+
+    Parameters
+    ----------
+    app : ASGIApp
+        アプリケーション
+    metrics : RequestMetrics, optional
+        記録先, by default request_metrics
+    server_timing : bool, optional
+        `Server-Timing` ヘッダーを付与するかどうか, by default True
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics, server_timing: bool = True):
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    header = (b"server-timing", timings.server_timing(time.perf_counter() - timings.started))
+                    message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"],
+                route.path if route is not None else "<unmatched>",
+                status,
+                timings,
+                time.perf_counter() - timings.started,
+            )
@@ -0,0 +1,11 @@
+import redis
+from .config import settings
+
+# Redisクライアントの作成（接続は最初のコマンド実行時に確立されます）
+redis_client = redis.Redis(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_socket_timeout,
+    health_check_interval=30,
+)
@@ -0,0 +1,100 @@
+"""
+データベースの行からレスポンスのJSONを直接組み立てる高速なシリアライズ処理
+
+`response_model` による変換では、行ごとにPydanticモデルの生成とバリデーション
+（`name_must_not_be_empty` など）が実行されます。データベースの行は書き込み時に
+検証済みのため、一覧系のエンドポイントでは再検証せず orjson で直接エンコードします。
+出力は `app.db.schemas.item.Item` と同じ形式（UTCの日時は `Z` 表記）です。
+
+分析結果のように NumPy の配列・数値を含むデータは、`ArrayResponse` で
+Pythonのリストに変換せずにエンコードします。
+"""
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+import orjson
+from fastapi.responses import Response
+from sqlalchemy.engine import Row
+
+from .instrumentation import measure_serialization
+
+_OPTIONS = orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    # orjson が直接エンコードするのは `uuid.UUID` 型のみのため、サブクラス（asyncpg の UUID）は文字列にする
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError
+
+
+def dump_rows(rows: Iterable[Row]) -> bytes:
+    """
+    行のリストをJSON配列にエンコードします。
+
+    Parameters
+    ----------
+    rows : Iterable[Row]
+        列名をキーとして出力する行（UUIDと日時はそのまま渡せます）
+
+    Returns
+    -------
+    bytes
+        JSON配列
+    """
+    return orjson.dumps([row._asdict() for row in rows], default=_default, option=_OPTIONS)
+
+
+def dump_rows_ndjson(rows: Iterable[Row]) -> bytes:
+    """
+    行のリストを1行1JSONのNDJSONにエンコードします。
+
+    Parameters
+    ----------
+    rows : Iterable[Row]
+        列名をキーとして出力する行
+
+    Returns
+    -------
+    bytes
+        NDJSON
+    """
+    options = _OPTIONS | orjson.OPT_APPEND_NEWLINE
+    return b"".join(orjson.dumps(row._asdict(), default=_default, option=options) for row in rows)
+
+
+class RowsResponse(Response):
+    """
+    行のリストをそのままJSON配列として返すレスポンスです。
+
+    Parameters
+    ----------
+    rows : Sequence[Row]
+        レスポンスに含める行
+    """
+    media_type = "application/json"
+
+    def __init__(self, rows: Sequence[Row], **kwargs):
+        with measure_serialization():
+            content = dump_rows(rows)
+        super().__init__(content=content, **kwargs)
+
+
+class ArrayResponse(Response):
+    """
+    NumPy の配列・数値を含むデータをそのままJSONとして返すレスポンスです。
+
+    配列の NaN は `null` に、タイムゾーンなしの日時はUTCとして `Z` 表記に変換されます。
+
+    Parameters
+    ----------
+    content : Any
+        レスポンスに含めるデータ（辞書・リストなど）
+    """
+    media_type = "application/json"
+
+    def __init__(self, content: Any, **kwargs):
+        options = _OPTIONS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        with measure_serialization():
+            body = orjson.dumps(content, option=options)
+        super().__init__(content=body, **kwargs)
@@ -1,9 +1,19 @@
-from typing import List, Optional
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Executable
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete
-from ..models.item import Item
-from ..schemas.item import ItemCreate, ItemUpdate
+from sqlalchemy import (
+    Boolean, String, Text, any_, bindparam, case, cast, column, delete, exists, func, insert,
+    select, text, tuple_, union, update, values
+)
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, UUID as PG_UUID
+from ..models.item import SEARCH_CONFIG, Item
+from ...core.config import settings
+from ..schemas.item import ItemBulkUpdate, ItemCreate, ItemUpdate
 
 
 def get_item(db: Session, item_id: UUID) -> Optional[Item]:
@@ -25,6 +35,139 @@ def get_item(db: Session, item_id: UUID) -> Optional[Item]:
     return db.get(Item, item_id)
 
 
+def get_item_updated_at(db: Session, item_id: UUID) -> Optional[datetime]:
+    """
+    指定されたIDのアイテムの更新日時のみを取得します。
+
+    条件付きリクエストの判定など、行全体が不要な場合に使用します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        アイテムのID
+
+    Returns
+    -------
+    Optional[datetime]
+        アイテムが見つかった場合は更新日時、見つからなかった場合はNone
+    """
+    return db.execute(ITEM_UPDATED_AT, {"item_id": item_id}).scalar_one_or_none()
+
+
+# 一覧・エクスポートで取得する列（`app.db.schemas.item.Item` のフィールドと同じ順序）
+ITEM_COLUMNS = (Item.name, Item.description, Item.id, Item.created_at, Item.updated_at)
+
+# 一覧のETagとカーソルの計算に必要な列
+ITEM_KEY_COLUMNS = (Item.id, Item.created_at, Item.updated_at)
+
+# 頻繁に実行するSQLは、値をバインドパラメータにした文をあらかじめ組み立てておく。
+# 呼び出しごとの文の組み立てとキャッシュキーの生成を省略でき、コンパイル済みSQLはエンジンのキャッシュ
+# （`GET /metrics/statements`）から取得される。値はリテラルとして埋め込まないため、SQLの形は常に同じになる。
+_ITEM_ID = bindparam("item_id", type_=Item.id.type)
+_EXPECTED_UPDATED_AT = bindparam("expected_updated_at", type_=Item.updated_at.type)
+# キーセットページネーションの直前のページの最後の行の `(created_at, id)`
+_AFTER_KEY = tuple_(
+    bindparam("after_created_at", type_=Item.created_at.type), bindparam("after_id", type_=Item.id.type)
+)
+
+ITEM_UPDATED_AT = select(Item.updated_at).where(Item.id == _ITEM_ID)
+
+
+def after_params(after: Tuple[datetime, UUID]) -> Dict[str, Any]:
+    """キーセット方式の文（`items_statement(..., keyset=True)`）のパラメータを返します。"""
+    return {"after_created_at": after[0], "after_id": after[1]}
+
+
+@lru_cache(maxsize=16)
+def items_statement(columns: Optional[Tuple] = None, keyset: bool = False) -> Executable:
+    """
+    アイテムの一覧を取得する文を返します（作成日時、IDの順）。
+
+    パラメータは `limit` と、`keyset` が偽の場合は `skip`、真の場合は `after_params` の値です。
+
+    Parameters
+    ----------
+    columns : Optional[Tuple], optional
+        取得する列。Noneの場合はORMオブジェクト, by default None
+    keyset : bool, optional
+        キーセット方式（直前のページの最後の行より後）で取得するかどうか, by default False
+
+    Returns
+    -------
+    Executable
+        組み立て済みの文（同じ引数では同じオブジェクト）
+    """
+    stmt = select(*columns) if columns is not None else select(Item)
+    stmt = stmt.order_by(Item.created_at, Item.id).limit(bindparam("limit"))
+    if keyset:
+        return stmt.where(tuple_(Item.created_at, Item.id) > _AFTER_KEY)
+    return stmt.offset(bindparam("skip"))
+
+
+@lru_cache(maxsize=16)
+def update_item_statement(fields: Tuple[str, ...], conditional: bool = False) -> Executable:
+    """
+    アイテムを更新する `UPDATE ... RETURNING` 文を返します（`fields` が空の場合は同じ条件の SELECT）。
+
+    パラメータは `item_id`、`conditional` が真の場合は `expected_updated_at`、更新する項目ごとの
+    `new_<項目名>` です。
+
+    Parameters
+    ----------
+    fields : Tuple[str, ...]
+        更新する項目名
+    conditional : bool, optional
+        更新日時が一致する場合のみ更新するかどうか, by default False
+
+    Returns
+    -------
+    Executable
+        組み立て済みの文（同じ引数では同じオブジェクト）
+    """
+    if not fields:
+        stmt = select(Item)
+    else:
+        # 値はバインドパラメータのため、セッション内のオブジェクトへの反映は評価（evaluate）ではなく
+        # RETURNING の値で行う
+        stmt = (
+            update(Item)
+            .values({field: bindparam(f"new_{field}") for field in fields})
+            .returning(Item)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+    stmt = stmt.where(Item.id == _ITEM_ID)
+    if conditional:
+        stmt = stmt.where(Item.updated_at == _EXPECTED_UPDATED_AT)
+    return stmt
+
+
+@lru_cache(maxsize=2)
+def delete_item_statement(conditional: bool = False) -> Executable:
+    """
+    アイテムを削除する文を返します。
+
+    パラメータは `item_id` と、`conditional` が真の場合は `expected_updated_at` です。
+
+    Parameters
+    ----------
+    conditional : bool, optional
+        更新日時が一致する場合のみ削除するかどうか, by default False
+
+    Returns
+    -------
+    Executable
+        組み立て済みの文（同じ引数では同じオブジェクト）
+    """
+    # 値はバインドパラメータのため、セッション内のオブジェクトは評価（evaluate）ではなく
+    # RETURNING で受け取った削除済みのIDで取り除く（追加のSQLは実行されない）
+    stmt = delete(Item).where(Item.id == _ITEM_ID).execution_options(synchronize_session="fetch")
+    if conditional:
+        stmt = stmt.where(Item.updated_at == _EXPECTED_UPDATED_AT)
+    return stmt
+
+
 def get_items(db: Session, skip: int = 0, limit: int = 100) -> List[Item]:
     """
     アイテムの一覧を取得します。
@@ -41,9 +184,188 @@ def get_items(db: Session, skip: int = 0, limit: int = 100) -> List[Item]:
     Returns
     -------
     List[Item]
-        アイテムオブジェクトのリスト
+        アイテムオブジェクトのリスト（作成日時、IDの順）
+    """
+    return list(db.execute(items_statement(), {"skip": skip, "limit": limit}).scalars())
+
+
+def get_items_after(
+    db: Session,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    limit: int = 100
+) -> List[Item]:
+    """
+    キーセット（カーソル）方式でアイテムの一覧を取得します。
+
+    `(created_at, id)` の複合インデックスを使って直前のページの最後の行から走査するため、
+    OFFSET と異なりページの深さに関係なく一定のコストで取得できます。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    after : Optional[Tuple[datetime, UUID]], optional
+        直前のページの最後の行の `(created_at, id)`。Noneの場合は先頭から取得, by default None
+    limit : int, optional
+        取得する最大件数, by default 100
+
+    Returns
+    -------
+    List[Item]
+        アイテムオブジェクトのリスト（作成日時、IDの順）
+    """
+    if after is None:
+        return list(db.execute(items_statement(), {"skip": 0, "limit": limit}).scalars())
+    return list(db.execute(items_statement(keyset=True), {"limit": limit, **after_params(after)}).scalars())
+
+
+def get_item_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    columns: Sequence = ITEM_COLUMNS
+) -> List[Row]:
+    """
+    アイテムの一覧をORMオブジェクトを生成せずに行として取得します。
+
+    `after` を指定した場合はキーセット方式で取得し、`skip` は無視されます。
+    `columns` を指定すると、取得する列を絞り込めます（条件付きリクエストの判定用など）。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    skip : int, optional
+        スキップする件数, by default 0
+    limit : int, optional
+        取得する最大件数, by default 100
+    after : Optional[Tuple[datetime, UUID]], optional
+        直前のページの最後の行の `(created_at, id)`, by default None
+    columns : Sequence, optional
+        取得する列, by default ITEM_COLUMNS
+
+    Returns
+    -------
+    List[Row]
+        `(name, description, id, created_at, updated_at)` の行のリスト（作成日時、IDの順）
+    """
+    if after is None:
+        return list(db.execute(items_statement(tuple(columns)), {"skip": skip, "limit": limit}))
+    return list(db.execute(items_statement(tuple(columns), keyset=True), {"limit": limit, **after_params(after)}))
+
+
+def iter_item_rows(db: Session, batch_size: int = 1000) -> Iterator[List[Row]]:
+    """
+    全アイテムをサーバーサイドカーソルで少しずつ読み込みます。
+
+    結果セット全体をメモリに載せず、`batch_size` 行ずつ取得して返します。
+    ORMオブジェクトは生成せず、`(name, description, id, created_at, updated_at)` の行を返します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション（読み込みが終わるまでトランザクションを保持します）
+    batch_size : int, optional
+        1回に取得する行数, by default 1000
+
+    Yields
+    ------
+    List[Row]
+        最大 `batch_size` 行のリスト（作成日時、IDの順）
+    """
+    result = db.execute(
+        select(*ITEM_COLUMNS)
+        .order_by(Item.created_at, Item.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from result.partitions()
+
+
+def search_items(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    after: Optional[Tuple[float, UUID]] = None,
+    max_candidates: int = settings.search_max_candidates
+) -> List[Row]:
     """
-    return list(db.execute(select(Item).offset(skip).limit(limit)).scalars())
+    名前と説明の全文検索、および名前のあいまい検索（pg_trgm）でアイテムを検索します。
+
+    全文検索に一致するアイテムを、全文検索のスコアと名前の類似度の合計（`rank`）の
+    高い順に返します。全文検索に一致するアイテムがない場合（タイプミスや単語の一部）は、
+    名前が単語単位で類似するアイテムを返します。どちらの条件もGINインデックスで
+    絞り込まれ、続きのページは `(rank, id)` のキーセット方式で取得します。
+
+    多数の行に一致する検索語でもスコア計算のコストが一定になるよう、
+    `max_candidates` 件までを候補とし、その中で順位付けします。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    query : str
+        検索文字列（websearch_to_tsquery の構文で解釈されます）
+    limit : int, optional
+        取得する最大件数, by default 20
+    after : Optional[Tuple[float, UUID]], optional
+        直前のページの最後の行の `(rank, id)`。Noneの場合は先頭から取得, by default None
+    max_candidates : int, optional
+        条件ごとの候補の最大件数, by default settings.search_max_candidates
+
+    Returns
+    -------
+    List[Row]
+        `(name, description, id, created_at, updated_at, rank)` の行のリスト（スコアの高い順）
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    full_text = (
+        select(Item.id).where(Item.search_vector.bool_op("@@")(tsquery)).limit(max_candidates).cte("full_text")
+    )
+    # あいまい検索はコストが高いため、全文検索で一致しない場合（タイプミスや単語の一部）のみ実行する
+    fuzzy = (
+        select(Item.id)
+        .where(Item.name.bool_op("%>")(query), ~exists(select(full_text.c.id)))
+        .limit(max_candidates)
+        .subquery()
+    )
+    candidates = union(select(full_text.c.id), select(fuzzy.c.id))
+    # カーソルで正確に往復できるよう、スコアは倍精度で扱う
+    rank = cast(
+        func.ts_rank_cd(Item.search_vector, tsquery) + func.word_similarity(query, Item.name),
+        DOUBLE_PRECISION
+    )
+    stmt = (
+        select(*ITEM_COLUMNS, rank.label("rank"))
+        .where(Item.id.in_(candidates))
+        .order_by(rank.desc(), Item.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Item.id) < tuple_(*after))
+    return list(db.execute(stmt))
+
+
+# アイテムコードをキーにした upsert（挿入した行は xmax が 0、更新した行は更新したトランザクションのID）
+# ON CONFLICT 付きの INSERT（`sqlalchemy.dialects.postgresql.insert`）はコンパイル済みSQLのキャッシュの
+# 対象外で、呼び出しごとに文の組み立てとコンパイルが必要になるため、SQLを文字列で一度だけ定義する
+UPSERT_ITEM = (
+    select(Item, column("inserted", Boolean))
+    .from_statement(
+        text(
+            "INSERT INTO items (id, code, name, description) VALUES (:id, :code, :name, :description) "
+            "ON CONFLICT (code) DO UPDATE "
+            "SET name = excluded.name, description = excluded.description, updated_at = now() "
+            "RETURNING id, code, name, description, created_at, updated_at, xmax = 0 AS inserted"
+        )
+        .bindparams(bindparam("id", type_=PG_UUID(as_uuid=True)))
+        .columns(
+            Item.id, Item.code, Item.name, Item.description, Item.created_at, Item.updated_at,
+            column("inserted", Boolean)
+        )
+    )
+    .execution_options(populate_existing=True)
+)
 
 
 def create_item(db: Session, item: ItemCreate) -> Item:
@@ -62,17 +384,51 @@ def create_item(db: Session, item: ItemCreate) -> Item:
     Item
         作成されたアイテムオブジェクト
     """
-    db_item = Item(**item.model_dump())
-    db.add(db_item)
+    # サーバー側で設定する作成日時・更新日時も RETURNING で受け取り、INSERT 後の再読み込み（SELECT）を行わない
+    # （オブジェクトはコミットで失効しないよう、コミット後に RETURNING の行から生成する）
+    result = db.execute(insert(Item).values(**item.model_dump()).returning(Item))
     db.commit()
-    db.refresh(db_item)
-    return db_item
+    return result.scalar_one()
 
 
-def update_item(db: Session, item_id: UUID, item: ItemUpdate) -> Optional[Item]:
+def upsert_item(db: Session, code: str, item: ItemCreate) -> Tuple[Item, bool]:
+    """
+    アイテムコードをキーにアイテムを作成、または更新します。
+
+    1つの `INSERT ... ON CONFLICT (code) DO UPDATE ... RETURNING` で実行するため、
+    存在確認の SELECT は行わず、同じコードで同時に呼び出しても重複して作成されません。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    code : str
+        アイテムコード
+    item : ItemCreate
+        作成・更新するアイテムの情報
+
+    Returns
+    -------
+    Tuple[Item, bool]
+        作成・更新されたアイテムオブジェクトと、新しく作成した場合はTrue
+    """
+    result = db.execute(UPSERT_ITEM, {"id": uuid.uuid4(), "code": code, **item.model_dump()})
+    db.commit()
+    db_item, created = result.one()
+    return db_item, created
+
+
+def update_item(
+    db: Session,
+    item_id: UUID,
+    item: ItemUpdate,
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[Item]:
     """
     指定されたIDのアイテムを更新します。
 
+    `expected_updated_at` を指定した場合は、更新日時が一致する場合のみ更新します（楽観的排他制御）。
+
     Parameters
     ----------
     db : Session
@@ -81,44 +437,167 @@ def update_item(db: Session, item_id: UUID, item: ItemUpdate) -> Optional[Item]:
         更新するアイテムのID
     item : ItemUpdate
         更新する情報
+    expected_updated_at : Optional[datetime], optional
+        クライアントが取得した時点の更新日時, by default None
 
     Returns
     -------
     Optional[Item]
-        更新されたアイテムオブジェクト、アイテムが見つからなかった場合はNone
+        更新されたアイテムオブジェクト、アイテムが見つからなかった場合（または更新日時が一致しない場合）はNone
     """
     update_data = item.model_dump(exclude_unset=True)
+    # 更新する項目がない場合は、更新と同じ条件の SELECT のみを実行する
+    stmt = update_item_statement(tuple(sorted(update_data)), conditional=expected_updated_at is not None)
+    params = {f"new_{field}": value for field, value in update_data.items()}
+    params["item_id"] = item_id
+    if expected_updated_at is not None:
+        params["expected_updated_at"] = expected_updated_at
     if not update_data:
-        return get_item(db, item_id)
+        return db.execute(stmt, params).scalar_one_or_none()
 
-    result = db.execute(
-        update(Item)
-        .where(Item.id == item_id)
-        .values(**update_data)
-        .returning(Item)
-    )
+    result = db.execute(stmt, params)
     db.commit()
     
     updated_item = result.scalar_one_or_none()
     return updated_item
 
 
-def delete_item(db: Session, item_id: UUID) -> bool:
+def delete_item(db: Session, item_id: UUID, expected_updated_at: Optional[datetime] = None) -> bool:
     """
     指定されたIDのアイテムを削除します。
 
+    `expected_updated_at` を指定した場合は、更新日時が一致する場合のみ削除します（楽観的排他制御）。
+
     Parameters
     ----------
     db : Session
         データベースセッション
     item_id : UUID
         削除するアイテムのID
+    expected_updated_at : Optional[datetime], optional
+        クライアントが取得した時点の更新日時, by default None
 
     Returns
     -------
     bool
-        削除に成功した場合はTrue、アイテムが見つからなかった場合はFalse
+        削除に成功した場合はTrue、アイテムが見つからなかった場合（または更新日時が一致しない場合）はFalse
     """
-    result = db.execute(delete(Item).where(Item.id == item_id))
+    params = {"item_id": item_id}
+    if expected_updated_at is not None:
+        params["expected_updated_at"] = expected_updated_at
+    result = db.execute(delete_item_statement(conditional=expected_updated_at is not None), params)
     db.commit()
     return result.rowcount > 0
+
+
+def create_items(db: Session, items: Sequence[ItemCreate]) -> List[Item]:
+    """
+    複数のアイテムを1つの `INSERT ... VALUES (...), (...) RETURNING` で作成します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    items : Sequence[ItemCreate]
+        作成するアイテムの情報のリスト
+
+    Returns
+    -------
+    List[Item]
+        作成されたアイテムオブジェクトのリスト（入力と同じ順序）
+    """
+    if not items:
+        return []
+
+    # RETURNING の行順に依存しないよう、IDをアプリケーション側で採番して入力順に並べ直す
+    rows = [{"id": uuid.uuid4(), **item.model_dump()} for item in items]
+    result = db.execute(insert(Item).values(rows).returning(Item))
+    db.commit()
+
+    created = {db_item.id: db_item for db_item in result.scalars()}
+    return [created[row["id"]] for row in rows]
+
+
+def update_items(db: Session, items: Sequence[ItemBulkUpdate]) -> Dict[UUID, Item]:
+    """
+    複数のアイテムを1つの `UPDATE ... FROM (VALUES ...) RETURNING` で更新します。
+
+    行ごとに指定されたフィールドだけを更新するため、VALUES にはフィールドごとの
+    更新フラグを含め、フラグが偽の列は既存の値を維持します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    items : Sequence[ItemBulkUpdate]
+        更新する情報のリスト
+
+    Returns
+    -------
+    Dict[UUID, Item]
+        更新されたアイテムのIDとアイテムオブジェクトの辞書（見つからなかったIDは含まない）
+    """
+    if not items:
+        return {}
+
+    rows = []
+    for item in items:
+        update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        rows.append((
+            item.id,
+            update_data.get("name"),
+            update_data.get("description"),
+            "name" in update_data,
+            "description" in update_data,
+        ))
+
+    data = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("name", String),
+        column("description", Text),
+        column("set_name", Boolean),
+        column("set_description", Boolean),
+        name="data"
+    ).data(rows)
+
+    result = db.execute(
+        update(Item)
+        .where(Item.id == data.c.id)
+        .values(
+            name=case((data.c.set_name, data.c.name), else_=Item.name),
+            description=case((data.c.set_description, data.c.description), else_=Item.description),
+        )
+        .returning(Item)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return {db_item.id: db_item for db_item in result.scalars()}
+
+
+def delete_items(db: Session, item_ids: Sequence[UUID]) -> List[UUID]:
+    """
+    複数のアイテムを1つの `DELETE ... WHERE id = ANY(...)` で削除します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_ids : Sequence[UUID]
+        削除するアイテムのIDのリスト
+
+    Returns
+    -------
+    List[UUID]
+        削除されたアイテムのIDのリスト
+    """
+    if not item_ids:
+        return []
+
+    result = db.execute(
+        delete(Item)
+        .where(Item.id == any_(bindparam("ids", list(item_ids), type_=ARRAY(PG_UUID(as_uuid=True)))))
+        .returning(Item.id)
+    )
+    db.commit()
+    return list(result.scalars())
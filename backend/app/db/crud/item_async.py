@@ -0,0 +1,260 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
+from ..models.item import Item
+from .item import (
+    ITEM_COLUMNS, ITEM_UPDATED_AT, UPSERT_ITEM, after_params, delete_item_statement, items_statement,
+    update_item_statement
+)
+from ..schemas.item import ItemCreate, ItemUpdate
+
+
+async def get_item(db: AsyncSession, item_id: UUID) -> Optional[Item]:
+    """
+    指定されたIDのアイテムを非同期で取得します。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    item_id : UUID
+        取得するアイテムのID
+
+    Returns
+    -------
+    Optional[Item]
+        アイテムが見つかった場合はアイテムオブジェクト、見つからなかった場合はNone
+    """
+    return await db.get(Item, item_id)
+
+
+async def get_item_updated_at(db: AsyncSession, item_id: UUID) -> Optional[datetime]:
+    """
+    指定されたIDのアイテムの更新日時のみを非同期で取得します。
+
+    条件付きリクエストの判定など、行全体が不要な場合に使用します。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    item_id : UUID
+        アイテムのID
+
+    Returns
+    -------
+    Optional[datetime]
+        アイテムが見つかった場合は更新日時、見つからなかった場合はNone
+    """
+    result = await db.execute(ITEM_UPDATED_AT, {"item_id": item_id})
+    return result.scalar_one_or_none()
+
+
+async def get_items(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Item]:
+    """
+    アイテムの一覧を非同期で取得します。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    skip : int, optional
+        スキップする件数, by default 0
+    limit : int, optional
+        取得する最大件数, by default 100
+
+    Returns
+    -------
+    List[Item]
+        アイテムオブジェクトのリスト（作成日時、IDの順）
+    """
+    result = await db.execute(items_statement(), {"skip": skip, "limit": limit})
+    return list(result.scalars())
+
+
+async def get_items_after(
+    db: AsyncSession,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    limit: int = 100
+) -> List[Item]:
+    """
+    キーセット（カーソル）方式でアイテムの一覧を非同期で取得します。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    after : Optional[Tuple[datetime, UUID]], optional
+        直前のページの最後の行の `(created_at, id)`。Noneの場合は先頭から取得, by default None
+    limit : int, optional
+        取得する最大件数, by default 100
+
+    Returns
+    -------
+    List[Item]
+        アイテムオブジェクトのリスト（作成日時、IDの順）
+    """
+    if after is None:
+        result = await db.execute(items_statement(), {"skip": 0, "limit": limit})
+    else:
+        result = await db.execute(items_statement(keyset=True), {"limit": limit, **after_params(after)})
+    return list(result.scalars())
+
+
+async def get_item_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, UUID]] = None
+) -> List[Row]:
+    """
+    アイテムの一覧をORMオブジェクトを生成せずに行として非同期で取得します。
+
+    `after` を指定した場合はキーセット方式で取得し、`skip` は無視されます。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    skip : int, optional
+        スキップする件数, by default 0
+    limit : int, optional
+        取得する最大件数, by default 100
+    after : Optional[Tuple[datetime, UUID]], optional
+        直前のページの最後の行の `(created_at, id)`, by default None
+
+    Returns
+    -------
+    List[Row]
+        `(name, description, id, created_at, updated_at)` の行のリスト（作成日時、IDの順）
+    """
+    if after is None:
+        result = await db.execute(items_statement(ITEM_COLUMNS), {"skip": skip, "limit": limit})
+    else:
+        result = await db.execute(items_statement(ITEM_COLUMNS, keyset=True), {"limit": limit, **after_params(after)})
+    return list(result.all())
+
+
+async def create_item(db: AsyncSession, item: ItemCreate) -> Item:
+    """
+    新しいアイテムを非同期で作成します。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    item : ItemCreate
+        作成するアイテムの情報
+
+    Returns
+    -------
+    Item
+        作成されたアイテムオブジェクト
+    """
+    # サーバー側で設定する作成日時・更新日時も RETURNING で受け取り、INSERT 後の再読み込み（SELECT）を行わない
+    result = await db.execute(insert(Item).values(**item.model_dump()).returning(Item))
+    await db.commit()
+    return result.scalar_one()
+
+
+async def upsert_item(db: AsyncSession, code: str, item: ItemCreate) -> Tuple[Item, bool]:
+    """
+    アイテムコードをキーにアイテムを非同期で作成、または更新します。
+
+    同期版と同じ1つの `INSERT ... ON CONFLICT (code) DO UPDATE ... RETURNING`（`UPSERT_ITEM`）で実行するため、
+    存在確認の SELECT は行わず、同じコードで同時に呼び出しても重複して作成されません。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    code : str
+        アイテムコード
+    item : ItemCreate
+        作成・更新するアイテムの情報
+
+    Returns
+    -------
+    Tuple[Item, bool]
+        作成・更新されたアイテムオブジェクトと、新しく作成した場合はTrue
+    """
+    result = await db.execute(UPSERT_ITEM, {"id": uuid.uuid4(), "code": code, **item.model_dump()})
+    await db.commit()
+    db_item, created = result.one()
+    return db_item, created
+
+
+async def update_item(
+    db: AsyncSession,
+    item_id: UUID,
+    item: ItemUpdate,
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[Item]:
+    """
+    指定されたIDのアイテムを非同期で更新します。
+
+    `expected_updated_at` を指定した場合は、更新日時が一致する場合のみ更新します（楽観的排他制御）。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    item_id : UUID
+        更新するアイテムのID
+    item : ItemUpdate
+        更新する情報
+    expected_updated_at : Optional[datetime], optional
+        クライアントが取得した時点の更新日時, by default None
+
+    Returns
+    -------
+    Optional[Item]
+        更新されたアイテムオブジェクト、アイテムが見つからなかった場合（または更新日時が一致しない場合）はNone
+    """
+    update_data = item.model_dump(exclude_unset=True)
+    # 更新する項目がない場合は、更新と同じ条件の SELECT のみを実行する
+    stmt = update_item_statement(tuple(sorted(update_data)), conditional=expected_updated_at is not None)
+    params = {f"new_{field}": value for field, value in update_data.items()}
+    params["item_id"] = item_id
+    if expected_updated_at is not None:
+        params["expected_updated_at"] = expected_updated_at
+    if not update_data:
+        return (await db.execute(stmt, params)).scalar_one_or_none()
+
+    result = await db.execute(stmt, params)
+    await db.commit()
+
+    updated_item = result.scalar_one_or_none()
+    return updated_item
+
+
+async def delete_item(db: AsyncSession, item_id: UUID, expected_updated_at: Optional[datetime] = None) -> bool:
+    """
+    指定されたIDのアイテムを非同期で削除します。
+
+    `expected_updated_at` を指定した場合は、更新日時が一致する場合のみ削除します（楽観的排他制御）。
+
+    Parameters
+    ----------
+    db : AsyncSession
+        非同期データベースセッション
+    item_id : UUID
+        削除するアイテムのID
+    expected_updated_at : Optional[datetime], optional
+        クライアントが取得した時点の更新日時, by default None
+
+    Returns
+    -------
+    bool
+        削除に成功した場合はTrue、アイテムが見つからなかった場合（または更新日時が一致しない場合）はFalse
+    """
+    params = {"item_id": item_id}
+    if expected_updated_at is not None:
+        params["expected_updated_at"] = expected_updated_at
+    result = await db.execute(delete_item_statement(conditional=expected_updated_at is not None), params)
+    await db.commit()
+    return result.rowcount > 0
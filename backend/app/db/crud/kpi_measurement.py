@@ -0,0 +1,136 @@
+from datetime import datetime
+from typing import List, Sequence
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.item import Item
+from ..models.kpi_measurement import KpiMeasurement
+from ..partitions import check_ingest_months, ensure_partitions, forget_partitions
+from ..schemas.kpi_measurement import KpiMeasurementCreate
+
+# 該当するパーティションがない場合のエラーコード（check_violation）
+_NO_PARTITION_FOUND = "23514"
+
+
+def ingest_measurements(db: Session, points: Sequence[KpiMeasurementCreate]) -> int:
+    """
+    測定値を一括で保存します。
+
+    測定日時が取り込める範囲内であることを確認し、必要な月のパーティションを作成した上で、
+    1つのトランザクションで保存します。
+    同じアイテム・同じ日時の測定値は上書きされるため、同じバッチを再送しても重複しません。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    points : Sequence[KpiMeasurementCreate]
+        保存する測定値のリスト
+
+    Returns
+    -------
+    int
+        保存した件数（バッチ内の重複は後の値を採用）
+
+    Raises
+    ------
+    MeasurementWindowError
+        取り込める範囲外の測定日時が含まれる場合、または月数が多すぎる場合（パーティションは作成しません）
+    sqlalchemy.exc.IntegrityError
+        存在しないアイテムのIDが含まれている場合
+    """
+    rows = {
+        (point.item_id, point.measured_at): point.value for point in points
+    }
+    if not rows:
+        return 0
+
+    months = check_ingest_months(measured_at for _, measured_at in rows)
+    stmt = insert(KpiMeasurement)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[KpiMeasurement.item_id, KpiMeasurement.measured_at],
+        set_={"value": stmt.excluded.value, "ingested_at": func.now()},
+    )
+    params = [
+        {"item_id": item_id, "measured_at": measured_at, "value": value}
+        for (item_id, measured_at), value in rows.items()
+    ]
+
+    ensure_partitions(db, months)
+    try:
+        db.execute(stmt, params)
+    except IntegrityError as e:
+        # 作成済みとして記録したパーティションが他のプロセスに削除されていた場合は作り直して再実行する
+        if getattr(e.orig, "pgcode", None) != _NO_PARTITION_FOUND:
+            raise
+        db.rollback()
+        forget_partitions()
+        ensure_partitions(db, months)
+        db.execute(stmt, params)
+    db.commit()
+    return len(rows)
+
+
+def get_missing_item_ids(db: Session, item_ids: Sequence[UUID]) -> List[UUID]:
+    """
+    指定されたIDのうち、存在しないアイテムのIDを返します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_ids : Sequence[UUID]
+        確認するアイテムのID
+
+    Returns
+    -------
+    List[UUID]
+        存在しないアイテムのID
+    """
+    existing = set(db.execute(select(Item.id).where(Item.id.in_(set(item_ids)))).scalars())
+    return sorted(set(item_ids) - existing)
+
+
+def get_measurements(
+    db: Session,
+    item_id: UUID,
+    start: datetime,
+    end: datetime,
+    limit: int = 1000
+) -> List[Row]:
+    """
+    アイテムの指定された期間の測定値を取得します。
+
+    期間の条件により、該当する月のパーティションのみが参照されます。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        アイテムのID
+    start : datetime
+        期間の開始日時（この日時を含む）
+    end : datetime
+        期間の終了日時（この日時を含まない）
+    limit : int, optional
+        取得する最大件数, by default 1000
+
+    Returns
+    -------
+    List[Row]
+        `(measured_at, value)` の行のリスト（測定日時の順）
+    """
+    return list(db.execute(
+        select(KpiMeasurement.measured_at, KpiMeasurement.value)
+        .where(
+            KpiMeasurement.item_id == item_id,
+            KpiMeasurement.measured_at >= start,
+            KpiMeasurement.measured_at < end,
+        )
+        .order_by(KpiMeasurement.measured_at)
+        .limit(limit)
+    ))
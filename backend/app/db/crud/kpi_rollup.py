@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import BigInteger, cast, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from ..models.kpi_measurement import KpiMeasurement
+from ..models.kpi_rollup import KpiRollupDaily, KpiRollupHourly, KpiRollupMonthly
+
+AggregateBucket = Literal["hour", "day", "week", "month", "year"]
+
+# 各集計単位を組み立てられるロールアップ（粗い順）
+ROLLUP_SOURCES = (
+    ("month", KpiRollupMonthly, {"month", "year"}),
+    ("day", KpiRollupDaily, {"day", "week", "month", "year"}),
+    ("hour", KpiRollupHourly, {"hour", "day", "week", "month", "year"}),
+)
+
+
+def _is_aligned(value: datetime, granularity: str) -> bool:
+    """日時がUTCで粒度の区切り（時・日・月の始まり）に一致するかどうかを返します。"""
+    value = value.astimezone(timezone.utc)
+    if (value.minute, value.second, value.microsecond) != (0, 0, 0):
+        return False
+    if granularity == "hour":
+        return True
+    if value.hour != 0:
+        return False
+    return granularity == "day" or value.day == 1
+
+
+def choose_source(bucket: AggregateBucket, start: datetime, end: datetime) -> Optional[str]:
+    """
+    集計に使用するロールアップの粒度を選択します。
+
+    集計単位を組み立てられ、期間の開始・終了がその粒度の区切りに一致するロールアップのうち、
+    最も粗いもの（読み込む行数が最も少ないもの）を選択します。
+
+    Parameters
+    ----------
+    bucket : AggregateBucket
+        集計単位
+    start : datetime
+        期間の開始日時（タイムゾーン付き）
+    end : datetime
+        期間の終了日時（タイムゾーン付き）
+
+    Returns
+    -------
+    Optional[str]
+        ロールアップの粒度（"month"、"day"、"hour"）。使用できない場合は測定値から集計するためNone
+    """
+    for granularity, _, buckets in ROLLUP_SOURCES:
+        if bucket in buckets and _is_aligned(start, granularity) and _is_aligned(end, granularity):
+            return granularity
+    return None
+
+
+def get_aggregates(
+    db: Session,
+    item_id: UUID,
+    bucket: AggregateBucket,
+    start: datetime,
+    end: datetime
+) -> Tuple[str, List[Row]]:
+    """
+    アイテムの指定された期間の測定値を集計単位ごとに集計します。
+
+    `choose_source` で選択したロールアップから集計し、使用できない場合のみ測定値から集計します
+    （例: 1年分の日ごとの集計は約365行の日ごとのロールアップのみを読み込みます）。
+    区切りはUTCで計算し、週は月曜日から始まります。ロールアップには差分更新ワーカーの
+    直近の実行までに取り込まれた測定値が反映されます。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    item_id : UUID
+        アイテムのID
+    bucket : AggregateBucket
+        集計単位
+    start : datetime
+        期間の開始日時（この日時を含む、タイムゾーン付き）
+    end : datetime
+        期間の終了日時（この日時を含まない、タイムゾーン付き）
+
+    Returns
+    -------
+    Tuple[str, List[Row]]
+        集計元（ロールアップの粒度、または測定値から集計した場合は "raw"）と、
+        `(bucket, count, sum, avg, min, max)` の行のリスト（期間の順）
+    """
+    granularity = choose_source(bucket, start, end)
+    if granularity is None:
+        source = "raw"
+        item_column, time_column, value = KpiMeasurement.item_id, KpiMeasurement.measured_at, KpiMeasurement.value
+        count, total = func.count(value), func.sum(value)
+        minimum, maximum = func.min(value), func.max(value)
+    else:
+        source = granularity
+        model = next(model for name, model, _ in ROLLUP_SOURCES if name == granularity)
+        item_column, time_column = model.item_id, model.bucket
+        count, total = cast(func.sum(model.count), BigInteger), func.sum(model.sum)
+        minimum, maximum = func.min(model.min), func.max(model.max)
+
+    period = func.date_trunc(bucket, time_column, "UTC").label("bucket")
+    rows = db.execute(
+        select(
+            period,
+            count.label("count"),
+            total.label("sum"),
+            (total / count).label("avg"),
+            minimum.label("min"),
+            maximum.label("max"),
+        )
+        .where(item_column == item_id, time_column >= start, time_column < end)
+        .group_by(period)
+        .order_by(period)
+    )
+    return source, list(rows)
@@ -1,15 +1,25 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from fastapi import Request
 from sqlalchemy.orm import Session
-from .models.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from .models.database import SessionLocal, AsyncSessionLocal
+from .replicas import READ_YOUR_WRITES_COOKIE, replica_router
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request) -> Generator[Session, None, None]:
     """
     データベースセッションを取得するための依存関数です。
 
     この関数は、セッションファクトリ `SessionLocal` を使用して
     データベースセッションを生成し、FastAPIの依存関係として提供します。
     リクエストごとに新しいセッションを作成し、リクエスト終了時にセッションをクローズします。
+    セッションでコミットした場合は `request.state.database_written` を設定します
+    （`ReadYourWritesMiddleware` が以降の読み取りをプライマリで行うクッキーを付与します）。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト
 
     Yields
     ------
@@ -17,7 +27,66 @@ def get_db() -> Generator[Session, None, None]:
         使用中のデータベースセッションオブジェクト。
     """
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        if db.info.get("written"):
+            request.state.database_written = True
+        db.close()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    読み取り専用のエンドポイントでデータベースセッションを取得するための依存関数です。
+
+    リードレプリカが設定されている場合はレプリカのセッションを、設定されていない場合・
+    使用できるレプリカがない場合・クライアントが直前に書き込みを行った場合は
+    プライマリのセッションを提供します。書き込みには使用しないでください。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト（書き込み直後のクライアントの判定用）
+
+    Yields
+    ------
+    Session
+        使用中のデータベースセッションオブジェクト。
+    """
+    db = replica_router.session(primary=READ_YOUR_WRITES_COOKIE in request.cookies)
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    非同期データベースセッションを取得するための依存関数です。
+
+    セッションファクトリ `AsyncSessionLocal` を使用して非同期セッションを生成し、
+    FastAPIの依存関係として提供します。スレッドプールを経由せずイベントループ上で
+    クエリを実行するため、`USE_ASYNC_DB` が有効な場合にのみ使用します。
+
+    Yields
+    ------
+    AsyncSession
+        使用中の非同期データベースセッションオブジェクト。
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    リクエストのセッションとは別に非同期セッションを開くためのセッションファクトリを取得する依存関数です。
+
+    single-flight でまとめた読み取りなど、呼び出し元のリクエストに依存せずにセッションを
+    開く場合に使用します。
+
+    Returns
+    -------
+    async_sessionmaker
+        非同期セッションファクトリ `AsyncSessionLocal`
+    """
+    return AsyncSessionLocal
@@ -0,0 +1,277 @@
+"""
+スロークエリのログと N+1 の検出（開発・テスト用）
+
+`QUERY_INSPECTION_ENABLED=true` の場合（または `enable_query_inspection` を呼び出した場合）、全てのエンジンで
+実行したSQLを記録し、以下を `app.db.inspection` のロガーに警告として出力します。
+
+- 実行時間が `SLOW_QUERY_THRESHOLD_MS` を超えたSQL（`EXPLAIN` の実行計画を含む）。
+  `SLOW_QUERY_EXPLAIN_ANALYZE=true` の場合、SELECT はSQLを再実行して `EXPLAIN (ANALYZE, BUFFERS)` の
+  実行計画を出力します（書き込みは再実行しないよう常に `EXPLAIN` です）。
+- 1つのリクエスト（`capture_queries` の範囲）で同じ形のSQLを `N_PLUS_ONE_THRESHOLD` 回以上実行した場合（N+1）。
+
+SQLごとに、実行した `app.db.crud` の関数（`origin`）を記録します。テストでは `tests/query_budget.py` の
+pytest プラグインで、エンドポイントごとのSQLの数の上限（`@pytest.mark.query_budget`）を確認できます。
+記録のためにSQLごとに呼び出し元のスタックを確認するため、本番環境では有効にしないでください。
+"""
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 呼び出し元として記録するモジュールの接頭辞
+CRUD_PACKAGE = "app.db.crud."
+
+# バインドパラメータのプレースホルダ（psycopg2・asyncpg・SQLite）
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|\?")
+# IN (...) に展開したパラメータや複数行の VALUES の並び（件数が異なっても同じ形とみなす）
+_PARAMETER_TUPLES = re.compile(r"\(\?(?:::\w+)?(?:, \?(?:::\w+)?)*\)(?:, \(\?(?:::\w+)?(?:, \?(?:::\w+)?)*\))*")
+_SELECT = re.compile(r"^\s*(?:SELECT|WITH\b(?:(?!\b(?:INSERT|UPDATE|DELETE)\b).)*$)", re.IGNORECASE | re.DOTALL)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    バインドパラメータの名前・件数と空白の違いを除いた、SQLの形を返します。
+
+    例: `WHERE id IN (%(id_1_1)s, %(id_1_2)s)` は `WHERE id IN (...)` になります。
+    """
+    statement = " ".join(statement.split())
+    return _PARAMETER_TUPLES.sub("(...)", _PLACEHOLDER.sub("?", statement))
+
+
+class CapturedQuery:
+    """
+    記録した1つのSQL
+
+    Attributes
+    ----------
+    statement : str
+        SQL（バインドパラメータはプレースホルダのまま）
+    shape : str
+        N+1 の検出に使用するSQLの形（`statement_shape`）
+    seconds : float
+        実行時間（秒）
+    origin : Optional[str]
+        実行した `app.db.crud` の関数（例: "app.db.crud.item.get_item"）、CRUD層の外で実行した場合はNone
+    """
+
+    __slots__ = ("statement", "shape", "seconds", "origin")
+
+    def __init__(self, statement: str, seconds: float, origin: Optional[str]):
+        self.statement = statement
+        self.shape = statement_shape(statement)
+        self.seconds = seconds
+        self.origin = origin
+
+
+class QueryLog:
+    """
+    `capture_queries` の範囲で実行したSQLの記録
+
+    Attributes
+    ----------
+    label : str
+        記録の識別名（リクエストの場合は "GET /api/items/{item_id}" のようなメソッドとルート）
+    queries : List[CapturedQuery]
+        実行したSQL（実行順）
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.queries: List[CapturedQuery] = []
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def repeated(self, threshold: int = settings.n_plus_one_threshold) -> List[Tuple[CapturedQuery, int]]:
+        """
+        同じ形で `threshold` 回以上実行したSQLを返します（N+1 の候補）。
+
+        Returns
+        -------
+        List[Tuple[CapturedQuery, int]]
+            最初に実行したSQLと実行回数の組（実行回数の多い順）
+        """
+        counts = Counter(query.shape for query in self.queries)
+        first = {}
+        for query in self.queries:
+            first.setdefault(query.shape, query)
+        return [(first[shape], count) for shape, count in counts.most_common() if count >= threshold]
+
+    def report(self, threshold: int = settings.n_plus_one_threshold) -> None:
+        """N+1 の候補をログに出力します。"""
+        for query, count in self.repeated(threshold):
+            logger.warning(
+                "Possible N+1 in %s: statement executed %d times (origin: %s): %s",
+                self.label, count, query.origin or "-", query.shape,
+            )
+
+
+# 処理中の記録（同期エンドポイント・依存関数を実行するスレッドにもコンテキストごと引き継がれる）
+_current: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+# リクエストの記録を受け取るコールバック（pytest プラグインが使用する）
+request_observers: List[Callable[[QueryLog], None]] = []
+
+
+@contextmanager
+def capture_queries(label: str = "block") -> Iterator[QueryLog]:
+    """
+    ブロック内で実行したSQLを記録します（`enable_query_inspection` で記録を有効にする必要があります）。
+
+    Parameters
+    ----------
+    label : str, optional
+        記録の識別名, by default "block"
+
+    Yields
+    ------
+    QueryLog
+        記録
+    """
+    log = QueryLog(label)
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+
+
+def _origin() -> Optional[str]:
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(CRUD_PACKAGE):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _explain(conn: Any, statement: str, parameters: Any) -> str:
+    # 実行計画の取得に失敗してもリクエストのトランザクションを中断しないよう、セーブポイントの中で実行する
+    # （自動コミットの接続ではセーブポイントを作成できないため、実行計画は出力しない）
+    # ANALYZE は遅いSQLをもう一度実行するため、明示的に有効にした場合の SELECT のみに使用する
+    analyze = "(ANALYZE, BUFFERS) " if settings.slow_query_explain_analyze and _SELECT.match(statement) else ""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN {analyze}{statement}", parameters)
+            plan = "\n".join(str(row[0]) for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    except Exception as e:
+        return f"(EXPLAIN failed: {e})"
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if context is not None:
+        context.inspection_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    started = getattr(context, "inspection_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    log = _current.get()
+    origin = _origin() if log is not None or seconds * 1000 >= settings.slow_query_threshold_ms else None
+    if log is not None:
+        log.queries.append(CapturedQuery(statement, seconds, origin))
+    if seconds * 1000 >= settings.slow_query_threshold_ms:
+        plan = None
+        if settings.slow_query_explain and not executemany and conn.dialect.name == "postgresql":
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms, origin: %s): %s\nparameters: %r%s",
+            seconds * 1000, origin or "-", statement, parameters, f"\n{plan}" if plan else "",
+        )
+
+
+_enabled = False
+_enable_lock = threading.Lock()
+
+
+def enable_query_inspection() -> bool:
+    """
+    全てのエンジン（作成済みのものを含む）でSQLの記録とスロークエリのログを有効にします。
+
+    2回目以降の呼び出しでは何もしません。
+
+    Returns
+    -------
+    bool
+        この呼び出しで有効にした場合はTrue（既に有効だった場合はFalse）
+    """
+    global _enabled
+    with _enable_lock:
+        if _enabled:
+            return False
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _enabled = True
+        return True
+
+
+def disable_query_inspection() -> None:
+    """
+    `enable_query_inspection` で有効にしたSQLの記録とスロークエリのログを無効にします（テスト用）。
+
+    エンジンクラスに登録したイベントリスナーを削除します。有効にしていない場合は何もしません。
+    """
+    global _enabled
+    with _enable_lock:
+        if not _enabled:
+            return
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+        _enabled = False
+
+
+class QueryInspectionMiddleware:
+    """
+    リクエストごとに実行したSQLを記録し、N+1 の候補をログに出力するASGIミドルウェアです。
+
+    記録は `request_observers` のコールバックにも渡します。
+
+    Parameters
+    ----------
+    app : ASGIApp
+        アプリケーション
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        enable_query_inspection()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries() as log:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                log.label = f"{scope['method']} {route.path if route is not None else scope['path']}"
+                log.report()
+                for observer in list(request_observers):
+                    observer(log)
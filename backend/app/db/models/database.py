@@ -1,7 +1,17 @@
+import os
+import threading
+from typing import Any, Optional
 from sqlalchemy import create_engine, Column, DateTime, func
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from sqlalchemy.dialects.postgresql import UUID
 from ...core.config import settings
+from ...core.instrumentation import instrument_engine
+from ..inspection import enable_query_inspection
+from ..pool import PoolMetrics
+from ..statement_cache import StatementCacheMetrics
 import uuid
 
 # データベース接続URLの構築
@@ -11,11 +21,124 @@ DATABASE_URL = (
     f"{settings.database_port}/{settings.database_name}"
 )
 
-# エンジンの作成
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# 非同期ドライバ（asyncpg）用のデータベース接続URL
+# asyncpg は接続ごとにSQLをサーバー側のプリペアドステートメントとして保持し、2回目以降は解析を省略する
+# （PgBouncer のトランザクションプーリングを経由する場合は `DB_PREPARED_STATEMENT_CACHE_SIZE=0` にする）
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{settings.database_user}:"
+    f"{settings.database_password}@{settings.database_host}:"
+    f"{settings.database_port}/{settings.database_name}"
+    f"?prepared_statement_cache_size={settings.db_prepared_statement_cache_size}"
+)
+
+# コネクションプールの設定（同期・非同期エンジンで共通）
+POOL_OPTIONS = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+
+# コネクションプールのメトリクス（エンジンを作成し直しても累積する）
+pool_metrics = PoolMetrics("primary")
+async_pool_metrics = PoolMetrics("async")
+
+# コンパイル済みSQLのキャッシュのメトリクス（エンジンを作成し直しても累積する）
+statement_cache_metrics = StatementCacheMetrics("primary")
+async_statement_cache_metrics = StatementCacheMetrics("async")
+
+# エンジンは最初のセッションの作成時にプロセスごとに作成する（`init_engines`）
+# インポート時に作成すると、gunicorn などで fork したワーカーが親プロセスのプールを共有してしまうため
+engine: Optional[Engine] = None
+async_engine: Optional[AsyncEngine] = None
+_engines_pid: Optional[int] = None
+_engines_lock = threading.Lock()
+
+
+def init_engines() -> Engine:
+    """
+    現在のプロセスのエンジンを作成し、セッションファクトリに設定します。
+
+    作成済みの場合は何もしません。fork する前に親プロセスで作成されたエンジンが残っている場合は、
+    親プロセスの接続を閉じずに（親プロセスが使用中のため）破棄して作成し直します。
+    非同期エンジンは `USE_ASYNC_DB` が有効な場合のみ作成します（asyncpg を読み込まないため）。
+
+    Returns
+    -------
+    Engine
+        現在のプロセスの同期エンジン
+    """
+    global engine, async_engine, _engines_pid
+    pid = os.getpid()
+    if engine is not None and _engines_pid == pid:
+        return engine
+    with _engines_lock:
+        if engine is not None and _engines_pid == pid:
+            return engine
+        if engine is not None:
+            engine.dispose(close=False)
+        if async_engine is not None:
+            async_engine.sync_engine.dispose(close=False)
+
+        sync_engine = create_engine(
+            DATABASE_URL,
+            poolclass=pool_metrics.pool_class(QueuePool),
+            execution_options={"compiled_cache": statement_cache_metrics.cache()},
+            **POOL_OPTIONS
+        )
+        pool_metrics.attach(sync_engine)
+        instrument_engine(sync_engine)
+        SessionLocal.configure(bind=sync_engine)
+
+        async_engine = (
+            create_async_engine(
+                ASYNC_DATABASE_URL,
+                poolclass=async_pool_metrics.pool_class(AsyncAdaptedQueuePool),
+                execution_options={"compiled_cache": async_statement_cache_metrics.cache()},
+                **POOL_OPTIONS
+            )
+            if settings.use_async_db
+            else None
+        )
+        if async_engine is not None:
+            async_pool_metrics.attach(async_engine.sync_engine)
+            instrument_engine(async_engine.sync_engine)
+            AsyncSessionLocal.configure(bind=async_engine)
+
+        # APIサーバー以外（ジョブワーカー・CLI）のSQLもスロークエリのログの対象にする
+        if settings.query_inspection_enabled:
+            enable_query_inspection()
+
+        engine, _engines_pid = sync_engine, pid
+        return engine
+
+
+class _ProcessLocalSessionmaker(sessionmaker):
+    """セッションの作成前に現在のプロセスのエンジンを用意する `sessionmaker` です。"""
+
+    def __call__(self, **local_kw: Any) -> Session:
+        init_engines()
+        return super().__call__(**local_kw)
+
+
+class _ProcessLocalAsyncSessionmaker(async_sessionmaker):
+    """セッションの作成前に現在のプロセスのエンジンを用意する `async_sessionmaker` です。"""
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        init_engines()
+        return super().__call__(**local_kw)
+
 
 # セッションファクトリの設定
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _ProcessLocalSessionmaker(autocommit=False, autoflush=False)
+
+# 非同期セッションファクトリの設定
+# コミット後の遅延ロード（暗黙のI/O）を避けるため expire_on_commit は無効にする
+AsyncSessionLocal = _ProcessLocalAsyncSessionmaker(
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # デクラレーティブベースの作成
 Base = declarative_base()
@@ -1,5 +1,16 @@
 from .database import BaseDatabase
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Computed, Index, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+# 全文検索に使用するテキスト検索設定（言語に依存しない単語分割）
+SEARCH_CONFIG = "simple"
+
+# 検索用ベクトルの生成式（名前を重み A、説明を重み B とする）
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
 
 
 class Item(BaseDatabase):
@@ -14,12 +25,31 @@ class Item(BaseDatabase):
         アイテムの名前
     description : str
         アイテムの説明
+    code : Optional[str]
+        アイテムコード（外部システムでの識別子。`PUT /api/items/by-code/{code}` の upsert のキー）
     created_at : datetime
         作成日時（BaseDatabaseから継承）
     updated_at : datetime
         更新日時（BaseDatabaseから継承）
+    search_vector : str
+        名前と説明から生成される全文検索用のベクトル（通常の読み込みでは取得しません）
     """
     __tablename__ = "items"
+    __table_args__ = (
+        # キーセットページネーション（ORDER BY created_at, id）用の複合インデックス
+        Index("ix_items_created_at_id", "created_at", "id"),
+        # 全文検索用のGINインデックス
+        Index("ix_items_search_vector", "search_vector", postgresql_using="gin"),
+        # 名前のあいまい検索（pg_trgm）用のGINインデックス
+        Index(
+            "ix_items_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        # upsert（ON CONFLICT (code)）の一意キー。NULL は重複とみなされない
+        Index("ix_items_code", "code", unique=True),
+    )
 
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
+    code = Column(String(64), nullable=True)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
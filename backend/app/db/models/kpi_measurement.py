@@ -0,0 +1,36 @@
+from .database import Base
+from sqlalchemy import Column, DateTime, Double, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class KpiMeasurement(Base):
+    """
+    KPIの測定値モデル。アイテムごとの時系列の測定値を保持します。
+
+    テーブルは `measured_at` で月ごとにレンジパーティション分割されています
+    （パーティションの作成は `app.db.partitions` を参照）。
+    同じアイテム・同じ日時の測定値は1件のみ保持します。
+
+    Attributes
+    ----------
+    item_id : UUID
+        測定対象のアイテムのID
+    measured_at : datetime
+        測定日時
+    value : float
+        測定値
+    ingested_at : datetime
+        取り込み日時（同じ測定値を再送した場合は更新されます）。
+        ロールアップの差分更新で、前回以降に取り込まれた測定値の検索に使用します
+    """
+    __tablename__ = "kpi_measurements"
+    __table_args__ = (
+        # 取り込み日時は挿入順とほぼ一致するため、小さく更新コストの低いBRINインデックスで十分
+        Index("ix_kpi_measurements_ingested_at", "ingested_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (measured_at)"},
+    )
+
+    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+    measured_at = Column(DateTime(timezone=True), primary_key=True)
+    value = Column(Double, nullable=False)
+    ingested_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,70 @@
+from .database import Base
+from sqlalchemy import BigInteger, Column, DateTime, Double, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class KpiRollupBase(Base):
+    """
+    KPI測定値のロールアップ（集計済みデータ）の基底クラスです。
+
+    アイテムごと・期間（バケット）ごとに、合算しても結果が変わらない集計値
+    （件数・合計・最小値・最大値）を保持します。平均値は合計÷件数で求めるため、
+    細かい粒度のロールアップを合算してより粗い期間の集計値を正確に求められます。
+    ロールアップは `app.db.rollups` で測定値から差分更新されます。
+
+    Attributes
+    ----------
+    item_id : UUID
+        測定対象のアイテムのID
+    bucket : datetime
+        期間の開始日時（UTCで区切った時・日・月の始まり）
+    count : int
+        測定値の件数
+    sum : float
+        測定値の合計
+    min : float
+        測定値の最小値
+    max : float
+        測定値の最大値
+    """
+
+    __abstract__ = True
+
+    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    count = Column(BigInteger, nullable=False)
+    sum = Column(Double, nullable=False)
+    min = Column(Double, nullable=False)
+    max = Column(Double, nullable=False)
+
+
+class KpiRollupHourly(KpiRollupBase):
+    """1時間ごとのロールアップ。測定値から集計します。"""
+    __tablename__ = "kpi_rollups_hourly"
+
+
+class KpiRollupDaily(KpiRollupBase):
+    """1日ごとのロールアップ。1時間ごとのロールアップから集計します。"""
+    __tablename__ = "kpi_rollups_daily"
+
+
+class KpiRollupMonthly(KpiRollupBase):
+    """1か月ごとのロールアップ。1日ごとのロールアップから集計します。"""
+    __tablename__ = "kpi_rollups_monthly"
+
+
+class KpiRollupWatermark(Base):
+    """
+    ロールアップの差分更新の進捗（ウォーターマーク）を保持するモデル
+
+    Attributes
+    ----------
+    name : str
+        ロールアップの名前
+    watermark : datetime
+        最後に更新したときの日時。次回はこれ以降に取り込まれた測定値のみを対象とします
+    """
+    __tablename__ = "kpi_rollup_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+from uuid import UUID
+
+
+class InvalidCursorError(ValueError):
+    """カーソル文字列が不正な場合に送出される例外です。"""
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """
+    キーセットページネーション用のカーソルを生成します。
+
+    カーソルは `(created_at, id)` をJSONにしてBase64URLでエンコードした不透明な文字列です。
+
+    Parameters
+    ----------
+    created_at : datetime
+        ページ最後の行の作成日時
+    item_id : UUID
+        ページ最後の行のID
+
+    Returns
+    -------
+    str
+        次ページの取得に使用するカーソル
+    """
+    return _encode([created_at.isoformat(), str(item_id)])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    カーソルを `(created_at, id)` に復元します。
+
+    Parameters
+    ----------
+    cursor : str
+        `encode_cursor` で生成したカーソル
+
+    Returns
+    -------
+    Tuple[datetime, UUID]
+        ページ最後の行の作成日時とID
+
+    Raises
+    ------
+    InvalidCursorError
+        カーソルの形式が不正な場合
+    """
+    try:
+        created_at, item_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def encode_search_cursor(rank: float, item_id: UUID) -> str:
+    """
+    検索結果のキーセットページネーション用のカーソルを生成します。
+
+    Parameters
+    ----------
+    rank : float
+        ページ最後の行のスコア
+    item_id : UUID
+        ページ最後の行のID
+
+    Returns
+    -------
+    str
+        次ページの取得に使用するカーソル
+    """
+    return _encode([rank, str(item_id)])
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, UUID]:
+    """
+    検索結果のカーソルを `(rank, id)` に復元します。
+
+    Parameters
+    ----------
+    cursor : str
+        `encode_search_cursor` で生成したカーソル
+
+    Returns
+    -------
+    Tuple[float, UUID]
+        ページ最後の行のスコアとID
+
+    Raises
+    ------
+    InvalidCursorError
+        カーソルの形式が不正な場合
+    """
+    try:
+        rank, item_id = _decode(cursor)
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise TypeError("rank must be a number")
+        return float(rank), UUID(item_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
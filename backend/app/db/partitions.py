@@ -0,0 +1,261 @@
+"""
+KPI測定値テーブル（kpi_measurements）の月別パーティションの管理
+
+パーティションはデータベース関数 `kpi_measurements_ensure_partition` で作成します。
+メンテナンスジョブとして1日1回程度実行し、先の月のパーティションを事前に作成し、
+保持期間を過ぎたパーティションを削除します（backend ディレクトリで実行）::
+
+    python -m app.db.partitions --ahead 3 --retain 24
+
+取り込み時にパーティションを作成できるのは、保持期間の最初の月から
+`MEASUREMENT_PARTITION_MONTHS_AHEAD` か月先までの月のみです（`check_ingest_months`）。
+"""
+import argparse
+import threading
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+
+PARENT_TABLE = "kpi_measurements"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+
+# 作成済みであることを確認した月（取り込みのたびに関数を呼び出さないため）
+_known_months: Set[date] = set()
+_known_lock = threading.Lock()
+
+
+def month_start(value: date) -> date:
+    """日付・日時（UTC）を含む月の初日を返します。"""
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc) if value.tzinfo else value
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """月の初日に指定された月数を加算します（負の値で減算）。"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """月に対応するパーティションのテーブル名を返します。"""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+class MeasurementWindowError(ValueError):
+    """取り込む測定値の月が取り込める期間外、または1回の取り込みで作成できる月数を超えている場合の例外です。"""
+
+
+def forget_partitions() -> None:
+    """作成済みとして記録したパーティションを破棄し、次回の取り込み時に再確認します。"""
+    with _known_lock:
+        _known_months.clear()
+
+
+def ensure_partitions(db: Session, months: Iterable[date]) -> List[str]:
+    """
+    指定された月のパーティションが存在しない場合は作成します。
+
+    作成は取り込みのトランザクションとは別にコミットします（親テーブルのロックを
+    取り込みの間保持しないため）。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    months : Iterable[date]
+        パーティションが必要な月（月内の任意の日付・日時）
+
+    Returns
+    -------
+    List[str]
+        確認・作成したパーティションのテーブル名
+    """
+    with _known_lock:
+        missing = sorted({month_start(month) for month in months} - _known_months)
+    if not missing:
+        return []
+
+    names = [
+        db.execute(select(func.kpi_measurements_ensure_partition(month))).scalar_one()
+        for month in missing
+    ]
+    db.commit()
+    with _known_lock:
+        _known_months.update(missing)
+    return names
+
+
+def ingest_window(today: Optional[date] = None) -> Tuple[Optional[date], date]:
+    """
+    測定値を取り込める月の範囲を返します。
+
+    保持期間（`MEASUREMENT_RETENTION_MONTHS`）の最初の月から、メンテナンスジョブが事前に作成する
+    `MEASUREMENT_PARTITION_MONTHS_AHEAD` か月先の月までです（保持期間を過ぎて削除した月を作り直さないため）。
+
+    Parameters
+    ----------
+    today : Optional[date], optional
+        基準日（UTC）, by default None
+
+    Returns
+    -------
+    Tuple[Optional[date], date]
+        最初の月（保持期間が0の場合はNone: 制限しない）と最後の月（この月を含む）
+    """
+    current = month_start(today or datetime.now(timezone.utc).date())
+    retention_months = settings.measurement_retention_months
+    first = add_months(current, -(retention_months - 1)) if retention_months > 0 else None
+    return first, add_months(current, settings.measurement_partition_months_ahead)
+
+
+def check_ingest_months(values: Iterable[date], today: Optional[date] = None) -> Set[date]:
+    """
+    取り込む測定値の月が取り込める範囲内であることを確認します（パーティションの作成前に呼び出します）。
+
+    Parameters
+    ----------
+    values : Iterable[date]
+        測定日時
+    today : Optional[date], optional
+        基準日（UTC）, by default None
+
+    Returns
+    -------
+    Set[date]
+        測定値の月（月の初日）
+
+    Raises
+    ------
+    MeasurementWindowError
+        範囲外の月が含まれる場合、または月数が `MEASUREMENT_BATCH_MAX_MONTHS` を超える場合
+    """
+    months = {month_start(value) for value in values}
+    first, last = ingest_window(today)
+    outside = sorted(month for month in months if month > last or (first is not None and month < first))
+    if outside:
+        raise MeasurementWindowError(
+            f"measured_at must be between {first or '-'} and {add_months(last, 1)} "
+            f"(got {', '.join(f'{month:%Y-%m}' for month in outside[:5])})"
+        )
+    if len(months) > settings.measurement_batch_max_months:
+        raise MeasurementWindowError(
+            f"Too many months in one batch: {len(months)} (max {settings.measurement_batch_max_months})"
+        )
+    return months
+
+
+def list_partitions(db: Session) -> Dict[str, date]:
+    """
+    既存のパーティションを返します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    Dict[str, date]
+        パーティションのテーブル名と対象の月（月順）
+    """
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT_TABLE}).scalars()
+    partitions = {
+        name: datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m").date()
+        for name in names if name.startswith(PARTITION_PREFIX)
+    }
+    return dict(sorted(partitions.items(), key=lambda p: p[1]))
+
+
+def drop_partitions_before(db: Session, cutoff: date) -> List[str]:
+    """
+    指定された月より前のパーティションを削除します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    cutoff : date
+        この月より前のパーティションを削除します
+
+    Returns
+    -------
+    List[str]
+        削除したパーティションのテーブル名
+    """
+    cutoff = month_start(cutoff)
+    dropped = [name for name, month in list_partitions(db).items() if month < cutoff]
+    for name in dropped:
+        db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+    db.commit()
+    with _known_lock:
+        _known_months.difference_update(
+            month for month in list(_known_months) if month < cutoff
+        )
+    return dropped
+
+
+def run_maintenance(
+    db: Session,
+    months_ahead: int = settings.measurement_partition_months_ahead,
+    retention_months: int = settings.measurement_retention_months,
+    today: Optional[date] = None
+) -> Dict[str, List[str]]:
+    """
+    今月から `months_ahead` か月先までのパーティションを作成し、保持期間を過ぎたものを削除します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    months_ahead : int, optional
+        事前に作成する月数, by default settings.measurement_partition_months_ahead
+    retention_months : int, optional
+        保持する月数（今月を含む。0の場合は削除しない）, by default settings.measurement_retention_months
+    today : Optional[date], optional
+        基準日（UTC）, by default None
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        作成・確認したパーティション（"ensured"）と削除したパーティション（"dropped"）
+    """
+    current = month_start(today or datetime.now(timezone.utc).date())
+    # メンテナンスでは他のプロセスによる削除も考慮して必ず確認する
+    forget_partitions()
+    ensured = ensure_partitions(db, [add_months(current, n) for n in range(months_ahead + 1)])
+    dropped = []
+    if retention_months > 0:
+        dropped = drop_partitions_before(db, add_months(current, -(retention_months - 1)))
+    return {"ensured": ensured, "dropped": dropped}
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """コマンドラインからパーティションのメンテナンスを実行します。"""
+    from .models.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain monthly kpi_measurements partitions")
+    parser.add_argument("--ahead", type=int, default=settings.measurement_partition_months_ahead,
+                        help="事前に作成する月数")
+    parser.add_argument("--retain", type=int, default=settings.measurement_retention_months,
+                        help="保持する月数（0の場合は削除しない）")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        result = run_maintenance(db, months_ahead=args.ahead, retention_months=args.retain)
+        partitions = list_partitions(db)
+
+    print(f"ensured: {', '.join(result['ensured']) or '-'}")
+    print(f"dropped: {', '.join(result['dropped']) or '-'}")
+    print(f"{len(partitions)} partitions: {', '.join(partitions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from ..core.instrumentation import record_pool_wait
+
+
+class PoolMetrics:
+    """
+    コネクションプールの利用状況を集計するクラスです。
+
+    プールイベント（connect / checkout / checkin / invalidate）から接続の出入りを数え、
+    `pool_class` で生成したプールクラスからチェックアウトの待ち時間を受け取ります。
+    チェックアウト待ち時間には、プールが空いていない場合の待機時間、オーバーフロー接続の
+    確立時間、および pre-ping の往復時間が含まれます。
+
+    Attributes
+    ----------
+    name : str
+        メトリクスの識別名（例: "primary"）
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self.connections_created = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def pool_class(self, base: Type[Pool]) -> Type[Pool]:
+        """
+        チェックアウト待ち時間を計測するプールクラスを生成します。
+
+        `engine.dispose()` でプールが再作成されても同じクラスが使われるよう、
+        メトリクスはクラス属性として保持します。
+
+        Parameters
+        ----------
+        base : Type[Pool]
+            元になるプールクラス（QueuePool、AsyncAdaptedQueuePool など）
+
+        Returns
+        -------
+        Type[Pool]
+            `create_engine` の `poolclass` に指定するプールクラス
+        """
+        return type(
+            f"Instrumented{base.__name__}",
+            (_WaitTimingPoolMixin, base),
+            {"pool_metrics": self}
+        )
+
+    def attach(self, engine: Engine) -> None:
+        """
+        エンジンのプールイベントにリスナーを登録します。
+
+        Parameters
+        ----------
+        engine : Engine
+            監視対象のエンジン
+        """
+        self._engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """チェックアウト1回分の待ち時間を記録します。"""
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.connections_created += 1
+
+    def _on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在のプールの状態と累積カウンタを返します。
+
+        Returns
+        -------
+        Dict[str, Any]
+            チェックアウト中・アイドル接続数、オーバーフロー数、待ち時間などの辞書
+        """
+        status: Dict[str, Any] = {"name": self.name}
+        pool = self._engine.pool if self._engine is not None else None
+        if pool is not None and hasattr(pool, "checkedout"):
+            status.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+                timeout_seconds=pool.timeout(),
+            )
+        with self._lock:
+            status.update(
+                connections_created_total=self.connections_created,
+                checkouts_total=self.checkouts,
+                checkins_total=self.checkins,
+                invalidations_total=self.invalidations,
+                timeouts_total=self.timeouts,
+                wait_seconds_total=round(self.wait_seconds_total, 6),
+                wait_seconds_max=round(self.wait_seconds_max, 6),
+                wait_seconds_avg=round(
+                    self.wait_seconds_total / self.wait_count, 6
+                ) if self.wait_count else 0.0,
+            )
+        return status
+
+
+class _WaitTimingPoolMixin:
+    """`Pool.connect` の所要時間を `pool_metrics` と処理中のリクエストの計測に記録するミックスインです。"""
+
+    pool_metrics: PoolMetrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            waited = time.perf_counter() - started
+            self.pool_metrics.record_wait(waited, timed_out=True)
+            record_pool_wait(waited)
+            raise
+        waited = time.perf_counter() - started
+        self.pool_metrics.record_wait(waited)
+        record_pool_wait(waited)
+        return connection
@@ -0,0 +1,317 @@
+"""
+リードレプリカへの読み取りの振り分け
+
+`DATABASE_REPLICA_URLS` にレプリカを指定すると、読み取り専用のエンドポイント（`get_read_db` を使用する
+エンドポイント）のセッションをレプリカに振り分けます。
+
+- レプリカは `round_robin`（順番）または `least_connections`（チェックアウト中の接続が最も少ないもの）で選択します。
+- 各レプリカの死活とレプリケーション遅延は `check_interval` 秒ごとに確認し、停止しているレプリカや
+  遅延が `max_lag` 秒を超えたレプリカは使用しません（使用できるレプリカがない場合はプライマリを使用します）。
+- セッションの作成時に接続を確認し、接続できない場合は次のレプリカ、最後にプライマリを使用します。
+- 書き込みに成功したクライアントには `READ_YOUR_WRITES_COOKIE` を付与し、その有効期間中の読み取りは
+  プライマリで行います（自身の書き込みがレプリカに反映される前の行を読まないようにするため）。
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.config import settings
+from ..core.instrumentation import instrument_engine
+from .models.database import POOL_OPTIONS, SessionLocal
+from .pool import PoolMetrics
+from .statement_cache import StatementCacheMetrics
+
+logger = logging.getLogger(__name__)
+
+# 書き込み後の読み取りをプライマリで行うためのクッキー
+READ_YOUR_WRITES_COOKIE = "db_read_primary"
+
+# レプリケーション遅延（秒）。WALの適用が追いついている場合（更新のないプライマリの待機中を含む）は0、
+# プライマリ（レプリカの代わりにプライマリを指定した場合）も0とする
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+class Replica:
+    """
+    1台のリードレプリカ
+
+    エンジンは `app.db.models.database.init_engines` と同様に、最初の使用時にプロセスごとに作成します。
+
+    Parameters
+    ----------
+    name : str
+        レプリカの識別名（例: "replica-1"）
+    url : str
+        接続URL
+    connect_timeout : int, optional
+        接続のタイムアウト（秒）, by default settings.db_replica_connect_timeout
+    """
+
+    def __init__(self, name: str, url: str, connect_timeout: int = settings.db_replica_connect_timeout):
+        self.name = name
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.pool_metrics = PoolMetrics(name)
+        self.statement_cache_metrics = StatementCacheMetrics(name)
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self.failures = 0
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, info={"replica": name})
+        self._engine: Optional[Engine] = None
+        self._engine_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        """現在のプロセスのエンジン"""
+        pid = os.getpid()
+        if self._engine is None or self._engine_pid != pid:
+            with self._lock:
+                if self._engine is None or self._engine_pid != pid:
+                    if self._engine is not None:
+                        self._engine.dispose(close=False)
+                    engine = create_engine(
+                        self.url,
+                        poolclass=self.pool_metrics.pool_class(QueuePool),
+                        connect_args={"connect_timeout": self.connect_timeout},
+                        execution_options={"compiled_cache": self.statement_cache_metrics.cache()},
+                        **POOL_OPTIONS
+                    )
+                    self.pool_metrics.attach(engine)
+                    instrument_engine(engine)
+                    self._engine, self._engine_pid = engine, pid
+        return self._engine
+
+    def usable(self, max_lag: float) -> bool:
+        """読み取りに使用できるかどうか（接続でき、遅延が `max_lag` 秒以下）"""
+        return self.healthy and self.lag is not None and self.lag <= max_lag
+
+    def checked_out(self) -> int:
+        """チェックアウト中の接続数"""
+        return self.engine.pool.checkedout()
+
+    def check(self) -> None:
+        """死活とレプリケーション遅延を確認します。"""
+        self.checked_at = time.monotonic()
+        try:
+            with self.engine.connect() as conn:
+                self.lag = float(conn.execute(LAG_QUERY).scalar_one())
+        except exc.DBAPIError as e:
+            self.mark_failed(e)
+            return
+        if not self.healthy:
+            logger.info("Read replica %s is back (lag %.3fs)", self.name, self.lag)
+        self.healthy = True
+
+    def mark_failed(self, error: Exception) -> None:
+        """接続できなかったレプリカを次の確認まで使用しないようにします。"""
+        if self.healthy:
+            logger.warning("Read replica %s is unavailable, reading from the primary: %s", self.name, error)
+        self.healthy = False
+        self.lag = None
+        self.failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """プールの状態と死活・遅延を返します。"""
+        status = self.pool_metrics.snapshot()
+        status.update(healthy=self.healthy, lag_seconds=self.lag, failures_total=self.failures)
+        return status
+
+
+class ReplicaRouter:
+    """
+    読み取りのセッションをレプリカ（またはプライマリ）に振り分けるクラスです。
+
+    Parameters
+    ----------
+    urls : Sequence[str]
+        レプリカの接続URL（空の場合は常にプライマリを使用する）
+    strategy : str, optional
+        レプリカの選択方法（"round_robin" または "least_connections"）, by default settings.db_replica_strategy
+    max_lag : float, optional
+        使用するレプリカの遅延の上限（秒）, by default settings.db_replica_max_lag
+    check_interval : float, optional
+        死活・遅延を確認する間隔（秒）, by default settings.db_replica_check_interval
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: str = settings.db_replica_strategy,
+        max_lag: float = settings.db_replica_max_lag,
+        check_interval: float = settings.db_replica_check_interval
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy!r} (expected one of {STRATEGIES})")
+        self.replicas: List[Replica] = [Replica(f"replica-{n}", url) for n, url in enumerate(urls, 1)]
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._check_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        """レプリカが設定されているかどうか"""
+        return bool(self.replicas)
+
+    def refresh(self) -> None:
+        """
+        確認から `check_interval` 秒以上経過したレプリカの死活・遅延を確認します。
+
+        確認はリクエストを処理するスレッドで行いますが、同時に確認するのは1つのスレッドのみで、
+        他のスレッドは前回の確認結果を使用します。
+        """
+        now = time.monotonic()
+        due = [replica for replica in self.replicas if now - replica.checked_at >= self.check_interval]
+        if not due or not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            for replica in due:
+                replica.check()
+        finally:
+            self._check_lock.release()
+
+    def choose(self) -> Optional[Replica]:
+        """
+        読み取りに使用するレプリカを選択します。
+
+        Returns
+        -------
+        Optional[Replica]
+            使用できるレプリカ、ない場合はNone（プライマリを使用する）
+        """
+        self.refresh()
+        candidates = [replica for replica in self.replicas if replica.usable(self.max_lag)]
+        if not candidates:
+            return None
+        if self.strategy == "least_connections":
+            return min(candidates, key=Replica.checked_out)
+        return candidates[next(self._counter) % len(candidates)]
+
+    def session(self, primary: bool = False) -> Session:
+        """
+        読み取り用のセッションを作成します。
+
+        レプリカのセッションは作成時に接続を確認し、接続できない場合は他のレプリカ、
+        最後にプライマリのセッションを返します。
+
+        Parameters
+        ----------
+        primary : bool, optional
+            プライマリを使用するかどうか（書き込み直後のクライアントなど）, by default False
+
+        Returns
+        -------
+        Session
+            データベースセッション（レプリカのセッションは `info["replica"]` にレプリカ名を持つ）
+        """
+        if not primary:
+            while (replica := self.choose()) is not None:
+                db = replica.session_factory(bind=replica.engine)
+                try:
+                    db.connection()
+                except exc.DBAPIError as e:
+                    db.close()
+                    replica.mark_failed(e)
+                    self._count("fallbacks")
+                    continue
+                self._count("replica_reads")
+                return db
+        self._count("primary_reads")
+        return SessionLocal()
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        振り分けの件数とレプリカごとの状態を返します。
+
+        Returns
+        -------
+        Dict[str, Any]
+            レプリカ・プライマリで行った読み取りの件数、フォールバックの件数、レプリカごとの状態
+        """
+        with self._stats_lock:
+            counts = {
+                "replica_reads_total": self.replica_reads,
+                "primary_reads_total": self.primary_reads,
+                "fallbacks_total": self.fallbacks,
+            }
+        return {
+            "strategy": self.strategy,
+            "max_lag_seconds": self.max_lag,
+            **counts,
+            "replicas": [replica.snapshot() for replica in self.replicas],
+        }
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_written(session: Session) -> None:
+    # プライマリのセッションでコミットしたこと（書き込み）を記録する（`get_db` が参照する）
+    session.info["written"] = True
+
+
+class ReadYourWritesMiddleware:
+    """
+    書き込みに成功したリクエストのレスポンスに `READ_YOUR_WRITES_COOKIE` を付与するASGIミドルウェアです。
+
+    `get_db` がコミットしたセッションを検知して `request.state.database_written` を設定し、
+    このミドルウェアがレスポンスの送信時にクッキーを付与します。
+
+    Parameters
+    ----------
+    app : ASGIApp
+        アプリケーション
+    seconds : int, optional
+        クッキーの有効期間（秒）, by default settings.db_read_your_writes_seconds
+    """
+
+    def __init__(self, app: ASGIApp, seconds: int = settings.db_read_your_writes_seconds):
+        self.app = app
+        self.cookie = (
+            f"{READ_YOUR_WRITES_COOKIE}=1; Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax"
+        ).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and scope.get("state", {}).get("database_written"):
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", self.cookie)]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _replica_urls(value: str) -> List[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+# アプリケーション全体で共有するルーター
+replica_router = ReplicaRouter(_replica_urls(settings.database_replica_urls))
@@ -0,0 +1,207 @@
+"""
+KPI測定値のロールアップ（1時間・1日・1か月ごとの集計）の差分更新
+
+前回の更新（ウォーターマーク）以降に取り込まれた測定値を `ingested_at` のBRINインデックスで探し、
+それらが属する期間（バケット）のみを再集計します。1時間ごとのロールアップは測定値から、
+1日ごとは1時間ごとのロールアップから、1か月ごとは1日ごとのロールアップから集計するため、
+1回の更新で読み込む行数は変更のあった期間の量に比例し、蓄積された測定値の総量には依存しません。
+
+ワーカーとして常駐させる場合（backend ディレクトリで実行）::
+
+    python -m app.db.rollups --interval 60
+
+1回だけ更新する場合は `--once`、全期間を集計し直す場合は `--rebuild` を指定します。
+保持期間を過ぎて削除された測定値のパーティションに対応するロールアップは削除されません。
+"""
+import argparse
+import logging
+import time
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import column, func, literal_column, select, table, text, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from .models.kpi_measurement import KpiMeasurement
+from .models.kpi_rollup import KpiRollupDaily, KpiRollupHourly, KpiRollupMonthly, KpiRollupWatermark
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "kpi_rollups"
+TOUCHED_TABLE = "kpi_rollups_touched"
+
+# 粒度とロールアップの対応（細かい順。各粒度は1つ前の粒度から集計する）
+ROLLUPS = {
+    "hour": KpiRollupHourly,
+    "day": KpiRollupDaily,
+    "month": KpiRollupMonthly,
+}
+
+# ロールアップの集計値の列
+ROLLUP_COLUMNS = ("count", "sum", "min", "max")
+
+_touched = table(TOUCHED_TABLE, column("item_id"), column("bucket"))
+
+
+def _aggregate_source(source):
+    """集計元の `(アイテムID, 日時, 件数, 合計, 最小値, 最大値)` の列を返します。"""
+    if source is KpiMeasurement:
+        value = KpiMeasurement.value
+        return (
+            KpiMeasurement.item_id, KpiMeasurement.measured_at,
+            func.count(value), func.sum(value), func.min(value), func.max(value),
+        )
+    return (
+        source.item_id, source.bucket,
+        func.sum(source.count), func.sum(source.sum), func.min(source.min), func.max(source.max),
+    )
+
+
+def refresh_rollups(
+    db: Session,
+    overlap_seconds: int = settings.rollup_refresh_overlap_seconds,
+    rebuild: bool = False
+) -> Dict[str, int]:
+    """
+    前回の更新以降に取り込まれた測定値が属する期間のロールアップを集計し直します。
+
+    更新は1つのトランザクションで行い、アドバイザリロックにより複数のワーカーが
+    同時に実行しても順番に処理されます。時・日・月の区切りはUTCで計算します。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    overlap_seconds : int, optional
+        前回のウォーターマークより遡って確認する秒数（前回の更新中にコミットされた
+        取り込みを含めるため）, by default settings.rollup_refresh_overlap_seconds
+    rebuild : bool, optional
+        Trueの場合は全ての測定値から集計し直す, by default False
+
+    Returns
+    -------
+    Dict[str, int]
+        粒度（"hour"、"day"、"month"）ごとの更新した行数
+    """
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(WATERMARK_NAME))))
+    db.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+    refreshed_at = db.execute(select(func.now())).scalar_one()
+    watermark = None if rebuild else db.execute(
+        select(KpiRollupWatermark.watermark).where(KpiRollupWatermark.name == WATERMARK_NAME)
+    ).scalar_one_or_none()
+
+    if watermark is not None:
+        # 変更のあったアイテムと時間帯を一時テーブルに集める
+        db.execute(text(
+            f"CREATE TEMP TABLE {TOUCHED_TABLE} (item_id UUID NOT NULL, bucket TIMESTAMPTZ NOT NULL) ON COMMIT DROP"
+        ))
+        changed = select(
+            KpiMeasurement.item_id, func.date_trunc("hour", KpiMeasurement.measured_at)
+        ).distinct().where(KpiMeasurement.ingested_at > watermark - timedelta(seconds=overlap_seconds))
+        db.execute(_touched.insert().from_select(["item_id", "bucket"], changed))
+        db.execute(text(f"ANALYZE {TOUCHED_TABLE}"))
+
+    counts = {}
+    source = KpiMeasurement
+    for granularity, model in ROLLUPS.items():
+        item_id, measured_at, *aggregates = _aggregate_source(source)
+        if watermark is None:
+            # 初回・全体の再集計では全ての行を集計する
+            bucket = func.date_trunc(granularity, measured_at)
+            rows = select(item_id, bucket, *aggregates).group_by(item_id, bucket)
+        else:
+            # 変更のあった期間ごとに、集計元の主キーのインデックスで範囲を読み込んで集計する
+            buckets = select(
+                _touched.c.item_id, func.date_trunc(granularity, _touched.c.bucket).label("bucket")
+            ).distinct().subquery()
+            aggregated = (
+                select(*(aggregate.label(name) for aggregate, name in zip(aggregates, ROLLUP_COLUMNS)))
+                .where(
+                    item_id == buckets.c.item_id,
+                    measured_at >= buckets.c.bucket,
+                    measured_at < buckets.c.bucket + literal_column(f"INTERVAL '1 {granularity}'"),
+                )
+                .having(func.count() > 0)
+                .lateral()
+            )
+            rows = select(buckets.c.item_id, buckets.c.bucket, *aggregated.c).join_from(buckets, aggregated, true())
+        stmt = insert(model).from_select(["item_id", "bucket", *ROLLUP_COLUMNS], rows)
+        result = db.execute(stmt.on_conflict_do_update(
+            index_elements=[model.item_id, model.bucket],
+            set_={name: stmt.excluded[name] for name in ROLLUP_COLUMNS},
+        ))
+        counts[granularity] = result.rowcount
+        source = model
+
+    stmt = insert(KpiRollupWatermark).values(name=WATERMARK_NAME, watermark=refreshed_at)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[KpiRollupWatermark.name],
+        set_={"watermark": stmt.excluded.watermark},
+    ))
+    db.commit()
+    return counts
+
+
+def run_worker(
+    session_factory: Callable[[], Session],
+    interval: float = settings.rollup_refresh_interval,
+    overlap_seconds: int = settings.rollup_refresh_overlap_seconds
+) -> None:
+    """
+    `interval` 秒ごとにロールアップを差分更新し続けます。
+
+    更新に失敗した場合はログに記録し、次の周期で再試行します（ウォーターマークは
+    更新されないため、失敗した周期の測定値も次の周期で集計されます）。
+
+    Parameters
+    ----------
+    session_factory : Callable[[], Session]
+        データベースセッションを作成する関数
+    interval : float, optional
+        更新の間隔（秒）, by default settings.rollup_refresh_interval
+    overlap_seconds : int, optional
+        前回のウォーターマークより遡って確認する秒数, by default settings.rollup_refresh_overlap_seconds
+    """
+    while True:
+        started = time.monotonic()
+        try:
+            with session_factory() as db:
+                counts = refresh_rollups(db, overlap_seconds=overlap_seconds)
+            logger.info(
+                "Refreshed KPI rollups in %.3fs: %s", time.monotonic() - started,
+                ", ".join(f"{granularity}={count}" for granularity, count in counts.items())
+            )
+        except SQLAlchemyError:
+            logger.exception("KPI rollup refresh failed")
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """コマンドラインからロールアップを更新します。"""
+    from .models.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Refresh hourly, daily and monthly KPI rollups")
+    parser.add_argument("--interval", type=float, default=settings.rollup_refresh_interval,
+                        help="更新の間隔（秒）")
+    parser.add_argument("--once", action="store_true", help="1回だけ更新して終了する")
+    parser.add_argument("--rebuild", action="store_true", help="全ての測定値から集計し直して終了する")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not (args.once or args.rebuild):
+        run_worker(SessionLocal, interval=args.interval)
+        return
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = refresh_rollups(db, rebuild=args.rebuild)
+    for granularity, count in counts.items():
+        print(f"{granularity}: {count} rows")
+    print(f"refreshed in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
 
@@ -68,3 +68,99 @@ class Item(ItemBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ItemSearchResult(Item):
+    """
+    検索結果の1行分のモデル
+
+    Attributes
+    ----------
+    rank : float
+        全文検索のスコアと名前の類似度の合計（大きいほど一致度が高い）
+    """
+    rank: float
+
+
+class ItemBulkUpdate(ItemUpdate):
+    """
+    一括更新時の1行分のモデル
+
+    Attributes
+    ----------
+    id : UUID
+        更新するアイテムのID
+    """
+    id: UUID
+
+
+class ItemBulkDelete(BaseModel):
+    """
+    一括削除時のモデル
+
+    Attributes
+    ----------
+    ids : List[UUID]
+        削除するアイテムのIDのリスト
+    """
+    ids: List[UUID]
+
+
+class ItemBulkResult(BaseModel):
+    """
+    一括更新・一括削除の1行分の結果
+
+    Attributes
+    ----------
+    id : UUID
+        対象のアイテムのID
+    status : Literal["updated", "deleted", "not_found"]
+        処理結果
+    item : Optional[Item]
+        更新後のアイテム（更新に成功した場合のみ）
+    """
+    id: UUID
+    status: Literal["updated", "deleted", "not_found"]
+    item: Optional[Item] = None
+
+
+class ItemImportError(BaseModel):
+    """
+    インポート時に取り込めなかった行の情報
+
+    Attributes
+    ----------
+    line : int
+        入力ファイル上の行番号
+    error : str
+        取り込めなかった理由
+    """
+    line: int
+    error: str
+
+
+class ItemImportResult(BaseModel):
+    """
+    アイテムのインポート結果
+
+    Attributes
+    ----------
+    total_rows : int
+        読み込んだ行数
+    imported_rows : int
+        取り込んだ行数
+    rejected_rows : int
+        検証エラーなどで取り込めなかった行数
+    elapsed_seconds : float
+        処理時間（秒）
+    rows_per_second : float
+        1秒あたりの読み込み行数
+    errors : List[ItemImportError]
+        取り込めなかった行の情報（先頭から最大 `IMPORT_MAX_REPORTED_ERRORS` 件）
+    """
+    total_rows: int = 0
+    imported_rows: int = 0
+    rejected_rows: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    errors: List[ItemImportError] = []
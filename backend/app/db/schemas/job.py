@@ -0,0 +1,57 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+
+class Job(BaseModel):
+    """
+    バックグラウンドジョブの状態
+
+    Attributes
+    ----------
+    id : str
+        ジョブのID
+    type : str
+        ジョブの種類（"items.import"、"items.export"、"kpi.rollups.refresh"）
+    params : Dict[str, Any]
+        ジョブのパラメータ
+    status : Literal["queued", "running", "retrying", "succeeded", "failed", "cancelled"]
+        ジョブの状態
+    progress : float
+        進捗（0〜1）
+    message : Optional[str]
+        進捗のメッセージ
+    attempts : int
+        実行回数
+    max_attempts : int
+        最大実行回数（初回を含む）
+    cancel_requested : bool
+        キャンセルが要求されているかどうか
+    created_at : datetime
+        登録日時
+    started_at : Optional[datetime]
+        最後に実行を開始した日時
+    finished_at : Optional[datetime]
+        完了日時
+    next_attempt_at : Optional[datetime]
+        次のリトライの予定日時
+    error : Optional[str]
+        最後に発生したエラー
+    result : Optional[Any]
+        ジョブの結果（成功した場合のみ）
+    """
+    id: str
+    type: str
+    params: Dict[str, Any]
+    status: Literal["queued", "running", "retrying", "succeeded", "failed", "cancelled"]
+    progress: float
+    message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Any] = None
@@ -0,0 +1,163 @@
+from pydantic import AwareDatetime, BaseModel, Field
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+
+class KpiAnalyticsOptions(BaseModel):
+    """
+    KPI分析の条件
+
+    Attributes
+    ----------
+    start : AwareDatetime
+        期間の開始日時（この日時を含む）
+    end : AwareDatetime
+        期間の終了日時（この日時を含まない）
+    bucket : Optional[Literal["hour", "day", "month"]]
+        指定した場合は測定値の代わりにロールアップの平均値の時系列を分析する
+    window : int
+        移動平均・zスコアの幅（値の個数）
+    periods : int
+        前期比で比較する値の間隔（値の個数）
+    z_threshold : float
+        異常値とみなすzスコアの絶対値
+    target : Optional[float]
+        目標値（指定した場合は達成率を計算する）
+    include_series : bool
+        派生指標の時系列を結果に含めるかどうか
+    """
+    start: AwareDatetime
+    end: AwareDatetime
+    bucket: Optional[Literal["hour", "day", "month"]] = None
+    window: int = Field(7, ge=2, le=10000)
+    periods: int = Field(1, ge=1, le=10000)
+    z_threshold: float = Field(3.0, gt=0)
+    target: Optional[float] = Field(None, allow_inf_nan=False)
+    include_series: bool = False
+
+
+class KpiAnalyticsBatchRequest(KpiAnalyticsOptions):
+    """
+    複数アイテムのKPI分析のリクエスト
+
+    Attributes
+    ----------
+    item_ids : List[UUID]
+        分析するアイテムのIDのリスト
+    """
+    item_ids: List[UUID] = Field(..., min_length=1)
+
+
+class KpiAnomaly(BaseModel):
+    """
+    異常値
+
+    Attributes
+    ----------
+    timestamp : datetime
+        日時
+    value : float
+        値
+    zscore : float
+        直前の期間に対するzスコア
+    """
+    timestamp: datetime
+    value: float
+    zscore: float
+
+
+class KpiAnalyticsSeries(BaseModel):
+    """
+    派生指標の時系列（列ごとの配列。計算できない位置は null）
+
+    Attributes
+    ----------
+    timestamps : List[datetime]
+        日時
+    values : List[float]
+        値
+    change : List[Optional[float]]
+        前期比の変化量
+    change_ratio : List[Optional[float]]
+        前期比の変化率
+    moving_average : List[Optional[float]]
+        移動平均
+    zscore : List[Optional[float]]
+        直前の期間に対するzスコア
+    """
+    timestamps: List[datetime]
+    values: List[float]
+    change: List[Optional[float]]
+    change_ratio: List[Optional[float]]
+    moving_average: List[Optional[float]]
+    zscore: List[Optional[float]]
+
+
+class KpiAnalytics(BaseModel):
+    """
+    KPI分析の結果（測定値がない場合、統計量・派生指標は null）
+
+    Attributes
+    ----------
+    item_id : UUID
+        アイテムのID
+    points : int
+        分析した値の件数
+    start : Optional[datetime]
+        最初の値の日時
+    end : Optional[datetime]
+        最後の値の日時
+    last : Optional[float]
+        最新の値
+    mean : Optional[float]
+        平均
+    min : Optional[float]
+        最小値
+    max : Optional[float]
+        最大値
+    std : Optional[float]
+        標準偏差
+    change : Optional[float]
+        最新の値の前期比の変化量
+    change_ratio : Optional[float]
+        最新の値の前期比の変化率
+    moving_average : Optional[float]
+        最新の移動平均
+    zscore : Optional[float]
+        最新の値のzスコア
+    anomaly_count : int
+        異常値の件数
+    anomalies : List[KpiAnomaly]
+        異常値（新しい順、最大100件）
+    target : Optional[float]
+        目標値
+    attainment : Optional[float]
+        平均の目標達成率（平均÷目標値）
+    last_attainment : Optional[float]
+        最新の値の目標達成率
+    target_hit_ratio : Optional[float]
+        目標値以上の値の割合
+    series : Optional[KpiAnalyticsSeries]
+        派生指標の時系列（`include_series` を指定した場合のみ）
+    """
+    item_id: UUID
+    points: int
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    last: Optional[float] = None
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    std: Optional[float] = None
+    change: Optional[float] = None
+    change_ratio: Optional[float] = None
+    moving_average: Optional[float] = None
+    zscore: Optional[float] = None
+    anomaly_count: int = 0
+    anomalies: List[KpiAnomaly] = []
+    target: Optional[float] = None
+    attainment: Optional[float] = None
+    last_attainment: Optional[float] = None
+    target_hit_ratio: Optional[float] = None
+    series: Optional[KpiAnalyticsSeries] = None
@@ -0,0 +1,81 @@
+from pydantic import AwareDatetime, BaseModel, Field
+from datetime import datetime
+from uuid import UUID
+
+
+class KpiMeasurementCreate(BaseModel):
+    """
+    測定値の取り込み時のモデル
+
+    Attributes
+    ----------
+    item_id : UUID
+        測定対象のアイテムのID
+    measured_at : AwareDatetime
+        測定日時（タイムゾーン付き）
+    value : float
+        測定値（NaN・無限大は不可）
+    """
+    item_id: UUID
+    measured_at: AwareDatetime
+    value: float = Field(..., allow_inf_nan=False)
+
+
+class KpiMeasurement(BaseModel):
+    """
+    測定値の取得時のモデル
+
+    Attributes
+    ----------
+    measured_at : datetime
+        測定日時
+    value : float
+        測定値
+    """
+    measured_at: datetime
+    value: float
+
+
+class KpiMeasurementIngestResult(BaseModel):
+    """
+    測定値の取り込み結果
+
+    Attributes
+    ----------
+    received : int
+        受け取った測定値の件数
+    stored : int
+        保存した測定値の件数（同じアイテム・日時の重複を除いた件数）
+    elapsed_seconds : float
+        処理時間（秒）
+    """
+    received: int
+    stored: int
+    elapsed_seconds: float
+
+
+class KpiAggregate(BaseModel):
+    """
+    測定値の集計結果（集計単位ごと）
+
+    Attributes
+    ----------
+    bucket : datetime
+        集計単位の開始日時（UTC）
+    count : int
+        測定値の件数
+    sum : float
+        測定値の合計
+    avg : float
+        測定値の平均
+    min : float
+        測定値の最小値
+    max : float
+        測定値の最大値
+    """
+    bucket: datetime
+    count: int
+    sum: float
+    avg: float
+    min: float
+    max: float
@@ -0,0 +1,90 @@
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy.util import LRUCache
+
+from ..core.config import settings
+
+
+class StatementCacheMetrics:
+    """
+    コンパイル済みSQLのキャッシュ（SQLAlchemy の compiled cache）のヒット率を集計するクラスです。
+
+    `cache` で生成したキャッシュを `create_engine` の `execution_options={"compiled_cache": ...}` に
+    指定すると、SQLの実行ごとのキャッシュの参照をヒット・ミスとして数えます。イベントリスナーを使用しないため、
+    SQLの実行ごとのオーバーヘッドは辞書の参照1回分です。キャッシュキーを生成できないSQL
+    （`ON CONFLICT` 付きの INSERT など）はキャッシュを参照しないため、集計に含まれません。
+
+    Attributes
+    ----------
+    name : str
+        メトリクスの識別名（例: "primary"）
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._cache: Optional["_CountingLRUCache"] = None
+        self.hits = 0
+        self.misses = 0
+
+    def cache(self, size: int = settings.db_statement_cache_size) -> LRUCache:
+        """
+        ヒット・ミスを数えるキャッシュを生成します。
+
+        エンジンを作成し直した場合（fork 後のワーカーなど）は新しいキャッシュを使用し、カウンタは累積します。
+
+        Parameters
+        ----------
+        size : int, optional
+            保持するコンパイル済みSQLの件数, by default settings.db_statement_cache_size
+
+        Returns
+        -------
+        LRUCache
+            `compiled_cache` に指定するキャッシュ
+        """
+        self._cache = _CountingLRUCache(self, size)
+        return self._cache
+
+    def record(self, hit: bool) -> None:
+        """キャッシュの参照1回分を記録します。"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在のキャッシュの件数と累積カウンタを返します。
+
+        Returns
+        -------
+        Dict[str, Any]
+            キャッシュの件数・上限、ヒット・ミス数、ヒット率の辞書
+        """
+        cache = self._cache
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(cache) if cache is not None else 0,
+                "capacity": cache.capacity if cache is not None else 0,
+                "hits_total": self.hits,
+                "misses_total": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class _CountingLRUCache(LRUCache):
+    """参照ごとにヒット・ミスを `StatementCacheMetrics` に記録する `LRUCache` です。"""
+
+    def __init__(self, metrics: StatementCacheMetrics, capacity: int):
+        super().__init__(capacity)
+        self._metrics = metrics
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = super().get(key)
+        self._metrics.record(value is not None)
+        return default if value is None else value
@@ -0,0 +1,102 @@
+"""
+アイテムのストリーミングエクスポート
+
+`items` テーブルをサーバーサイドカーソルで一定件数ずつ読み込み、NDJSON / CSV に
+エンコードしながら返します。保持するのは1バッチ分の行だけなので、件数に関係なく
+最初のバイトまでの時間とメモリ使用量は一定です。
+"""
+import csv
+import io
+from typing import Callable, Iterable, Iterator, List, Literal
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..core.serialization import dump_rows_ndjson
+from ..db.crud import item as crud
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_COLUMNS = ("id", "name", "description", "created_at", "updated_at")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def encode_ndjson(partitions: Iterable[List[Row]]) -> Iterator[bytes]:
+    """
+    行のまとまりを1行1JSONのバイト列に変換します。
+
+    Parameters
+    ----------
+    partitions : Iterable[List[Row]]
+        `(name, description, id, created_at, updated_at)` の行のまとまり
+
+    Yields
+    ------
+    bytes
+        まとまりごとのNDJSON
+    """
+    for rows in partitions:
+        yield dump_rows_ndjson(rows)
+
+
+def encode_csv(partitions: Iterable[List[Row]]) -> Iterator[bytes]:
+    """
+    行のまとまりをヘッダー付きCSVのバイト列に変換します。
+
+    Parameters
+    ----------
+    partitions : Iterable[List[Row]]
+        `(name, description, id, created_at, updated_at)` の行のまとまり
+
+    Yields
+    ------
+    bytes
+        ヘッダー行、およびまとまりごとのCSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode()
+
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            (row.id, row.name, row.description, row.created_at.isoformat(), row.updated_at.isoformat())
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+
+
+def stream_items(
+    session_factory: Callable[[], Session],
+    format: ExportFormat,
+    batch_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    全アイテムを指定された形式で少しずつエンコードして返します。
+
+    レスポンスの送信中もカーソルを保持する必要があるため、リクエストの依存関係とは
+    別に専用のセッションを開き、送信完了（またはクライアントの切断）時に閉じます。
+
+    Parameters
+    ----------
+    session_factory : Callable[[], Session]
+        セッションファクトリ
+    format : ExportFormat
+        出力形式（"ndjson" または "csv"）
+    batch_size : int, optional
+        1回に取得・エンコードする行数, by default 1000
+
+    Yields
+    ------
+    bytes
+        エンコード済みのチャンク
+    """
+    encode = encode_csv if format == "csv" else encode_ndjson
+    with session_factory() as db:
+        yield from encode(crud.iter_item_rows(db, batch_size=batch_size))
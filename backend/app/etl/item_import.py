@@ -0,0 +1,228 @@
+"""
+アイテムのストリーミングインポート
+
+CSV / NDJSON を1行ずつ読み込み、`ItemCreate` で検証した行を一定件数ごとに
+PostgreSQL の `COPY FROM STDIN` で一時テーブルへ送り、`INSERT ... SELECT` で
+`items` テーブルへ取り込みます。保持するのは1バッチ分の行だけなので、
+ファイルサイズに関係なくメモリ使用量は一定です。
+
+コマンドラインからの実行方法（backend ディレクトリで実行）::
+
+    python -m app.etl.item_import items.csv --format csv --errors rejected.ndjson
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Literal, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.schemas.item import ItemCreate, ItemImportError, ItemImportResult
+
+ImportFormat = Literal["csv", "ndjson"]
+
+STAGING_TABLE = "items_import_staging"
+
+
+def iter_records(stream: TextIO, format: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    """
+    入力ストリームから `(行番号, レコード)` を1件ずつ読み込みます。
+
+    JSONとして解析できない行は、レコードの代わりに例外オブジェクトを返します。
+
+    Parameters
+    ----------
+    stream : TextIO
+        入力ストリーム（CSVの場合は `newline=""` で開いたもの）
+    format : ImportFormat
+        入力形式（"csv" または "ndjson"）
+
+    Yields
+    ------
+    Tuple[int, Any]
+        行番号とレコード（辞書）、または解析エラー
+    """
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # 空欄・欠落した列は未指定（NULL）として扱い、ヘッダーにない余分な列は無視する
+            yield reader.line_num, {
+                k: v for k, v in record.items() if k is not None and v not in ("", None)
+            }
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+def _copy_escape(value: Optional[str]) -> str:
+    """COPY の text 形式に合わせて値をエスケープします。"""
+    if value is None:
+        return "\\N"
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in e['loc']) or 'row'}: {e['msg']}"
+            for e in error.errors()
+        )
+    return str(error)
+
+
+def import_items(
+    db: Session,
+    stream: TextIO,
+    format: ImportFormat,
+    batch_size: int = settings.import_batch_size,
+    max_reported_errors: int = settings.import_max_reported_errors,
+    on_error: Optional[Callable[[ItemImportError], None]] = None,
+    on_progress: Optional[Callable[[ItemImportResult], None]] = None,
+) -> ItemImportResult:
+    """
+    CSV / NDJSON のストリームからアイテムを一括で取り込みます。
+
+    有効な行は全て1つのトランザクションで取り込まれます。検証に失敗した行は
+    スキップされ、`on_error` と結果の `errors` に報告されます。
+
+    Parameters
+    ----------
+    db : Session
+        データベースセッション
+    stream : TextIO
+        入力ストリーム
+    format : ImportFormat
+        入力形式（"csv" または "ndjson"）
+    batch_size : int, optional
+        1回のCOPYで送信する最大行数, by default settings.import_batch_size
+    max_reported_errors : int, optional
+        結果の `errors` に含めるエラー行の最大件数, by default settings.import_max_reported_errors
+    on_error : Optional[Callable[[ItemImportError], None]], optional
+        エラー行ごとに呼び出される関数（エラーレポートの書き出し用）, by default None
+    on_progress : Optional[Callable[[ItemImportResult], None]], optional
+        バッチごとに途中までの結果を渡して呼び出される関数（進捗の報告用。例外を送出すると
+        コミットせずに中断する）, by default None
+
+    Returns
+    -------
+    ItemImportResult
+        取り込み件数、エラー件数、スループットなどの結果
+    """
+    result = ItemImportResult()
+    started = time.perf_counter()
+
+    cursor = db.connection().connection.cursor()
+    cursor.execute(
+        f"CREATE TEMP TABLE {STAGING_TABLE} "
+        "(name varchar(255) NOT NULL, description text) ON COMMIT DROP"
+    )
+
+    def reject(line: int, error: Exception) -> None:
+        report = ItemImportError(line=line, error=_error_message(error))
+        result.rejected_rows += 1
+        if len(result.errors) < max_reported_errors:
+            result.errors.append(report)
+        if on_error is not None:
+            on_error(report)
+
+    records = iter_records(stream, format)
+    buffer = io.StringIO()
+    while True:
+        batch: List[Tuple[int, Any]] = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        buffer.seek(0)
+        buffer.truncate()
+        valid_rows = 0
+        for line, record in batch:
+            result.total_rows += 1
+            if isinstance(record, Exception):
+                reject(line, record)
+                continue
+            try:
+                item = ItemCreate.model_validate(record)
+            except ValidationError as e:
+                reject(line, e)
+                continue
+            buffer.write(f"{_copy_escape(item.name)}\t{_copy_escape(item.description)}\n")
+            valid_rows += 1
+
+        if valid_rows:
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {STAGING_TABLE} (name, description) FROM STDIN", buffer)
+            cursor.execute(
+                f"INSERT INTO items (name, description) SELECT name, description FROM {STAGING_TABLE}"
+            )
+            result.imported_rows += cursor.rowcount
+            cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+
+        if on_progress is not None:
+            on_progress(result)
+
+    db.commit()
+
+    result.elapsed_seconds = round(time.perf_counter() - started, 6)
+    if result.elapsed_seconds:
+        result.rows_per_second = round(result.total_rows / result.elapsed_seconds, 1)
+    return result
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """コマンドラインからファイルをインポートします。"""
+    from ..db.models.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Import items from a CSV or NDJSON file")
+    parser.add_argument("path", help="入力ファイルのパス（'-' で標準入力）")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    parser.add_argument("--errors", help="エラー行をNDJSONで書き出すファイルのパス")
+    args = parser.parse_args(argv)
+
+    stream = (
+        io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        if args.path == "-"
+        else open(args.path, encoding="utf-8-sig", newline="")
+    )
+    error_file = open(args.errors, "w", encoding="utf-8") if args.errors else None
+    on_error = (lambda report: error_file.write(report.model_dump_json() + "\n")) if error_file else None
+
+    try:
+        with SessionLocal() as db:
+            result = import_items(
+                db, stream, args.format,
+                batch_size=args.batch_size,
+                max_reported_errors=0,
+                on_error=on_error,
+            )
+    finally:
+        stream.close()
+        if error_file is not None:
+            error_file.close()
+
+    print(
+        f"imported {result.imported_rows} / {result.total_rows} rows "
+        f"({result.rejected_rows} rejected) in {result.elapsed_seconds:.2f}s "
+        f"- {result.rows_per_second:.1f} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+アイテムの変更フィード
+
+`items` テーブルのトリガーが `items_changes` チャンネルに NOTIFY した変更を、プロセスごとに1本の
+asyncpg 接続で LISTEN し、購読者（SSE / WebSocket の接続）に配信します。
+
+- 通知のペイロード（JSON）は変換せずにそのまま配信し、SSEのフレームも通知ごとに1回だけ組み立てて
+  全ての購読者で共有します。
+- 購読者はアイテムのIDごとに索引付けしているため、1件の変更の配信にかかる時間は
+  購読者の総数ではなく、その変更を受け取る購読者の数に比例します。
+- 購読者ごとのキューは `queue_size` 件までで、受信が追いつかない購読者は溜まった変更を破棄して
+  `resync`（一覧を取得し直す必要があること）を受け取ります。配信が遅い購読者を待つことはありません。
+- 待機中の購読者はキューを待つだけで、接続ごとのタイマーは持ちません（ハートビートは
+  フィード全体で `heartbeat_interval` 秒ごとに、配信待ちの変更がない購読者へ送ります）。
+"""
+import asyncio
+import logging
+from collections import deque
+from itertools import chain
+from typing import AbstractSet, Deque, Dict, FrozenSet, Iterable, NamedTuple, Optional, Set
+
+import asyncpg
+import orjson
+
+from ..core.config import settings
+from ..db.models.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "items_changes"
+
+# 変更の種類（件数の多い変更は `id` を含まない1件の通知にまとめられる）
+OPERATIONS = frozenset({"insert", "update", "delete"})
+
+
+class ItemChange(NamedTuple):
+    """
+    購読者に配信する変更
+
+    Attributes
+    ----------
+    event : str
+        イベントの種類（"insert"、"update"、"delete"、"resync"、"ping"）
+    data : str
+        イベントのJSON（WebSocketではこのまま送信する）
+    sse : bytes
+        Server-Sent Events のフレーム
+    """
+    event: str
+    data: str
+    sse: bytes
+
+
+def _change(event: str, data: str) -> ItemChange:
+    return ItemChange(event, data, f"event: {event}\ndata: {data}\n\n".encode())
+
+
+# 変更を取りこぼした可能性がある（購読者のキューが溢れた・LISTEN の接続が切れた）ことを示すイベント
+RESYNC = _change("resync", '{"op": "resync"}')
+# 接続の維持と切断の検知のためのイベント（SSEではコメント行として送る）
+PING = ItemChange("ping", '{"op": "ping"}', b": ping\n\n")
+# フィードの停止を示すイベント（受け取った購読者は配信を終了する）
+CLOSED = ItemChange("closed", '{"op": "closed"}', b"")
+
+
+class FeedFull(Exception):
+    """購読者数が上限に達していることを示す例外です。"""
+
+
+class Subscription:
+    """
+    1つの接続の購読
+
+    待機中の購読は1つの Future のみを保持し、配信待ちの変更がある間だけキューを作成します
+    （`asyncio.Queue` は内部に4つの deque を持ち、待機中の接続1本あたり約3KBを使用するため）。
+
+    Parameters
+    ----------
+    item_ids : Optional[FrozenSet[str]]
+        受け取るアイテムのID（Noneの場合は全てのアイテム）
+    operations : FrozenSet[str]
+        受け取る変更の種類
+    queue_size : int
+        配信待ちの変更の最大件数
+    """
+    __slots__ = ("item_ids", "operations", "queue_size", "pending", "waiter", "dropped")
+
+    def __init__(self, item_ids: Optional[FrozenSet[str]], operations: FrozenSet[str], queue_size: int):
+        self.item_ids = item_ids
+        self.operations = operations
+        self.queue_size = queue_size
+        self.pending: Optional[Deque[ItemChange]] = None
+        self.waiter: Optional[asyncio.Future] = None
+        self.dropped = 0
+
+    @property
+    def idle(self) -> bool:
+        """配信待ちの変更がないかどうか"""
+        return not self.pending
+
+    def deliver(self, change: ItemChange) -> None:
+        """
+        変更を配信します。配信待ちの変更が `queue_size` 件に達している場合は溜まった変更を破棄し、
+        `RESYNC` に置き換えます。
+        """
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(change)
+            self.waiter = None
+            return
+        if self.pending is None:
+            self.pending = deque()
+        elif len(self.pending) >= self.queue_size:
+            self.dropped += len(self.pending)
+            self.pending.clear()
+            change = RESYNC
+        self.pending.append(change)
+
+    def close(self) -> None:
+        """配信待ちの変更を破棄し、`CLOSED` を配信します（受け取った側は配信を終了します）。"""
+        self.pending = None
+        self.deliver(CLOSED)
+
+    async def get(self) -> ItemChange:
+        """次の変更を待って返します。"""
+        if self.pending:
+            change = self.pending.popleft()
+            if not self.pending:
+                self.pending = None
+            return change
+        self.waiter = asyncio.get_running_loop().create_future()
+        try:
+            return await self.waiter
+        finally:
+            self.waiter = None
+
+
+class ItemChangeFeed:
+    """
+    アイテムの変更を LISTEN して購読者に配信するフィードです。
+
+    LISTEN の接続は最初の購読時に開始し、切断された場合は `reconnect_interval` 秒後に
+    再接続します（切断中の変更は配信されないため、再接続時に全購読者へ `resync` を送ります）。
+
+    Parameters
+    ----------
+    dsn : str
+        データベースの接続文字列
+    queue_size : int, optional
+        購読者ごとの配信待ちの変更の最大件数, by default settings.item_stream_queue_size
+    max_subscribers : int, optional
+        購読者数の上限, by default settings.item_stream_max_subscribers
+    heartbeat_interval : float, optional
+        ハートビートを送る間隔（秒）, by default settings.item_stream_heartbeat_interval
+    reconnect_interval : float, optional
+        LISTEN の接続が切れた場合に再接続するまでの秒数, by default 5.0
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        queue_size: int = settings.item_stream_queue_size,
+        max_subscribers: int = settings.item_stream_max_subscribers,
+        heartbeat_interval: float = settings.item_stream_heartbeat_interval,
+        reconnect_interval: float = 5.0
+    ):
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_interval = heartbeat_interval
+        self.reconnect_interval = reconnect_interval
+        self._subscribers: Set[Subscription] = set()
+        self._all_items: Set[Subscription] = set()
+        self._by_item: Dict[str, Set[Subscription]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._listening: Optional[asyncio.Event] = None
+        self.notifications = 0
+        self.reconnects = 0
+
+    async def subscribe(
+        self,
+        item_ids: Optional[AbstractSet[str]] = None,
+        operations: AbstractSet[str] = OPERATIONS
+    ) -> Subscription:
+        """
+        変更の購読を開始します。
+
+        Parameters
+        ----------
+        item_ids : Optional[AbstractSet[str]], optional
+            受け取るアイテムのID（Noneの場合は全てのアイテム）, by default None
+        operations : AbstractSet[str], optional
+            受け取る変更の種類, by default OPERATIONS
+
+        Returns
+        -------
+        Subscription
+            購読（`get` で変更を受け取り、終了時に `unsubscribe` に渡す）
+
+        Raises
+        ------
+        FeedFull
+            購読者数が上限に達している場合
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise FeedFull()
+        await self._start()
+
+        subscription = Subscription(
+            frozenset(item_ids) if item_ids is not None else None,
+            frozenset(operations),
+            self.queue_size,
+        )
+        self._subscribers.add(subscription)
+        if subscription.item_ids is None:
+            self._all_items.add(subscription)
+        else:
+            for item_id in subscription.item_ids:
+                self._by_item.setdefault(item_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """購読を終了します。"""
+        self._subscribers.discard(subscription)
+        self._all_items.discard(subscription)
+        for item_id in subscription.item_ids or ():
+            subscribers = self._by_item.get(item_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_item[item_id]
+
+    def publish(self, payload: str) -> int:
+        """
+        通知のペイロードを、変更の種類・アイテムのIDが一致する購読者に配信します。
+
+        件数の多い変更をまとめた通知（`id` を含まない）は、変更の種類が一致する全ての購読者に配信します。
+
+        Parameters
+        ----------
+        payload : str
+            通知のペイロード（トリガーが作成したJSON）
+
+        Returns
+        -------
+        int
+            配信した購読者の数
+        """
+        self.notifications += 1
+        try:
+            message = orjson.loads(payload)
+            operation = message["op"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Ignoring malformed item change notification: %r", payload)
+            return 0
+
+        item_id = message.get("id")
+        if item_id is None:
+            targets: Iterable[Subscription] = self._subscribers
+        else:
+            # 購読者は全アイテム・アイテムIDごとのどちらか一方にのみ登録されている
+            targets = chain(self._all_items, self._by_item.get(item_id, ()))
+
+        change = _change(operation, payload)
+        delivered = 0
+        for subscription in targets:
+            if operation in subscription.operations:
+                subscription.deliver(change)
+                delivered += 1
+        return delivered
+
+    def broadcast(self, change: ItemChange) -> None:
+        """全ての購読者に `RESYNC` などのイベントを配信します。"""
+        for subscription in self._subscribers:
+            subscription.deliver(change)
+
+    async def _start(self) -> None:
+        if self._listening is None:
+            self._listening = asyncio.Event()
+            for coroutine in (self._listen(), self._heartbeat()):
+                task = asyncio.create_task(coroutine)
+                self._tasks.add(task)
+        # LISTEN の開始前の変更を取りこぼさないよう、最初の接続が確立するまで待つ（接続できない場合も購読は受け付ける）
+        try:
+            await asyncio.wait_for(self._listening.wait(), timeout=self.reconnect_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, lambda *args: self.publish(args[-1]))
+                if self._listening.is_set():
+                    # 切断中の変更は配信されていないため、購読者に取得し直させる
+                    self.reconnects += 1
+                    self.broadcast(RESYNC)
+                self._listening.set()
+                logger.info("Listening for item changes on %r", CHANNEL)
+                await closed.wait()
+                logger.warning("Item change listener disconnected")
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Item change listener failed to connect: %s", e)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            # 配信待ちの変更がある購読者には次の変更の送信で代わりとなるため送らない
+            for subscription in self._subscribers:
+                if subscription.idle:
+                    subscription.deliver(PING)
+
+    async def close(self) -> None:
+        """LISTEN を停止し、全ての購読者に配信の終了を通知します。"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._listening = None
+        for subscription in self._subscribers:
+            subscription.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        購読者数・受信した通知数などの統計を返します。
+
+        Returns
+        -------
+        Dict[str, int]
+            統計
+        """
+        return {
+            "subscribers": len(self._subscribers),
+            "item_filters": len(self._by_item),
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+            "dropped": sum(subscription.dropped for subscription in self._subscribers),
+        }
+
+
+# アプリケーション全体で共有するフィード
+item_change_feed = ItemChangeFeed(DATABASE_URL)
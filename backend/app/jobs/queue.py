@@ -0,0 +1,396 @@
+"""
+Redisをブローカーとするバックグラウンドジョブのキュー
+
+ジョブの状態はハッシュ（`jobs:job:<id>`）に保存し、実行待ちのジョブIDをリスト（`jobs:queue`）、
+リトライ待ちのジョブIDを実行予定時刻をスコアとするソート済みセット（`jobs:delayed`）、
+実行中のジョブIDをリスト（`jobs:processing`）で管理します。ワーカーは `LMOVE` で
+実行待ちのリストから実行中のリストへ移すことでジョブを取得するため、同じジョブが
+複数のワーカーで実行されることはありません。ワーカーが停止した場合は、ハートビートが
+途絶えたジョブをリトライとして実行待ちに戻します。取得（`LMOVE`）とハートビートの記録は
+別のコマンドのため、ハートビートは実行待ちに戻す際に削除し、取得直後のハートビートのないジョブを
+停止したワーカーのジョブとみなさないようにしています。
+
+テストでは Redis の代わりにインプロセスの `fakeredis.FakeRedis` を渡して使用します。
+"""
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Literal, Optional
+
+import orjson
+import redis
+
+from ..core.config import settings
+from ..core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["queued", "running", "retrying", "succeeded", "failed", "cancelled"]
+
+# 完了したジョブの状態（結果は `result_ttl` 秒後に削除されます）
+FINISHED_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+
+
+class JobCancelled(Exception):
+    """実行中のジョブのキャンセルが要求されたことを示す例外です。"""
+
+
+def _timestamp(value: Optional[bytes]) -> Optional[datetime]:
+    return datetime.fromtimestamp(float(value), tz=timezone.utc) if value else None
+
+
+class JobQueue:
+    """
+    バックグラウンドジョブのキューです。
+
+    Parameters
+    ----------
+    client : redis.Redis
+        Redisクライアント
+    key_prefix : str, optional
+        キーの接頭辞, by default "jobs:"
+    max_attempts : int, optional
+        ジョブの最大実行回数（初回を含む）, by default settings.job_max_attempts
+    retry_backoff : float, optional
+        1回目のリトライまでの秒数（以降は2倍ずつ増加）, by default settings.job_retry_backoff
+    retry_backoff_max : float, optional
+        リトライまでの最大秒数, by default settings.job_retry_backoff_max
+    result_ttl : int, optional
+        完了したジョブの状態を保持する秒数, by default settings.job_result_ttl
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        key_prefix: str = "jobs:",
+        max_attempts: int = settings.job_max_attempts,
+        retry_backoff: float = settings.job_retry_backoff,
+        retry_backoff_max: float = settings.job_retry_backoff_max,
+        result_ttl: int = settings.job_result_ttl
+    ):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.result_ttl = result_ttl
+        self.queue_key = f"{key_prefix}queue"
+        self.delayed_key = f"{key_prefix}delayed"
+        self.processing_key = f"{key_prefix}processing"
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.key_prefix}job:{job_id}"
+
+    def enqueue(self, job_type: str, params: Optional[Dict[str, Any]] = None, max_attempts: Optional[int] = None) -> Dict[str, Any]:
+        """
+        ジョブを登録します。
+
+        Parameters
+        ----------
+        job_type : str
+            ジョブの種類（`app.jobs.tasks.TASKS` のキー）
+        params : Optional[Dict[str, Any]], optional
+            ジョブのパラメータ（JSONに変換できる値）, by default None
+        max_attempts : Optional[int], optional
+            最大実行回数, by default None（キューの設定値）
+
+        Returns
+        -------
+        Dict[str, Any]
+            登録したジョブの状態
+        """
+        job_id = uuid.uuid4().hex
+        pipe = self.client.pipeline()
+        pipe.hset(self._key(job_id), mapping={
+            "id": job_id,
+            "type": job_type,
+            "params": orjson.dumps(params or {}),
+            "status": "queued",
+            "progress": 0.0,
+            "message": "",
+            "attempts": 0,
+            "max_attempts": max_attempts or self.max_attempts,
+            "created_at": time.time(),
+            "cancel_requested": 0,
+        })
+        pipe.lpush(self.queue_key, job_id)
+        pipe.execute()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        ジョブの状態を取得します。
+
+        Parameters
+        ----------
+        job_id : str
+            ジョブのID
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            ジョブの状態（`app.db.schemas.job.Job` の形式）、見つからない場合はNone
+        """
+        fields = self.client.hgetall(self._key(job_id))
+        if not fields:
+            return None
+        return {
+            "id": fields[b"id"].decode(),
+            "type": fields[b"type"].decode(),
+            "params": orjson.loads(fields[b"params"]),
+            "status": fields[b"status"].decode(),
+            "progress": float(fields[b"progress"]),
+            "message": fields[b"message"].decode() or None,
+            "attempts": int(fields[b"attempts"]),
+            "max_attempts": int(fields[b"max_attempts"]),
+            "cancel_requested": fields[b"cancel_requested"] == b"1",
+            "created_at": _timestamp(fields.get(b"created_at")),
+            "started_at": _timestamp(fields.get(b"started_at")),
+            "finished_at": _timestamp(fields.get(b"finished_at")),
+            "next_attempt_at": _timestamp(fields.get(b"next_attempt_at")),
+            "error": fields[b"error"].decode() if b"error" in fields else None,
+            "result": orjson.loads(fields[b"result"]) if b"result" in fields else None,
+        }
+
+    def promote_due(self, now: Optional[float] = None) -> int:
+        """
+        リトライの予定時刻を過ぎたジョブを実行待ちに戻します。
+
+        Returns
+        -------
+        int
+            実行待ちに戻したジョブの件数
+        """
+        promoted = 0
+        for job_id in self.client.zrangebyscore(self.delayed_key, 0, now or time.time()):
+            # ZREM に成功したプロセスのみが戻す（複数のワーカーで重複しないようにする）
+            if self.client.zrem(self.delayed_key, job_id):
+                pipe = self.client.pipeline()
+                pipe.hset(self._key(job_id.decode()), "status", "queued")
+                pipe.lpush(self.queue_key, job_id)
+                pipe.execute()
+                promoted += 1
+        return promoted
+
+    def dequeue(self, timeout: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        実行待ちのジョブを1件取得し、実行中にします。
+
+        Parameters
+        ----------
+        timeout : int, optional
+            実行待ちのジョブがない場合に待機する秒数（0の場合は待機しない）, by default 0
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            取得したジョブの状態、実行待ちのジョブがない場合はNone
+        """
+        self.promote_due()
+        if timeout > 0:
+            job_id = self.client.blmove(self.queue_key, self.processing_key, timeout, "RIGHT", "LEFT")
+        else:
+            job_id = self.client.lmove(self.queue_key, self.processing_key, "RIGHT", "LEFT")
+        if job_id is None:
+            return None
+
+        job_id = job_id.decode()
+        key = self._key(job_id)
+        if self.client.hget(key, "cancel_requested") == b"1":
+            self.finish(job_id, "cancelled")
+            return None
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={"status": "running", "started_at": now, "heartbeat": now})
+        pipe.hdel(key, "next_attempt_at")
+        pipe.hincrby(key, "attempts", 1)
+        pipe.execute()
+        return self.get(job_id)
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        """実行中のジョブのハートビート（最終確認時刻）を更新します。"""
+        now = time.time()
+        pipe = self.client.pipeline()
+        for job_id in job_ids:
+            pipe.hset(self._key(job_id), "heartbeat", now)
+        pipe.execute()
+
+    def report_progress(self, job_id: str, progress: float, message: Optional[str] = None) -> bool:
+        """
+        実行中のジョブの進捗を更新します。
+
+        Parameters
+        ----------
+        job_id : str
+            ジョブのID
+        progress : float
+            進捗（0〜1）
+        message : Optional[str], optional
+            進捗のメッセージ, by default None
+
+        Returns
+        -------
+        bool
+            キャンセルが要求されている場合はTrue
+        """
+        fields = {"progress": min(max(progress, 0.0), 1.0), "heartbeat": time.time()}
+        if message is not None:
+            fields["message"] = message
+        pipe = self.client.pipeline()
+        pipe.hset(self._key(job_id), mapping=fields)
+        pipe.hget(self._key(job_id), "cancel_requested")
+        return pipe.execute()[1] == b"1"
+
+    def finish(self, job_id: str, status: JobStatus, result: Any = None, error: Optional[str] = None) -> None:
+        """
+        ジョブを完了（成功・失敗・キャンセル）にし、`result_ttl` 秒後に削除されるようにします。
+
+        Parameters
+        ----------
+        job_id : str
+            ジョブのID
+        status : JobStatus
+            完了時の状態（"succeeded"、"failed"、"cancelled"）
+        result : Any, optional
+            ジョブの結果（JSONに変換できる値）, by default None
+        error : Optional[str], optional
+            エラーの内容, by default None
+        """
+        key = self._key(job_id)
+        fields: Dict[str, Any] = {"status": status, "finished_at": time.time()}
+        if status == "succeeded":
+            fields["progress"] = 1.0
+            fields["result"] = orjson.dumps(result)
+        if error is not None:
+            fields["error"] = error
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.result_ttl)
+        pipe.lrem(self.processing_key, 0, job_id)
+        pipe.execute()
+
+    def retry_or_fail(self, job_id: str, error: str) -> JobStatus:
+        """
+        失敗したジョブを、最大実行回数に達していなければ指数バックオフ後に再実行するよう登録し、
+        達していれば失敗にします。
+
+        Parameters
+        ----------
+        job_id : str
+            ジョブのID
+        error : str
+            エラーの内容
+
+        Returns
+        -------
+        JobStatus
+            "retrying"（再実行を登録した場合）または "failed"
+        """
+        key = self._key(job_id)
+        attempts, max_attempts = (int(v or 0) for v in self.client.hmget(key, "attempts", "max_attempts"))
+        if attempts >= max_attempts:
+            self.finish(job_id, "failed", error=error)
+            return "failed"
+
+        # 同時に失敗したジョブが一斉に再実行されないよう、待ち時間を揺らす
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), self.retry_backoff_max)
+        next_attempt_at = time.time() + delay * random.uniform(0.5, 1.0)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={"status": "retrying", "error": error, "next_attempt_at": next_attempt_at})
+        # 前回の実行のハートビートが次の取得直後に途絶えたと判定されないよう削除する
+        pipe.hdel(key, "heartbeat")
+        pipe.zadd(self.delayed_key, {job_id: next_attempt_at})
+        pipe.lrem(self.processing_key, 0, job_id)
+        pipe.execute()
+        return "retrying"
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        ジョブをキャンセルします。
+
+        実行待ち・リトライ待ちのジョブは直ちにキャンセルされます。実行中のジョブには
+        キャンセルを要求し、ジョブが次に進捗を報告した時点で中断されます。
+
+        Parameters
+        ----------
+        job_id : str
+            ジョブのID
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            キャンセル後のジョブの状態、見つからない場合はNone
+        """
+        key = self._key(job_id)
+        status = self.client.hget(key, "status")
+        if status is None:
+            return None
+        if status.decode() not in FINISHED_STATUSES:
+            pipe = self.client.pipeline()
+            pipe.hset(key, "cancel_requested", 1)
+            pipe.lrem(self.queue_key, 0, job_id)
+            pipe.zrem(self.delayed_key, job_id)
+            _, removed, removed_delayed = pipe.execute()
+            if removed or removed_delayed:
+                self.finish(job_id, "cancelled")
+        return self.get(job_id)
+
+    def requeue_stale(self, stale_seconds: float = settings.job_stale_seconds) -> List[str]:
+        """
+        ハートビートが `stale_seconds` 秒以上途絶えた実行中のジョブ（停止したワーカーのジョブ）を
+        失敗として扱い、リトライまたは失敗にします。
+
+        ハートビートのないジョブは取得直後（`dequeue` がハートビートを記録する前）のため、
+        この時点をハートビートとして記録し、その後 `stale_seconds` 秒以上記録されない場合のみ
+        （取得直後にワーカーが停止した場合）リトライにします。
+
+        Parameters
+        ----------
+        stale_seconds : float, optional
+            ワーカーが停止したとみなす秒数, by default settings.job_stale_seconds
+
+        Returns
+        -------
+        List[str]
+            リトライまたは失敗にしたジョブのID
+        """
+        stale = []
+        deadline = time.time() - stale_seconds
+        for job_id in self.client.lrange(self.processing_key, 0, -1):
+            key = self._key(job_id.decode())
+            heartbeat = self.client.hget(key, "heartbeat")
+            if heartbeat is None:
+                # 実行中のワーカーが記録したハートビートは上書きしない
+                self.client.hsetnx(key, "heartbeat", time.time())
+                continue
+            if float(heartbeat) >= deadline:
+                continue
+            # LREM に成功したプロセスのみが処理する（複数のワーカーで重複しないようにする）
+            if self.client.lrem(self.processing_key, 1, job_id):
+                job_id = job_id.decode()
+                logger.warning("Job %s lost its worker, scheduling retry", job_id)
+                self.retry_or_fail(job_id, "Worker stopped responding")
+                stale.append(job_id)
+        return stale
+
+    def stats(self) -> Dict[str, int]:
+        """
+        実行待ち・リトライ待ち・実行中のジョブの件数を返します。
+
+        Returns
+        -------
+        Dict[str, int]
+            状態ごとのジョブの件数
+        """
+        pipe = self.client.pipeline()
+        pipe.llen(self.queue_key)
+        pipe.zcard(self.delayed_key)
+        pipe.llen(self.processing_key)
+        queued, retrying, running = pipe.execute()
+        return {"queued": queued, "retrying": retrying, "running": running}
+
+
+# APIから使用するキュー（ワーカーはブロッキング取得のため専用のクライアントを使用する）
+job_queue = JobQueue(redis_client)
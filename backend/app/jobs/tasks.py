@@ -0,0 +1,108 @@
+"""
+バックグラウンドジョブとして実行する処理
+
+各関数は `JobContext` を受け取り、JSONに変換できる結果を返します。関数が例外を送出した場合は
+キューの設定に従ってリトライされるため、途中で失敗しても結果が残らない（1つのトランザクションで
+コミットする、一時ファイルに書き出してから名前を変更する）ように実装します。
+"""
+import io
+import os
+from typing import Any, Callable, Dict, Iterator, List
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+
+from ..db.crud import item as item_crud
+from ..db.models.item import Item
+from ..db.rollups import refresh_rollups
+from ..db.schemas.item import ItemImportResult
+from ..etl.item_export import MEDIA_TYPES, encode_csv, encode_ndjson
+from ..etl.item_import import import_items
+from .worker import JobContext
+
+TaskFunction = Callable[[JobContext], Any]
+
+# ジョブの種類と実行する関数
+TASKS: Dict[str, TaskFunction] = {}
+
+
+def task(name: str) -> Callable[[TaskFunction], TaskFunction]:
+    """関数をジョブの種類 `name` の処理として登録するデコレータです。"""
+    def register(function: TaskFunction) -> TaskFunction:
+        TASKS[name] = function
+        return function
+    return register
+
+
+@task("items.import")
+def import_items_task(ctx: JobContext) -> Dict[str, Any]:
+    """
+    アップロードされたCSV / NDJSONファイル（`params["path"]`）からアイテムを取り込みます。
+
+    進捗はファイルの読み込み位置から計算します。取り込みは1つのトランザクションで行うため、
+    キャンセル・失敗した場合は1行も取り込まれません。成功した場合はファイルを削除します。
+    """
+    path = ctx.params["path"]
+    size = os.path.getsize(path) or 1
+    with open(path, "rb") as file:
+        stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+        def on_progress(result: ItemImportResult) -> None:
+            ctx.progress(file.tell() / size, f"{result.total_rows} rows read")
+
+        with ctx.session_factory() as db:
+            result = import_items(db, stream, ctx.params["format"], on_progress=on_progress)
+    os.remove(path)
+    return result.model_dump(mode="json")
+
+
+@task("items.export")
+def export_items_task(ctx: JobContext) -> Dict[str, Any]:
+    """
+    全アイテムをNDJSONまたはCSV（`params["format"]`）でファイルに書き出します。
+
+    一時ファイルに書き出してから名前を変更するため、結果のファイルは完成したものだけが見えます。
+    """
+    format = ctx.params.get("format", "ndjson")
+    batch_size = ctx.params.get("batch_size", 1000)
+    encode = encode_csv if format == "csv" else encode_ndjson
+    path = ctx.path(f".{format}")
+    exported = 0
+
+    with ctx.session_factory() as db:
+        total = db.scalar(select(func.count()).select_from(Item)) or 1
+
+        def partitions() -> Iterator[List[Row]]:
+            nonlocal exported
+            for rows in item_crud.iter_item_rows(db, batch_size=batch_size):
+                yield rows
+                exported += len(rows)
+                ctx.progress(exported / total, f"{exported} rows exported")
+
+        try:
+            with open(f"{path}.tmp", "wb") as file:
+                for chunk in encode(partitions()):
+                    file.write(chunk)
+            os.replace(f"{path}.tmp", path)
+        finally:
+            if os.path.exists(f"{path}.tmp"):
+                os.remove(f"{path}.tmp")
+
+    return {
+        "rows": exported,
+        "bytes": os.path.getsize(path),
+        "filename": f"items.{format}",
+        "media_type": MEDIA_TYPES[format],
+    }
+
+
+@task("kpi.rollups.refresh")
+def refresh_rollups_task(ctx: JobContext) -> Dict[str, int]:
+    """KPIのロールアップを更新します（`params["rebuild"]` が真の場合は全期間を集計し直します）。"""
+    with ctx.session_factory() as db:
+        return refresh_rollups(db, rebuild=ctx.params.get("rebuild", False))
+
+
+def result_path(data_dir: str, job: Dict[str, Any]) -> str:
+    """ファイルを出力するジョブの結果ファイルのパスを返します。"""
+    return os.path.join(data_dir, f"{job['id']}.{job['params'].get('format', 'ndjson')}")
@@ -0,0 +1,299 @@
+"""
+バックグラウンドジョブのワーカー
+
+Redisのキューからジョブを取得し、`app.jobs.tasks.TASKS` に登録された関数で実行します。
+`--concurrency` で指定した数のスレッドが並行してジョブを実行し、別のスレッドが
+実行中のジョブのハートビートの更新、停止したワーカーのジョブの再登録、
+保持期間を過ぎたファイルの削除を定期的に行います。
+
+ワーカーの起動方法（backend ディレクトリで実行）::
+
+    python -m app.jobs.worker --concurrency 4
+
+SIGTERM / SIGINT を受け取ると新しいジョブの取得をやめ、実行中のジョブの完了を待って終了します。
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import redis
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from .queue import JobCancelled, JobQueue, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """
+    実行中のジョブの情報と、進捗の報告・キャンセルの確認を行う関数を提供します。
+
+    Parameters
+    ----------
+    queue : JobQueue
+        ジョブのキュー
+    job : Dict[str, Any]
+        ジョブの状態
+    session_factory : Callable[[], Session]
+        データベースセッションを作成する関数
+    data_dir : str
+        ファイルを保存するディレクトリ
+    progress_interval : float, optional
+        進捗をRedisに書き込む最小の間隔（秒）, by default 0.5
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        job: Dict[str, Any],
+        session_factory: Callable[[], Session],
+        data_dir: str,
+        progress_interval: float = 0.5
+    ):
+        self.queue = queue
+        self.job_id: str = job["id"]
+        self.params: Dict[str, Any] = job["params"]
+        self.attempt: int = job["attempts"]
+        self.session_factory = session_factory
+        self.data_dir = data_dir
+        self.progress_interval = progress_interval
+        self._reported_at = float("-inf")
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """
+        進捗を報告します。
+
+        報告は `progress_interval` 秒に1回に間引かれます。キャンセルが要求されている場合は
+        `JobCancelled` を送出するため、ジョブはトランザクションをコミットせずに中断します。
+
+        Parameters
+        ----------
+        fraction : float
+            進捗（0〜1）
+        message : Optional[str], optional
+            進捗のメッセージ, by default None
+
+        Raises
+        ------
+        JobCancelled
+            キャンセルが要求されている場合
+        """
+        now = time.monotonic()
+        if now - self._reported_at < self.progress_interval:
+            return
+        self._reported_at = now
+        if self.queue.report_progress(self.job_id, fraction, message):
+            raise JobCancelled(self.job_id)
+
+    def path(self, suffix: str) -> str:
+        """ジョブのファイルのパス（`<data_dir>/<ジョブID><suffix>`）を返します。"""
+        return os.path.join(self.data_dir, f"{self.job_id}{suffix}")
+
+
+def remove_expired_files(data_dir: str, ttl: float = settings.job_result_ttl) -> int:
+    """
+    `ttl` 秒以上更新されていないファイル（完了したジョブの結果・取り込まれなかったアップロード）を
+    削除します。
+
+    Returns
+    -------
+    int
+        削除したファイルの件数
+    """
+    removed = 0
+    deadline = time.time() - ttl
+    try:
+        entries = list(os.scandir(data_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < deadline:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+class Worker:
+    """
+    キューのジョブを実行するワーカーです。
+
+    Parameters
+    ----------
+    queue : JobQueue
+        ジョブのキュー
+    tasks : Dict[str, Callable[[JobContext], Any]]
+        ジョブの種類と実行する関数の辞書（関数の戻り値がジョブの結果になる）
+    session_factory : Callable[[], Session]
+        データベースセッションを作成する関数
+    concurrency : int, optional
+        同時に実行するジョブの数, by default settings.job_concurrency
+    poll_timeout : int, optional
+        実行待ちのジョブを待機する秒数（停止の要求を確認する間隔）, by default 1
+    stale_seconds : float, optional
+        ハートビートが途絶えたジョブを再登録するまでの秒数, by default settings.job_stale_seconds
+    data_dir : str, optional
+        ファイルを保存するディレクトリ, by default settings.job_data_dir
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        tasks: Dict[str, Callable[[JobContext], Any]],
+        session_factory: Callable[[], Session],
+        concurrency: int = settings.job_concurrency,
+        poll_timeout: int = 1,
+        stale_seconds: float = settings.job_stale_seconds,
+        data_dir: str = settings.job_data_dir
+    ):
+        self.queue = queue
+        self.tasks = tasks
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_timeout = poll_timeout
+        self.stale_seconds = stale_seconds
+        self.data_dir = data_dir
+        self._stopping = threading.Event()
+        self._running: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def run_job(self, job: Dict[str, Any]) -> JobStatus:
+        """
+        取得したジョブを1件実行し、結果に応じて成功・リトライ・失敗・キャンセルにします。
+
+        Parameters
+        ----------
+        job : Dict[str, Any]
+            `JobQueue.dequeue` で取得したジョブの状態
+
+        Returns
+        -------
+        JobStatus
+            実行後のジョブの状態
+        """
+        job_id = job["id"]
+        task = self.tasks.get(job["type"])
+        if task is None:
+            self.queue.finish(job_id, "failed", error=f"Unknown job type: {job['type']}")
+            return "failed"
+
+        with self._lock:
+            self._running.add(job_id)
+        started = time.perf_counter()
+        try:
+            result = task(JobContext(self.queue, job, self.session_factory, self.data_dir))
+        except JobCancelled:
+            logger.info("Job %s (%s) cancelled", job_id, job["type"])
+            self.queue.finish(job_id, "cancelled")
+            return "cancelled"
+        except Exception as e:
+            logger.exception("Job %s (%s) failed on attempt %d", job_id, job["type"], job["attempts"])
+            return self.queue.retry_or_fail(job_id, f"{type(e).__name__}: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+
+        logger.info("Job %s (%s) succeeded in %.3fs", job_id, job["type"], time.perf_counter() - started)
+        self.queue.finish(job_id, "succeeded", result=result)
+        return "succeeded"
+
+    def run_pending(self) -> int:
+        """
+        実行待ちのジョブがなくなるまで、現在のスレッドで順に実行します（テスト・バッチ実行用）。
+
+        Returns
+        -------
+        int
+            実行したジョブの件数
+        """
+        count = 0
+        while (job := self.queue.dequeue()) is not None:
+            self.run_job(job)
+            count += 1
+        return count
+
+    def maintain(self) -> None:
+        """実行中のジョブのハートビートの更新、停止したワーカーのジョブの再登録、期限切れファイルの削除を行います。"""
+        with self._lock:
+            running = list(self._running)
+        if running:
+            self.queue.heartbeat(running)
+        self.queue.requeue_stale(self.stale_seconds)
+        remove_expired_files(self.data_dir, self.queue.result_ttl)
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.dequeue(timeout=self.poll_timeout)
+            except redis.RedisError:
+                logger.exception("Failed to fetch a job from Redis")
+                self._stopping.wait(settings.redis_retry_interval)
+                continue
+            if job is not None:
+                self.run_job(job)
+
+    def _maintain(self) -> None:
+        interval = max(1.0, min(30.0, self.stale_seconds / 3))
+        while not self._stopping.wait(interval):
+            try:
+                self.maintain()
+            except redis.RedisError:
+                logger.exception("Job maintenance failed")
+
+    def stop(self, *args: Any) -> None:
+        """新しいジョブの取得をやめるよう要求します（実行中のジョブは完了まで実行されます）。"""
+        self._stopping.set()
+
+    def run(self) -> None:
+        """停止が要求されるまで、`concurrency` 個のスレッドでジョブを実行し続けます。"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        threads = [threading.Thread(target=self._maintain, name="job-maintenance", daemon=True)]
+        threads += [
+            threading.Thread(target=self._work, name=f"job-worker-{n}")
+            for n in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        logger.info("Job worker started with concurrency %d", self.concurrency)
+        for thread in threads[1:]:
+            thread.join()
+        logger.info("Job worker stopped")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """コマンドラインからワーカーを起動します。"""
+    from ..db.models.database import SessionLocal
+    from .tasks import TASKS
+
+    parser = argparse.ArgumentParser(description="Run background jobs from the Redis queue")
+    parser.add_argument("--concurrency", type=int, default=settings.job_concurrency,
+                        help="同時に実行するジョブの数")
+    parser.add_argument("--poll-timeout", type=int, default=1,
+                        help="実行待ちのジョブを待機する秒数")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # ブロッキング取得（BLMOVE）の待機中にタイムアウトしないよう、待機時間より長いタイムアウトを設定する
+    client = redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        socket_timeout=args.poll_timeout + 5,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        health_check_interval=30,
+    )
+    worker = Worker(JobQueue(client), TASKS, SessionLocal, concurrency=args.concurrency,
+                    poll_timeout=args.poll_timeout)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import item
+from .core.compression import CompressionMiddleware
+from .core.config import settings
+from .core.instrumentation import InstrumentationMiddleware
+from .db.inspection import QueryInspectionMiddleware
+from .db.replicas import ReadYourWritesMiddleware, replica_router
+from .routers import (
+    item, item_analytics, item_async, item_bulk, item_export, item_import, item_search,
+    item_stream, jobs, kpi_measurement, metrics
+)
 
 app = FastAPI(
     title="KPI Management API",
@@ -15,10 +23,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Aggregate-Source", "Location", "Server-Timing"],
 )
 
+# リードレプリカを使用する場合は、書き込み直後のクライアントの読み取りをプライマリで行う
+if replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# 開発・テスト用のスロークエリ・N+1 の検出
+if settings.query_inspection_enabled:
+    app.add_middleware(QueryInspectionMiddleware)
+
+# レスポンスの圧縮（brotli / gzip）
+if settings.response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=settings.response_compression.split(","),
+        minimum_size=settings.response_compression_min_size,
+        gzip_level=settings.response_compression_gzip_level,
+        brotli_quality=settings.response_compression_brotli_quality,
+    )
+
+# リクエストごとの処理時間の計測（最後に追加して最も外側で計測する）
+if settings.request_metrics_enabled:
+    app.add_middleware(InstrumentationMiddleware, server_timing=settings.server_timing_enabled)
+
 # ルーターの登録
-app.include_router(item.router)
+# 固定パス（/api/items/bulk など）のルートは `/api/items/{item_id}` より先に登録する
+app.include_router(item_bulk.router)
+app.include_router(item_import.router)
+app.include_router(item_export.router)
+app.include_router(item_search.router)
+app.include_router(item_stream.router)
+app.include_router(item_analytics.router)
+# USE_ASYNC_DB が有効な場合は非同期版のルーターを使用
+app.include_router(item_async.router if settings.use_async_db else item.router)
+app.include_router(kpi_measurement.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
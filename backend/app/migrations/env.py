@@ -18,6 +18,8 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 from app.db.models.database import Base
 from app.db.models.item import Item  # モデルをインポート
+from app.db.models.kpi_measurement import KpiMeasurement
+from app.db.models.kpi_rollup import KpiRollupDaily, KpiRollupHourly, KpiRollupMonthly, KpiRollupWatermark
 
 target_metadata = Base.metadata
 
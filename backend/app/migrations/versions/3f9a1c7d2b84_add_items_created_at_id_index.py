@@ -0,0 +1,37 @@
+"""Add items created_at/id index for keyset pagination
+
+Revision ID: 3f9a1c7d2b84
+Revises: 700b98982143
+Create Date: 2026-10-17 09:12:44.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7d2b84'
+down_revision: Union[str, None] = '700b98982143'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create composite index for keyset pagination (ORDER BY created_at, id)
+    # CONCURRENTLY avoids blocking writes on large items tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_created_at_id', 'items', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    # Drop composite index
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_items_created_at_id', table_name='items',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,81 @@
+"""Add NOTIFY triggers for item changes
+
+Revision ID: a7c3e5f1b924
+Revises: f2b8c4d6e013
+Create Date: 2026-10-18 21:05:44.318620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f1b924'
+down_revision: Union[str, None] = 'f2b8c4d6e013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Statements touching more rows than this emit a single summary event instead of one per row
+# (keeps bulk endpoints and COPY imports from flooding the notification queue)
+MAX_ROW_EVENTS = 1000
+
+TRIGGERS = (
+    ('notify_items_inserted', 'INSERT', 'NEW TABLE AS new_items'),
+    ('notify_items_updated', 'UPDATE', 'NEW TABLE AS new_items'),
+    ('notify_items_deleted', 'DELETE', 'OLD TABLE AS old_items'),
+)
+
+
+def upgrade() -> None:
+    # Create function publishing changed rows on the items_changes channel
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_items_changes()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            changed_rows bigint;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                SELECT count(*) INTO changed_rows FROM old_items;
+            ELSE
+                SELECT count(*) INTO changed_rows FROM new_items;
+            END IF;
+
+            IF changed_rows = 0 THEN
+                RETURN NULL;
+            ELSIF changed_rows > {MAX_ROW_EVENTS} THEN
+                PERFORM pg_notify('items_changes', json_build_object(
+                    'op', lower(TG_OP), 'count', changed_rows
+                )::text);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('items_changes', json_build_object(
+                    'op', 'delete', 'id', id
+                )::text) FROM old_items;
+            ELSE
+                PERFORM pg_notify('items_changes', json_build_object(
+                    'op', lower(TG_OP), 'id', id, 'updated_at', updated_at
+                )::text) FROM new_items;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+    """)
+
+    # Create statement-level triggers (transition tables allow one event per trigger)
+    for name, event, transition in TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {event} ON items
+            REFERENCING {transition}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION notify_items_changes()
+        """)
+
+
+def downgrade() -> None:
+    # Drop triggers
+    for name, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON items")
+    # Drop function
+    op.execute("DROP FUNCTION IF EXISTS notify_items_changes()")
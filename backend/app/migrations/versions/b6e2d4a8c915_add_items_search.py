@@ -0,0 +1,58 @@
+"""Add full-text and trigram search to items
+
+Revision ID: b6e2d4a8c915
+Revises: 3f9a1c7d2b84
+Create Date: 2026-10-18 10:21:37.604112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d4a8c915'
+down_revision: Union[str, None] = '3f9a1c7d2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Enable trigram matching for fuzzy name search (kept on downgrade, like uuid-ossp)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Add stored tsvector column (name weighted A, description weighted B)
+    # NOTE: adding a stored generated column rewrites the table
+    op.add_column('items', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+
+    # Create GIN indexes for full-text and trigram search
+    # CONCURRENTLY avoids blocking writes on large items tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_search_vector', 'items', ['search_vector'],
+            unique=False, postgresql_using='gin', postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_items_name_trgm', 'items', ['name'],
+            unique=False, postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    # Drop search indexes
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_items_name_trgm', table_name='items', postgresql_concurrently=True)
+        op.drop_index('ix_items_search_vector', table_name='items', postgresql_concurrently=True)
+    # Drop tsvector column
+    op.drop_column('items', 'search_vector')
@@ -0,0 +1,39 @@
+"""Add items code as the natural key for upserts
+
+Revision ID: c5d9e3b7a142
+Revises: a7c3e5f1b924
+Create Date: 2026-10-18 16:05:12.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d9e3b7a142'
+down_revision: Union[str, None] = 'a7c3e5f1b924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add nullable code column (existing items have no code, so no table rewrite)
+    op.add_column('items', sa.Column('code', sa.String(length=64), nullable=True))
+
+    # Create unique index used as the ON CONFLICT arbiter (NULL codes do not conflict)
+    # CONCURRENTLY avoids blocking writes on large items tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_code', 'items', ['code'],
+            unique=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    # Drop code index
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_items_code', table_name='items', postgresql_concurrently=True)
+    # Drop code column
+    op.drop_column('items', 'code')
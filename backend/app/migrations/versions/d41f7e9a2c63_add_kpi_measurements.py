@@ -0,0 +1,67 @@
+"""Add kpi_measurements partitioned by month
+
+Revision ID: d41f7e9a2c63
+Revises: b6e2d4a8c915
+Create Date: 2026-10-18 13:05:52.381947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7e9a2c63'
+down_revision: Union[str, None] = 'b6e2d4a8c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create kpi_measurements table partitioned by month of measured_at
+    op.execute("""
+        CREATE TABLE kpi_measurements (
+            item_id UUID NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+            measured_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            value DOUBLE PRECISION NOT NULL,
+            ingested_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+            CONSTRAINT kpi_measurements_pkey PRIMARY KEY (item_id, measured_at)
+        ) PARTITION BY RANGE (measured_at)
+    """)
+
+    # Create function that creates the monthly partition containing the given date
+    # (used by the maintenance job and by ingestion for months not created yet)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION kpi_measurements_ensure_partition(month DATE)
+        RETURNS TEXT AS $$
+        DECLARE
+            start_at TIMESTAMP := date_trunc('month', month);
+            partition_name TEXT := 'kpi_measurements_p' || to_char(start_at, 'YYYYMM');
+        BEGIN
+            IF to_regclass(partition_name) IS NULL THEN
+                -- Serialize concurrent creators of the same partition
+                PERFORM pg_advisory_xact_lock(hashtext('kpi_measurements_partitions'));
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF kpi_measurements FOR VALUES FROM (%L) TO (%L)',
+                    partition_name,
+                    start_at AT TIME ZONE 'UTC',
+                    (start_at + INTERVAL '1 month') AT TIME ZONE 'UTC'
+                );
+            END IF;
+            RETURN partition_name;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Create partitions from the current month to three months ahead
+    op.execute("""
+        SELECT kpi_measurements_ensure_partition((CURRENT_DATE + make_interval(months => n))::date)
+        FROM generate_series(0, 3) AS n
+    """)
+
+
+def downgrade() -> None:
+    # Drop table (with all partitions) and partition function
+    op.execute("DROP TABLE IF EXISTS kpi_measurements")
+    op.execute("DROP FUNCTION IF EXISTS kpi_measurements_ensure_partition(DATE)")
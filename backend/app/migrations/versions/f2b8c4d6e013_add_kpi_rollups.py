@@ -0,0 +1,60 @@
+"""Add hourly, daily and monthly KPI rollups
+
+Revision ID: f2b8c4d6e013
+Revises: d41f7e9a2c63
+Create Date: 2026-10-18 16:42:08.519374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c4d6e013'
+down_revision: Union[str, None] = 'd41f7e9a2c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = ('kpi_rollups_hourly', 'kpi_rollups_daily', 'kpi_rollups_monthly')
+
+
+def upgrade() -> None:
+    # Create rollup tables (one per granularity)
+    for table_name in ROLLUP_TABLES:
+        op.create_table(
+            table_name,
+            sa.Column('item_id', sa.UUID(), nullable=False),
+            sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('count', sa.BigInteger(), nullable=False),
+            sa.Column('sum', sa.Double(), nullable=False),
+            sa.Column('min', sa.Double(), nullable=False),
+            sa.Column('max', sa.Double(), nullable=False),
+            sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('item_id', 'bucket')
+        )
+
+    # Create table holding the incremental refresh watermark
+    op.create_table(
+        'kpi_rollup_watermarks',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    # Create BRIN index used to find measurements ingested since the watermark
+    # (propagated to all existing and future partitions)
+    op.create_index(
+        'ix_kpi_measurements_ingested_at',
+        'kpi_measurements',
+        ['ingested_at'],
+        postgresql_using='brin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kpi_measurements_ingested_at', table_name='kpi_measurements')
+    op.drop_table('kpi_rollup_watermarks')
+    for table_name in reversed(ROLLUP_TABLES):
+        op.drop_table(table_name)
@@ -1,69 +1,148 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from ..db.dependencies import get_db
+from ..core.conditional import (
+    is_conditional, is_not_modified, item_etag, item_headers, page_etag, parse_item_etag, shared_cache_headers
+)
+from ..core.config import settings
+from ..core.instrumentation import TimedRoute
+from ..core.serialization import RowsResponse
+from ..db.dependencies import get_db, get_read_db
+from ..db.pagination import InvalidCursorError, decode_cursor, encode_cursor
 from ..db.crud import item as crud
+from ..cache import item as cache
 from ..db.schemas.item import Item, ItemCreate, ItemUpdate
 
 router = APIRouter(
     prefix="/api/items",
-    tags=["Items"]
+    tags=["Items"],
+    route_class=TimedRoute
 )
 
 
+def _page_headers(rows: Sequence[Row], limit: int) -> Dict[str, str]:
+    """一覧のレスポンスに付与する `ETag`・`X-Next-Cursor`・`Cache-Control` ヘッダーを返します。"""
+    headers = {"ETag": page_etag(rows), **shared_cache_headers(settings.item_list_cache_max_age)}
+    if rows and len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return headers
+
+
+def _expected_updated_at(if_match: Optional[str]) -> Optional[datetime]:
+    """`If-Match` ヘッダーから楽観的排他制御に使用する更新日時を取得します。"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    expected = parse_item_etag(if_match)
+    if expected is None:
+        raise HTTPException(status_code=412, detail="Precondition failed")
+    return expected
+
+
 @router.get("", response_model=List[Item])
 def read_items(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """
     アイテムの一覧を取得します。
 
+    `cursor` を指定した場合はキーセット方式で取得し、`skip` は無視されます。
+    取得件数が `limit` に達した場合は、次ページのカーソルを `X-Next-Cursor` ヘッダーで返します。
+    行ごとのPydanticモデルの生成・再検証を行わず、取得した行から直接JSONを組み立てます。
+    同じページの同時のリクエストは1回のSQLにまとめます。
+
+    ページの `ETag` を返し、`If-None-Match` が一致する場合は `(id, created_at, updated_at)` のみを
+    取得して304を返します。リバースプロキシが `ITEM_LIST_CACHE_MAX_AGE` 秒だけ保存できるよう
+    `Cache-Control` を返します。
+
     Parameters
     ----------
+    request : Request
+        リクエスト（条件付きGETの判定用）
     skip : int, optional
         スキップする件数, by default 0
     limit : int, optional
         取得する最大件数, by default 100
+    cursor : Optional[str], optional
+        前ページのレスポンスの `X-Next-Cursor` の値, by default None
     db : Session
         データベースセッション
 
     Returns
     -------
-    List[Item]
-        アイテムオブジェクトのリスト
+    Response
+        アイテムのJSON配列（作成日時、IDの順）、またはページが変更されていない場合は304
+
+    Raises
+    ------
+    HTTPException
+        カーソルが不正な場合は400エラー
     """
-    return crud.get_items(db, skip=skip, limit=limit)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if "if-none-match" in request.headers:
+        keys = cache.get_item_rows(db, skip=skip, limit=limit, after=after, columns=crud.ITEM_KEY_COLUMNS)
+        headers = _page_headers(keys, limit)
+        if is_not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    rows = cache.get_item_rows(db, skip=skip, limit=limit, after=after)
+    return RowsResponse(rows, headers=_page_headers(rows, limit))
 
 
 @router.get("/{item_id}", response_model=Item)
-def read_item(item_id: UUID, db: Session = Depends(get_db)):
+def read_item(item_id: UUID, request: Request, db: Session = Depends(get_read_db)):
     """
     指定されたIDのアイテムを取得します。
 
+    プロセス内のキャッシュ・Redisキャッシュを経由して取得し、キャッシュミスの場合のみデータベースを参照します
+    （同じアイテムの同時のキャッシュミスは1回のSQLにまとめます）。キャッシュのJSONをそのままレスポンスにします。
+    `ETag` / `Last-Modified` を返し、`If-None-Match` / `If-Modified-Since` に対しては
+    キャッシュまたは `SELECT updated_at` で更新日時のみを確認して304を返します。
+
     Parameters
     ----------
     item_id : UUID
         取得するアイテムのID
+    request : Request
+        リクエスト（条件付きGETの判定用）
     db : Session
         データベースセッション
 
     Returns
     -------
-    Item
-        アイテムオブジェクト
+    Response
+        アイテムのJSON（変更されていない場合は304）
 
     Raises
     ------
     HTTPException
         アイテムが見つからない場合は404エラー
     """
-    db_item = crud.get_item(db, item_id=item_id)
-    if db_item is None:
+    if is_conditional(request):
+        updated_at = cache.get_item_updated_at(db, item_id=item_id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        if is_not_modified(request, item_etag(updated_at), updated_at):
+            return Response(status_code=304, headers=item_headers(updated_at))
+
+    payload = cache.get_item_json(db, item_id=item_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Item not found")
-    return db_item
+    return Response(
+        content=payload, media_type="application/json", headers=item_headers(cache.payload_updated_at(payload))
+    )
 
 
 @router.post("", response_model=Item, status_code=201)
@@ -83,24 +162,70 @@ def create_item(item: ItemCreate, db: Session = Depends(get_db)):
     Item
         作成されたアイテムオブジェクト
     """
-    return crud.create_item(db=db, item=item)
+    return cache.create_item(db=db, item=item)
+
+
+@router.put("/by-code/{code}", response_model=Item)
+def upsert_item(
+    item: ItemCreate,
+    response: Response,
+    code: str = Path(..., min_length=1, max_length=64),
+    db: Session = Depends(get_db)
+):
+    """
+    アイテムコードをキーにアイテムを作成、または更新します（upsert）。
+
+    外部システムとの同期など、IDではなくアイテムコードで識別する場合に使用します。
+    存在確認を行わず1つの `INSERT ... ON CONFLICT` で処理するため、同じコードで同時に
+    呼び出しても重複して作成されません。
+
+    Parameters
+    ----------
+    item : ItemCreate
+        作成・更新するアイテムの情報
+    response : Response
+        レスポンス（ステータスコード・ヘッダー設定用）
+    code : str
+        アイテムコード
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    Item
+        作成・更新されたアイテムオブジェクト（作成した場合は201、更新した場合は200）
+    """
+    db_item, created = cache.upsert_item(db=db, code=code, item=item)
+    if created:
+        response.status_code = 201
+    response.headers.update(item_headers(db_item.updated_at))
+    return db_item
 
 
 @router.put("/{item_id}", response_model=Item)
 def update_item(
     item_id: UUID,
     item: ItemUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
     指定されたIDのアイテムを更新します。
 
+    `If-Match` にアイテムの `ETag` を指定した場合は、取得後に他のクライアントが
+    更新していない場合のみ更新します（楽観的排他制御）。
+
     Parameters
     ----------
     item_id : UUID
         更新するアイテムのID
     item : ItemUpdate
         更新する情報
+    response : Response
+        レスポンス（ヘッダー設定用）
+    if_match : Optional[str], optional
+        取得時の `ETag`, by default None
     db : Session
         データベースセッション
 
@@ -112,30 +237,46 @@ def update_item(
     Raises
     ------
     HTTPException
-        アイテムが見つからない場合は404エラー
+        アイテムが見つからない場合は404エラー、`If-Match` が一致しない場合は412エラー
     """
-    db_item = crud.update_item(db=db, item_id=item_id, item=item)
+    expected_updated_at = _expected_updated_at(if_match)
+    db_item = cache.update_item(db=db, item_id=item_id, item=item, expected_updated_at=expected_updated_at)
     if db_item is None:
+        if expected_updated_at is not None and crud.get_item_updated_at(db, item_id) is not None:
+            raise HTTPException(status_code=412, detail="Precondition failed")
         raise HTTPException(status_code=404, detail="Item not found")
+    response.headers.update(item_headers(db_item.updated_at))
     return db_item
 
 
 @router.delete("/{item_id}", status_code=204)
-def delete_item(item_id: UUID, db: Session = Depends(get_db)):
+def delete_item(
+    item_id: UUID,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """
     指定されたIDのアイテムを削除します。
 
+    `If-Match` にアイテムの `ETag` を指定した場合は、取得後に他のクライアントが
+    更新していない場合のみ削除します（楽観的排他制御）。
+
     Parameters
     ----------
     item_id : UUID
         削除するアイテムのID
+    if_match : Optional[str], optional
+        取得時の `ETag`, by default None
     db : Session
         データベースセッション
 
     Raises
     ------
     HTTPException
-        アイテムが見つからない場合は404エラー
+        アイテムが見つからない場合は404エラー、`If-Match` が一致しない場合は412エラー
     """
-    if not crud.delete_item(db=db, item_id=item_id):
+    expected_updated_at = _expected_updated_at(if_match)
+    if not cache.delete_item(db=db, item_id=item_id, expected_updated_at=expected_updated_at):
+        if expected_updated_at is not None and crud.get_item_updated_at(db, item_id) is not None:
+            raise HTTPException(status_code=412, detail="Precondition failed")
         raise HTTPException(status_code=404, detail="Item not found")
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ..analytics.kpi import analyze
+from ..analytics.series import fetch_series
+from ..core.config import settings
+from ..core.instrumentation import TimedRoute
+from ..core.serialization import ArrayResponse
+from ..db.dependencies import get_read_db
+from ..db.crud import item as crud
+from ..db.schemas.kpi_analytics import KpiAnalytics, KpiAnalyticsBatchRequest, KpiAnalyticsOptions
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["KPI Analytics"],
+    route_class=TimedRoute
+)
+
+
+def _analyze_items(db: Session, item_ids: Sequence[UUID], options: KpiAnalyticsOptions) -> List[Dict[str, Any]]:
+    """アイテムの時系列を1回のクエリで取得し、アイテムごとに分析します。"""
+    if options.start >= options.end:
+        raise HTTPException(status_code=422, detail="start must be earlier than end")
+    series = fetch_series(db, item_ids, options.start, options.end, bucket=options.bucket)
+    return [
+        {
+            "item_id": item_id,
+            **analyze(
+                series[item_id],
+                window=options.window,
+                periods=options.periods,
+                z_threshold=options.z_threshold,
+                target=options.target,
+                include_series=options.include_series,
+            ),
+        }
+        for item_id in item_ids
+    ]
+
+
+@router.post("/analytics/batch", response_model=List[KpiAnalytics])
+def analyze_items(request: KpiAnalyticsBatchRequest, db: Session = Depends(get_read_db)):
+    """
+    複数アイテムのKPIの統計量と派生指標（前期比、移動平均、異常値、目標達成率）を計算します。
+
+    全アイテムの時系列を1回のクエリで取得します。存在しないアイテムの結果は測定値なし（`points` が0）になります。
+
+    Parameters
+    ----------
+    request : KpiAnalyticsBatchRequest
+        分析するアイテムのIDのリストと分析の条件
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    ArrayResponse
+        アイテムごとの分析結果（リクエストと同じ順序、重複したIDは1件にまとめる）
+
+    Raises
+    ------
+    HTTPException
+        件数が上限を超えた場合は413エラー、期間の指定が不正な場合は422エラー
+    """
+    item_ids = list(dict.fromkeys(request.item_ids))
+    if len(item_ids) > settings.analytics_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items (max {settings.analytics_batch_max_items})"
+        )
+    return ArrayResponse(_analyze_items(db, item_ids, request))
+
+
+@router.get("/{item_id}/analytics", response_model=KpiAnalytics)
+def analyze_item(item_id: UUID, options: KpiAnalyticsOptions = Depends(), db: Session = Depends(get_read_db)):
+    """
+    アイテムのKPIの統計量と派生指標（前期比、移動平均、異常値、目標達成率）を計算します。
+
+    Parameters
+    ----------
+    item_id : UUID
+        アイテムのID
+    options : KpiAnalyticsOptions
+        分析の条件（クエリパラメータ）
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    ArrayResponse
+        分析結果
+
+    Raises
+    ------
+    HTTPException
+        アイテムが見つからない場合は404エラー、期間の指定が不正な場合は422エラー
+    """
+    if crud.get_item_updated_at(db, item_id) is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return ArrayResponse(_analyze_items(db, [item_id], options)[0])
@@ -0,0 +1,297 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from ..cache.item import item_flights, payload_updated_at
+from ..core.conditional import is_conditional, is_not_modified, item_etag, item_headers
+from ..core.instrumentation import TimedRoute, measure_serialization
+from ..core.serialization import dump_rows
+from ..db.dependencies import get_async_db, get_async_session_factory
+from ..db.pagination import InvalidCursorError, decode_cursor
+from ..db.crud import item_async as crud
+from ..db.schemas.item import Item, ItemCreate, ItemUpdate
+from .item import _expected_updated_at, _page_headers
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["Items"],
+    route_class=TimedRoute
+)
+
+
+# single-flight で共有する読み取りは、呼び出し元のリクエストのセッションを使用せず専用のセッションで実行し、
+# セッションに依存しないエンコード済みのJSONのみを共有する（呼び出し元がキャンセルされてセッションが
+# 閉じられても、待っている他のリクエストの読み取りは続行できる）
+
+async def _load_item_json(item_id: UUID, session_factory: async_sessionmaker) -> Optional[bytes]:
+    """専用のセッションでアイテムを読み込み、JSONにエンコードして返します（見つからない場合はNone）。"""
+    async with session_factory() as db:
+        db_item = await crud.get_item(db, item_id=item_id)
+        return Item.model_validate(db_item).model_dump_json().encode() if db_item is not None else None
+
+
+async def _load_item_updated_at(item_id: UUID, session_factory: async_sessionmaker) -> Optional[datetime]:
+    """専用のセッションでアイテムの更新日時のみを読み込みます（見つからない場合はNone）。"""
+    async with session_factory() as db:
+        return await crud.get_item_updated_at(db, item_id=item_id)
+
+
+async def _load_page(
+    skip: int,
+    limit: int,
+    after: Optional[Tuple[datetime, UUID]],
+    session_factory: async_sessionmaker
+) -> Tuple[bytes, Dict[str, str]]:
+    """専用のセッションで一覧のページを読み込み、JSONとレスポンスのヘッダー（`ETag` など）を返します。"""
+    async with session_factory() as db:
+        rows = await crud.get_item_rows(db, skip=skip, limit=limit, after=after)
+    with measure_serialization():
+        content = dump_rows(rows)
+    return content, _page_headers(rows, limit)
+
+
+@router.get("", response_model=List[Item])
+async def read_items(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+):
+    """
+    アイテムの一覧を取得します。
+
+    `cursor` を指定した場合はキーセット方式で取得し、`skip` は無視されます。
+    取得件数が `limit` に達した場合は、次ページのカーソルを `X-Next-Cursor` ヘッダーで返します。
+    行ごとのPydanticモデルの生成・再検証を行わず、取得した行から直接JSONを組み立てます。
+    同じページの同時のリクエストは1回のSQL（専用のセッション）にまとめ、エンコード済みのJSONを共有します。
+
+    ページの `ETag` を返し、`If-None-Match` が一致する場合は304を返します。リバースプロキシが
+    `ITEM_LIST_CACHE_MAX_AGE` 秒だけ保存できるよう `Cache-Control` を返します。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト（条件付きGETの判定用）
+    skip : int, optional
+        スキップする件数, by default 0
+    limit : int, optional
+        取得する最大件数, by default 100
+    cursor : Optional[str], optional
+        前ページのレスポンスの `X-Next-Cursor` の値, by default None
+    session_factory : async_sessionmaker
+        読み取りに使用する非同期セッションファクトリ
+
+    Returns
+    -------
+    Response
+        アイテムのJSON配列（作成日時、IDの順）、またはページが変更されていない場合は304
+
+    Raises
+    ------
+    HTTPException
+        カーソルが不正な場合は400エラー
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    content, headers = await item_flights.do_async(
+        ("rows", skip if after is None else None, limit, after),
+        lambda: _load_page(skip, limit, after, session_factory)
+    )
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router.get("/{item_id}", response_model=Item)
+async def read_item(
+    item_id: UUID,
+    request: Request,
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+):
+    """
+    指定されたIDのアイテムを取得します。
+
+    同じアイテムの同時のリクエストは1回のSQL（専用のセッション）にまとめ、エンコード済みのJSONを共有します。
+    `ETag` / `Last-Modified` を返し、`If-None-Match` / `If-Modified-Since` に対しては
+    `SELECT updated_at` で更新日時のみを確認して304を返します。
+
+    Parameters
+    ----------
+    item_id : UUID
+        取得するアイテムのID
+    request : Request
+        リクエスト（条件付きGETの判定用）
+    session_factory : async_sessionmaker
+        読み取りに使用する非同期セッションファクトリ
+
+    Returns
+    -------
+    Response
+        アイテムのJSON（変更されていない場合は304）
+
+    Raises
+    ------
+    HTTPException
+        アイテムが見つからない場合は404エラー
+    """
+    if is_conditional(request):
+        updated_at = await item_flights.do_async(
+            ("updated_at", item_id), lambda: _load_item_updated_at(item_id, session_factory)
+        )
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        if is_not_modified(request, item_etag(updated_at), updated_at):
+            return Response(status_code=304, headers=item_headers(updated_at))
+
+    content = await item_flights.do_async(("item", item_id), lambda: _load_item_json(item_id, session_factory))
+    if content is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return Response(content=content, media_type="application/json", headers=item_headers(payload_updated_at(content)))
+
+
+@router.post("", response_model=Item, status_code=201)
+async def create_item(item: ItemCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    新しいアイテムを作成します。
+
+    Parameters
+    ----------
+    item : ItemCreate
+        作成するアイテムの情報
+    db : AsyncSession
+        非同期データベースセッション
+
+    Returns
+    -------
+    Item
+        作成されたアイテムオブジェクト
+    """
+    db_item = await crud.create_item(db=db, item=item)
+    item_flights.forget()
+    return db_item
+
+
+@router.put("/by-code/{code}", response_model=Item)
+async def upsert_item(
+    item: ItemCreate,
+    response: Response,
+    code: str = Path(..., min_length=1, max_length=64),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    アイテムコードをキーにアイテムを作成、または更新します（upsert）。
+
+    外部システムとの同期など、IDではなくアイテムコードで識別する場合に使用します。
+    存在確認を行わず1つの `INSERT ... ON CONFLICT` で処理するため、同じコードで同時に
+    呼び出しても重複して作成されません。
+
+    Parameters
+    ----------
+    item : ItemCreate
+        作成・更新するアイテムの情報
+    response : Response
+        レスポンス（ステータスコード・ヘッダー設定用）
+    code : str
+        アイテムコード
+    db : AsyncSession
+        非同期データベースセッション
+
+    Returns
+    -------
+    Item
+        作成・更新されたアイテムオブジェクト（作成した場合は201、更新した場合は200）
+    """
+    db_item, created = await crud.upsert_item(db=db, code=code, item=item)
+    item_flights.forget()
+    if created:
+        response.status_code = 201
+    response.headers.update(item_headers(db_item.updated_at))
+    return db_item
+
+
+@router.put("/{item_id}", response_model=Item)
+async def update_item(
+    item_id: UUID,
+    item: ItemUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    指定されたIDのアイテムを更新します。
+
+    `If-Match` にアイテムの `ETag` を指定した場合は、取得後に他のクライアントが
+    更新していない場合のみ更新します（楽観的排他制御）。
+
+    Parameters
+    ----------
+    item_id : UUID
+        更新するアイテムのID
+    item : ItemUpdate
+        更新する情報
+    response : Response
+        レスポンス（ヘッダー設定用）
+    if_match : Optional[str], optional
+        取得時の `ETag`, by default None
+    db : AsyncSession
+        非同期データベースセッション
+
+    Returns
+    -------
+    Item
+        更新されたアイテムオブジェクト
+
+    Raises
+    ------
+    HTTPException
+        アイテムが見つからない場合は404エラー、`If-Match` が一致しない場合は412エラー
+    """
+    expected_updated_at = _expected_updated_at(if_match)
+    db_item = await crud.update_item(db=db, item_id=item_id, item=item, expected_updated_at=expected_updated_at)
+    if db_item is None:
+        if expected_updated_at is not None and await crud.get_item_updated_at(db, item_id) is not None:
+            raise HTTPException(status_code=412, detail="Precondition failed")
+        raise HTTPException(status_code=404, detail="Item not found")
+    item_flights.forget()
+    response.headers.update(item_headers(db_item.updated_at))
+    return db_item
+
+
+@router.delete("/{item_id}", status_code=204)
+async def delete_item(
+    item_id: UUID,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    指定されたIDのアイテムを削除します。
+
+    `If-Match` にアイテムの `ETag` を指定した場合は、取得後に他のクライアントが
+    更新していない場合のみ削除します（楽観的排他制御）。
+
+    Parameters
+    ----------
+    item_id : UUID
+        削除するアイテムのID
+    if_match : Optional[str], optional
+        取得時の `ETag`, by default None
+    db : AsyncSession
+        非同期データベースセッション
+
+    Raises
+    ------
+    HTTPException
+        アイテムが見つからない場合は404エラー、`If-Match` が一致しない場合は412エラー
+    """
+    expected_updated_at = _expected_updated_at(if_match)
+    if not await crud.delete_item(db=db, item_id=item_id, expected_updated_at=expected_updated_at):
+        if expected_updated_at is not None and await crud.get_item_updated_at(db, item_id) is not None:
+            raise HTTPException(status_code=412, detail="Precondition failed")
+        raise HTTPException(status_code=404, detail="Item not found")
+    item_flights.forget()
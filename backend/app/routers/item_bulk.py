@@ -0,0 +1,115 @@
+from typing import List, Sequence
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.instrumentation import TimedRoute
+from ..db.dependencies import get_db
+from ..cache import item as cache
+from ..db.schemas.item import (
+    Item, ItemBulkDelete, ItemBulkResult, ItemBulkUpdate, ItemCreate
+)
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["Items"],
+    route_class=TimedRoute
+)
+
+
+def _check_batch(count: int, ids: Sequence = ()) -> None:
+    """一括処理の件数上限とIDの重複を検証します。"""
+    if count > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items (max {settings.bulk_max_items})"
+        )
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=422, detail="Duplicate item ids")
+
+
+@router.post("/bulk", response_model=List[Item], status_code=201)
+def create_items(items: List[ItemCreate], db: Session = Depends(get_db)):
+    """
+    複数のアイテムを1つのトランザクション・1つのINSERT文で作成します。
+
+    Parameters
+    ----------
+    items : List[ItemCreate]
+        作成するアイテムの情報のリスト
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    List[Item]
+        作成されたアイテムオブジェクトのリスト（入力と同じ順序）
+
+    Raises
+    ------
+    HTTPException
+        件数が上限を超えた場合は413エラー
+    """
+    _check_batch(len(items))
+    return cache.create_items(db=db, items=items)
+
+
+@router.patch("/bulk", response_model=List[ItemBulkResult])
+def update_items(items: List[ItemBulkUpdate], db: Session = Depends(get_db)):
+    """
+    複数のアイテムを1つのトランザクション・1つのUPDATE文で更新します。
+
+    Parameters
+    ----------
+    items : List[ItemBulkUpdate]
+        更新する情報のリスト（各行にIDと更新するフィールドを指定）
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    List[ItemBulkResult]
+        行ごとの結果（入力と同じ順序）。見つからなかったIDは `not_found`
+
+    Raises
+    ------
+    HTTPException
+        件数が上限を超えた場合は413エラー、IDが重複している場合は422エラー
+    """
+    _check_batch(len(items), [item.id for item in items])
+    updated = cache.update_items(db=db, items=items)
+    return [
+        ItemBulkResult(id=item.id, status="updated", item=updated[item.id])
+        if item.id in updated
+        else ItemBulkResult(id=item.id, status="not_found")
+        for item in items
+    ]
+
+
+@router.delete("/bulk", response_model=List[ItemBulkResult])
+def delete_items(payload: ItemBulkDelete, db: Session = Depends(get_db)):
+    """
+    複数のアイテムを1つのトランザクション・1つのDELETE文で削除します。
+
+    Parameters
+    ----------
+    payload : ItemBulkDelete
+        削除するアイテムのIDのリスト
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    List[ItemBulkResult]
+        行ごとの結果（入力と同じ順序）。見つからなかったIDは `not_found`
+
+    Raises
+    ------
+    HTTPException
+        件数が上限を超えた場合は413エラー、IDが重複している場合は422エラー
+    """
+    _check_batch(len(payload.ids), payload.ids)
+    deleted = set(cache.delete_items(db=db, item_ids=payload.ids))
+    return [
+        ItemBulkResult(id=item_id, status="deleted" if item_id in deleted else "not_found")
+        for item_id in payload.ids
+    ]
@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from ..core.instrumentation import TimedRoute
+from ..db.models.database import SessionLocal
+from ..etl.item_export import MEDIA_TYPES, ExportFormat, stream_items
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["Items"],
+    route_class=TimedRoute
+)
+
+
+@router.get("/export")
+def export_items(format: ExportFormat = "ndjson", batch_size: int = 1000):
+    """
+    全アイテムをNDJSONまたはCSVでストリーミング出力します。
+
+    サーバーサイドカーソルで `batch_size` 行ずつ読み込みながら送信するため、
+    件数に関係なく最初のバイトまでの時間とメモリ使用量は一定です。
+
+    Parameters
+    ----------
+    format : ExportFormat, optional
+        出力形式（"ndjson" または "csv"）, by default "ndjson"
+    batch_size : int, optional
+        1回に取得・エンコードする行数, by default 1000
+
+    Returns
+    -------
+    StreamingResponse
+        エンコード済みのアイテムを順次送信するレスポンス
+    """
+    return StreamingResponse(
+        stream_items(SessionLocal, format, batch_size=max(1, min(batch_size, 10000))),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'}
+    )
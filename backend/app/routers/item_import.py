@@ -0,0 +1,64 @@
+import io
+import tempfile
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from ..core.instrumentation import TimedRoute
+from ..db.dependencies import get_db
+from ..db.schemas.item import ItemImportResult
+from ..etl.item_import import ImportFormat, import_items
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["Items"],
+    route_class=TimedRoute
+)
+
+# アップロードをメモリ上に保持する上限（超えた分は一時ファイルに書き出す）
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+@router.post("/import", response_model=ItemImportResult)
+async def import_items_endpoint(
+    request: Request,
+    format: ImportFormat = "csv",
+    db: Session = Depends(get_db)
+):
+    """
+    リクエストボディのCSV / NDJSONからアイテムを一括で取り込みます。
+
+    ボディはチャンク単位で受信して一時ファイルに書き出し、`COPY FROM STDIN` による
+    取り込みはスレッドプールで実行します。`SPOOL_MAX_BYTES` を超えてディスクに書き出す
+    チャンクは、イベントループを止めないようスレッドプールで書き込みます。CSVは1行目をヘッダー（`name`, `description`）
+    として扱います。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト（ボディのストリーミング受信用）
+    format : ImportFormat, optional
+        入力形式（"csv" または "ndjson"）, by default "csv"
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    ItemImportResult
+        取り込み件数、エラー件数、エラー行、スループット
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > SPOOL_MAX_BYTES:
+                # 上限を超えた時点で一時ファイルに書き出すため（以降もディスクへの書き込み）、スレッドで実行する
+                await run_in_threadpool(spool.write, chunk)
+            else:
+                spool.write(chunk)
+        spool.seek(0)
+
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(import_items, db, stream, format)
+        finally:
+            stream.detach()
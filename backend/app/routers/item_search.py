@@ -0,0 +1,69 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..core.instrumentation import TimedRoute
+from ..core.serialization import RowsResponse
+from ..db.dependencies import get_read_db
+from ..db.pagination import InvalidCursorError, decode_search_cursor, encode_search_cursor
+from ..db.crud import item as crud
+from ..db.schemas.item import ItemSearchResult
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["Items"],
+    route_class=TimedRoute
+)
+
+# 検索結果の1ページで取得できる最大件数
+SEARCH_MAX_LIMIT = 100
+
+
+@router.get("/search", response_model=List[ItemSearchResult])
+def search_items(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    名前と説明からアイテムを検索します。
+
+    全文検索と名前のあいまい検索（タイプミスなど）の結果を、一致度の高い順に返します。
+    取得件数が `limit` に達した場合は、次ページのカーソルを `X-Next-Cursor` ヘッダーで返します。
+
+    Parameters
+    ----------
+    q : str
+        検索文字列（`"完全一致"`、`OR`、`-除外` を使用可能）
+    limit : int, optional
+        取得する最大件数（1〜`SEARCH_MAX_LIMIT`）, by default 20
+    cursor : Optional[str], optional
+        前ページのレスポンスの `X-Next-Cursor` の値, by default None
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    RowsResponse
+        スコア（`rank`）付きのアイテムのJSON配列（スコアの高い順）
+
+    Raises
+    ------
+    HTTPException
+        検索文字列が空白のみの場合・件数が範囲外の場合は422エラー、カーソルが不正な場合は400エラー
+    """
+    if not q.strip():
+        raise HTTPException(status_code=422, detail="Query must not be empty")
+
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_search_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = crud.search_items(db, q.strip(), limit=limit, after=after)
+
+    headers = {}
+    if rows and len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_search_cursor(rows[-1].rank, rows[-1].id)
+    return RowsResponse(rows, headers=headers)
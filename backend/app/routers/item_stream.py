@@ -0,0 +1,150 @@
+import asyncio
+from typing import List, Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Query, Response, WebSocket
+from starlette.types import Receive, Scope, Send
+from ..core.instrumentation import TimedRoute
+from ..feeds.item import CLOSED, OPERATIONS, PING, FeedFull, Subscription, item_change_feed
+
+router = APIRouter(
+    prefix="/api/items",
+    tags=["Items"],
+    route_class=TimedRoute
+)
+
+ItemChangeOperation = Literal["insert", "update", "delete"]
+
+# EventSource が切断後に再接続するまでのミリ秒
+SSE_RETRY_MILLISECONDS = 3000
+
+
+async def _subscribe(ids: Optional[List[UUID]], ops: Optional[List[ItemChangeOperation]]) -> Subscription:
+    return await item_change_feed.subscribe(
+        item_ids={str(item_id) for item_id in ids} if ids else None,
+        operations=set(ops) if ops else OPERATIONS,
+    )
+
+
+class SubscriptionResponse(Response):
+    """
+    購読した変更を Server-Sent Events で送信するレスポンスです。
+
+    `StreamingResponse` と異なり、接続ごとのタスクは切断を待つ1つだけで、送信はキューから直接行います
+    （待機中の接続1本あたりのメモリ使用量を抑えるため）。切断時・フィードの停止時に購読を終了します。
+
+    Parameters
+    ----------
+    subscription : Subscription
+        購読
+    """
+    media_type = "text/event-stream"
+
+    def __init__(self, subscription: Subscription):
+        self.subscription = subscription
+        self.status_code = 200
+        self.background = None
+        # プロキシ（Nginx）でバッファリングされないようにする
+        self.init_headers({"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def wait_for_disconnect() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            self.subscription.close()
+
+        watcher = asyncio.create_task(wait_for_disconnect())
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({
+                "type": "http.response.body",
+                "body": f"retry: {SSE_RETRY_MILLISECONDS}\n\n".encode(),
+                "more_body": True,
+            })
+            while (change := await self.subscription.get()) is not CLOSED:
+                await send({"type": "http.response.body", "body": change.sse, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            watcher.cancel()
+            item_change_feed.unsubscribe(self.subscription)
+
+
+@router.get("/stream")
+async def stream_item_changes(
+    ids: Optional[List[UUID]] = Query(None),
+    ops: Optional[List[ItemChangeOperation]] = Query(None)
+):
+    """
+    アイテムの作成・更新・削除を Server-Sent Events で配信します。
+
+    イベントの種類は `insert` / `update` / `delete` で、データは `{"op", "id", "updated_at"}` です。
+    1回の操作で多数のアイテムが変更された場合は `id` の代わりに `count` を含む1件のイベントに、
+    受信が追いつかず変更を破棄した場合や再接続した場合は `resync` イベントになります
+    （いずれも一覧を取得し直してください）。
+
+    Parameters
+    ----------
+    ids : Optional[List[UUID]]
+        受け取るアイテムのID（省略した場合は全てのアイテム）
+    ops : Optional[List[ItemChangeOperation]]
+        受け取る変更の種類（省略した場合は全て）
+
+    Returns
+    -------
+    SubscriptionResponse
+        `text/event-stream` のレスポンス
+
+    Raises
+    ------
+    HTTPException
+        接続数が上限に達している場合は503エラー
+    """
+    try:
+        subscription = await _subscribe(ids, ops)
+    except FeedFull:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+    return SubscriptionResponse(subscription)
+
+
+@router.websocket("/stream")
+async def stream_item_changes_websocket(
+    websocket: WebSocket,
+    ids: Optional[List[UUID]] = Query(None),
+    ops: Optional[List[ItemChangeOperation]] = Query(None)
+):
+    """
+    アイテムの作成・更新・削除を WebSocket で配信します。
+
+    メッセージは Server-Sent Events のデータと同じJSONです（`op` が `resync` の場合は一覧を取得し直してください）。
+    接続数が上限に達している場合はコード1013で切断します。
+
+    Parameters
+    ----------
+    websocket : WebSocket
+        WebSocket の接続
+    ids : Optional[List[UUID]]
+        受け取るアイテムのID（省略した場合は全てのアイテム）
+    ops : Optional[List[ItemChangeOperation]]
+        受け取る変更の種類（省略した場合は全て）
+    """
+    await websocket.accept()
+    try:
+        subscription = await _subscribe(ids, ops)
+    except FeedFull:
+        await websocket.close(code=1013)
+        return
+
+    async def send() -> None:
+        while (change := await subscription.get()) is not CLOSED:
+            # 接続の維持は WebSocket の ping（uvicorn が送信）で行う
+            if change is not PING:
+                await websocket.send_text(change.data)
+        await websocket.close()
+
+    sender = asyncio.create_task(send())
+    try:
+        # クライアントからのメッセージは使用しないが、切断を検知するために受信し続ける
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        item_change_feed.unsubscribe(subscription)
@@ -0,0 +1,229 @@
+import contextlib
+import os
+import uuid
+from typing import Any, Callable
+import anyio
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from redis import RedisError
+from ..core.config import settings
+from ..core.instrumentation import TimedRoute
+from ..db.schemas.job import Job
+from ..etl.item_export import ExportFormat
+from ..etl.item_import import ImportFormat
+from ..jobs.queue import job_queue
+from ..jobs.tasks import result_path
+
+router = APIRouter(
+    prefix="/api/jobs",
+    tags=["Jobs"],
+    route_class=TimedRoute
+)
+
+
+def _call(function: Callable[..., Any], *args: Any) -> Any:
+    """キューの操作を実行し、Redisに接続できない場合は503エラーにします。"""
+    try:
+        return function(*args)
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Job queue is unavailable")
+
+
+def _remove(path: str) -> None:
+    """ファイルを削除します（存在しない場合は何もしません）。"""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def _accepted(response: Response, job: dict) -> dict:
+    """登録したジョブを202で返し、状態を確認するURLを Location ヘッダーに設定します。"""
+    response.headers["Location"] = f"{router.prefix}/{job['id']}"
+    return job
+
+
+@router.post("/items/import", response_model=Job, status_code=202)
+async def enqueue_import(request: Request, response: Response, format: ImportFormat = "csv"):
+    """
+    リクエストボディのCSV / NDJSONからアイテムを取り込むジョブを登録します。
+
+    ボディは `JOB_DATA_DIR` に保存し、取り込みはワーカーで実行します。
+    進捗・結果は `GET /api/jobs/{job_id}` で確認できます。
+
+    Parameters
+    ----------
+    request : Request
+        リクエスト（ボディのストリーミング受信用）
+    response : Response
+        レスポンス（Location ヘッダーの設定用）
+    format : ImportFormat, optional
+        入力形式（"csv" または "ndjson"）, by default "csv"
+
+    Returns
+    -------
+    Job
+        登録したジョブの状態
+
+    Raises
+    ------
+    HTTPException
+        ジョブキューに接続できない場合は503エラー
+    """
+    # ファイルの操作はスレッドで実行し、大きなファイルの受信中もイベントループを止めない
+    await run_in_threadpool(os.makedirs, settings.job_data_dir, exist_ok=True)
+    path = os.path.join(settings.job_data_dir, f"upload-{uuid.uuid4().hex}.{format}")
+    try:
+        async with await anyio.open_file(path, "wb") as file:
+            async for chunk in request.stream():
+                await file.write(chunk)
+        job = await run_in_threadpool(_call, job_queue.enqueue, "items.import", {"path": path, "format": format})
+    except BaseException:
+        # 切断（キャンセル）された場合も受信途中のファイルを削除する
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(_remove, path)
+        raise
+    return _accepted(response, job)
+
+
+@router.post("/items/export", response_model=Job, status_code=202)
+def enqueue_export(response: Response, format: ExportFormat = "ndjson", batch_size: int = 1000):
+    """
+    全アイテムをNDJSONまたはCSVのファイルに書き出すジョブを登録します。
+
+    完了後、`GET /api/jobs/{job_id}/result` でファイルをダウンロードできます。
+
+    Parameters
+    ----------
+    response : Response
+        レスポンス（Location ヘッダーの設定用）
+    format : ExportFormat, optional
+        出力形式（"ndjson" または "csv"）, by default "ndjson"
+    batch_size : int, optional
+        1回に取得・エンコードする行数, by default 1000
+
+    Returns
+    -------
+    Job
+        登録したジョブの状態
+
+    Raises
+    ------
+    HTTPException
+        ジョブキューに接続できない場合は503エラー
+    """
+    params = {"format": format, "batch_size": max(1, min(batch_size, 10000))}
+    return _accepted(response, _call(job_queue.enqueue, "items.export", params))
+
+
+@router.post("/kpi/rollups", response_model=Job, status_code=202)
+def enqueue_rollup_refresh(response: Response, rebuild: bool = False):
+    """
+    KPIのロールアップを更新するジョブを登録します。
+
+    Parameters
+    ----------
+    response : Response
+        レスポンス（Location ヘッダーの設定用）
+    rebuild : bool, optional
+        全期間の測定値から集計し直すかどうか, by default False
+
+    Returns
+    -------
+    Job
+        登録したジョブの状態
+
+    Raises
+    ------
+    HTTPException
+        ジョブキューに接続できない場合は503エラー
+    """
+    return _accepted(response, _call(job_queue.enqueue, "kpi.rollups.refresh", {"rebuild": rebuild}))
+
+
+@router.get("/{job_id}", response_model=Job)
+def read_job(job_id: str):
+    """
+    ジョブの状態・進捗・結果を取得します。
+
+    Parameters
+    ----------
+    job_id : str
+        ジョブのID
+
+    Returns
+    -------
+    Job
+        ジョブの状態
+
+    Raises
+    ------
+    HTTPException
+        ジョブが見つからない場合は404エラー、ジョブキューに接続できない場合は503エラー
+    """
+    job = _call(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=Job)
+def cancel_job(job_id: str):
+    """
+    ジョブをキャンセルします。
+
+    実行待ち・リトライ待ちのジョブは直ちにキャンセルされます。実行中のジョブは
+    次に進捗を報告した時点で中断され、トランザクションはロールバックされます。
+    完了したジョブは変更されません。
+
+    Parameters
+    ----------
+    job_id : str
+        ジョブのID
+
+    Returns
+    -------
+    Job
+        キャンセル後のジョブの状態
+
+    Raises
+    ------
+    HTTPException
+        ジョブが見つからない場合は404エラー、ジョブキューに接続できない場合は503エラー
+    """
+    job = _call(job_queue.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result")
+def download_job_result(job_id: str):
+    """
+    エクスポートジョブが出力したファイルをダウンロードします。
+
+    Parameters
+    ----------
+    job_id : str
+        ジョブのID
+
+    Returns
+    -------
+    FileResponse
+        出力されたファイル
+
+    Raises
+    ------
+    HTTPException
+        ジョブ・ファイルが見つからない場合は404エラー、ジョブが成功していない場合は409エラー、
+        ジョブキューに接続できない場合は503エラー
+    """
+    job = _call(job_queue.get, job_id)
+    if job is None or job["type"] != "items.export":
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    path = result_path(settings.job_data_dir, job)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Result file has expired")
+    return FileResponse(path, media_type=job["result"]["media_type"], filename=job["result"]["filename"])
@@ -0,0 +1,160 @@
+import time
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import AwareDatetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.instrumentation import TimedRoute
+from ..core.serialization import RowsResponse
+from ..db.dependencies import get_db, get_read_db
+from ..db.crud import kpi_measurement as crud
+from ..db.crud import kpi_rollup
+from ..db.partitions import MeasurementWindowError
+from ..db.schemas.kpi_measurement import (
+    KpiAggregate, KpiMeasurement, KpiMeasurementCreate, KpiMeasurementIngestResult
+)
+
+router = APIRouter(
+    prefix="/api/measurements",
+    tags=["KPI Measurements"],
+    route_class=TimedRoute
+)
+
+# 測定値の一覧で1回に取得できる最大件数
+MEASUREMENTS_MAX_LIMIT = 10000
+
+
+@router.post("", response_model=KpiMeasurementIngestResult)
+def ingest_measurements(points: List[KpiMeasurementCreate], db: Session = Depends(get_db)):
+    """
+    KPIの測定値を一括で取り込みます。
+
+    1リクエストで最大 `MEASUREMENT_BATCH_MAX_POINTS` 件の測定値を1つのトランザクションで保存します。
+    同じアイテム・同じ日時の測定値は上書きされるため、失敗したバッチはそのまま再送できます。
+    測定日時は保持期間の最初の月から `MEASUREMENT_PARTITION_MONTHS_AHEAD` か月先の月まで、
+    1リクエストの月数は `MEASUREMENT_BATCH_MAX_MONTHS` までです。
+
+    Parameters
+    ----------
+    points : List[KpiMeasurementCreate]
+        取り込む測定値のリスト
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    KpiMeasurementIngestResult
+        受け取った件数、保存した件数、処理時間
+
+    Raises
+    ------
+    HTTPException
+        件数が上限を超えた場合は413エラー、取り込める範囲外の測定日時または存在しないアイテムのIDが含まれる場合は422エラー
+    """
+    if len(points) > settings.measurement_batch_max_points:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many points (max {settings.measurement_batch_max_points})"
+        )
+
+    started = time.perf_counter()
+    try:
+        stored = crud.ingest_measurements(db, points)
+    except MeasurementWindowError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IntegrityError:
+        db.rollback()
+        missing = crud.get_missing_item_ids(db, [point.item_id for point in points])
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "Unknown item ids", "item_ids": [str(item_id) for item_id in missing]}
+        )
+    return KpiMeasurementIngestResult(
+        received=len(points),
+        stored=stored,
+        elapsed_seconds=round(time.perf_counter() - started, 6),
+    )
+
+
+@router.get("", response_model=List[KpiMeasurement])
+def read_measurements(
+    item_id: UUID,
+    start: AwareDatetime,
+    end: AwareDatetime,
+    limit: int = Query(1000, ge=1, le=MEASUREMENTS_MAX_LIMIT),
+    db: Session = Depends(get_read_db)
+):
+    """
+    アイテムの指定された期間の測定値を取得します。
+
+    Parameters
+    ----------
+    item_id : UUID
+        アイテムのID
+    start : AwareDatetime
+        期間の開始日時（この日時を含む、タイムゾーン付き）
+    end : AwareDatetime
+        期間の終了日時（この日時を含まない、タイムゾーン付き）
+    limit : int, optional
+        取得する最大件数（1〜`MEASUREMENTS_MAX_LIMIT`）, by default 1000
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    RowsResponse
+        測定値のJSON配列（測定日時の順）
+
+    Raises
+    ------
+    HTTPException
+        期間・件数の指定が不正な場合は422エラー
+    """
+    if start >= end:
+        raise HTTPException(status_code=422, detail="start must be earlier than end")
+    return RowsResponse(crud.get_measurements(db, item_id, start, end, limit=limit))
+
+
+@router.get("/aggregates", response_model=List[KpiAggregate])
+def read_aggregates(
+    item_id: UUID,
+    start: AwareDatetime,
+    end: AwareDatetime,
+    bucket: kpi_rollup.AggregateBucket = "day",
+    db: Session = Depends(get_read_db)
+):
+    """
+    アイテムの指定された期間の測定値を集計単位ごとに集計します（ダッシュボード用）。
+
+    期間と集計単位に応じて最も粗いロールアップ（1か月・1日・1時間ごと）から集計し、
+    集計元を `X-Aggregate-Source` ヘッダー（"month"、"day"、"hour"、"raw"）で返します。
+
+    Parameters
+    ----------
+    item_id : UUID
+        アイテムのID
+    start : AwareDatetime
+        期間の開始日時（この日時を含む、タイムゾーン付き）
+    end : AwareDatetime
+        期間の終了日時（この日時を含まない、タイムゾーン付き）
+    bucket : AggregateBucket, optional
+        集計単位（"hour"、"day"、"week"、"month"、"year"）, by default "day"
+    db : Session
+        データベースセッション
+
+    Returns
+    -------
+    RowsResponse
+        集計結果のJSON配列（期間の順）
+
+    Raises
+    ------
+    HTTPException
+        期間の指定が不正な場合は422エラー
+    """
+    if start >= end:
+        raise HTTPException(status_code=422, detail="start must be earlier than end")
+    source, rows = kpi_rollup.get_aggregates(db, item_id, bucket, start, end)
+    return RowsResponse(rows, headers={"X-Aggregate-Source": source})
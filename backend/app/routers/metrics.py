@@ -0,0 +1,123 @@
+from typing import Any, Dict
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from redis import RedisError
+from ..cache.item import item_cache, item_flights
+from ..core.config import settings
+from ..core.instrumentation import TimedRoute, request_metrics
+from ..db.models.database import (
+    async_pool_metrics, async_statement_cache_metrics, pool_metrics, statement_cache_metrics
+)
+from ..db.replicas import replica_router
+from ..feeds.item import item_change_feed
+from ..jobs.queue import job_queue
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    route_class=TimedRoute
+)
+
+
+@router.get("", response_class=PlainTextResponse)
+async def read_request_metrics() -> PlainTextResponse:
+    """
+    リクエストの処理時間の内訳（合計・SQLの実行時間と実行回数・プール待ち・シリアライズ）の
+    ヒストグラムを Prometheus のテキスト形式で取得します。
+
+    Returns
+    -------
+    PlainTextResponse
+        メソッド・ルート・ステータスコードごとのヒストグラム
+    """
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/pool")
+async def read_pool_metrics() -> Dict[str, Any]:
+    """
+    データベースのコネクションプールの利用状況を取得します。
+
+    チェックアウト中・アイドルの接続数、オーバーフロー数、チェックアウト待ち時間、
+    タイムアウト回数を返します。非同期エンジンが有効な場合はその状況も、リードレプリカを使用する場合は
+    レプリカごとの状況（死活・レプリケーション遅延を含む）と振り分けの件数も含めます。
+
+    Returns
+    -------
+    Dict[str, Any]
+        エンジンごとのプールの状態
+    """
+    pools = {"primary": pool_metrics.snapshot()}
+    if settings.use_async_db:
+        pools["async"] = async_pool_metrics.snapshot()
+    if replica_router.enabled:
+        pools["replicas"] = replica_router.stats()
+    return pools
+
+
+@router.get("/statements")
+async def read_statement_cache_metrics() -> Dict[str, Any]:
+    """
+    エンジンごとのコンパイル済みSQLのキャッシュの件数とヒット率を取得します。
+
+    ヒット率が低い場合は、呼び出しごとに形の異なるSQL（値をリテラルとして埋め込んだSQLなど）を
+    組み立てているか、`DB_STATEMENT_CACHE_SIZE` が実行するSQLの種類に対して小さすぎます。
+
+    Returns
+    -------
+    Dict[str, Any]
+        エンジンごとのキャッシュの状態（リードレプリカを使用する場合はレプリカごとの状態を含む）
+    """
+    caches = {"primary": statement_cache_metrics.snapshot()}
+    if settings.use_async_db:
+        caches["async"] = async_statement_cache_metrics.snapshot()
+    if replica_router.enabled:
+        caches["replicas"] = [replica.statement_cache_metrics.snapshot() for replica in replica_router.replicas]
+    return caches
+
+
+@router.get("/cache")
+async def read_cache_metrics() -> Dict[str, Any]:
+    """
+    アイテムキャッシュのヒット・ミス数などの統計と、同時の読み取りをまとめた数（single-flight）を取得します。
+
+    Returns
+    -------
+    Dict[str, Any]
+        キャッシュごとの統計
+    """
+    return {"item": item_cache.stats(), "single_flight": item_flights.stats()}
+
+
+@router.get("/streams")
+async def read_stream_metrics() -> Dict[str, Any]:
+    """
+    アイテム変更ストリームの接続数・受信した通知数・破棄した変更数などの統計を取得します。
+
+    Returns
+    -------
+    Dict[str, Any]
+        ストリームごとの統計
+    """
+    return {"items": item_change_feed.stats()}
+
+
+@router.get("/jobs")
+def read_job_metrics() -> Dict[str, int]:
+    """
+    ジョブキューの実行待ち・リトライ待ち・実行中のジョブの件数を取得します。
+
+    Returns
+    -------
+    Dict[str, int]
+        状態ごとのジョブの件数
+
+    Raises
+    ------
+    HTTPException
+        ジョブキューに接続できない場合は503エラー
+    """
+    try:
+        return job_queue.stats()
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Job queue is unavailable")
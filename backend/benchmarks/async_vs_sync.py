@@ -0,0 +1,97 @@
+"""
+同期（スレッドプール + psycopg2）と非同期（asyncpg）のAPIスループット比較ベンチマーク
+
+`USE_ASYNC_DB=false` と `USE_ASYNC_DB=true` のuvicornプロセスをそれぞれ起動し、
+同じデータベースに対して同じ負荷をかけて requests/sec と p50/p95/p99 を比較します。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.async_vs_sync --concurrency 64 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import httpx
+
+from .loadgen import format_result, run_load
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def spawn_server(use_async_db: bool, **env: str) -> Iterator[str]:
+    """指定したモード・環境変数でuvicornを起動し、ベースURLを返します。"""
+    port = _free_port()
+    env = dict(os.environ, USE_ASYNC_DB=str(use_async_db).lower(), **env)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            raise RuntimeError(f"server on port {port} did not start")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def seed_items(base_url: str, count: int) -> List[str]:
+    """ベンチマーク用のアイテムをAPI経由で作成し、IDのリストを返します。"""
+    with httpx.Client(base_url=base_url) as client:
+        return [
+            client.post("/api/items", json={"name": f"bench-{i}"}).json()["id"]
+            for i in range(count)
+        ]
+
+
+async def _run_scenarios(label: str, base_url: str, item_ids: List[str], args) -> None:
+    scenarios = {
+        "GET /api/items/{item_id}": lambda n: f"/api/items/{random.choice(item_ids)}",
+        "GET /api/items?limit=100": lambda n: "/api/items?limit=100",
+    }
+    for name, path_factory in scenarios.items():
+        # ウォームアップ（コネクションプールとコンパイルキャッシュを温める）
+        await run_load(base_url, path_factory, args.concurrency, args.concurrency * 4)
+        result = await run_load(base_url, path_factory, args.concurrency, args.requests)
+        print(format_result(f"[{label}] {name}", result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=200, help="作成するアイテム数")
+    args = parser.parse_args()
+
+    item_ids: List[str] = []
+    for label, use_async_db in (("sync", False), ("async", True)):
+        with spawn_server(use_async_db) as base_url:
+            if not item_ids:
+                item_ids = seed_items(base_url, args.seed)
+            asyncio.run(_run_scenarios(label, base_url, item_ids, args))
+
+
+if __name__ == "__main__":
+    main()
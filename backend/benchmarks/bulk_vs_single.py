@@ -0,0 +1,67 @@
+"""
+一括作成・更新・削除（単一SQL文）と1件ずつの処理のスループット比較ベンチマーク
+
+CRUD関数を直接呼び出し、行数ごとに rows/sec を計測します。1件ずつの処理は
+`--single-limit` を超える行数では時間がかかりすぎるため省略します。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.bulk_vs_single --sizes 1000 10000 100000
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from app.db.crud import item as crud
+from app.db.models.database import SessionLocal
+from app.db.schemas.item import ItemBulkUpdate, ItemCreate, ItemUpdate
+
+
+def _measure(label: str, rows: int, fn: Callable[[], object]) -> None:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {rows:>8} rows  {elapsed:>8.3f}s  {rows / elapsed:>12.1f} rows/s")
+
+
+def run(size: int, single_limit: int) -> None:
+    payloads = [ItemCreate(name=f"bulk-{i}", description="benchmark") for i in range(size)]
+
+    with SessionLocal() as db:
+        created = []
+        _measure("bulk create", size, lambda: created.extend(crud.create_items(db, payloads)))
+        ids = [item.id for item in created]
+        updates = [ItemBulkUpdate(id=item_id, name="bulk-updated") for item_id in ids]
+        _measure("bulk update", size, lambda: crud.update_items(db, updates))
+        _measure("bulk delete", size, lambda: crud.delete_items(db, ids))
+
+        if size > single_limit:
+            print(f"{'single (skipped)':<28} {size:>8} rows")
+            return
+
+        single_ids: List = []
+        _measure("single create", size, lambda: single_ids.extend(
+            crud.create_item(db, payload).id for payload in payloads
+        ))
+        _measure("single update", size, lambda: [
+            crud.update_item(db, item_id, ItemUpdate(name="single-updated")) for item_id in single_ids
+        ])
+        _measure("single delete", size, lambda: [
+            crud.delete_item(db, item_id) for item_id in single_ids
+        ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--single-limit", type=int, default=10000,
+                        help="1件ずつの処理を計測する最大行数")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.single_limit)
+        print()
+
+
+if __name__ == "__main__":
+    main()
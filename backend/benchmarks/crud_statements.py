@@ -0,0 +1,174 @@
+"""
+組み立て済みのSQL（バインドパラメータ）とプリペアドステートメントの効果を計測するマイクロベンチマーク
+
+1. Python 側: 呼び出しごとに文を組み立てる変更前の実装と、組み立て済みの文を使用する現在の CRUD 関数を
+   交互に実行し、1回あたりのプロセスのCPU時間（`time.process_time`、PostgreSQL の処理時間を含まない）を比較します。
+2. PostgreSQL 側: 同じ文の1回あたりの計画（planning）時間を `EXPLAIN (ANALYZE, SUMMARY)` で計測し、
+   非同期エンジン（asyncpg）でプリペアドステートメントのキャッシュを無効（`0`）・有効にした場合の
+   1回あたりの処理時間を比較します（キャッシュが有効な場合、2回目以降は解析・計画を省略できます）。
+
+最後にエンジンのコンパイル済みSQLのキャッシュのヒット率を表示します。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.crud_statements --calls 2000
+"""
+import argparse
+import asyncio
+import re
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.crud import item as crud
+from app.db.models.database import ASYNC_DATABASE_URL, SessionLocal, init_engines, statement_cache_metrics
+from app.db.models.item import Item
+from app.db.schemas.item import ItemCreate, ItemUpdate
+
+
+def legacy_get_items(db, skip: int = 0, limit: int = 100):
+    return list(db.execute(
+        select(Item).order_by(Item.created_at, Item.id).offset(skip).limit(limit)
+    ).scalars())
+
+
+def legacy_get_item_rows(db, skip: int = 0, limit: int = 100, after=None, columns=crud.ITEM_COLUMNS):
+    stmt = select(*columns).order_by(Item.created_at, Item.id).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(Item.created_at, Item.id) > tuple_(*after))
+    else:
+        stmt = stmt.offset(skip)
+    return list(db.execute(stmt))
+
+
+def legacy_update_item(db, item_id, item: ItemUpdate):
+    result = db.execute(update(Item).where(Item.id == item_id).values(**item.model_dump(exclude_unset=True)).returning(Item))
+    db.commit()
+    return result.scalar_one_or_none()
+
+
+def legacy_delete_item(db, item_id):
+    result = db.execute(delete(Item).where(Item.id == item_id))
+    db.commit()
+    return result.rowcount > 0
+
+
+def _cpu_per_call(call: Callable[[], object], calls: int) -> float:
+    for _ in range(min(calls, 200)):
+        call()
+    started = time.process_time()
+    for _ in range(calls):
+        call()
+    return (time.process_time() - started) / calls
+
+
+def measure_python(db, calls: int, repeat: int, item_ids: List[uuid.UUID]) -> None:
+    after = (crud.get_items(db, limit=1)[0].created_at, item_ids[0])
+    missing = uuid.uuid4()
+    cases: Dict[str, Dict[str, Callable[[], object]]] = {
+        "get_items": {
+            "before": lambda: legacy_get_items(db, limit=10),
+            "after": lambda: crud.get_items(db, limit=10),
+        },
+        "get_item_rows (keyset)": {
+            "before": lambda: legacy_get_item_rows(db, limit=10, after=after),
+            "after": lambda: crud.get_item_rows(db, limit=10, after=after),
+        },
+        "update_item": {
+            "before": lambda: legacy_update_item(db, item_ids[1], ItemUpdate(name="before")),
+            "after": lambda: crud.update_item(db, item_ids[1], ItemUpdate(name="after")),
+        },
+        "delete_item (missing)": {
+            "before": lambda: legacy_delete_item(db, missing),
+            "after": lambda: crud.delete_item(db, missing),
+        },
+    }
+    print(f"{'python cpu / call':<24} {'before µs':>10} {'after µs':>10} {'saved µs':>10}")
+    for name, variants in cases.items():
+        best = {variant: float("inf") for variant in variants}
+        for _ in range(repeat):
+            for variant, call in variants.items():
+                best[variant] = min(best[variant], _cpu_per_call(call, calls))
+        print(
+            f"{name:<24} {best['before'] * 1e6:>10.1f} {best['after'] * 1e6:>10.1f} "
+            f"{(best['before'] - best['after']) * 1e6:>10.1f}"
+        )
+
+
+def measure_planning(db, item_ids: List[uuid.UUID]) -> None:
+    statements = {
+        "get_items": (crud.items_statement(), {"skip": 0, "limit": 10}),
+        "get_item_rows (keyset)": (
+            crud.items_statement(crud.ITEM_COLUMNS, keyset=True),
+            {"limit": 10, **crud.after_params((crud.get_items(db, limit=1)[0].created_at, item_ids[0]))},
+        ),
+        "get_item_updated_at": (crud.ITEM_UPDATED_AT, {"item_id": item_ids[0]}),
+    }
+    print(f"\n{'postgres planning / call':<24} {'ms':>10}")
+    for name, (stmt, params) in statements.items():
+        # コンパイル済みのSQL（psycopg2 のパラメータ形式）のまま EXPLAIN に渡す
+        compiled = stmt.compile(db.get_bind())
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN (ANALYZE, SUMMARY) {compiled}", compiled.construct_params(params)
+        ).scalars().all()
+        planning = next(float(re.search(r"([\d.]+) ms", line).group(1)) for line in plan if line.startswith("Planning Time"))
+        print(f"{name:<24} {planning:>10.3f}")
+    db.rollback()
+
+
+async def _asyncpg_per_call(cache_size: int, calls: int) -> float:
+    url = make_url(ASYNC_DATABASE_URL).update_query_dict({"prepared_statement_cache_size": str(cache_size)})
+    engine = create_async_engine(url, pool_size=1)
+    try:
+        async with engine.connect() as conn:
+            stmt = crud.items_statement(crud.ITEM_COLUMNS)
+            for _ in range(min(calls, 200)):
+                await conn.execute(stmt, {"skip": 0, "limit": 10})
+            started = time.perf_counter()
+            for _ in range(calls):
+                await conn.execute(stmt, {"skip": 0, "limit": 10})
+            return (time.perf_counter() - started) / calls
+    finally:
+        await engine.dispose()
+
+
+def measure_prepared(calls: int, repeat: int) -> None:
+    best = {0: float("inf"), 100: float("inf")}
+    for _ in range(repeat):
+        for size in best:
+            best[size] = min(best[size], asyncio.run(_asyncpg_per_call(size, calls)))
+    print(f"\n{'asyncpg get_item_rows':<24} {'ms / call':>10}")
+    print(f"{'unprepared (cache 0)':<24} {best[0] * 1e3:>10.3f}")
+    print(f"{'prepared (cache 100)':<24} {best[100] * 1e3:>10.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000, help="1回の計測の呼び出し回数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の回数（最小値を使用する）")
+    args = parser.parse_args()
+
+    init_engines()
+    prefix = f"bench-stmt-{uuid.uuid4().hex[:8]}"
+    with SessionLocal() as db:
+        item_ids = [item.id for item in crud.create_items(db, [ItemCreate(name=f"{prefix}-{i}") for i in range(20)])]
+        try:
+            measure_python(db, args.calls, args.repeat, item_ids)
+            measure_planning(db, item_ids)
+        finally:
+            db.execute(delete(Item).where(Item.name.startswith(prefix)))
+            db.commit()
+    try:
+        measure_prepared(args.calls, args.repeat)
+    except ImportError:
+        print("\nasyncpg is not installed; skipping prepared statement comparison")
+
+    print(f"\ncompiled cache: {statement_cache_metrics.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+リクエストごとの計測（`InstrumentationMiddleware` / `TimedRoute` / SQLのイベントリスナー）のオーバーヘッドのベンチマーク
+
+同じエンドポイント（`--queries` 回の SQL を実行し、`response_model` で変換した値を返す）を、
+計測なしのアプリケーションと計測ありのアプリケーションで作成し、ネットワークを介さずに
+ASGI アプリケーションを直接呼び出して1リクエストあたりの処理時間の差を計測します。
+SQL は SQLite（インメモリ）で実行するため、PostgreSQL は不要です。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.instrumentation --requests 2000 --repeat 20 --queries 1
+"""
+import argparse
+import asyncio
+import time
+from typing import Type
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.instrumentation import InstrumentationMiddleware, RequestMetrics, TimedRoute, instrument_engine
+
+
+class Payload(BaseModel):
+    id: int
+    name: str
+
+
+def build_app(route_class: Type[APIRoute], instrumented: bool, queries: int) -> FastAPI:
+    """計測の有無だけが異なるアプリケーションを作成します。"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    if instrumented:
+        instrument_engine(engine)
+    connection = engine.connect()
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/items/{item_id}", response_model=Payload)
+    async def read_item(item_id: int):
+        for _ in range(queries):
+            connection.execute(text("SELECT 1"))
+        return {"id": item_id, "name": "benchmark"}
+
+    app = FastAPI()
+    app.include_router(router)
+    if instrumented:
+        app.add_middleware(InstrumentationMiddleware, metrics=RequestMetrics())
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """ASGI アプリケーションを直接呼び出し、1リクエストあたりの処理時間（秒）を返します。"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/items/1", "raw_path": b"/items/1", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"benchmark")], "server": ("benchmark", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(min(requests, 1000)):
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="1回の計測のリクエスト数")
+    parser.add_argument("--queries", type=int, default=1, help="1リクエストで実行するSQLの数")
+    parser.add_argument("--repeat", type=int, default=20, help="計測の回数（最小値を使用する）")
+    args = parser.parse_args()
+
+    plain = build_app(APIRoute, instrumented=False, queries=args.queries)
+    instrumented = build_app(TimedRoute, instrumented=True, queries=args.queries)
+    # 計測ありとなしを交互に計測し、負荷の変動の影響を揃える
+    baseline = timed = float("inf")
+    for _ in range(args.repeat):
+        baseline = min(baseline, asyncio.run(measure(plain, args.requests)))
+        timed = min(timed, asyncio.run(measure(instrumented, args.requests)))
+    print(f"without instrumentation {baseline * 1e6:>8.1f} µs/request")
+    print(f"with instrumentation    {timed * 1e6:>8.1f} µs/request")
+    print(f"overhead                {(timed - baseline) * 1e6:>8.1f} µs/request ({args.queries} queries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+アイテムAPI（`app/routers/item.py`）の負荷試験・レイテンシのベンチマーク
+
+ベンチマーク用のデータベース（`<DATABASE_NAME>_bench`）を作成してマイグレーションを適用し、
+`--sizes` の件数ごとに items テーブルに行を追加したうえで、uvicorn を起動して各エンドポイントに
+`--concurrency` の同時実行数ごとに負荷をかけ、requests/sec と p50/p95/p99 を計測します。
+
+計測結果は `--baseline` のファイル（JSON）と比較し、スループットの低下または p95 の増加が
+`--threshold` を超えた項目がある場合（エラーが発生した場合も）は終了コード1で終了します。
+ベースラインは計測した環境に依存するため、比較する環境で `--save-baseline` を指定して作成してください。
+
+実行方法（backend ディレクトリで実行）::
+
+    # ベースラインの作成
+    python -m benchmarks.item_api --sizes 10000 1000000 --save-baseline
+    # ベースラインとの比較（15%を超える悪化で失敗）
+    python -m benchmarks.item_api --sizes 10000 1000000 --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.core.conditional import item_etag
+from app.core.config import settings
+from app.db.pagination import encode_cursor
+
+from .async_vs_sync import spawn_server
+from .loadgen import LoadResult, format_result, run_load
+
+BENCH_DATABASE = f"{settings.database_name}_bench"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "item_api.json")
+
+# 1回の INSERT で追加する最大件数（大きな件数を1つのトランザクションで追加しないようにする）
+SEED_BATCH = 1_000_000
+# 計測に使用するアイテムID・カーソルの数
+SAMPLE_SIZE = 1000
+
+
+def _url(database: str) -> str:
+    return (
+        f"postgresql://{settings.database_user}:{settings.database_password}@"
+        f"{settings.database_host}:{settings.database_port}/{database}"
+    )
+
+
+def create_database() -> Engine:
+    """ベンチマーク用のデータベースを作り直してマイグレーションを適用し、そのエンジンを返します。"""
+    from alembic import command
+    from alembic.config import Config
+
+    admin = create_engine(_url(settings.database_name), isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f"DROP DATABASE IF EXISTS {BENCH_DATABASE} WITH (FORCE)"))
+        conn.execute(text(f"CREATE DATABASE {BENCH_DATABASE}"))
+    admin.dispose()
+
+    engine = create_engine(_url(BENCH_DATABASE))
+    with engine.begin() as conn:
+        # `containers/postgresql/init.sql` と同じ初期化
+        conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
+        conn.execute(text("""
+            CREATE OR REPLACE FUNCTION update_updated_at_column()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                NEW.updated_at = CURRENT_TIMESTAMP;
+                RETURN NEW;
+            END;
+            $$ language 'plpgsql';
+        """))
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", _url(BENCH_DATABASE))
+    command.upgrade(config, "head")
+    return engine
+
+
+def seed(engine: Engine, size: int, prefix: str = "bench") -> None:
+    """
+    items テーブルの `prefix` の行が `size` 件になるまで行を追加します。
+
+    行はデータベース側で `generate_series` から作成するため、1000万件でも転送は発生しません。
+    作成日時は1秒ずつずらし、キーセットページネーションが実際のデータと同様に動作するようにします。
+    """
+    with engine.connect() as conn:
+        existing = conn.execute(
+            text("SELECT count(*) FROM items WHERE name LIKE :pattern"), {"pattern": f"{prefix}-%"}
+        ).scalar_one()
+    started = time.perf_counter()
+    for offset in range(existing, size, SEED_BATCH):
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO items (id, name, description, created_at, updated_at)
+                SELECT gen_random_uuid(), :prefix || '-' || n, 'Benchmark item ' || n,
+                       now() - make_interval(secs => n), now() - make_interval(secs => n)
+                FROM generate_series(:start, :stop) AS n
+            """), {"prefix": prefix, "start": offset + 1, "stop": min(size, offset + SEED_BATCH)})
+    with engine.connect() as conn:
+        conn.execute(text("COMMIT"))
+        conn.execute(text("VACUUM ANALYZE items"))
+    if size > existing:
+        print(f"seeded {size - existing} items in {time.perf_counter() - started:.1f}s (total {size})")
+
+
+def sample(engine: Engine, count: int = SAMPLE_SIZE) -> Tuple[List[str], List[str]]:
+    """計測に使用するアイテムのIDと、そのアイテムから始まるページのカーソルを無作為に取得します。"""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT id, created_at FROM items WHERE name LIKE 'bench-%' ORDER BY random() LIMIT :count
+        """), {"count": count}).all()
+    return [str(row.id) for row in rows], [encode_cursor(row.created_at, row.id) for row in rows]
+
+
+def deletable(engine: Engine, count: int) -> List[str]:
+    """削除のシナリオで使用するアイテムを作成し、IDのリストを返します。"""
+    with engine.begin() as conn:
+        return [str(item_id) for item_id in conn.execute(text("""
+            INSERT INTO items (name) SELECT 'bench-delete-' || n FROM generate_series(1, :count) AS n
+            RETURNING id
+        """), {"count": count}).scalars()]
+
+
+class Scenario:
+    """
+    1つのエンドポイントの負荷のかけ方
+
+    Parameters
+    ----------
+    name : str
+        シナリオ名（結果のキーに使用する）
+    method : str
+        HTTPメソッド
+    path_factory : Callable[[int], str]
+        リクエスト番号からパスを生成する関数
+    json_factory : Optional[Callable[[int], dict]], optional
+        リクエスト番号からJSONボディを生成する関数, by default None
+    headers : Optional[dict], optional
+        リクエストヘッダー, by default None
+    warmup : bool, optional
+        計測の前にウォームアップを行うかどうか（読み取りのみ）, by default True
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path_factory: Callable[[int], str],
+        json_factory: Optional[Callable[[int], dict]] = None,
+        headers: Optional[dict] = None,
+        warmup: bool = True
+    ):
+        self.name = name
+        self.method = method
+        self.path_factory = path_factory
+        self.json_factory = json_factory
+        self.headers = headers
+        self.warmup = warmup
+
+    async def run(self, base_url: str, concurrency: int, requests: int) -> LoadResult:
+        if self.warmup:
+            await run_load(base_url, self.path_factory, concurrency, concurrency * 4,
+                           self.method, self.json_factory, self.headers)
+        return await run_load(base_url, self.path_factory, concurrency, requests,
+                              self.method, self.json_factory, self.headers)
+
+
+def scenarios(engine: Engine, requests: int) -> List[Scenario]:
+    """`app/routers/item.py` の各エンドポイントのシナリオを作成します（書き込みは最後に実行）。"""
+    item_ids, cursors = sample(engine)
+    hot_id = item_ids[0]
+    with engine.connect() as conn:
+        hot_etag = item_etag(conn.execute(
+            text("SELECT updated_at FROM items WHERE id = :id"), {"id": hot_id}
+        ).scalar_one())
+    to_delete = deletable(engine, requests)
+    return [
+        Scenario("GET /api/items?limit=100", "GET", lambda n: "/api/items?limit=100"),
+        Scenario("GET /api/items?cursor&limit=100", "GET",
+                 lambda n: f"/api/items?limit=100&cursor={random.choice(cursors)}"),
+        Scenario("GET /api/items/{item_id}", "GET", lambda n: f"/api/items/{random.choice(item_ids)}"),
+        Scenario("GET /api/items/{item_id} (304)", "GET", lambda n: f"/api/items/{hot_id}",
+                 headers={"If-None-Match": hot_etag}),
+        Scenario("PUT /api/items/{item_id}", "PUT", lambda n: f"/api/items/{random.choice(item_ids[1:])}",
+                 json_factory=lambda n: {"description": f"updated {n}"}, warmup=False),
+        Scenario("POST /api/items", "POST", lambda n: "/api/items",
+                 json_factory=lambda n: {"name": f"bench-created-{n}"}, warmup=False),
+        Scenario("DELETE /api/items/{item_id}", "DELETE", lambda n: f"/api/items/{to_delete[n]}",
+                 warmup=False),
+    ]
+
+
+def summarize(result: LoadResult) -> Dict[str, float]:
+    """計測結果をベースラインに保存する値に変換します。"""
+    return {
+        "requests": result.requests,
+        "errors": result.errors,
+        "rps": round(result.rps, 1),
+        "p50_ms": round(result.percentile(50), 2),
+        "p95_ms": round(result.percentile(95), 2),
+        "p99_ms": round(result.percentile(99), 2),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float
+) -> List[str]:
+    """
+    計測結果をベースラインと比較し、悪化した項目の説明を返します。
+
+    Parameters
+    ----------
+    results : Dict[str, Dict[str, float]]
+        計測結果（キーは "<件数>/<シナリオ>/c<同時実行数>"）
+    baseline : Dict[str, Dict[str, float]]
+        ベースライン（ベースラインにない項目は比較しない）
+    threshold : float
+        許容する悪化の割合（0.15 の場合、スループットが15%を超えて低下するか p95 が15%を超えて増加すると悪化とする）
+
+    Returns
+    -------
+    List[str]
+        悪化した項目の説明（ない場合は空）
+    """
+    regressions = []
+    for key, current in results.items():
+        if current["errors"]:
+            regressions.append(f"{key}: {current['errors']} errors")
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{key}: throughput {base['rps']:.1f} -> {current['rps']:.1f} req/s "
+                               f"({current['rps'] / base['rps'] - 1:+.1%})")
+        if current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{key}: p95 {base['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms "
+                               f"({current['p95_ms'] / base['p95_ms'] - 1:+.1%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="items テーブルの件数（10000〜10000000）")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="シナリオ・同時実行数ごとのリクエスト数")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="ベースラインのファイル")
+    parser.add_argument("--save-baseline", action="store_true", help="計測結果をベースラインとして保存する")
+    parser.add_argument("--threshold", type=float, default=0.15, help="許容する悪化の割合")
+    parser.add_argument("--output", help="計測結果を保存するファイル（JSON）")
+    args = parser.parse_args()
+
+    engine = create_database()
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        with spawn_server(settings.use_async_db, DATABASE_NAME=BENCH_DATABASE) as base_url:
+            for size in sorted(args.sizes):
+                seed(engine, size)
+                for concurrency in args.concurrency:
+                    for scenario in scenarios(engine, args.requests):
+                        result = asyncio.run(scenario.run(base_url, concurrency, args.requests))
+                        key = f"{size}/{scenario.name}/c{concurrency}"
+                        results[key] = summarize(result)
+                        print(format_result(f"[{size} c={concurrency}] {scenario.name}", result))
+    finally:
+        engine.dispose()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "use_async_db": settings.use_async_db,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+アイテムの読み取り（`cache.get_item_json`）のキャッシュの階層ごとのレイテンシを比較するマイクロベンチマーク
+
+同じアイテムをリクエストと同じく読み取りごとにセッションを作成して繰り返し読み取り、
+1回あたりのレイテンシ（p50/p99、マイクロ秒）を以下の階層ごとに計測します。
+
+- `database`: キャッシュなし（毎回 SELECT してJSONに変換する）
+- `redis`: Redisのキャッシュ（ネットワークの往復1回）
+- `local`: プロセス内のキャッシュ（ネットワーク・データベースを参照しない）
+
+最後にプロセス内のキャッシュの統計（件数・使用メモリ・ヒット率）を表示します。
+Redisに接続できない場合は、無効化の通知にインプロセスのRedis互換サーバー（fakeredis）を使用し、`redis` は計測しません
+（`local` のヒットはRedisを参照しないため影響しません）。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.item_cache_tiers --reads 20000
+"""
+import argparse
+import time
+from typing import Callable, List
+
+import fakeredis
+import redis
+
+from app.cache import item as cache
+from app.cache.item import ItemCache
+from app.cache.local import LocalCache
+from app.cache.singleflight import SingleFlight
+from app.core.redis import redis_client
+from app.db.crud import item as crud
+from app.db.models.database import SessionLocal, init_engines
+from app.db.schemas.item import ItemCreate
+
+
+def _latencies(read: Callable[[], object], reads: int) -> List[float]:
+    for _ in range(min(reads, 1000)):
+        read()
+    latencies = []
+    for _ in range(reads):
+        started = time.perf_counter()
+        read()
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reads", type=int, default=20000, help="階層ごとの読み取り回数")
+    args = parser.parse_args()
+
+    client = redis_client
+    try:
+        client.ping()
+    except redis.RedisError:
+        print("Redis is not reachable; using fakeredis and skipping the redis tier\n")
+        client = fakeredis.FakeRedis()
+
+    init_engines()
+    flights = SingleFlight("bench", enabled=False)
+    tiers = {
+        "database": ItemCache(client, ttl=60, enabled=False),
+        "redis": ItemCache(client, ttl=60, enabled=client is redis_client),
+        "local": ItemCache(client, ttl=60, local=LocalCache(max_items=10000, max_bytes=16 * 1024 * 1024, ttl=60)),
+    }
+    if not tiers["redis"].enabled:
+        del tiers["redis"]
+
+    def read(tier: ItemCache) -> None:
+        with SessionLocal() as db:
+            cache.get_item_json(db, item_id, cache=tier, flights=flights)
+
+    with SessionLocal() as db:
+        item_id = crud.create_item(db, ItemCreate(name="bench-hot-item", description="x" * 200)).id
+    try:
+        print(f"{'tier':<10} {'p50 µs':>10} {'p99 µs':>10}")
+        for name, tier in tiers.items():
+            # プロセス内のキャッシュは無効化の通知の受信を開始してから使用する
+            deadline = time.monotonic() + 5
+            while tier.local is not None and not tier.stats()["local"]["listening"] and time.monotonic() < deadline:
+                read(tier)
+                time.sleep(0.01)
+            latencies = _latencies(lambda: read(tier), args.reads)
+            print(
+                f"{name:<10} {latencies[len(latencies) // 2] * 1e6:>10.1f} "
+                f"{latencies[int(len(latencies) * 0.99)] * 1e6:>10.1f}"
+            )
+        print(f"\nlocal tier: {tiers['local'].stats()['local']}")
+    finally:
+        for tier in tiers.values():
+            tier.invalidate(item_id)
+            tier.close()
+        with SessionLocal() as db:
+            crud.delete_item(db, item_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+アイテム変更ストリーム（SSE）の同時接続数と配信レイテンシのベンチマーク
+
+起動中のAPIサーバーに `--subscribers` 本の SSE 接続（`GET /api/items/stream`）を張り、
+接続前後のサーバープロセスのメモリ使用量（`--pid` を指定した場合）と、
+アイテムを1件更新してから全ての接続にイベントが届くまでの時間を計測します。
+半数の接続は全アイテム、残りは1件のアイテムのみを購読します。
+
+実行方法（backend ディレクトリで実行。接続数に応じて `ulimit -n` を増やしてください）::
+
+    python -m benchmarks.item_stream --url http://localhost:8000 --subscribers 10000 --pid <uvicorn の PID>
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from app.db.crud import item as item_crud
+from app.db.models.database import SessionLocal
+from app.db.schemas.item import ItemCreate, ItemUpdate
+
+
+def rss_megabytes(pid: Optional[int]) -> Optional[float]:
+    """プロセスの常駐メモリ（MB）を返します（Linux のみ）。"""
+    if pid is None:
+        return None
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+class Subscriber:
+    """1本の SSE 接続です。`event:` 行を受信した時刻を記録します。"""
+
+    def __init__(self, host: str, port: int, path: str):
+        self.host, self.port, self.path = host, port, path
+        self.received: List[float] = []
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"GET {self.path} HTTP/1.1\r\nHost: {self.host}\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        # ステータス行と最初の retry フィールドを受信するまで待つ（購読の開始）
+        while not (await self.reader.readline()).startswith(b"retry:"):
+            pass
+
+    async def read(self) -> None:
+        while line := await self.reader.readline():
+            if b"event: " in line:
+                self.received.append(time.perf_counter())
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def run(url: str, subscribers: int, pid: Optional[int], rounds: int) -> None:
+    target = urlsplit(url)
+    with SessionLocal() as db:
+        item = item_crud.create_item(db, ItemCreate(name="stream-benchmark"))
+        item_id = item.id
+
+    before = rss_megabytes(pid)
+    clients = [
+        Subscriber(target.hostname, target.port or 80,
+                   "/api/items/stream" if n % 2 else f"/api/items/stream?ids={item_id}")
+        for n in range(subscribers)
+    ]
+    started = time.perf_counter()
+    for offset in range(0, subscribers, 500):
+        await asyncio.gather(*(client.connect() for client in clients[offset:offset + 500]))
+    print(f"connected {subscribers} subscribers in {time.perf_counter() - started:.1f}s")
+    after = rss_megabytes(pid)
+    if before is not None:
+        print(f"server RSS {before:.0f} MB -> {after:.0f} MB "
+              f"({(after - before) * 1024 / subscribers:.1f} KB per subscriber)")
+
+    readers = [asyncio.create_task(client.read()) for client in clients]
+    latencies = []
+    try:
+        for n in range(rounds):
+            with SessionLocal() as db:
+                sent = time.perf_counter()
+                item_crud.update_item(db, item_id, ItemUpdate(description=f"round {n}"))
+            while sum(len(client.received) > n for client in clients) < subscribers:
+                await asyncio.sleep(0.001)
+            latency = max(client.received[n] for client in clients) - sent
+            latencies.append(latency)
+            print(f"round {n}: all {subscribers} subscribers received the update in {latency * 1000:.1f} ms")
+            await asyncio.sleep(0.5)
+        print(f"median fan-out latency {statistics.median(latencies) * 1000:.1f} ms")
+    finally:
+        for reader in readers:
+            reader.cancel()
+        for client in clients:
+            client.close()
+        with SessionLocal() as db:
+            item_crud.delete_item(db, item_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--pid", type=int, help="メモリ使用量を計測するAPIサーバーのプロセスID")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.subscribers, args.pid, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+アイテムの作成・upsert の1件あたりのレイテンシとラウンドトリップ数の比較ベンチマーク
+
+変更前の実装（`db.add` → `commit` → `refresh` による作成、SELECT で存在を確認してから
+INSERT / UPDATE する upsert）と、現在の CRUD 関数（`INSERT ... RETURNING`、
+`INSERT ... ON CONFLICT ... RETURNING`）を、リクエストと同じく1件ごとにセッションを
+作成・破棄して交互に実行し、レイテンシ（平均・p50・p95）と1件あたりのラウンドトリップ数
+（SQL に加えて BEGIN / COMMIT / ROLLBACK を含む）を比較します。書き込んだアイテムは API のレスポンスと
+同じくスキーマに変換するため、コミット後の再読み込みもラウンドトリップに含まれます。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.item_writes --writes 1000
+"""
+import argparse
+import statistics
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from sqlalchemy import delete, event, select
+
+from app.db.crud import item as crud
+from app.db.models.database import SessionLocal, init_engines
+from app.db.models.item import Item
+from app.db.schemas.item import Item as ItemSchema, ItemCreate
+
+# 計測対象のラウンドトリップ（SQLの実行とトランザクションの開始・終了）
+_round_trips = 0
+
+
+def _count(*args, **kwargs) -> None:
+    global _round_trips
+    _round_trips += 1
+
+
+def legacy_create_item(db, item: ItemCreate) -> Item:
+    """変更前の作成（INSERT → COMMIT → 新しいトランザクションで SELECT）"""
+    db_item = Item(**item.model_dump())
+    db.add(db_item)
+    db.commit()
+    db.refresh(db_item)
+    return db_item
+
+
+def legacy_upsert_item(db, code: str, item: ItemCreate) -> Item:
+    """SELECT で存在を確認してから INSERT / UPDATE する upsert（同時実行時は一意制約違反になりうる）"""
+    db_item = db.execute(select(Item).where(Item.code == code)).scalar_one_or_none()
+    if db_item is None:
+        db_item = Item(code=code, **item.model_dump())
+        db.add(db_item)
+    else:
+        for key, value in item.model_dump().items():
+            setattr(db_item, key, value)
+    db.commit()
+    db.refresh(db_item)
+    return db_item
+
+
+def _run(write: Callable[[object, int], Item], writes: int) -> Dict[str, float]:
+    global _round_trips
+    latencies: List[float] = []
+    _round_trips = 0
+    for i in range(writes):
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            ItemSchema.model_validate(write(db, i))
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "mean": statistics.fmean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "round_trips": _round_trips / writes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=1000, help="1回の計測の書き込み件数")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の回数（変更前・現在を交互に実行し、平均が最小の回を使用する）")
+    args = parser.parse_args()
+
+    engine = init_engines()
+    for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+        event.listen(engine, name, _count)
+
+    prefix = f"bench-write-{uuid.uuid4().hex[:8]}"
+    payload = ItemCreate(name=prefix, description="benchmark")
+    # upsert は作成と更新が半分ずつになるよう、同じコードを2回ずつ使用する
+    scenarios = {
+        "create": {
+            "before": lambda db, i: legacy_create_item(db, payload),
+            "after": lambda db, i: crud.create_item(db, payload),
+        },
+        "upsert": {
+            "before": lambda db, i: legacy_upsert_item(db, f"{prefix}-before-{i // 2}", payload),
+            "after": lambda db, i: crud.upsert_item(db, f"{prefix}-after-{i // 2}", payload)[0],
+        },
+    }
+
+    try:
+        print(f"{'scenario':<18} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'round trips':>12}")
+        for scenario, variants in scenarios.items():
+            best: Dict[str, Dict[str, float]] = {}
+            for attempt in range(args.repeat):
+                for variant, write in variants.items():
+                    if scenario == "upsert":
+                        # 繰り返しごとに新しいコードで作成と更新を行う
+                        result = _run(lambda db, i, write=write, attempt=attempt: write(db, i + attempt * args.writes), args.writes)
+                    else:
+                        result = _run(write, args.writes)
+                    if variant not in best or result["mean"] < best[variant]["mean"]:
+                        best[variant] = result
+            for variant, result in best.items():
+                print(
+                    f"{scenario + ' ' + variant:<18} {result['mean'] * 1e3:>9.3f} {result['p50'] * 1e3:>9.3f} "
+                    f"{result['p95'] * 1e3:>9.3f} {result['round_trips']:>12.1f}"
+                )
+    finally:
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.remove(engine, name, _count)
+        with SessionLocal() as db:
+            db.execute(delete(Item).where(Item.name == prefix))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+KPI分析（前期比・移動平均・zスコア・目標達成率）の時系列の長さごとのコスト比較ベンチマーク
+
+`app.analytics.kpi.analyze` のベクトル演算と、同じ指標を1点ずつ Python で計算する
+実装の処理時間を、時系列の長さごとに比較します（1点あたりのコストが長さに依存しないことの確認）。
+`--fetch` を指定すると、測定値を保存した上で `fetch_series` による取得時間も計測します。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.kpi_analytics --sizes 1000 10000 100000 1000000 --fetch
+"""
+import argparse
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import delete
+
+from app.analytics.kpi import analyze
+from app.analytics.series import Series, fetch_series
+from app.db.crud import item as item_crud
+from app.db.crud import kpi_measurement as measurement_crud
+from app.db.models.database import SessionLocal
+from app.db.models.item import Item
+from app.db.schemas.item import ItemCreate
+from app.db.schemas.kpi_measurement import KpiMeasurementCreate
+
+WINDOW = 24
+START = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def analyze_rows(values, window: int = WINDOW, z_threshold: float = 3.0) -> int:
+    """比較用: 移動平均・zスコア・前期比を1点ずつ計算し、異常値の件数を返します。"""
+    recent = deque(maxlen=window)
+    anomalies = 0
+    previous = None
+    for value in values:
+        if len(recent) == window:
+            mean = sum(recent) / window
+            std = math.sqrt(sum((v - mean) ** 2 for v in recent) / window)
+            if std > 0 and abs(value - mean) / std > z_threshold:
+                anomalies += 1
+        if previous is not None and previous != 0:
+            _ = (value - previous) / abs(previous)
+        recent.append(value)
+        _ = sum(recent) / len(recent)
+        previous = value
+    return anomalies
+
+
+def _report(label: str, size: int, elapsed: float) -> None:
+    print(f"{label:<18} {size:>9} points  {elapsed * 1000:>10.2f} ms  {elapsed / size * 1e9:>9.1f} ns/point")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--row-limit", type=int, default=100000,
+                        help="1点ずつの計算を計測する最大の長さ")
+    parser.add_argument("--fetch", action="store_true", help="データベースからの取得時間も計測する")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        timestamps = np.datetime64("2000-01-01T00:00:00", "us") + np.arange(size).astype("timedelta64[m]")
+        values = rng.normal(100.0, 5.0, size)
+
+        started = time.perf_counter()
+        analyze(Series(timestamps, values), window=WINDOW, target=100.0)
+        _report("vectorized", size, time.perf_counter() - started)
+
+        if size <= args.row_limit:
+            rows = values.tolist()
+            started = time.perf_counter()
+            analyze_rows(rows)
+            _report("row by row", size, time.perf_counter() - started)
+
+        if args.fetch:
+            with SessionLocal() as db:
+                item = item_crud.create_item(db, ItemCreate(name=f"analytics-bench-{size}"))
+                try:
+                    for i in range(0, size, 10000):
+                        measurement_crud.ingest_measurements(db, [
+                            KpiMeasurementCreate.model_construct(
+                                item_id=item.id, measured_at=START + timedelta(minutes=n), value=float(values[n])
+                            )
+                            for n in range(i, min(i + 10000, size))
+                        ])
+                    started = time.perf_counter()
+                    fetch_series(db, [item.id], START, START + timedelta(minutes=size))
+                    _report("fetch_series", size, time.perf_counter() - started)
+                finally:
+                    db.rollback()
+                    db.execute(delete(Item).where(Item.id == item.id))
+                    db.commit()
+        print()
+
+
+if __name__ == "__main__":
+    main()
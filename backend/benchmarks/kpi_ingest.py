@@ -0,0 +1,93 @@
+"""
+KPI測定値の取り込みスループットと、パーティション数に対する検索レイテンシのベンチマーク
+
+`--items` 件のアイテムについて `--interval` 分間隔の測定値を1か月分ずつ
+`ingest_measurements` で取り込み、月ごとに points/sec と、1アイテム・1日分の
+範囲検索のレイテンシ（中央値・p95）を表示します。月を重ねるごとにパーティションが
+増えるため、パーティション数と検索レイテンシの関係を確認できます。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.kpi_ingest --items 100 --months 12 --interval 60
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.db.crud import item as item_crud
+from app.db.crud import kpi_measurement as crud
+from app.db.models.database import SessionLocal
+from app.db.models.item import Item
+from app.db.models.kpi_measurement import KpiMeasurement
+from app.db.partitions import add_months, list_partitions
+from app.db.schemas.item import ItemCreate
+from app.db.schemas.kpi_measurement import KpiMeasurementCreate
+
+
+def _points(item_ids, start: datetime, end: datetime, interval: timedelta):
+    measured_at = start
+    while measured_at < end:
+        for item_id in item_ids:
+            yield KpiMeasurementCreate.model_construct(
+                item_id=item_id, measured_at=measured_at, value=random.random() * 100
+            )
+        measured_at += interval
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--interval", type=int, default=60, help="測定間隔（分）")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--start", default="2000-01-01", help="最初の月（過去の月を使用して既存データと分離）")
+    args = parser.parse_args()
+
+    interval = timedelta(minutes=args.interval)
+    first = datetime.fromisoformat(args.start).replace(day=1, tzinfo=timezone.utc)
+
+    with SessionLocal() as db:
+        items = item_crud.create_items(
+            db, [ItemCreate(name=f"kpi-bench-{i}") for i in range(args.items)]
+        )
+        item_ids = [item.id for item in items]
+        try:
+            print(f"{'month':<8} {'points':>9} {'points/s':>10} {'partitions':>10} {'p50 ms':>8} {'p95 ms':>8}")
+            for offset in range(args.months):
+                start = add_months(first.date(), offset)
+                start = datetime(start.year, start.month, 1, tzinfo=timezone.utc)
+                end = datetime.combine(add_months(start.date(), 1), datetime.min.time(), timezone.utc)
+
+                points = list(_points(item_ids, start, end, interval))
+                started = time.perf_counter()
+                for i in range(0, len(points), args.batch_size):
+                    crud.ingest_measurements(db, points[i:i + args.batch_size])
+                elapsed = time.perf_counter() - started
+
+                latencies = []
+                for _ in range(args.queries):
+                    day = first + timedelta(days=random.randrange((end - first).days))
+                    query_started = time.perf_counter()
+                    crud.get_measurements(db, random.choice(item_ids), day, day + timedelta(days=1))
+                    latencies.append((time.perf_counter() - query_started) * 1000)
+                db.rollback()
+
+                print(
+                    f"{start:%Y-%m} {len(points):>9} {len(points) / elapsed:>10.0f} "
+                    f"{len(list_partitions(db)):>10} {statistics.median(latencies):>8.2f} "
+                    f"{statistics.quantiles(latencies, n=20)[-1]:>8.2f}"
+                )
+        finally:
+            db.rollback()
+            db.execute(delete(KpiMeasurement).where(KpiMeasurement.item_id.in_(item_ids)))
+            db.execute(delete(Item).where(Item.id.in_(item_ids)))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
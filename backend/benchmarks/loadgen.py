@@ -0,0 +1,112 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import httpx
+
+
+@dataclass
+class LoadResult:
+    """
+    負荷試験1回分の計測結果です。
+
+    Attributes
+    ----------
+    requests : int
+        送信したリクエスト数
+    errors : int
+        ステータスコードが2xx/3xx以外、または例外となったリクエスト数
+    elapsed : float
+        計測にかかった時間（秒）
+    latencies : List[float]
+        各リクエストのレイテンシ（秒）
+    """
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        """レイテンシのパーセンタイル値（ミリ秒）を返します。"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index] * 1000
+
+
+async def run_load(
+    base_url: str,
+    path_factory: Callable[[int], str],
+    concurrency: int,
+    total_requests: int,
+    method: str = "GET",
+    json_factory: Optional[Callable[[int], dict]] = None,
+    headers: Optional[dict] = None,
+) -> LoadResult:
+    """
+    固定の同時実行数でHTTPリクエストを送信し、スループットとレイテンシを計測します。
+
+    Parameters
+    ----------
+    base_url : str
+        対象サーバーのベースURL
+    path_factory : Callable[[int], str]
+        リクエスト番号からパスを生成する関数
+    concurrency : int
+        同時実行数
+    total_requests : int
+        送信するリクエストの総数
+    method : str, optional
+        HTTPメソッド, by default "GET"
+    json_factory : Optional[Callable[[int], dict]], optional
+        リクエスト番号からJSONボディを生成する関数, by default None
+    headers : Optional[dict], optional
+        全リクエストに付与するヘッダー, by default None
+
+    Returns
+    -------
+    LoadResult
+        計測結果
+    """
+    result = LoadResult()
+    counter = iter(range(total_requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def worker() -> None:
+            for n in counter:
+                body = json_factory(n) if json_factory else None
+                started = time.perf_counter()
+                try:
+                    response = await client.request(
+                        method, path_factory(n), json=body, headers=headers
+                    )
+                    if response.status_code >= 400:
+                        result.errors += 1
+                except httpx.HTTPError:
+                    result.errors += 1
+                result.latencies.append(time.perf_counter() - started)
+                result.requests += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        result.elapsed = time.perf_counter() - started
+
+    return result
+
+
+def format_result(label: str, result: LoadResult) -> str:
+    """計測結果を1行の表形式に整形します。"""
+    return (
+        f"{label:<32} {result.rps:>10.1f} req/s  "
+        f"p50={result.percentile(50):>8.2f}ms  "
+        f"p95={result.percentile(95):>8.2f}ms  "
+        f"p99={result.percentile(99):>8.2f}ms  "
+        f"errors={result.errors}"
+    )
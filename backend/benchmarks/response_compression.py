@@ -0,0 +1,91 @@
+"""
+レスポンスの圧縮による転送量（bytes on the wire）とスループットの変化を計測するベンチマーク
+
+API の圧縮を無効（変更前）・gzip・brotli（`brotli` パッケージがインストールされている場合のみ）にして
+uvicorn をそれぞれ起動し、アイテム一覧の1レスポンスあたりの本文のバイト数（圧縮後）と、
+`--concurrency` 件の同時実行でのスループット・レイテンシ（クライアントでの展開を含む）を比較します。
+
+`--base-url` を指定した場合はサーバーを起動せず、起動済みの環境（nginx 経由など）に対して
+`Accept-Encoding` ごとに計測し、nginx のマイクロキャッシュの `X-Cache-Status` の内訳も表示します。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.response_compression --requests 2000
+    python -m benchmarks.response_compression --base-url http://localhost:8080
+"""
+import argparse
+import asyncio
+from collections import Counter
+from typing import Dict
+
+import httpx
+
+from app.core.compression import available_encodings
+
+from .async_vs_sync import spawn_server
+from .loadgen import format_result, run_load
+
+PATHS = ("/api/items?limit=100", "/api/items?limit=1000")
+
+
+def measure_bytes(base_url: str, path: str, accept_encoding: str) -> Dict[str, object]:
+    """1レスポンスの本文の転送量（圧縮後）と展開後のサイズを返します。"""
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+            response.raise_for_status()
+            wire = sum(len(chunk) for chunk in response.iter_raw())
+            encoding = response.headers.get("content-encoding", "identity")
+        size = len(client.get(path, headers={"Accept-Encoding": "identity"}).content)
+    return {"wire": wire, "size": size, "encoding": encoding}
+
+
+def cache_statuses(base_url: str, path: str, accept_encoding: str, requests: int) -> Counter:
+    """連続したリクエストの `X-Cache-Status`（nginx のマイクロキャッシュ）の内訳を返します。"""
+    statuses: Counter = Counter()
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        for _ in range(requests):
+            response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+            statuses[response.headers.get("x-cache-status", "-")] += 1
+    return statuses
+
+
+async def _run(label: str, base_url: str, accept_encoding: str, args) -> None:
+    headers = {"Accept-Encoding": accept_encoding}
+    for path in PATHS:
+        measured = measure_bytes(base_url, path, accept_encoding)
+        # ウォームアップ（コネクションプールとコンパイルキャッシュを温める）
+        await run_load(base_url, lambda n: path, args.concurrency, args.concurrency * 4, headers=headers)
+        result = await run_load(base_url, lambda n: path, args.concurrency, args.requests, headers=headers)
+        print(format_result(f"[{label}] {path}", result))
+        print(
+            f"{'':<32} {measured['encoding']}: {measured['wire']:,} / {measured['size']:,} bytes "
+            f"({measured['wire'] / measured['size']:.1%}), {measured['wire'] * result.rps / 1e6:.1f} MB/s on the wire"
+        )
+        if args.base_url:
+            print(f"{'':<32} X-Cache-Status: {dict(cache_statuses(base_url, path, accept_encoding, 20))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--base-url", default=None, help="起動済みのサーバー（nginx など）のURL（省略時は uvicorn を起動する）")
+    args = parser.parse_args()
+
+    variants: Dict[str, str] = {"off": "", "gzip": "gzip"}
+    if available_encodings(["br"]):
+        variants["br"] = "br"
+
+    if args.base_url:
+        for accept_encoding in ("identity", "gzip", "gzip, br"):
+            asyncio.run(_run(f"Accept-Encoding: {accept_encoding}", args.base_url, accept_encoding, args))
+        return
+
+    for label, compression in variants.items():
+        # クライアントは常に gzip / br を受け付け、サーバーの設定だけを変える
+        with spawn_server(False, RESPONSE_COMPRESSION=compression) as base_url:
+            asyncio.run(_run(label, base_url, "gzip, br", args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+アイテム一覧のシリアライズ処理の µs/row ベンチマーク
+
+`response_model` による従来の変換（ORMオブジェクト → Pydanticモデルの検証 → JSON）と、
+行から orjson で直接エンコードする変換を比較します。テスト用の行はトランザクション内で
+作成し、計測後にロールバックします。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.serialization --rows 100 --repeat 2000
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import insert
+
+from app.core.serialization import RowsResponse
+from app.db.crud import item as crud
+from app.db.models.database import SessionLocal
+from app.db.models.item import Item
+from app.main import app
+
+
+def _measure(label: str, rows: int, repeat: int, fn: Callable[[], object]) -> None:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {elapsed / repeat * 1e6:>10.1f} µs/page  {elapsed / (repeat * rows) * 1e6:>8.2f} µs/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100, help="1ページの行数")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    route = next(
+        r for r in app.routes
+        if isinstance(r, APIRoute) and r.path == "/api/items" and "GET" in r.methods
+    )
+
+    def pydantic_path(items):
+        content = asyncio.run(serialize_response(field=route.response_field, response_content=items))
+        return JSONResponse(content).body
+
+    with SessionLocal() as db:
+        db.execute(insert(Item), [
+            {"name": f"bench-{i}", "description": "serialization benchmark"} for i in range(args.rows)
+        ])
+        items = crud.get_items(db, limit=args.rows)
+        rows = crud.get_item_rows(db, limit=args.rows)
+
+        print("serialization only")
+        _measure("  response_model (before)", args.rows, args.repeat, lambda: pydantic_path(items))
+        _measure("  orjson from rows (after)", args.rows, args.repeat, lambda: RowsResponse(rows).body)
+
+        print("query + serialization")
+        _measure("  ORM + response_model (before)", args.rows, args.repeat // 10,
+                 lambda: pydantic_path(crud.get_items(db, limit=args.rows)))
+        _measure("  rows + orjson (after)", args.rows, args.repeat // 10,
+                 lambda: RowsResponse(crud.get_item_rows(db, limit=args.rows)).body)
+        db.rollback()
+
+
+if __name__ == "__main__":
+    main()
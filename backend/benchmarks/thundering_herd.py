@@ -0,0 +1,108 @@
+"""
+同じ読み取りが同時に集中した場合（thundering herd）の single-flight の効果を計測するベンチマーク
+
+ダッシュボードの一斉更新のように `--clients` 件の同じ読み取りを同時に開始するバーストを `--bursts` 回繰り返し、
+single-flight を無効・有効にした場合の実行したSQLの数、1秒あたりのSQLの数、レイテンシ（p50/p99）を比較します。
+読み取りは FastAPI の同期エンドポイントと同じくスレッドプール（`--threads`、FastAPI の既定は40スレッド）で、
+読み取りごとにセッションを作成して実行します（レイテンシにはスレッドの空きとコネクションプールの待ち時間を含みます）。
+アイテムの読み取りがデータベースに届くよう、アイテムキャッシュは使用しません。
+
+計測する読み取り:
+
+- `get_item`: `GET /api/items/{item_id}`（`cache.get_item`）
+- `get_item_rows`: `GET /api/items?skip=0&limit=100`（`cache.get_item_rows`）
+- `get_item_rows (deep)`: SQLの実行に時間のかかるページ（`skip=<--deep-skip>`、アイテム数より小さくする）
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.thundering_herd --clients 200 --bursts 20
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import item as cache
+from app.cache.item import ItemCache
+from app.cache.singleflight import SingleFlight
+from app.db.crud import item as crud
+from app.db.models.database import SessionLocal, init_engines
+
+from .loadgen import LoadResult
+
+# 計測対象のSQLの実行回数
+_queries = 0
+_lock = threading.Lock()
+
+
+def _count(*args, **kwargs) -> None:
+    global _queries
+    with _lock:
+        _queries += 1
+
+
+def run_bursts(pool: ThreadPoolExecutor, read: Callable[[Session], object], clients: int, bursts: int) -> LoadResult:
+    """`clients` 件の同じ読み取りを同時に開始するバーストを繰り返し、計測結果を返します。"""
+    result = LoadResult()
+
+    def request(submitted: float) -> None:
+        with SessionLocal() as db:
+            read(db)
+        result.latencies.append(time.perf_counter() - submitted)
+
+    started = time.perf_counter()
+    for _ in range(bursts):
+        submitted = time.perf_counter()
+        for future in wait([pool.submit(request, submitted) for _ in range(clients)]).done:
+            future.result()
+    result.elapsed = time.perf_counter() - started
+    result.requests = clients * bursts
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200, help="1回のバーストで同時に開始する読み取りの数")
+    parser.add_argument("--bursts", type=int, default=20, help="バーストの回数")
+    parser.add_argument("--threads", type=int, default=40, help="スレッドプールのスレッド数")
+    parser.add_argument("--deep-skip", type=int, default=10000, help="SQLの実行に時間のかかるページの skip")
+    args = parser.parse_args()
+
+    global _queries
+    engine = init_engines()
+    no_cache = ItemCache(client=None, ttl=0, enabled=False)
+    with SessionLocal() as db:
+        item_id = crud.get_items(db, limit=1)[0].id
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        print(f"{'read':<30} {'queries':>8} {'queries/s':>10} {'reads/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            for label, enabled in (("off", False), ("on", True)):
+                flights = SingleFlight("bench", enabled=enabled)
+                reads: Dict[str, Callable[[Session], object]] = {
+                    "get_item": lambda db: cache.get_item(db, item_id, cache=no_cache, flights=flights),
+                    "get_item_rows": lambda db: cache.get_item_rows(db, skip=0, limit=100, flights=flights),
+                    "get_item_rows (deep)": lambda db: cache.get_item_rows(
+                        db, skip=args.deep_skip, limit=100, flights=flights
+                    ),
+                }
+                for name, read in reads.items():
+                    # スレッドとコネクションプールを温める
+                    run_bursts(pool, read, args.threads, 1)
+                    _queries = 0
+                    result = run_bursts(pool, read, args.clients, args.bursts)
+                    print(
+                        f"{f'[{label}] {name}':<30} {_queries:>8} {_queries / result.elapsed:>10.0f} "
+                        f"{result.rps:>9.0f} {result.percentile(50):>8.1f} {result.percentile(99):>8.1f}"
+                    )
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+本番モード（gunicorn + uvicorn ワーカー）のワーカー数ごとのスループット比較ベンチマーク
+
+`--workers` で指定したワーカー数ごとに `gunicorn.conf.py` でAPIサーバーを起動し、
+同じ負荷をかけて requests/sec と p50/p95/p99 を比較します。負荷をかける側が
+ボトルネックにならないよう、`--clients` 個のプロセスから並行してリクエストを送信します。
+
+実行方法（backend ディレクトリで実行）::
+
+    python -m benchmarks.worker_scaling --workers 1 2 4 --concurrency 64 --requests 10000
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import httpx
+
+from .async_vs_sync import _free_port, seed_items
+from .loadgen import LoadResult, format_result, run_load
+
+
+@contextmanager
+def spawn_gunicorn(workers: int) -> Iterator[str]:
+    """指定したワーカー数で gunicorn を起動し、ベースURLを返します。"""
+    port = _free_port()
+    env = dict(os.environ, API_HOST="127.0.0.1", API_PORT=str(port), API_WORKERS=str(workers))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            raise RuntimeError(f"gunicorn on port {port} did not start")
+        # 最初のワーカーが応答した時点では残りのワーカーが起動中のことがあるため待つ
+        time.sleep(1 + workers * 0.5)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _client(base_url: str, paths: List[str], concurrency: int, requests: int) -> LoadResult:
+    return asyncio.run(run_load(base_url, lambda n: random.choice(paths), concurrency, requests))
+
+
+def run_clients(base_url: str, paths: List[str], concurrency: int, requests: int, clients: int) -> LoadResult:
+    """`clients` 個のプロセスから負荷をかけ、結果を合算します。"""
+    with ProcessPoolExecutor(clients) as pool:
+        results = list(pool.map(
+            _client,
+            [base_url] * clients,
+            [paths] * clients,
+            [max(1, concurrency // clients)] * clients,
+            [requests // clients] * clients,
+        ))
+    merged = LoadResult(elapsed=max(result.elapsed for result in results))
+    for result in results:
+        merged.requests += result.requests
+        merged.errors += result.errors
+        merged.latencies.extend(result.latencies)
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1,
+                        help="負荷をかけるプロセス数")
+    parser.add_argument("--seed", type=int, default=200, help="作成するアイテム数")
+    args = parser.parse_args()
+
+    item_ids: List[str] = []
+    for workers in args.workers:
+        with spawn_gunicorn(workers) as base_url:
+            if not item_ids:
+                item_ids = seed_items(base_url, args.seed)
+            scenarios = {
+                "GET /api/items/{item_id}": [f"/api/items/{item_id}" for item_id in item_ids],
+                "GET /api/items?limit=100": ["/api/items?limit=100"],
+            }
+            for name, paths in scenarios.items():
+                # ウォームアップ（全てのワーカーのコネクションプールを温める）
+                run_clients(base_url, paths, args.concurrency, args.concurrency * 8, args.clients)
+                result = run_clients(base_url, paths, args.concurrency, args.requests, args.clients)
+                print(format_result(f"[workers={workers}] {name}", result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+#!/bin/sh
+# APIサーバーの起動スクリプト
+# API_RELOAD=true の場合は開発用（uvicorn の単一プロセス・コード変更時に自動再起動）、
+# それ以外は本番用（gunicorn で複数のワーカープロセス、gunicorn.conf.py を参照）で起動する
+set -e
+
+if [ "${API_RELOAD:-false}" = "true" ]; then
+    exec uvicorn app.main:app --host "${API_HOST:-0.0.0.0}" --port "${API_PORT:-8000}" \
+        --reload --timeout-graceful-shutdown 5
+fi
+exec gunicorn app.main:app -c gunicorn.conf.py
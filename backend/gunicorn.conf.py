@@ -0,0 +1,34 @@
+"""
+本番モードの gunicorn の設定
+
+gunicorn がワーカープロセスを管理し、各ワーカーは uvicorn のイベントループで
+アプリケーションを実行します（uvloop・httptools がインストールされている場合は自動的に使用されます）。
+
+起動方法（backend ディレクトリで実行）::
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+- ワーカー数は `API_WORKERS`（`0` の場合はCPUコア数）です。
+- `kill -HUP <マスターのPID>` で新しいワーカーを起動してから古いワーカーを停止します（コードの再読み込みを含む）。
+  停止するワーカーは処理中のリクエストの完了を `API_GRACEFUL_TIMEOUT` 秒まで待ちます。
+- `kill -TTIN` / `kill -TTOU` でワーカーを1つずつ増減できます。
+"""
+import multiprocessing
+
+from app.core.config import settings
+
+bind = f"{settings.api_host}:{settings.api_port}"
+workers = settings.api_workers or multiprocessing.cpu_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# アプリケーションはワーカーごとに読み込む（HUP でコードを再読み込みできるようにするため）。
+# データベースのエンジンは読み込み時ではなく最初のセッションの作成時にワーカーごとに作成される
+preload_app = False
+
+graceful_timeout = settings.api_graceful_timeout
+max_requests = settings.api_max_requests
+# 全てのワーカーが同時に入れ替わらないようにずらす
+max_requests_jitter = settings.api_max_requests // 10
+
+# Keep-Alive の接続を閉じるまでの秒数（uvicorn のデフォルトの5秒より長くし、接続を再利用しやすくする）
+keepalive = 75
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.analytics.kpi import analyze, moving_average, period_change, rolling_zscore
+from app.analytics.series import Series
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    return np.random.default_rng(0).normal(1000.0, 5.0, 500)
+
+
+def test_moving_average(values):
+    """移動平均が区間ごとの平均と一致することを確認するテスト"""
+    result = moving_average(values, 7)
+
+    assert np.isnan(result[:6]).all()
+    np.testing.assert_allclose(result[6:], [values[i - 6:i + 1].mean() for i in range(6, len(values))])
+    assert np.isnan(moving_average(values[:3], 7)).all()
+
+
+def test_rolling_zscore(values):
+    """zスコアが直前の区間の平均・標準偏差から計算されることを確認するテスト"""
+    result = rolling_zscore(values, 10)
+
+    expected = [(values[i] - values[i - 10:i].mean()) / values[i - 10:i].std() for i in range(10, len(values))]
+    assert np.isnan(result[:10]).all()
+    np.testing.assert_allclose(result[10:], expected, rtol=1e-6)
+    # 直前の値がすべて同じ場合は計算しない
+    assert np.isnan(rolling_zscore(np.ones(20), 5)).all()
+
+
+def test_period_change():
+    """前期比の変化量と変化率（比較する値が0の場合はNaN）を確認するテスト"""
+    change, ratio = period_change(np.array([0.0, 2.0, 3.0, -6.0]), 1)
+
+    np.testing.assert_array_equal(change, [np.nan, 2.0, 1.0, -9.0])
+    np.testing.assert_array_equal(ratio, [np.nan, np.nan, 0.5, -3.0])
+
+
+def test_analyze(values):
+    """異常値と目標達成率が分析結果に含まれることを確認するテスト"""
+    timestamps = np.arange(len(values)).astype("datetime64[h]").astype("datetime64[us]")
+    values = values.copy()
+    values[300] = 2000.0
+
+    result = analyze(Series(timestamps, values), window=20, z_threshold=10.0, target=1000.0, include_series=True)
+
+    assert result["points"] == 500
+    assert result["anomaly_count"] == 1
+    assert result["anomalies"][0]["timestamp"] == timestamps[300].item()
+    assert result["target_hit_ratio"] == pytest.approx(np.mean(values >= 1000.0))
+    assert result["last_attainment"] == pytest.approx(values[-1] / 1000.0)
+    assert len(result["series"]["moving_average"]) == 500
+
+    empty = analyze(Series(timestamps[:0], values[:0]), target=1.0)
+    assert empty["points"] == 0 and empty["mean"] is None and empty["anomalies"] == []
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.analytics.series import fetch_series
+from app.db.crud import item as item_crud
+from app.db.crud import kpi_measurement as measurement_crud
+from app.db.rollups import refresh_rollups
+from app.db.schemas.item import ItemCreate
+from app.db.schemas.kpi_measurement import KpiMeasurementCreate
+
+START = datetime(2021, 5, 1, tzinfo=timezone.utc)
+
+
+def test_fetch_series(postgres_session: Session):
+    """複数アイテムの測定値・ロールアップの時系列が配列として取得されることを確認するテスト"""
+    items = item_crud.create_items(postgres_session, [ItemCreate(name=f"KPI {i}") for i in range(2)])
+    measurement_crud.ingest_measurements(postgres_session, [
+        KpiMeasurementCreate(item_id=item.id, measured_at=START + timedelta(hours=i), value=i * (n + 1))
+        for n, item in enumerate(items)
+        for i in reversed(range(48))
+    ])
+    unknown = uuid4()
+
+    series = fetch_series(postgres_session, [items[0].id, items[1].id, unknown], START, START + timedelta(days=2))
+
+    timestamps, values = series[items[1].id]
+    assert timestamps.dtype == np.dtype("datetime64[us]")
+    assert timestamps[1].item() == (START + timedelta(hours=1)).replace(tzinfo=None)
+    np.testing.assert_array_equal(values, np.arange(48) * 2.0)
+    assert len(series[unknown].values) == 0
+
+    refresh_rollups(postgres_session)
+    daily = fetch_series(postgres_session, [items[0].id], START, START + timedelta(days=2), bucket="day")
+    np.testing.assert_array_equal(daily[items[0].id].values, [11.5, 35.5])
@@ -0,0 +1,170 @@
+import threading
+import time
+from uuid import uuid4
+
+import fakeredis
+import pytest
+import redis
+from sqlalchemy.orm import Session
+
+from app.cache import item as cache
+from app.cache.item import ItemCache
+from app.cache.local import LocalCache
+from app.db.crud import item as crud
+from app.db.schemas.item import Item, ItemCreate, ItemUpdate
+
+
+@pytest.fixture
+def item_cache() -> ItemCache:
+    """インプロセスのRedis互換サーバー（fakeredis）を使うキャッシュを提供するフィクスチャ"""
+    return ItemCache(fakeredis.FakeRedis(), ttl=60)
+
+
+@pytest.fixture
+def unavailable_cache() -> ItemCache:
+    """接続できないRedisを指すキャッシュを提供するフィクスチャ"""
+    client = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1, socket_timeout=0.1)
+    return ItemCache(client, ttl=60, retry_interval=60)
+
+
+def test_read_through(postgres_session: Session, item_cache: ItemCache):
+    """キャッシュミス時にDBから取得し、以降はキャッシュから返すことを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Cached Item"))
+
+    first = cache.get_item(postgres_session, db_item.id, cache=item_cache)
+    second = cache.get_item(postgres_session, db_item.id, cache=item_cache)
+
+    assert first == second
+    assert second.name == "Cached Item"
+    assert item_cache.stats()["misses"] == 1
+    assert item_cache.stats()["hits"] == 1
+    assert item_cache.client.ttl(f"item:{db_item.id}") > 0
+
+
+def test_update_invalidates(postgres_session: Session, item_cache: ItemCache):
+    """更新後に古いキャッシュが返されないことを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Before"))
+    cache.get_item(postgres_session, db_item.id, cache=item_cache)
+
+    cache.update_item(postgres_session, db_item.id, ItemUpdate(name="After"), cache=item_cache)
+
+    assert cache.get_item(postgres_session, db_item.id, cache=item_cache).name == "After"
+    assert item_cache.stats()["invalidations"] == 1
+
+
+def test_delete_invalidates(postgres_session: Session, item_cache: ItemCache):
+    """削除後にキャッシュからアイテムが返されないことを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Delete Me"))
+    cache.get_item(postgres_session, db_item.id, cache=item_cache)
+
+    assert cache.delete_item(postgres_session, db_item.id, cache=item_cache) is True
+    assert cache.get_item(postgres_session, db_item.id, cache=item_cache) is None
+
+
+def test_redis_outage_falls_back_to_database(postgres_session: Session, unavailable_cache: ItemCache):
+    """Redisに接続できない場合にDBから取得できることを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Fallback"))
+
+    assert cache.get_item(postgres_session, db_item.id, cache=unavailable_cache).name == "Fallback"
+    assert cache.get_item(postgres_session, db_item.id, cache=unavailable_cache).name == "Fallback"
+
+    stats = unavailable_cache.stats()
+    assert stats["available"] is False
+    # 障害検知後はRedisへのアクセスを行わない
+    assert stats["errors"] == 1
+
+
+def test_tombstone_blocks_stale_refill(postgres_session: Session, item_cache: ItemCache):
+    """無効化後の一定時間は、無効化の前に読み込んだ古い値（遅延したレプリカの値を含む）で埋め直されないことを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Before"))
+    stale = cache.get_item(postgres_session, db_item.id, cache=item_cache)
+
+    cache.update_item(postgres_session, db_item.id, ItemUpdate(name="After"), cache=item_cache)
+    # 更新前に読み込んでいた値を、更新後に保存しようとしても保存されない
+    item_cache.set(db_item.id, stale.model_dump_json().encode())
+
+    assert item_cache.get(db_item.id) is None
+    assert 0 < item_cache.client.ttl(f"item:{db_item.id}") <= cache.DEFAULT_TOMBSTONE_TTL
+    assert cache.get_item(postgres_session, db_item.id, cache=item_cache).name == "After"
+    with pytest.raises(ValueError):
+        ItemCache(fakeredis.FakeRedis(), ttl=60, tombstone_ttl=0)
+
+
+def test_lock_waits_for_other_process(postgres_session: Session):
+    """他のプロセスがロックを取得している場合は、データベースを参照せずに保存された値を返すことを確認するテスト"""
+    locking_cache = ItemCache(fakeredis.FakeRedis(), ttl=60, lock_timeout=2)
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Database"))
+    other = Item.model_validate(db_item).model_copy(update={"name": "Other Process"})
+    assert locking_cache.lock(db_item.id) is True
+    assert locking_cache.lock(db_item.id) is False
+
+    def fill():
+        time.sleep(0.05)
+        locking_cache.set(db_item.id, other.model_dump_json().encode())
+        locking_cache.unlock(db_item.id)
+
+    filler = threading.Thread(target=fill)
+    filler.start()
+    try:
+        assert cache.get_item(postgres_session, db_item.id, cache=locking_cache).name == "Other Process"
+    finally:
+        filler.join()
+    assert locking_cache.stats()["lock_waits"] == 1
+
+
+def test_lock_released_without_value_reads_database(postgres_session: Session):
+    """ロックが保存されずに解放された場合は、データベースから読み込むことを確認するテスト"""
+    locking_cache = ItemCache(fakeredis.FakeRedis(), ttl=60, lock_timeout=0.1)
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Database"))
+    locking_cache.lock(db_item.id)
+
+    assert cache.get_item(postgres_session, db_item.id, cache=locking_cache).name == "Database"
+    # 読み込んだプロセスがロックを解放する
+    assert locking_cache.lock(db_item.id) is True
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def workers():
+    """同じRedisを使用し、プロセス内のキャッシュを持つ2つのワーカーのキャッシュを提供するフィクスチャ"""
+    server = fakeredis.FakeServer()
+    caches = [
+        ItemCache(fakeredis.FakeRedis(server=server), ttl=60, local=LocalCache(max_items=100, max_bytes=65536, ttl=60))
+        for _ in range(2)
+    ]
+    for worker in caches:
+        worker.get(uuid4())
+        _wait_until(lambda: worker.stats()["local"]["listening"])
+    yield caches
+    for worker in caches:
+        worker.close()
+
+
+def test_local_tier_serves_without_redis(postgres_session: Session, workers):
+    """プロセス内のキャッシュにある値は、Redisを参照せずに返されることを確認するテスト"""
+    worker, _ = workers
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Hot Item"))
+    cache.get_item(postgres_session, db_item.id, cache=worker)
+    worker.client.flushall()
+
+    assert cache.get_item(postgres_session, db_item.id, cache=worker).name == "Hot Item"
+    local = worker.stats()["local"]
+    assert local["hits"] == 1 and local["items"] == 1 and local["bytes"] > 0
+
+
+def test_invalidation_is_broadcast_to_other_workers(postgres_session: Session, workers):
+    """更新したワーカー以外のプロセス内のキャッシュも Pub/Sub で無効化されることを確認するテスト"""
+    writer, reader = workers
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Before"))
+    assert cache.get_item(postgres_session, db_item.id, cache=reader).name == "Before"
+
+    cache.update_item(postgres_session, db_item.id, ItemUpdate(name="After"), cache=writer)
+
+    _wait_until(lambda: reader.local.stats()["items"] == 0)
+    assert cache.get_item(postgres_session, db_item.id, cache=reader).name == "After"
@@ -0,0 +1,58 @@
+import sys
+
+from app.cache.local import LocalCache
+
+
+class FakeClock:
+    """テストで進める時刻"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_expires_entries():
+    """有効期限を過ぎた値が返されず、期限切れとして数えられることを確認するテスト"""
+    clock = FakeClock()
+    local = LocalCache(max_items=10, max_bytes=1024, ttl=5, clock=clock)
+    local.set("a", b"payload")
+
+    clock.now = 4.9
+    assert local.get("a") == b"payload"
+    clock.now = 5.0
+    assert local.get("a") is None
+
+    stats = local.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+    assert stats["items"] == 0 and stats["bytes"] == 0
+
+
+def test_lru_eviction_by_count_and_bytes():
+    """件数・合計サイズの上限を超えた場合に、最も長く参照されていない値から破棄されることを確認するテスト"""
+    size = sys.getsizeof(b"x" * 10)
+    local = LocalCache(max_items=2, max_bytes=size * 3, ttl=60)
+    local.set("a", b"x" * 10)
+    local.set("b", b"x" * 10)
+    local.get("a")
+    local.set("c", b"x" * 10)
+
+    assert local.get("b") is None
+    assert local.get("a") is not None and local.get("c") is not None
+
+    # 1件で上限を超える値は保存しない
+    assert local.set("large", b"x" * (size * 3)) is False
+    assert local.stats()["evictions"] == 1
+    assert local.stats()["bytes"] == size * 2
+
+
+def test_set_after_discard_is_rejected():
+    """読み込み中に無効化された値が保存されないことを確認するテスト"""
+    local = LocalCache(max_items=10, max_bytes=1024, ttl=60)
+    generation = local.generation
+    local.discard("a")
+
+    assert local.set("a", b"stale", generation) is False
+    assert local.set("a", b"fresh", local.generation) is True
+    assert local.get("a") == b"fresh"
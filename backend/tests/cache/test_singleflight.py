@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.cache.singleflight import SingleFlight
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    """同じキーの同時呼び出しで関数が1回だけ実行され、全員に同じ結果が返されることを確認するテスト"""
+    flights = SingleFlight("test")
+    release = threading.Event()
+    executions = []
+
+    def load():
+        executions.append(1)
+        release.wait()
+        return ["row"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flights.do, "key", load) for _ in range(8)]
+        _wait_until(lambda: flights.stats()["shared"] == 7)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats() == {"enabled": True, "executions": 1, "shared": 7, "shared_ratio": 0.875, "in_flight": 0}
+
+    # 完了後の呼び出しは新たに実行する
+    flights.do("key", load)
+    assert len(executions) == 2
+
+
+def test_error_is_shared_and_not_remembered():
+    """関数の例外が待っていた呼び出しにも送出され、次の呼び出しは再実行されることを確認するテスト"""
+    flights = SingleFlight("test")
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise RuntimeError("database unavailable")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flights.do, "key", fail) for _ in range(2)]
+        _wait_until(lambda: flights.stats()["shared"] == 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="database unavailable"):
+                future.result()
+
+    assert flights.do("key", lambda: "recovered") == "recovered"
+
+
+def test_forget_starts_new_execution():
+    """`forget` 後の呼び出しが書き込み前に開始した実行にまとめられないことを確認するテスト"""
+    flights = SingleFlight("test")
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        stale = pool.submit(flights.do, "key", lambda: release.wait() and "before")
+        _wait_until(lambda: flights.stats()["in_flight"] == 1)
+        flights.forget()
+        assert flights.do("key", lambda: "after") == "after"
+        release.set()
+        assert stale.result() == "before"
+
+
+def test_disabled_always_executes():
+    """無効にした場合は呼び出しごとに関数が実行されることを確認するテスト"""
+    flights = SingleFlight("test", enabled=False)
+    executions = []
+
+    flights.do("key", lambda: executions.append(1))
+    flights.do("key", lambda: executions.append(1))
+
+    assert len(executions) == 2
+    assert flights.stats()["executions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_calls_share_one_execution():
+    """非同期の同時呼び出しがまとめられ、呼び出し元のキャンセルが他の呼び出しに影響しないことを確認するテスト"""
+    flights = SingleFlight("test")
+    release = asyncio.Event()
+    executions = []
+
+    async def load():
+        executions.append(1)
+        await release.wait()
+        return "row"
+
+    callers = [asyncio.create_task(flights.do_async("key", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    callers[0].cancel()
+    release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["row"] * 4
+    assert len(executions) == 1
+    assert flights.stats()["in_flight"] == 0
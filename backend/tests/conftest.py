@@ -1,11 +1,13 @@
 import os
 import sys
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 import pytest
+import pytest_asyncio
 from alembic.config import Config
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # プロジェクトルートディレクトリをPYTHONPATHに追加
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -13,6 +15,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from app.core.config import settings
 from app.db.models.database import Base
 
+# `@pytest.mark.query_budget` によるSQLの数の上限の確認（tests/query_budget.py）と、プラグインのテスト用の pytester
+pytest_plugins = ["tests.query_budget", "pytester"]
+
 
 # テスト用のデータベースURL
 TEST_DATABASE_URL = (
@@ -21,6 +26,11 @@ TEST_DATABASE_URL = (
     f"{settings.database_port}/{settings.database_name}_test"
 )
 
+# 非同期テスト用のデータベースURL
+TEST_ASYNC_DATABASE_URL = TEST_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
 
 @pytest.fixture(scope="session")
 def postgres_engine():
@@ -110,3 +120,25 @@ def postgres_session(postgres_engine, alembic_config) -> Generator[Session, None
         session.close()
         # マイグレーションをロールバック
         command.downgrade(alembic_config, "base")
+
+
+@pytest_asyncio.fixture
+async def async_postgres_session(postgres_engine, alembic_config) -> AsyncGenerator[AsyncSession, None]:
+    """テスト用の非同期データベースセッションを提供するフィクスチャ"""
+    from alembic import command
+
+    # マイグレーションを適用
+    command.upgrade(alembic_config, "head")
+
+    engine = create_async_engine(TEST_ASYNC_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    session = AsyncSessionLocal()
+
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+        await engine.dispose()
+        # マイグレーションをロールバック
+        command.downgrade(alembic_config, "base")
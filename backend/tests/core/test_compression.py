@@ -0,0 +1,129 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, available_encodings, negotiate_encoding
+
+PAYLOAD = json.dumps([{"id": i, "name": f"Item {i}", "description": "説明" * 10} for i in range(100)]).encode()
+
+
+@pytest.fixture
+def client():
+    """圧縮ミドルウェアを使用するアプリケーションのクライアントを提供するフィクスチャ"""
+    app = FastAPI()
+
+    @app.get("/items")
+    def read_items():
+        return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"page"'})
+
+    @app.get("/small")
+    def read_small():
+        return Response(b'{"id": 1}', media_type="application/json")
+
+    @app.get("/encoded")
+    def read_encoded():
+        return Response(gzip.compress(PAYLOAD), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter([b"data: 1\n\n" * 200]), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, encodings=("gzip",), minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*;q=0.1, br;q=0", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    """qの値とサーバーの優先順で圧縮方式が選ばれることを確認するテスト"""
+    assert negotiate_encoding(accept_encoding, ("br", "gzip")) == expected
+
+
+def test_gzip_response(client):
+    """しきい値以上の本文が gzip で圧縮され、ETagが弱いETagになることを確認するテスト"""
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"page"'
+    assert int(response.headers["content-length"]) == response.num_bytes_downloaded < len(PAYLOAD) // 4
+    assert response.content == PAYLOAD
+
+
+def test_uncompressed_responses(client):
+    """圧縮を受け付けないクライアント・小さい本文・圧縮済み・SSE のレスポンスは圧縮されないことを確認するテスト"""
+    identity = client.get("/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert identity.headers["etag"] == '"page"'
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert "vary" not in small.headers
+
+    encoded = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert encoded.content == PAYLOAD
+    assert int(encoded.headers["content-length"]) == len(gzip.compress(PAYLOAD))
+
+    events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in events.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_response():
+    """ストリーミングのレスポンスがチャンクごとに圧縮・フラッシュされ、受信した分から展開できることを確認するテスト"""
+    chunks = [PAYLOAD[i:i + 1000] for i in range(0, len(PAYLOAD), 1000)]
+    messages = []
+
+    async def receive():
+        # クライアントは切断しない
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = CompressionMiddleware(
+        StreamingResponse(iter(chunks), media_type="text/csv"), encodings=("gzip",)
+    )
+    await middleware(
+        {"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip")]}, receive, send
+    )
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    bodies = [message["body"] for message in messages[1:]]
+    assert len(bodies) == len(chunks) + 1
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    assert decompressor.decompress(bodies[0]) == chunks[0]
+    assert gzip.decompress(b"".join(bodies)) == PAYLOAD
+
+
+def test_brotli_response():
+    """brotli がインストールされている場合に br で圧縮されることを確認するテスト"""
+    pytest.importorskip("brotli")
+    app = FastAPI()
+
+    @app.get("/items")
+    def read_items():
+        return Response(PAYLOAD, media_type="application/json")
+
+    app.add_middleware(CompressionMiddleware)
+    response = TestClient(app).get("/items", headers={"Accept-Encoding": "gzip, br"})
+
+    assert available_encodings(["br", "gzip"]) == ("br", "gzip")
+    assert response.headers["content-encoding"] == "br"
+    assert response.content == PAYLOAD
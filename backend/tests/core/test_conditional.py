@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+from app.core.conditional import (
+    is_not_modified, item_etag, last_modified, page_etag, parse_item_etag, shared_cache_headers
+)
+
+UPDATED_AT = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def _request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def test_item_etag_round_trip():
+    """ETagから更新日時がマイクロ秒単位で復元できることを確認するテスト"""
+    etag = item_etag(UPDATED_AT)
+
+    assert parse_item_etag(etag) == UPDATED_AT
+    assert parse_item_etag(f"W/{etag}") == UPDATED_AT
+
+
+@pytest.mark.parametrize("etag", ["", "abc", '"xyz"', '"1", "2"'])
+def test_parse_invalid_item_etag(etag):
+    """不正なETagの場合にNoneが返されることを確認するテスト"""
+    assert parse_item_etag(etag) is None
+
+
+def test_page_etag_changes_with_rows():
+    """ページのETagが行の更新・削除で変わることを確認するテスト"""
+    rows = [SimpleNamespace(id=uuid4(), updated_at=UPDATED_AT) for _ in range(3)]
+    updated = rows[:2] + [SimpleNamespace(id=rows[2].id, updated_at=datetime.now(timezone.utc))]
+
+    assert page_etag(rows) == page_etag(list(rows))
+    assert page_etag(rows) != page_etag(updated)
+    assert page_etag(rows) != page_etag(rows[:2])
+
+
+def test_is_not_modified_if_none_match():
+    """If-None-Match が一致する場合のみ304と判定されることを確認するテスト"""
+    etag = item_etag(UPDATED_AT)
+
+    assert is_not_modified(_request(if_none_match=f'"other", {etag}'), etag, UPDATED_AT)
+    assert is_not_modified(_request(if_none_match="*"), etag, UPDATED_AT)
+    assert not is_not_modified(_request(if_none_match='"other"'), etag, UPDATED_AT)
+    # If-None-Match がある場合は If-Modified-Since を無視する
+    assert not is_not_modified(
+        _request(if_none_match='"other"', if_modified_since=last_modified(UPDATED_AT)), etag, UPDATED_AT
+    )
+
+
+def test_is_not_modified_if_modified_since():
+    """If-Modified-Since が秒単位で比較されることを確認するテスト"""
+    etag = item_etag(UPDATED_AT)
+
+    assert is_not_modified(_request(if_modified_since=last_modified(UPDATED_AT)), etag, UPDATED_AT)
+    assert not is_not_modified(_request(if_modified_since="Sat, 17 Oct 2026 09:30:15 GMT"), etag, UPDATED_AT)
+    assert not is_not_modified(_request(if_modified_since="invalid"), etag, UPDATED_AT)
+    assert not is_not_modified(_request(if_modified_since=last_modified(UPDATED_AT)), etag)
+
+
+def test_shared_cache_headers():
+    """共有キャッシュにのみ保存を許可し、0秒の場合は保存させないことを確認するテスト"""
+    assert shared_cache_headers(5) == {"Cache-Control": "public, max-age=0, s-maxage=5"}
+    assert shared_cache_headers(0) == {"Cache-Control": "no-cache"}
@@ -0,0 +1,96 @@
+from typing import Dict
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.instrumentation import (
+    InstrumentationMiddleware, RequestMetrics, RequestTimings, TimedRoute, instrument_engine
+)
+from app.db.pool import PoolMetrics
+
+
+class Payload(BaseModel):
+    id: int
+    queries: int
+
+
+@pytest.fixture
+def metrics() -> RequestMetrics:
+    """テストごとの集計を提供するフィクスチャ"""
+    return RequestMetrics()
+
+
+@pytest.fixture
+def client(tmp_path, metrics):
+    """計測付きのエンジン・ルート・ミドルウェアを使用するアプリケーションのクライアントを提供するフィクスチャ"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'instrumentation.db'}",
+        poolclass=PoolMetrics("test").pool_class(QueuePool),
+    )
+    instrument_engine(engine)
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/items/{item_id}", response_model=Payload)
+    def read_item(item_id: int, queries: int = 2):
+        with engine.connect() as conn:
+            for _ in range(queries):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id, "queries": queries}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(InstrumentationMiddleware, metrics=metrics)
+    try:
+        yield TestClient(app)
+    finally:
+        engine.dispose()
+
+
+def _server_timing(header: str) -> Dict[str, str]:
+    return {entry.split(";", 1)[0]: entry.split(";", 1)[1] for entry in header.split(", ")}
+
+
+def test_server_timing_header(client):
+    """SQLの実行回数・時間、プール待ち、シリアライズ時間が Server-Timing ヘッダーに含まれることを確認するテスト"""
+    response = client.get("/items/1", params={"queries": 3})
+
+    assert response.status_code == 200
+    timing = _server_timing(response.headers["server-timing"])
+    assert set(timing) == {"total", "db", "pool", "serialize"}
+    assert timing["db"].endswith('desc="3 queries"')
+    for name in ("total", "pool", "serialize"):
+        assert float(timing[name].removeprefix("dur=")) > 0
+
+
+def test_histograms_are_recorded_per_route(client, metrics):
+    """ヒストグラムがルートのテンプレート・ステータスコードごとに記録されることを確認するテスト"""
+    client.get("/items/1")
+    client.get("/items/2", params={"queries": 0})
+    client.get("/missing")
+
+    output = metrics.render()
+    labels = 'method="GET",route="/items/{item_id}",status="200"'
+    assert f"http_request_duration_seconds_count{{{labels}}} 2" in output
+    assert f"http_request_db_queries_sum{{{labels}}} 2.0" in output
+    assert f'http_request_db_queries_bucket{{{labels},le="0"}} 1' in output
+    assert 'route="<unmatched>",status="404"' in output
+
+
+def test_histogram_buckets_are_cumulative(metrics):
+    """バケットが累積値で出力され、`+Inf` が件数と一致することを確認するテスト"""
+    timings = RequestTimings()
+    timings.queries = 4
+    for total in (0.0004, 0.003, 20.0):
+        metrics.observe("GET", "/", 200, timings, total)
+
+    lines = [line for line in metrics.render().splitlines() if line.startswith("http_request_duration_seconds")]
+    labels = 'method="GET",route="/",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.0005"}} 1' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 2' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="10.0"}} 2' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f"http_request_duration_seconds_count{{{labels}}} 3" in lines
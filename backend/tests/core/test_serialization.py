@@ -0,0 +1,49 @@
+import json
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.serialization import RowsResponse, dump_rows, dump_rows_ndjson
+from app.db.crud import item as crud
+from app.db.crud import item_async as crud_async
+from app.db.schemas.item import Item, ItemCreate
+
+
+def test_dump_rows_matches_response_model(postgres_session: Session):
+    """行から直接組み立てたJSONが `response_model` による出力と同じになることを確認するテスト"""
+    crud.create_items(postgres_session, [
+        ItemCreate(name="Item 1", description="日本語 \"quoted\"\n"),
+        ItemCreate(name="Item 2"),
+    ])
+    rows = crud.get_item_rows(postgres_session)
+    orm_items = crud.get_items(postgres_session)
+
+    adapter = TypeAdapter(List[Item])
+    expected = adapter.dump_json(adapter.validate_python(orm_items, from_attributes=True))
+
+    assert dump_rows(rows) == expected
+    assert RowsResponse(rows).body == expected
+    assert [json.loads(line) for line in dump_rows_ndjson(rows).splitlines()] == json.loads(expected)
+
+
+@pytest.mark.asyncio
+async def test_dump_rows_from_asyncpg(async_postgres_session: AsyncSession):
+    """asyncpg の行（UUIDが `uuid.UUID` のサブクラス）もエンコードできることを確認するテスト"""
+    item = await crud_async.create_item(async_postgres_session, ItemCreate(name="Async Item"))
+    rows = await crud_async.get_item_rows(async_postgres_session)
+
+    assert json.loads(dump_rows(rows))[0]["id"] == str(item.id)
+    assert json.loads(dump_rows_ndjson(rows))["id"] == str(item.id)
+
+
+def test_get_item_rows_keyset(postgres_session: Session):
+    """`after` を指定した場合にキーセット方式で続きの行が取得されることを確認するテスト"""
+    crud.create_items(postgres_session, [ItemCreate(name=f"Item {i}") for i in range(5)])
+
+    first = crud.get_item_rows(postgres_session, limit=2)
+    rest = crud.get_item_rows(postgres_session, limit=10, after=(first[-1].created_at, first[-1].id))
+
+    assert [row.id for row in first + rest] == [item.id for item in crud.get_items(postgres_session)]
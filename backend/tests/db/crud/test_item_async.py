@@ -0,0 +1,176 @@
+import asyncio
+import json
+from datetime import datetime
+from uuid import UUID
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.singleflight import SingleFlight
+from app.db.crud import item_async as crud
+from app.db.dependencies import get_async_db, get_async_session_factory
+from app.routers import item_async
+from app.routers.item_async import _load_item_json, _load_page
+from app.db.schemas.item import ItemCreate, ItemUpdate
+
+
+NON_EXISTENT_ID = UUID('12345678-1234-5678-1234-567812345678')
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_item(async_postgres_session: AsyncSession):
+    """非同期でのアイテム作成と取得のテスト"""
+    item = await crud.create_item(
+        async_postgres_session,
+        ItemCreate(name="Async Item", description="Async Description")
+    )
+
+    assert isinstance(item.id, UUID)
+    assert isinstance(item.created_at, datetime)
+
+    retrieved_item = await crud.get_item(async_postgres_session, item.id)
+    assert retrieved_item is not None
+    assert retrieved_item.name == "Async Item"
+    assert retrieved_item.description == "Async Description"
+
+
+@pytest.mark.asyncio
+async def test_get_items_pagination(async_postgres_session: AsyncSession):
+    """非同期でのアイテム一覧取得とページネーションのテスト"""
+    for i in range(5):
+        await crud.create_item(async_postgres_session, ItemCreate(name=f"Item {i}"))
+
+    assert len(await crud.get_items(async_postgres_session)) == 5
+    assert len(await crud.get_items(async_postgres_session, skip=2, limit=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_item(async_postgres_session: AsyncSession):
+    """非同期でのアイテム更新のテスト"""
+    item = await crud.create_item(async_postgres_session, ItemCreate(name="Before"))
+
+    updated_item = await crud.update_item(
+        async_postgres_session, item.id, ItemUpdate(name="After")
+    )
+    assert updated_item is not None
+    assert updated_item.name == "After"
+
+    # 空の更新は既存のアイテムを返す
+    unchanged_item = await crud.update_item(async_postgres_session, item.id, ItemUpdate())
+    assert unchanged_item.name == "After"
+
+    assert await crud.update_item(
+        async_postgres_session, NON_EXISTENT_ID, ItemUpdate(name="After")
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_item(async_postgres_session: AsyncSession):
+    """非同期でのアイテム削除のテスト"""
+    item = await crud.create_item(async_postgres_session, ItemCreate(name="Delete Me"))
+
+    assert await crud.delete_item(async_postgres_session, item.id) is True
+    assert await crud.get_item(async_postgres_session, item.id) is None
+    assert await crud.delete_item(async_postgres_session, NON_EXISTENT_ID) is False
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_detached_json(async_postgres_session: AsyncSession):
+    """まとめた読み取りが専用のセッションで実行され、先頭の呼び出し元がキャンセルされても他の呼び出しにJSONが返されることを確認するテスト"""
+    item = await crud.create_item(async_postgres_session, ItemCreate(name="Shared Item"))
+    session_factory = async_sessionmaker(bind=async_postgres_session.bind, expire_on_commit=False)
+    flights = SingleFlight("test")
+
+    callers = [
+        asyncio.create_task(flights.do_async(("item", item.id), lambda: _load_item_json(item.id, session_factory)))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    callers[0].cancel()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] is results[2]
+    assert json.loads(results[1])["name"] == "Shared Item"
+    assert await _load_item_json(NON_EXISTENT_ID, session_factory) is None
+
+    content, headers = await _load_page(0, 1, None, session_factory)
+    assert json.loads(content)[0]["id"] == str(item.id)
+    assert "X-Next-Cursor" in headers and "ETag" in headers
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_with_expected_updated_at(async_postgres_session: AsyncSession):
+    """更新日時が一致する場合のみ非同期で更新・削除されることを確認するテスト"""
+    item = await crud.create_item(async_postgres_session, ItemCreate(name="Before"))
+    original_updated_at = item.updated_at
+    assert await crud.get_item_updated_at(async_postgres_session, item.id) == original_updated_at
+
+    updated = await crud.update_item(
+        async_postgres_session, item.id, ItemUpdate(name="After"), expected_updated_at=original_updated_at
+    )
+    assert updated is not None and updated.updated_at > original_updated_at
+    assert await crud.update_item(
+        async_postgres_session, item.id, ItemUpdate(), expected_updated_at=original_updated_at
+    ) is None
+    assert await crud.delete_item(async_postgres_session, item.id, expected_updated_at=original_updated_at) is False
+    assert await crud.delete_item(async_postgres_session, item.id, expected_updated_at=updated.updated_at) is True
+    assert await crud.get_item_updated_at(async_postgres_session, item.id) is None
+
+
+@pytest.mark.asyncio
+async def test_router_conditional_requests(async_postgres_session: AsyncSession):
+    """非同期のルーターでも ETag による条件付きGET（304）と If-Match による楽観的排他制御が行われることを確認するテスト"""
+    item = await crud.create_item(async_postgres_session, ItemCreate(name="Item"))
+    app = FastAPI()
+    app.include_router(item_async.router)
+    app.dependency_overrides[get_async_db] = lambda: async_postgres_session
+    app.dependency_overrides[get_async_session_factory] = lambda: async_sessionmaker(
+        bind=async_postgres_session.bind, expire_on_commit=False
+    )
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(f"/api/items/{item.id}")
+        etag = response.headers["etag"]
+        assert response.headers["last-modified"]
+        assert (await client.get(f"/api/items/{item.id}", headers={"If-None-Match": etag})).status_code == 304
+
+        page = await client.get("/api/items")
+        assert (await client.get("/api/items", headers={"If-None-Match": page.headers["etag"]})).status_code == 304
+
+        updated = await client.put(f"/api/items/{item.id}", json={"name": "Updated"}, headers={"If-Match": etag})
+        assert updated.status_code == 200
+        assert updated.headers["etag"] != etag
+        # 取得後に更新されたアイテムは、古いETagでは更新・削除できない
+        stale = await client.put(f"/api/items/{item.id}", json={"name": "Lost"}, headers={"If-Match": etag})
+        assert stale.status_code == 412
+        assert (await client.delete(f"/api/items/{item.id}", headers={"If-Match": etag})).status_code == 412
+        assert (await client.delete(f"/api/items/{NON_EXISTENT_ID}", headers={"If-Match": etag})).status_code == 404
+
+        response = await client.get(f"/api/items/{item.id}")
+        assert response.json()["name"] == "Updated"
+        assert (await client.delete(
+            f"/api/items/{item.id}", headers={"If-Match": updated.headers["etag"]}
+        )).status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_router_upsert_by_code(async_postgres_session: AsyncSession):
+    """非同期のルーターでもアイテムコードによる upsert（作成は201、更新は200）が使用できることを確認するテスト"""
+    app = FastAPI()
+    app.include_router(item_async.router)
+    app.dependency_overrides[get_async_db] = lambda: async_postgres_session
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.put("/api/items/by-code/X-1", json={"name": "Created"})
+        updated = await client.put("/api/items/by-code/X-1", json={"name": "Updated"})
+
+    assert created.status_code == 201
+    assert updated.status_code == 200
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["name"] == "Updated"
+    assert "etag" in updated.headers
@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemBulkUpdate, ItemCreate
+
+
+@pytest.mark.query_budget(2)
+def test_create_items_preserves_order(postgres_session: Session):
+    """一括作成で入力と同じ順序のアイテムが返されることを確認するテスト"""
+    items = crud.create_items(
+        postgres_session,
+        [ItemCreate(name=f"Item {i}", description=f"Description {i}") for i in range(50)]
+    )
+
+    assert [item.name for item in items] == [f"Item {i}" for i in range(50)]
+    assert all(item.created_at is not None for item in items)
+    assert len(crud.get_items(postgres_session)) == 50
+
+
+@pytest.mark.query_budget(0)
+def test_create_items_empty(postgres_session: Session):
+    """空のリストの一括作成で何も作成されないことを確認するテスト"""
+    assert crud.create_items(postgres_session, []) == []
+
+
+@pytest.mark.query_budget(2)
+def test_update_items_partial(postgres_session: Session):
+    """行ごとに指定したフィールドだけが一括更新されることを確認するテスト"""
+    first, second = crud.create_items(postgres_session, [
+        ItemCreate(name="First", description="First Description"),
+        ItemCreate(name="Second", description="Second Description"),
+    ])
+    missing_id = uuid4()
+
+    updated = crud.update_items(postgres_session, [
+        ItemBulkUpdate(id=first.id, name="First Updated"),
+        ItemBulkUpdate(id=second.id, description=None),
+        ItemBulkUpdate(id=missing_id, name="Missing"),
+    ])
+
+    assert set(updated) == {first.id, second.id}
+    assert updated[first.id].name == "First Updated"
+    assert updated[first.id].description == "First Description"
+    assert updated[second.id].name == "Second"
+    assert updated[second.id].description is None
+
+
+@pytest.mark.query_budget(3)
+def test_delete_items(postgres_session: Session):
+    """一括削除で存在するアイテムのみ削除されることを確認するテスト"""
+    items = crud.create_items(postgres_session, [ItemCreate(name=f"Item {i}") for i in range(3)])
+    missing_id = uuid4()
+
+    deleted = crud.delete_items(postgres_session, [items[0].id, items[1].id, missing_id])
+
+    assert set(deleted) == {items[0].id, items[1].id}
+    assert [item.id for item in crud.get_items(postgres_session)] == [items[2].id]
@@ -0,0 +1,46 @@
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemCreate, ItemUpdate
+
+
+def test_get_item_updated_at(postgres_session: Session):
+    """更新日時のみを取得できることを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Item"))
+
+    assert crud.get_item_updated_at(postgres_session, db_item.id) == db_item.updated_at
+    assert crud.get_item_updated_at(postgres_session, uuid4()) is None
+
+
+def test_update_item_with_expected_updated_at(postgres_session: Session):
+    """更新日時が一致する場合のみ更新されることを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Before"))
+    original_updated_at = db_item.updated_at
+
+    updated = crud.update_item(
+        postgres_session, db_item.id, ItemUpdate(name="After"), expected_updated_at=original_updated_at
+    )
+    assert updated is not None
+    assert updated.updated_at > original_updated_at
+
+    # 古い更新日時では更新されない（変更のない更新も同様）
+    assert crud.update_item(
+        postgres_session, db_item.id, ItemUpdate(name="Lost"), expected_updated_at=original_updated_at
+    ) is None
+    assert crud.update_item(
+        postgres_session, db_item.id, ItemUpdate(), expected_updated_at=original_updated_at
+    ) is None
+    assert crud.get_item(postgres_session, db_item.id).name == "After"
+
+
+def test_delete_item_with_expected_updated_at(postgres_session: Session):
+    """更新日時が一致しない場合は削除されないことを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Item"))
+    original_updated_at = db_item.updated_at
+    crud.update_item(postgres_session, db_item.id, ItemUpdate(name="Changed"))
+
+    assert crud.delete_item(postgres_session, db_item.id, expected_updated_at=original_updated_at) is False
+    current = crud.get_item_updated_at(postgres_session, db_item.id)
+    assert crud.delete_item(postgres_session, db_item.id, expected_updated_at=current) is True
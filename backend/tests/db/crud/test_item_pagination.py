@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.models.item import Item
+
+
+def test_get_items_after_walks_all_rows(postgres_session: Session):
+    """作成日時が同じ行を含めて、キーセット方式で全件を重複なく取得できることを確認するテスト"""
+    # 同一トランザクションで作成し、created_at を同じ値にする
+    postgres_session.add_all([Item(name=f"Item {i}") for i in range(7)])
+    postgres_session.commit()
+
+    seen = []
+    after = None
+    while True:
+        page = crud.get_items_after(postgres_session, after=after, limit=3)
+        seen.extend(item.id for item in page)
+        if len(page) < 3:
+            break
+        after = (page[-1].created_at, page[-1].id)
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    assert seen == [item.id for item in crud.get_items(postgres_session)]
+
+
+def test_get_items_after_uses_index(postgres_session: Session):
+    """キーセット方式のクエリで複合インデックスが使われることを確認するテスト"""
+    from sqlalchemy import text
+
+    postgres_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(row[0] for row in postgres_session.execute(text(
+        "EXPLAIN SELECT * FROM items "
+        "WHERE (created_at, id) > (now(), gen_random_uuid()) "
+        "ORDER BY created_at, id LIMIT 100"
+    )))
+
+    assert "ix_items_created_at_id" in plan
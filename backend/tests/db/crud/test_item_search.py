@@ -0,0 +1,68 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.dependencies import get_read_db
+from app.db.schemas.item import ItemCreate
+from app.routers import item_search
+
+
+def _create_items(db: Session):
+    crud.create_items(db, [
+        ItemCreate(name="Blue Widget", description="A small gadget"),
+        ItemCreate(name="Red Gadget", description="Works with any widget"),
+        ItemCreate(name="Green Bolt", description="Hardware"),
+    ])
+
+
+def test_search_full_text_ranks_name_above_description(postgres_session: Session):
+    """名前での一致が説明での一致より上位になり、無関係な行は返されないことを確認するテスト"""
+    _create_items(postgres_session)
+
+    rows = crud.search_items(postgres_session, "widget")
+
+    assert [row.name for row in rows] == ["Blue Widget", "Red Gadget"]
+    assert rows[0].rank > rows[1].rank
+
+
+def test_search_fuzzy_name(postgres_session: Session):
+    """表記ゆれのある検索文字列でも名前の類似度で一致することを確認するテスト"""
+    _create_items(postgres_session)
+
+    rows = crud.search_items(postgres_session, "widgets")
+
+    assert rows[0].name == "Blue Widget"
+
+
+def test_search_keyset_pagination(postgres_session: Session):
+    """カーソルで続きを取得した結果が、一度に取得した結果と同じ順序になることを確認するテスト"""
+    crud.create_items(postgres_session, [
+        ItemCreate(name=f"Widget {i}", description="widget" if i % 2 else None) for i in range(7)
+    ])
+    expected = [row.id for row in crud.search_items(postgres_session, "widget", limit=100)]
+
+    paged = []
+    after = None
+    while True:
+        rows = crud.search_items(postgres_session, "widget", limit=3, after=after)
+        paged += [row.id for row in rows]
+        if len(rows) < 3:
+            break
+        after = (rows[-1].rank, rows[-1].id)
+
+    assert len(expected) == 7
+    assert paged == expected
+
+
+@pytest.mark.parametrize("limit", [-1, 0, item_search.SEARCH_MAX_LIMIT + 1])
+def test_search_rejects_out_of_range_limit(postgres_session: Session, limit):
+    """範囲外の件数が500やすべての候補の取得ではなく422になることを確認するテスト"""
+    app = FastAPI()
+    app.include_router(item_search.router)
+    app.dependency_overrides[get_read_db] = lambda: postgres_session
+
+    response = TestClient(app).get("/api/items/search", params={"q": "item", "limit": limit})
+
+    assert response.status_code == 422
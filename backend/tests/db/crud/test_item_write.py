@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemCreate, ItemUpdate
+
+
+@pytest.mark.query_budget(1)
+def test_create_item_returns_server_defaults(postgres_session: Session):
+    """作成日時・更新日時を含むアイテムが1つの INSERT ... RETURNING で返されることを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Item", description="Description"))
+
+    assert db_item.name == "Item"
+    assert db_item.description == "Description"
+    assert db_item.created_at is not None
+    assert db_item.updated_at == db_item.created_at
+
+
+@pytest.mark.query_budget(3)
+def test_update_item_without_changes(postgres_session: Session):
+    """更新する項目がない場合は SELECT のみで、更新日時の条件も確認されることを確認するテスト"""
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Item"))
+    postgres_session.expunge_all()
+
+    assert crud.update_item(postgres_session, db_item.id, ItemUpdate(), expected_updated_at=db_item.updated_at).name == "Item"
+    assert crud.update_item(postgres_session, db_item.id, ItemUpdate(), expected_updated_at=db_item.created_at.replace(year=2000)) is None
+
+
+@pytest.mark.query_budget(2)
+def test_upsert_item(postgres_session: Session):
+    """同じアイテムコードでは作成済みのアイテムが更新されることを確認するテスト"""
+    created, is_created = crud.upsert_item(postgres_session, "ITEM-001", ItemCreate(name="Before", description="Description"))
+    item_id, created_at = created.id, created.created_at
+    updated, is_updated_created = crud.upsert_item(postgres_session, "ITEM-001", ItemCreate(name="After"))
+
+    assert is_created is True and is_updated_created is False
+    assert updated.id == item_id
+    assert updated.code == "ITEM-001"
+    assert updated.name == "After"
+    assert updated.description is None
+    assert updated.created_at == created_at
+    assert updated.updated_at > created_at
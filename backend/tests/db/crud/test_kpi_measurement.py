@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.crud import item as item_crud
+from app.db.crud import kpi_measurement as crud
+from app.db.dependencies import get_db, get_read_db
+from app.db.partitions import list_partitions
+from app.db.schemas.item import ItemCreate
+from app.db.schemas.kpi_measurement import KpiMeasurementCreate
+from app.routers import kpi_measurement
+
+START = datetime(2021, 3, 31, 23, 0, tzinfo=timezone.utc)
+
+
+def test_ingest_across_partitions_and_upsert(postgres_session: Session):
+    """月をまたぐ測定値が保存され、同じ日時の測定値は上書きされることを確認するテスト"""
+    item = item_crud.create_item(postgres_session, ItemCreate(name="KPI"))
+    points = [
+        KpiMeasurementCreate(item_id=item.id, measured_at=START + timedelta(minutes=30 * i), value=i)
+        for i in range(4)
+    ]
+
+    assert crud.ingest_measurements(postgres_session, points) == 4
+    # 再送とバッチ内の重複（後の値を採用）
+    retry = points[:1] + [points[0].model_copy(update={"value": 100.0})]
+    assert crud.ingest_measurements(postgres_session, retry) == 1
+
+    rows = crud.get_measurements(postgres_session, item.id, START, START + timedelta(days=1))
+    assert [row.value for row in rows] == [100.0, 1.0, 2.0, 3.0]
+    assert rows[0].measured_at == START
+
+
+def test_ingest_unknown_item(postgres_session: Session):
+    """存在しないアイテムの測定値が拒否され、そのIDを特定できることを確認するテスト"""
+    unknown = uuid4()
+
+    with pytest.raises(IntegrityError):
+        crud.ingest_measurements(postgres_session, [
+            KpiMeasurementCreate(item_id=unknown, measured_at=START, value=1.0)
+        ])
+    postgres_session.rollback()
+
+    assert crud.get_missing_item_ids(postgres_session, [unknown]) == [unknown]
+
+
+@pytest.mark.parametrize("params", [
+    {"start": "2021-04-01T00:00:00", "end": "2021-05-01T00:00:00Z"},
+    {"start": "2021-04-01T00:00:00Z", "end": "2021-05-01T00:00:00Z", "limit": -1},
+    {"start": "2021-04-01T00:00:00Z", "end": "2021-05-01T00:00:00Z", "limit": kpi_measurement.MEASUREMENTS_MAX_LIMIT + 1},
+])
+def test_read_measurements_rejects_invalid_params(postgres_session: Session, params):
+    """タイムゾーンのない日時・範囲外の件数が500ではなく422になることを確認するテスト"""
+    app = FastAPI()
+    app.include_router(kpi_measurement.router)
+    app.dependency_overrides[get_read_db] = lambda: postgres_session
+    item = item_crud.create_item(postgres_session, ItemCreate(name="KPI"))
+
+    response = TestClient(app).get("/api/measurements", params={"item_id": str(item.id), **params})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("measured_at", [
+    "1900-01-01T00:00:00Z",
+    "9999-12-01T00:00:00Z",
+    [f"{2000 + i}-01-01T00:00:00Z" for i in range(settings.measurement_batch_max_months + 1)],
+])
+def test_ingest_rejects_out_of_window_points(postgres_session: Session, monkeypatch, measured_at):
+    """保持期間より前・事前作成の範囲より先の測定日時と、月数の多すぎるバッチがパーティションを作成せずに422になることを確認するテスト"""
+    monkeypatch.setattr(settings, "measurement_retention_months", 12 * 30)
+    app = FastAPI()
+    app.include_router(kpi_measurement.router)
+    app.dependency_overrides[get_db] = lambda: postgres_session
+    item = item_crud.create_item(postgres_session, ItemCreate(name="KPI"))
+    partitions = list_partitions(postgres_session)
+    now = datetime.now(timezone.utc).isoformat()
+    values = measured_at if isinstance(measured_at, list) else [measured_at]
+
+    response = TestClient(app).post("/api/measurements", json=[
+        {"item_id": str(item.id), "measured_at": value, "value": 1.0} for value in [now, *values]
+    ])
+
+    assert response.status_code == 422
+    assert list_partitions(postgres_session) == partitions
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as item_crud
+from app.db.crud import kpi_measurement as measurement_crud
+from app.db.crud import kpi_rollup as crud
+from app.db.rollups import refresh_rollups
+from app.db.schemas.item import ItemCreate
+from app.db.schemas.kpi_measurement import KpiMeasurementCreate
+
+JAN = datetime(2021, 1, 1, tzinfo=timezone.utc)
+MAR = datetime(2021, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("bucket, start, end, expected", [
+    ("day", datetime(2020, 1, 1, tzinfo=timezone.utc), JAN, "day"),
+    ("month", JAN, MAR, "month"),
+    ("year", JAN, MAR, "month"),
+    ("week", JAN, MAR, "day"),
+    ("month", JAN + timedelta(days=3), MAR, "day"),
+    ("day", JAN + timedelta(hours=5), MAR, "hour"),
+    ("hour", JAN, MAR, "hour"),
+    ("day", JAN + timedelta(minutes=5), MAR, None),
+    # 日本時間の0時はUTCの区切りではない
+    ("day", datetime(2021, 1, 1, tzinfo=timezone(timedelta(hours=9))), MAR, "hour"),
+])
+def test_choose_source(bucket, start, end, expected):
+    """集計単位と期間から最も粗いロールアップが選択されることを確認するテスト"""
+    assert crud.choose_source(bucket, start, end) == expected
+
+
+def test_get_aggregates_matches_raw(postgres_session: Session):
+    """ロールアップからの集計結果が測定値からの集計結果と一致することを確認するテスト"""
+    item = item_crud.create_item(postgres_session, ItemCreate(name="KPI"))
+    measurement_crud.ingest_measurements(postgres_session, [
+        KpiMeasurementCreate(item_id=item.id, measured_at=JAN + timedelta(hours=7 * i), value=i % 10)
+        for i in range(300)
+    ])
+    refresh_rollups(postgres_session)
+
+    for bucket in ("day", "week", "month"):
+        source, rows = crud.get_aggregates(postgres_session, item.id, bucket, JAN, MAR)
+        _, raw = crud.get_aggregates(postgres_session, item.id, bucket, JAN + timedelta(microseconds=1), MAR)
+        assert source != "raw"
+        # 先頭の測定値（JAN ちょうど、値0）を除いた集計と比較する
+        assert rows[0].count == raw[0].count + 1
+        assert [tuple(row) for row in rows[1:]] == [tuple(row) for row in raw[1:]]
+        # 1月・2月（59日間）に含まれる7時間間隔の測定値の件数
+        assert sum(row.count for row in rows) == (59 * 24 - 1) // 7 + 1
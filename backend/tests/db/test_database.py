@@ -0,0 +1,21 @@
+from app.db.models import database
+
+
+def test_engine_is_created_on_first_session():
+    """エンジンが最初のセッションの作成時に作成され、セッションに設定されることを確認するテスト"""
+    engine = database.init_engines()
+
+    with database.SessionLocal() as session:
+        assert session.get_bind() is engine
+    assert database.init_engines() is engine
+
+
+def test_engine_is_recreated_after_fork(monkeypatch):
+    """fork した子プロセスでは親プロセスのエンジンを使わずに作成し直すことを確認するテスト"""
+    parent_engine = database.init_engines()
+    monkeypatch.setattr(database.os, "getpid", lambda: -1)
+
+    with database.SessionLocal() as session:
+        child_engine = session.get_bind()
+    assert child_engine is not parent_engine
+    assert database.engine is child_engine
@@ -0,0 +1,176 @@
+import logging
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import inspection
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemCreate
+
+
+@pytest.fixture(autouse=True)
+def enabled():
+    """SQLの記録を有効にし、終了後に無効にするフィクスチャ（以降のテストにリスナーを残さない）"""
+    enabled = inspection.enable_query_inspection()
+    yield
+    if enabled:
+        inspection.disable_query_inspection()
+
+
+@pytest.fixture
+def warnings_log(postgres_session, caplog, monkeypatch):
+    """`app.db.inspection` の警告を記録するフィクスチャ"""
+    # マイグレーションの適用（alembic の fileConfig）で無効にされたロガーを有効にする
+    monkeypatch.setattr(inspection.logger, "disabled", False)
+    caplog.set_level(logging.WARNING, logger=inspection.logger.name)
+    return caplog
+
+
+def test_statement_shape():
+    """パラメータの名前・件数が異なるSQLが同じ形になることを確認するテスト"""
+    assert inspection.statement_shape(
+        "SELECT * FROM items\n WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND name = %(name_1)s"
+    ) == inspection.statement_shape(
+        "SELECT * FROM items WHERE id IN (%(id_1_1)s) AND name = %(name_2)s"
+    ) == "SELECT * FROM items WHERE id IN (...) AND name = ?"
+    assert inspection.statement_shape(
+        "INSERT INTO items (name, id) VALUES (%(name_m0)s, %(id_m0)s::UUID), (%(name_m1)s, %(id_m1)s::UUID)"
+    ) == "INSERT INTO items (name, id) VALUES (...)"
+
+
+def test_disable_removes_listeners():
+    """無効にするとエンジンクラスのイベントリスナーが削除され、再度有効にできることを確認するテスト"""
+    inspection.disable_query_inspection()
+    assert not event.contains(Engine, "after_cursor_execute", inspection._after_cursor_execute)
+
+    assert inspection.enable_query_inspection() is True
+    assert inspection.enable_query_inspection() is False
+    assert event.contains(Engine, "after_cursor_execute", inspection._after_cursor_execute)
+
+
+def test_capture_records_crud_origin(postgres_session: Session):
+    """記録したSQLに実行したCRUD関数が含まれることを確認するテスト"""
+    with inspection.capture_queries() as log:
+        crud.create_items(postgres_session, [ItemCreate(name="Item")])
+        crud.get_items(postgres_session)
+
+    assert [query.origin for query in log.queries] == [
+        "app.db.crud.item.create_items", "app.db.crud.item.get_items"
+    ]
+
+
+@pytest.mark.parametrize("explain_analyze", [False, True])
+def test_slow_query_is_logged_with_plan(postgres_session: Session, warnings_log, monkeypatch, explain_analyze):
+    """スロークエリが実行計画とともに出力され、SELECT は ANALYZE を有効にした場合のみ、書き込みは常に再実行されないことを確認するテスト"""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    monkeypatch.setattr(settings, "slow_query_explain_analyze", explain_analyze)
+
+    crud.create_items(postgres_session, [ItemCreate(name="Item")])
+    items = crud.get_items(postgres_session)
+
+    insert, select = [record.getMessage() for record in warnings_log.records if "Slow query" in record.getMessage()]
+    assert "INSERT INTO items" in insert and "cost=" in insert and "actual time" not in insert
+    assert "SELECT" in select and "cost=" in select
+    assert ("actual time" in select) is explain_analyze
+    assert "origin: app.db.crud.item.get_items" in select
+    assert len(items) == 1
+
+
+def test_n_plus_one_is_reported_per_request(postgres_session: Session, warnings_log):
+    """1リクエストで同じ形のSQLを繰り返し実行した場合に N+1 の候補として出力されることを確認するテスト"""
+    items = crud.create_items(postgres_session, [ItemCreate(name=f"Item {i}") for i in range(settings.n_plus_one_threshold)])
+    # `get_item`（`Session.get`）がアイテムごとにSQLを実行するよう、セッションから切り離す
+    postgres_session.expunge_all()
+    logs: List[inspection.QueryLog] = []
+    app = FastAPI()
+
+    @app.get("/items")
+    def read_items():
+        return [crud.get_item(postgres_session, item.id).name for item in items]
+
+    app.add_middleware(inspection.QueryInspectionMiddleware)
+    inspection.request_observers.append(logs.append)
+    try:
+        assert TestClient(app).get("/items").status_code == 200
+    finally:
+        inspection.request_observers.remove(logs.append)
+
+    assert [log.label for log in logs] == ["GET /items"]
+    assert any(
+        f"Possible N+1 in GET /items: statement executed {settings.n_plus_one_threshold} times "
+        "(origin: app.db.crud.item.get_item)" in record.getMessage()
+        for record in warnings_log.records
+    )
+
+
+def test_query_budget_marker_fails_test(pytester):
+    """`query_budget` の上限を超えたテストが失敗することを確認するテスト"""
+    pytester.makepyfile("""
+        import pytest
+        from sqlalchemy import create_engine, text
+
+        @pytest.mark.query_budget(1)
+        def test_over_budget():
+            with create_engine("sqlite://").connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        @pytest.mark.query_budget(2)
+        def test_within_budget():
+            with create_engine("sqlite://").connect() as conn:
+                conn.execute(text("SELECT 1"))
+    """)
+
+    result = pytester.runpytest("-p", "tests.query_budget")
+
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*test body: 2 queries (budget 1)*"])
+
+
+def test_query_budget_marker_per_endpoint(pytester):
+    """エンドポイントごとの `query_budget`（dict）がリクエストごとに確認され、終了後に記録が無効になることを確認するテスト"""
+    pytester.makepyfile("""
+        import pytest
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from sqlalchemy import create_engine, event, text
+        from sqlalchemy.engine import Engine
+
+        from app.db import inspection
+
+        engine = create_engine("sqlite://")
+        app = FastAPI()
+
+        @app.get("/x")
+        def read_x(queries: int = 1):
+            with engine.connect() as conn:
+                for n in range(queries):
+                    conn.execute(text(f"SELECT {n}"))
+            return {}
+
+        app.add_middleware(inspection.QueryInspectionMiddleware)
+
+        @pytest.mark.query_budget({"GET /x": 1})
+        def test_within_budget():
+            assert TestClient(app).get("/x").status_code == 200
+
+        @pytest.mark.query_budget({"GET /x": 1})
+        def test_over_budget():
+            assert TestClient(app).get("/x", params={"queries": 2}).status_code == 200
+
+        def test_disabled_after_budget():
+            assert not event.contains(Engine, "after_cursor_execute", inspection._after_cursor_execute)
+    """)
+    # 外側のテストで有効にした記録を無効にし、プラグインが有効・無効を切り替える状態で実行する
+    inspection.disable_query_inspection()
+
+    result = pytester.runpytest("-p", "tests.query_budget")
+
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines(["*GET /x: 2 queries (budget 1)*"])
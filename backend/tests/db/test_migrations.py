@@ -38,8 +38,8 @@ def test_migrations_stairway(alembic_config: Config, postgres_engine: Engine) ->
             if revision == revisions[-1]:  # 最新のリビジョン
                 assert 'items' in table_names, "items テーブルが存在しません"
 
-    # 逆順にダウングレード
-    for revision in reversed(revisions[:-1]):
+    # 逆順にダウングレード（最後は base まで戻す）
+    for revision in [*reversed(revisions[:-1]), "base"]:
         downgrade(alembic_config, revision)
         
         # ダウングレード後のテーブル構造を確認
@@ -54,7 +54,7 @@ def test_migrations_stairway(alembic_config: Config, postgres_engine: Engine) ->
             table_names = [table[0] for table in tables]
             
             # 適切なテーブルが存在することを確認
-            if revision == revisions[0]:  # 最初のリビジョン
+            if revision == "base":  # 全てのマイグレーションをロールバック
                 assert 'items' not in table_names, "items テーブルが予期せず存在しています"
 
 
@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.db.pagination import (
+    InvalidCursorError, decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor
+)
+
+
+def test_cursor_round_trip():
+    """カーソルのエンコードとデコードで値が保持されることを確認するテスト"""
+    created_at = datetime(2025, 2, 21, 1, 18, 10, 497376, tzinfo=timezone.utc)
+    item_id = uuid4()
+
+    cursor = encode_cursor(created_at, item_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, item_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WyJhIiwiYiJd", "bnVsbA"])
+def test_invalid_cursor(cursor):
+    """不正なカーソルで InvalidCursorError が送出されることを確認するテスト"""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_search_cursor_round_trip():
+    """検索用カーソルのエンコードとデコードでスコアが正確に保持されることを確認するテスト"""
+    item_id = uuid4()
+    rank = 0.6666666865348816
+
+    assert decode_search_cursor(encode_search_cursor(rank, item_id)) == (rank, item_id)
+
+
+
+@pytest.mark.parametrize("values", [["a", "b"], [True, "b"], [0.5, "not-a-uuid"]])
+def test_invalid_search_cursor(values):
+    """スコアやIDが不正な検索用カーソルで InvalidCursorError が送出されることを確認するテスト"""
+    cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    with pytest.raises(InvalidCursorError):
+        decode_search_cursor(cursor)
@@ -0,0 +1,52 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.partitions import (
+    MeasurementWindowError, add_months, check_ingest_months, ensure_partitions, ingest_window, list_partitions,
+    month_start, partition_name, run_maintenance
+)
+
+
+def test_month_helpers():
+    """月の計算とパーティション名の生成を確認するテスト"""
+    jst = timezone(timedelta(hours=9))
+
+    assert month_start(date(2026, 10, 18)) == date(2026, 10, 1)
+    # 日時はUTCに変換してから月を判定する
+    assert month_start(datetime(2026, 11, 1, 8, 0, tzinfo=jst)) == date(2026, 10, 1)
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name(date(2026, 2, 1)) == "kpi_measurements_p202602"
+
+
+def test_ingest_window(monkeypatch):
+    """取り込める月が保持期間の最初の月から事前に作成する月までになることを確認するテスト"""
+    monkeypatch.setattr(settings, "measurement_partition_months_ahead", 3)
+    monkeypatch.setattr(settings, "measurement_retention_months", 0)
+    today = date(2026, 10, 18)
+
+    assert ingest_window(today) == (None, date(2027, 1, 1))
+    assert check_ingest_months([datetime(1990, 1, 1, tzinfo=timezone.utc)], today) == {date(1990, 1, 1)}
+    with pytest.raises(MeasurementWindowError):
+        check_ingest_months([datetime(2027, 2, 1, tzinfo=timezone.utc)], today)
+
+    monkeypatch.setattr(settings, "measurement_retention_months", 12)
+    assert ingest_window(today) == (date(2025, 11, 1), date(2027, 1, 1))
+    with pytest.raises(MeasurementWindowError):
+        check_ingest_months([date(2025, 10, 31)], today)
+
+
+def test_ensure_partitions_and_retention(postgres_session: Session):
+    """パーティションの作成と、保持期間を過ぎたパーティションの削除を確認するテスト"""
+    names = ensure_partitions(postgres_session, [datetime(2020, 1, 15, tzinfo=timezone.utc)])
+    assert names == ["kpi_measurements_p202001"]
+    assert date(2020, 1, 1) in list_partitions(postgres_session).values()
+
+    result = run_maintenance(postgres_session, months_ahead=2, retention_months=3, today=date(2030, 6, 10))
+
+    assert result["ensured"] == ["kpi_measurements_p203006", "kpi_measurements_p203007", "kpi_measurements_p203008"]
+    assert "kpi_measurements_p202001" in result["dropped"]
+    assert min(list_partitions(postgres_session).values()) == date(2030, 6, 1)
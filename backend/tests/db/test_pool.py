@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.db.pool import PoolMetrics
+
+
+@pytest.fixture
+def instrumented_engine(tmp_path):
+    """計測付きプール（サイズ1、オーバーフローなし）を使用するエンジンを提供するフィクスチャ"""
+    metrics = PoolMetrics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=metrics.pool_class(QueuePool),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    metrics.attach(engine)
+    try:
+        yield engine, metrics
+    finally:
+        engine.dispose()
+
+
+def test_snapshot_tracks_checked_out_connections(instrumented_engine):
+    """チェックアウト中とアイドルの接続数が反映されることを確認するテスト"""
+    engine, metrics = instrumented_engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = metrics.snapshot()
+        assert status["checked_out"] == 1
+        assert status["idle"] == 0
+
+    status = metrics.snapshot()
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+    assert status["connections_created_total"] == 1
+    assert status["checkouts_total"] == 1
+    assert status["checkins_total"] == 1
+
+
+def test_pool_timeout_is_recorded(instrumented_engine):
+    """プール枯渇によるタイムアウトと待ち時間が記録されることを確認するテスト"""
+    engine, metrics = instrumented_engine
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    status = metrics.snapshot()
+    assert status["timeouts_total"] == 1
+    assert status["wait_seconds_max"] >= 0.1
+
+
+def test_metrics_survive_pool_recreate(instrumented_engine):
+    """dispose でプールが再作成されても計測が継続することを確認するテスト"""
+    engine, metrics = instrumented_engine
+
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert metrics.snapshot()["checkouts_total"] == 1
+    assert metrics.wait_count == 1
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as item_crud
+from app.db.crud import kpi_measurement as crud
+from app.db.models.kpi_rollup import KpiRollupDaily, KpiRollupHourly, KpiRollupMonthly
+from app.db.rollups import refresh_rollups
+from app.db.schemas.item import ItemCreate
+from app.db.schemas.kpi_measurement import KpiMeasurementCreate
+
+START = datetime(2021, 1, 31, 22, 0, tzinfo=timezone.utc)
+
+
+def _rollup(db: Session, model, bucket: datetime):
+    return db.execute(
+        select(model.count, model.sum, model.min, model.max).where(model.bucket == bucket)
+    ).one()
+
+
+def test_refresh_rollups_incrementally(postgres_session: Session):
+    """ロールアップが各粒度で集計され、2回目以降は変更のあった期間のみ更新されることを確認するテスト"""
+    item = item_crud.create_item(postgres_session, ItemCreate(name="KPI"))
+    # 2021-01-31 22:00 から 30分間隔で4時間分（1月と2月にまたがる）
+    crud.ingest_measurements(postgres_session, [
+        KpiMeasurementCreate(item_id=item.id, measured_at=START + timedelta(minutes=30 * i), value=i)
+        for i in range(8)
+    ])
+
+    assert refresh_rollups(postgres_session) == {"hour": 4, "day": 2, "month": 2}
+    assert _rollup(postgres_session, KpiRollupHourly, START) == (2, 1.0, 0.0, 1.0)
+    assert _rollup(postgres_session, KpiRollupDaily, datetime(2021, 2, 1, tzinfo=timezone.utc)) == (4, 22.0, 4.0, 7.0)
+    assert _rollup(postgres_session, KpiRollupMonthly, datetime(2021, 1, 1, tzinfo=timezone.utc)) == (4, 6.0, 0.0, 3.0)
+
+    # 既存の測定値の上書きと、1時間分の追加
+    crud.ingest_measurements(postgres_session, [
+        KpiMeasurementCreate(item_id=item.id, measured_at=START, value=10.0)
+    ])
+    refresh_rollups(postgres_session, overlap_seconds=0)
+    assert _rollup(postgres_session, KpiRollupMonthly, datetime(2021, 1, 1, tzinfo=timezone.utc)) == (4, 16.0, 1.0, 10.0)
+
+    # 変更がなければ何も更新しない
+    assert refresh_rollups(postgres_session, overlap_seconds=0) == {"hour": 0, "day": 0, "month": 0}
@@ -0,0 +1,50 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemCreate, ItemUpdate
+from app.db.statement_cache import StatementCacheMetrics
+
+
+def test_snapshot_counts_hits_and_misses():
+    """同じSQLの2回目以降の実行がキャッシュのヒットとして数えられることを確認するテスト"""
+    metrics = StatementCacheMetrics("test")
+    engine = create_engine("sqlite://", execution_options={"compiled_cache": metrics.cache(size=10)})
+    try:
+        with engine.connect() as conn:
+            for value in range(3):
+                conn.execute(text("SELECT :value"), {"value": value})
+    finally:
+        engine.dispose()
+
+    status = metrics.snapshot()
+    assert status["name"] == "test"
+    assert status["capacity"] == 10
+    assert status["size"] == 1
+    assert status["misses_total"] == 1
+    assert status["hits_total"] == 2
+    assert status["hit_ratio"] == round(2 / 3, 4)
+
+
+def test_item_statements_are_reused():
+    """アイテムのSQLが呼び出しごとに組み立て直されず、同じ文が再利用されることを確認するテスト"""
+    assert crud.items_statement() is crud.items_statement()
+    assert crud.items_statement(crud.ITEM_COLUMNS, keyset=True) is crud.items_statement(crud.ITEM_COLUMNS, keyset=True)
+    assert crud.update_item_statement(("name",)) is crud.update_item_statement(("name",))
+    assert crud.delete_item_statement(True) is not crud.delete_item_statement(False)
+
+
+def test_crud_hits_compiled_cache(postgres_session: Session):
+    """同じ形の参照・更新の2回目以降がコンパイル済みSQLのキャッシュにヒットすることを確認するテスト"""
+    metrics = StatementCacheMetrics("test")
+    engine = postgres_session.get_bind().execution_options(compiled_cache=metrics.cache())
+    with Session(engine) as db:
+        item = crud.create_item(db, ItemCreate(name="Item"))
+        before = metrics.snapshot()
+        for i in range(3):
+            crud.get_items(db, skip=i, limit=10)
+            crud.update_item(db, item.id, ItemUpdate(name=f"Item {i}"))
+        after = metrics.snapshot()
+
+    assert after["misses_total"] - before["misses_total"] == 2
+    assert after["hits_total"] - before["hits_total"] == 4
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemCreate
+from app.etl.item_export import EXPORT_COLUMNS, stream_items
+
+
+def _create_items(db: Session, count: int):
+    return crud.create_items(db, [
+        ItemCreate(name=f"Item {i}", description=None if i % 2 else f"line\n\"{i}\"")
+        for i in range(count)
+    ])
+
+
+def test_stream_ndjson(postgres_session: Session):
+    """全アイテムがバッチごとのチャンクとしてNDJSONで出力されることを確認するテスト"""
+    created = _create_items(postgres_session, 5)
+    factory = sessionmaker(bind=postgres_session.get_bind())
+
+    chunks = list(stream_items(factory, "ndjson", batch_size=2))
+
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert [row["id"] for row in rows] == [str(item.id) for item in sorted(created, key=lambda i: (i.created_at, i.id))]
+    assert {row["name"]: row["description"] for row in rows}["Item 0"] == "line\n\"0\""
+    assert set(rows[0]) == set(EXPORT_COLUMNS)
+
+
+def test_stream_csv(postgres_session: Session):
+    """ヘッダー付きのCSVで出力され、改行や引用符を含む値が復元できることを確認するテスト"""
+    _create_items(postgres_session, 3)
+    factory = sessionmaker(bind=postgres_session.get_bind())
+
+    body = b"".join(stream_items(factory, "csv", batch_size=2)).decode()
+
+    rows = list(csv.DictReader(io.StringIO(body, newline="")))
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+    assert {row["name"]: row["description"] for row in rows} == {
+        "Item 0": "line\n\"0\"", "Item 1": "", "Item 2": "line\n\"2\""
+    }
+
+
+def test_stream_empty_table(postgres_session: Session):
+    """アイテムがない場合はNDJSONは空、CSVはヘッダーのみになることを確認するテスト"""
+    factory = sessionmaker(bind=postgres_session.get_bind())
+
+    assert b"".join(stream_items(factory, "ndjson")) == b""
+    assert b"".join(stream_items(factory, "csv")).decode().strip() == ",".join(EXPORT_COLUMNS)
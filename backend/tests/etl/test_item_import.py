@@ -0,0 +1,95 @@
+import io
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.dependencies import get_db
+from app.routers import item_import
+from app.etl.item_import import import_items, iter_records
+
+
+def test_iter_records_csv():
+    """CSVの空欄を未指定として扱い、行番号を返すことを確認するテスト"""
+    stream = io.StringIO("name,description\nA,\nB,desc\n")
+
+    assert list(iter_records(stream, "csv")) == [(2, {"name": "A"}), (3, {"name": "B", "description": "desc"})]
+
+
+def test_iter_records_ndjson_reports_parse_errors():
+    """NDJSONの解析できない行を例外として返し、空行を読み飛ばすことを確認するテスト"""
+    stream = io.StringIO('{"name": "A"}\n\n{broken\n')
+
+    records = list(iter_records(stream, "ndjson"))
+
+    assert records[0] == (1, {"name": "A"})
+    assert records[1][0] == 3
+    assert isinstance(records[1][1], ValueError)
+
+
+def test_import_csv(postgres_session: Session):
+    """CSVの有効な行だけが取り込まれ、エラー行が報告されることを確認するテスト"""
+    rows = ["name,description"]
+    rows += [f"Item {i},\"multi\nline\ttab\\slash {i}\"" for i in range(7)]
+    rows += [",missing name", "   ,blank name"]
+    stream = io.StringIO("\n".join(rows) + "\n")
+    reported = []
+
+    result = import_items(postgres_session, stream, "csv", batch_size=3, on_error=reported.append)
+
+    assert result.total_rows == 9
+    assert result.imported_rows == 7
+    assert result.rejected_rows == 2
+    # 行番号は物理行（改行を含む値は2行として数える）
+    assert [error.line for error in result.errors] == [16, 17]
+    assert reported == result.errors
+
+    items = {item.name: item for item in crud.get_items(postgres_session)}
+    assert len(items) == 7
+    assert items["Item 0"].description == "multi\nline\ttab\\slash 0"
+
+
+def test_import_ndjson(postgres_session: Session):
+    """NDJSONの取り込みと、エラー報告件数の上限を確認するテスト"""
+    stream = io.StringIO(
+        '{"name": "A", "description": null}\n'
+        '{"name": ""}\n'
+        'not json\n'
+        '{"name": "B", "description": "b"}\n'
+    )
+
+    result = import_items(postgres_session, stream, "ndjson", max_reported_errors=1)
+
+    assert result.imported_rows == 2
+    assert result.rejected_rows == 2
+    assert len(result.errors) == 1
+    assert sorted(item.name for item in crud.get_items(postgres_session)) == ["A", "B"]
+
+
+def test_import_endpoint_writes_spilled_chunks_off_loop(postgres_session: Session, monkeypatch):
+    """メモリの上限を超えたアップロードのチャンクがスレッドプールで一時ファイルに書き込まれることを確認するテスト"""
+    offloaded = []
+    run_in_threadpool = item_import.run_in_threadpool
+
+    async def record(func, *args, **kwargs):
+        offloaded.append(getattr(func, "__name__", func))
+        return await run_in_threadpool(func, *args, **kwargs)
+
+    monkeypatch.setattr(item_import, "SPOOL_MAX_BYTES", 64)
+    monkeypatch.setattr(item_import, "run_in_threadpool", record)
+    app = FastAPI()
+    app.include_router(item_import.router)
+    app.dependency_overrides[get_db] = lambda: postgres_session
+    body = "name,description\n" + "".join(f"Item {i},description {i}\n" for i in range(20))
+
+    def chunks():
+        for line in io.StringIO(body):
+            yield line.encode()
+
+    response = TestClient(app).post("/api/items/import?format=csv", content=chunks())
+
+    assert response.status_code == 200
+    assert response.json()["imported_rows"] == 20
+    assert offloaded.count("write") > 0
+    assert offloaded[-1] == "import_items"
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.orm import Session
+
+from app.db.crud import item as crud
+from app.db.schemas.item import ItemCreate, ItemUpdate
+from app.feeds.item import CLOSED, RESYNC, FeedFull, ItemChangeFeed
+
+ITEM_A = "00000000-0000-0000-0000-00000000000a"
+ITEM_B = "00000000-0000-0000-0000-00000000000b"
+
+
+@pytest_asyncio.fixture
+async def feed(postgres_session: Session):
+    """テスト用データベースを LISTEN するフィードを提供するフィクスチャ"""
+    dsn = postgres_session.get_bind().url.render_as_string(hide_password=False)
+    feed = ItemChangeFeed(dsn, queue_size=3, max_subscribers=3, heartbeat_interval=60)
+    yield feed
+    await feed.close()
+
+
+def _events(subscription):
+    return [change.event for change in subscription.pending or ()]
+
+
+@pytest.mark.asyncio
+async def test_publish_filters_subscribers(feed: ItemChangeFeed):
+    """アイテムのID・変更の種類で購読者ごとに絞り込まれることを確認するテスト"""
+    everything = await feed.subscribe()
+    only_a = await feed.subscribe(item_ids={ITEM_A})
+    only_deletes = await feed.subscribe(operations={"delete"})
+
+    assert feed.publish(f'{{"op": "update", "id": "{ITEM_A}"}}') == 2
+    assert feed.publish(f'{{"op": "delete", "id": "{ITEM_B}"}}') == 2
+    # 件数の多い変更をまとめた通知はアイテムのIDに関係なく配信される
+    assert feed.publish('{"op": "insert", "count": 5000}') == 2
+
+    assert _events(everything) == ["update", "delete", "insert"]
+    assert _events(only_a) == ["update", "insert"]
+    assert _events(only_deletes) == ["delete"]
+    assert (await only_a.get()).data == f'{{"op": "update", "id": "{ITEM_A}"}}'
+    assert feed.publish("not json") == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_receives_resync(feed: ItemChangeFeed):
+    """受信が追いつかない購読者の変更が破棄され、resync に置き換えられることを確認するテスト"""
+    subscription = await feed.subscribe()
+    for _ in range(4):
+        feed.publish(f'{{"op": "update", "id": "{ITEM_A}"}}')
+
+    assert await subscription.get() is RESYNC
+    assert subscription.idle
+    assert feed.stats()["dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_subscriber_limit_and_unsubscribe(feed: ItemChangeFeed):
+    """購読者数の上限と、購読の終了で索引から削除されることを確認するテスト"""
+    subscriptions = [await feed.subscribe(item_ids={ITEM_A}) for _ in range(3)]
+    with pytest.raises(FeedFull):
+        await feed.subscribe()
+
+    for subscription in subscriptions:
+        feed.unsubscribe(subscription)
+    assert feed.stats()["subscribers"] == 0
+    assert feed.stats()["item_filters"] == 0
+    assert feed.publish(f'{{"op": "update", "id": "{ITEM_A}"}}') == 0
+
+
+@pytest.mark.asyncio
+async def test_listen_delivers_committed_changes(postgres_session: Session, feed: ItemChangeFeed):
+    """コミットされたアイテムの変更がトリガー経由で購読者に配信されることを確認するテスト"""
+    subscription = await feed.subscribe()
+
+    db_item = crud.create_item(postgres_session, ItemCreate(name="Streamed"))
+    crud.update_item(postgres_session, db_item.id, ItemUpdate(name="Streamed again"))
+    crud.delete_item(postgres_session, db_item.id)
+
+    received = [await asyncio.wait_for(subscription.get(), timeout=5) for _ in range(3)]
+    assert [change.event for change in received] == ["insert", "update", "delete"]
+    assert all(f'"id" : "{db_item.id}"' in change.data for change in received)
+
+    await feed.close()
+    assert await subscription.get() is CLOSED
@@ -0,0 +1,140 @@
+import time
+
+import fakeredis
+import pytest
+
+from app.jobs.queue import JobQueue
+
+
+@pytest.fixture
+def queue() -> JobQueue:
+    """インプロセスのRedis互換サーバー（fakeredis）を使うキューを提供するフィクスチャ"""
+    return JobQueue(fakeredis.FakeRedis(), max_attempts=3, retry_backoff=10, retry_backoff_max=15, result_ttl=60)
+
+
+def test_enqueue_and_dequeue(queue: JobQueue):
+    """登録した順にジョブを取得し、実行中になることを確認するテスト"""
+    first = queue.enqueue("example", {"n": 1})
+    second = queue.enqueue("example", {"n": 2})
+
+    assert first["status"] == "queued"
+    assert queue.stats() == {"queued": 2, "retrying": 0, "running": 0}
+
+    job = queue.dequeue()
+    assert job["id"] == first["id"]
+    assert job["params"] == {"n": 1}
+    assert job["status"] == "running"
+    assert job["attempts"] == 1
+    assert queue.dequeue()["id"] == second["id"]
+    assert queue.dequeue() is None
+    assert queue.stats() == {"queued": 0, "retrying": 0, "running": 2}
+
+
+def test_progress_and_finish(queue: JobQueue):
+    """進捗の更新と成功時の結果の保存を確認するテスト"""
+    job_id = queue.enqueue("example")["id"]
+    queue.dequeue()
+
+    assert queue.report_progress(job_id, 0.5, "halfway") is False
+    job = queue.get(job_id)
+    assert job["progress"] == 0.5
+    assert job["message"] == "halfway"
+
+    queue.finish(job_id, "succeeded", result={"rows": 10})
+    job = queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["result"] == {"rows": 10}
+    assert job["finished_at"] is not None
+    assert 0 < queue.client.ttl(f"jobs:job:{job_id}") <= 60
+    assert queue.stats()["running"] == 0
+
+
+def test_retry_with_backoff(queue: JobQueue):
+    """失敗したジョブが指数バックオフ後に再実行され、最大実行回数で失敗になることを確認するテスト"""
+    job_id = queue.enqueue("example")["id"]
+
+    queue.dequeue()
+    assert queue.retry_or_fail(job_id, "boom") == "retrying"
+    job = queue.get(job_id)
+    assert job["status"] == "retrying"
+    assert job["error"] == "boom"
+    # 1回目のリトライは retry_backoff（10秒）の半分から全部の間
+    assert 5 <= (job["next_attempt_at"] - job["started_at"]).total_seconds() <= 10.5
+    assert queue.dequeue() is None
+
+    assert queue.promote_due(now=time.time() + 15) == 1
+    assert queue.dequeue()["attempts"] == 2
+    assert queue.retry_or_fail(job_id, "boom") == "retrying"
+    # 2回目は 20秒だが retry_backoff_max（15秒）で頭打ち
+    job = queue.get(job_id)
+    assert (job["next_attempt_at"] - job["started_at"]).total_seconds() <= 15.5
+
+    queue.promote_due(now=time.time() + 15)
+    assert queue.dequeue()["attempts"] == 3
+    assert queue.retry_or_fail(job_id, "boom") == "failed"
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.stats() == {"queued": 0, "retrying": 0, "running": 0}
+
+
+def test_cancel_waiting_jobs(queue: JobQueue):
+    """実行待ち・リトライ待ちのジョブが直ちにキャンセルされることを確認するテスト"""
+    retrying_id = queue.enqueue("example")["id"]
+    queue.dequeue()
+    queue.retry_or_fail(retrying_id, "boom")
+    queued_id = queue.enqueue("example")["id"]
+
+    assert queue.cancel(queued_id)["status"] == "cancelled"
+    assert queue.cancel(retrying_id)["status"] == "cancelled"
+    assert queue.dequeue() is None
+    assert queue.promote_due(now=time.time() + 60) == 0
+    assert queue.stats() == {"queued": 0, "retrying": 0, "running": 0}
+    assert queue.cancel("unknown") is None
+
+
+def test_cancel_running_job(queue: JobQueue):
+    """実行中のジョブにはキャンセルが要求され、進捗の報告時に通知されることを確認するテスト"""
+    job_id = queue.enqueue("example")["id"]
+    queue.dequeue()
+
+    job = queue.cancel(job_id)
+    assert job["status"] == "running"
+    assert job["cancel_requested"] is True
+    assert queue.report_progress(job_id, 0.1) is True
+
+    queue.finish(job_id, "cancelled")
+    # 完了したジョブはキャンセルしても変わらない
+    assert queue.cancel(job_id)["status"] == "cancelled"
+
+
+def test_requeue_stale(queue: JobQueue):
+    """ハートビートが途絶えたジョブがリトライとして再登録されることを確認するテスト"""
+    stale_id = queue.enqueue("example")["id"]
+    alive_id = queue.enqueue("example")["id"]
+    queue.dequeue()
+    queue.dequeue()
+    queue.client.hset(f"jobs:job:{stale_id}", "heartbeat", time.time() - 600)
+
+    assert queue.requeue_stale(stale_seconds=300) == [stale_id]
+    assert queue.get(stale_id)["status"] == "retrying"
+    assert queue.get(stale_id)["error"] == "Worker stopped responding"
+    assert queue.get(alive_id)["status"] == "running"
+    assert queue.stats() == {"queued": 0, "retrying": 1, "running": 1}
+
+
+def test_requeue_stale_skips_just_claimed_job(queue: JobQueue):
+    """リトライ後に取得されたばかりのジョブが、前回の実行のハートビートで停止と判定されないことを確認するテスト"""
+    job_id = queue.enqueue("example")["id"]
+    queue.dequeue()
+    queue.client.hset(f"jobs:job:{job_id}", "heartbeat", time.time() - 600)
+    queue.retry_or_fail(job_id, "boom")
+    queue.promote_due(now=time.time() + 15)
+    # 別のワーカーが LMOVE で取得し、ハートビートを記録する前の状態
+    queue.client.lmove(queue.queue_key, queue.processing_key, "RIGHT", "LEFT")
+
+    assert queue.requeue_stale(stale_seconds=300) == []
+    assert queue.stats()["running"] == 1
+    assert float(queue.client.hget(f"jobs:job:{job_id}", "heartbeat")) > time.time() - 5
+    # 取得直後にワーカーが停止した場合は、記録したハートビートから stale_seconds 後にリトライする
+    queue.client.hset(f"jobs:job:{job_id}", "heartbeat", time.time() - 600)
+    assert queue.requeue_stale(stale_seconds=300) == [job_id]
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.crud import item as crud
+from app.db.models.item import Item
+from app.db.schemas.item import ItemCreate
+from app.jobs.queue import JobQueue
+from app.jobs.tasks import TASKS, result_path
+from app.jobs.worker import JobContext, Worker, remove_expired_files
+from app.routers import jobs
+
+
+@pytest.fixture
+def queue() -> JobQueue:
+    """インプロセスのRedis互換サーバー（fakeredis）を使うキューを提供するフィクスチャ"""
+    return JobQueue(fakeredis.FakeRedis(), max_attempts=2, retry_backoff=0, retry_backoff_max=0)
+
+
+@pytest.fixture
+def worker(postgres_session: Session, queue: JobQueue, tmp_path) -> Worker:
+    """テスト用データベースとfakeredisを使うワーカーを提供するフィクスチャ"""
+    session_factory = sessionmaker(bind=postgres_session.get_bind())
+    return Worker(queue, dict(TASKS), session_factory, concurrency=2, poll_timeout=1, data_dir=str(tmp_path))
+
+
+def _count_items(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(Item))
+
+
+def test_import_job(postgres_session: Session, worker: Worker, tmp_path):
+    """アップロードしたファイルの取り込みジョブの結果・進捗を確認するテスト"""
+    path = tmp_path / "upload.csv"
+    path.write_text("name,description\n" + "".join(f"Item {i},d\n" for i in range(10)) + ",missing name\n")
+    job_id = worker.queue.enqueue("items.import", {"path": str(path), "format": "csv"})["id"]
+
+    assert worker.run_pending() == 1
+
+    job = worker.queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["result"]["imported_rows"] == 10
+    assert job["result"]["rejected_rows"] == 1
+    assert _count_items(postgres_session) == 10
+    assert not path.exists()
+
+
+
+def test_upload_import(postgres_session: Session, worker: Worker, tmp_path, monkeypatch):
+    """APIでアップロードしたファイルが保存されて取り込まれ、キューに接続できない場合は削除されることを確認するテスト"""
+    monkeypatch.setattr(jobs, "job_queue", worker.queue)
+    monkeypatch.setattr(jobs.settings, "job_data_dir", str(tmp_path / "uploads"))
+    app = FastAPI()
+    app.include_router(jobs.router)
+    client = TestClient(app)
+    body = "name\n" + "".join(f"Item {i}\n" for i in range(100))
+
+    response = client.post("/api/jobs/items/import", content=(line.encode() for line in body.splitlines(True)))
+
+    assert response.status_code == 202
+    assert worker.run_pending() == 1
+    assert worker.queue.get(response.json()["id"])["result"]["imported_rows"] == 100
+    assert _count_items(postgres_session) == 100
+
+    server = fakeredis.FakeServer()
+    server.connected = False
+    monkeypatch.setattr(jobs, "job_queue", JobQueue(fakeredis.FakeRedis(server=server)))
+    assert client.post("/api/jobs/items/import", content=body).status_code == 503
+    assert os.listdir(tmp_path / "uploads") == []
+
+def test_export_job(postgres_session: Session, worker: Worker):
+    """エクスポートジョブが結果ファイルを出力することを確認するテスト"""
+    for i in range(3):
+        crud.create_item(postgres_session, ItemCreate(name=f"Export {i}"))
+    job_id = worker.queue.enqueue("items.export", {"format": "csv", "batch_size": 2})["id"]
+
+    worker.run_pending()
+
+    job = worker.queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["result"]["rows"] == 3
+    with open(result_path(worker.data_dir, job)) as file:
+        lines = file.read().splitlines()
+    assert lines[0] == "id,name,description,created_at,updated_at"
+    assert len(lines) == 4
+    assert not [name for name in os.listdir(worker.data_dir) if name.endswith(".tmp")]
+
+
+def test_cancel_running_import(postgres_session: Session, worker: Worker, tmp_path):
+    """実行中にキャンセルした取り込みジョブがロールバックされることを確認するテスト"""
+    path = tmp_path / "upload.ndjson"
+    path.write_text("".join(f'{{"name": "Item {i}"}}\n' for i in range(20000)))
+    job_id = worker.queue.enqueue("items.import", {"path": str(path), "format": "ndjson"})["id"]
+
+    job = worker.queue.dequeue()
+    worker.queue.cancel(job_id)
+
+    assert worker.run_job(job) == "cancelled"
+    assert worker.queue.get(job_id)["status"] == "cancelled"
+    assert _count_items(postgres_session) == 0
+
+
+def test_retry_then_fail(worker: Worker):
+    """例外を送出したジョブがリトライされ、最大実行回数で失敗になることを確認するテスト"""
+    attempts = []
+
+    def flaky(ctx: JobContext):
+        attempts.append(ctx.attempt)
+        raise RuntimeError("temporary failure")
+
+    worker.tasks["flaky"] = flaky
+    job_id = worker.queue.enqueue("flaky")["id"]
+
+    assert worker.run_pending() == 2
+    assert attempts == [1, 2]
+    job = worker.queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "RuntimeError: temporary failure"
+
+    unknown_id = worker.queue.enqueue("unknown")["id"]
+    worker.run_pending()
+    assert worker.queue.get(unknown_id)["status"] == "failed"
+
+
+def test_run_concurrently(worker: Worker):
+    """ワーカーが複数のスレッドでジョブを並行して実行し、停止を要求すると終了することを確認するテスト"""
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def sleep(ctx: JobContext):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.2)
+        with lock:
+            active[0] -= 1
+        return ctx.params["n"]
+
+    worker.tasks["sleep"] = sleep
+    job_ids = [worker.queue.enqueue("sleep", {"n": n})["id"] for n in range(4)]
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if all(worker.queue.get(job_id)["status"] == "succeeded" for job_id in job_ids):
+                break
+            time.sleep(0.05)
+    finally:
+        worker.stop()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert [worker.queue.get(job_id)["result"] for job_id in job_ids] == [0, 1, 2, 3]
+    assert peak[0] == 2
+
+
+def test_remove_expired_files(tmp_path):
+    """保持期間を過ぎたファイルのみが削除されることを確認するテスト"""
+    old, new = tmp_path / "old.csv", tmp_path / "new.csv"
+    old.write_text("old")
+    new.write_text("new")
+    os.utime(old, (time.time() - 120, time.time() - 120))
+
+    assert remove_expired_files(str(tmp_path), ttl=60) == 1
+    assert not old.exists()
+    assert new.exists()
+    assert remove_expired_files(str(tmp_path / "missing")) == 0
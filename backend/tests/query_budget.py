@@ -0,0 +1,96 @@
+"""
+SQLの数の上限（クエリバジェット）を確認する pytest プラグイン
+
+`@pytest.mark.query_budget` を付けたテストで実行したSQLを `app.db.inspection` で記録し、
+上限を超えた場合や N+1 の候補がある場合にテストを失敗させます。
+
+- リクエスト（`QueryInspectionMiddleware` を追加したアプリケーションへの `TestClient` の呼び出し）は、
+  リクエストごとに上限を確認します。
+- リクエスト外（CRUD関数の直接の呼び出し）で実行したSQLは、テスト全体の合計で上限を確認します
+  （フィクスチャの準備・後片付けで実行したSQLは含みません）。
+
+使用例::
+
+    @pytest.mark.query_budget(1)
+    def test_get_item(postgres_session): ...
+
+    @pytest.mark.query_budget({"GET /api/items/{item_id}": 1, "PUT /api/items/{item_id}": 2})
+    def test_item_api(client): ...
+
+`n_plus_one=False` を指定すると N+1 の候補があっても失敗させません。
+"""
+import threading
+from typing import Dict, List, Optional, Union
+
+import pytest
+
+from app.core.config import settings
+from app.db.inspection import (
+    QueryLog, capture_queries, disable_query_inspection, enable_query_inspection, request_observers
+)
+
+TEST_BODY = "test body"
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(limit, n_plus_one=True): SQLの数の上限（int、またはエンドポイントごとの dict）を確認する",
+    )
+
+
+def _violations(log: QueryLog, limit: Optional[int], n_plus_one: bool) -> List[str]:
+    violations = []
+    if limit is not None and len(log) > limit:
+        statements = "\n".join(f"    [{query.origin or '-'}] {query.shape}" for query in log.queries)
+        violations.append(f"{log.label}: {len(log)} queries (budget {limit})\n{statements}")
+    if n_plus_one:
+        for query, count in log.repeated():
+            violations.append(
+                f"{log.label}: possible N+1, executed {count} times (origin: {query.origin or '-'}): {query.shape}"
+            )
+    return violations
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+
+    budget: Union[int, Dict[str, int]] = marker.args[0] if marker.args else marker.kwargs["limit"]
+    n_plus_one: bool = marker.kwargs.get("n_plus_one", True)
+    # このテストのために有効にした場合は、以降のテストに記録・スロークエリのログが残らないよう終了後に無効にする
+    enabled = enable_query_inspection()
+
+    # リクエストは TestClient のイベントループのスレッドで処理されるため、コールバックで受け取る
+    lock = threading.Lock()
+    requests: List[QueryLog] = []
+
+    def observe(log: QueryLog) -> None:
+        with lock:
+            requests.append(log)
+
+    request_observers.append(observe)
+    try:
+        with capture_queries(TEST_BODY) as body:
+            outcome = yield
+    finally:
+        request_observers.remove(observe)
+        if enabled:
+            disable_query_inspection()
+    if outcome.excinfo is not None:
+        return
+
+    violations = []
+    for log in requests:
+        limit = budget.get(log.label) if isinstance(budget, dict) else budget
+        violations.extend(_violations(log, limit, n_plus_one))
+    # テスト本体でのN+1（ループでのCRUD関数の呼び出し）はテストの書き方によるため、上限のみ確認する
+    violations.extend(_violations(body, budget if isinstance(budget, int) else None, n_plus_one=False))
+    if violations:
+        pytest.fail(
+            f"Query budget exceeded (N+1 threshold {settings.n_plus_one_threshold}):\n" + "\n".join(violations),
+            pytrace=False,
+        )